@@ -0,0 +1,29 @@
+"""Add materialized next free slot per master
+
+Revision ID: 20261017_0009
+Revises: 20261017_0008
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0009"
+down_revision = "20261017_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "master_next_free_slot",
+        sa.Column("master_id", sa.Integer(), sa.ForeignKey("masters.id"), primary_key=True),
+        sa.Column("slot_start", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("slot_end", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("master_next_free_slot")
@@ -0,0 +1,73 @@
+"""Exclude overlapping active bookings per master
+
+Revision ID: 20261017_0010
+Revises: 20261017_0009
+Create Date: 2026-10-17
+
+`CREATE EXTENSION btree_gist` needs a role allowed to create extensions (superuser, or
+database owner on PostgreSQL 13+ where btree_gist is a trusted extension). When the
+migration role lacks that, a privileged role must run `CREATE EXTENSION btree_gist` first.
+"""
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0010"
+down_revision = "20261017_0009"
+branch_labels = None
+depends_on = None
+
+
+_OVERLAP_REPORT_LIMIT = 50
+
+
+def upgrade() -> None:
+    _fail_on_existing_overlaps()
+    # btree_gist provides the `=` operator class for master_id inside a GiST exclusion constraint.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        """
+        ALTER TABLE bookings
+        ADD CONSTRAINT ex_bookings_active_master_slot
+        EXCLUDE USING gist (
+            master_id WITH =,
+            tstzrange(slot_start, slot_end, '[)') WITH &&
+        )
+        WHERE (status = 'active')
+        """
+    )
+
+
+def _fail_on_existing_overlaps() -> None:
+    """Stop with the conflicting booking ids instead of a bare constraint error mid-deploy."""
+    overlaps = op.get_bind().execute(
+        text(
+            """
+            SELECT a.master_id, a.id AS booking_id, b.id AS overlapping_booking_id
+            FROM bookings a
+            JOIN bookings b
+              ON b.master_id = a.master_id
+             AND b.id > a.id
+             AND b.status = 'active'
+             AND a.slot_start < b.slot_end
+             AND b.slot_start < a.slot_end
+            WHERE a.status = 'active'
+            ORDER BY a.master_id, a.id, b.id
+            LIMIT :limit
+            """
+        ),
+        {"limit": _OVERLAP_REPORT_LIMIT},
+    ).all()
+    if not overlaps:
+        return
+    pairs = ", ".join(f"master {row[0]}: {row[1]}/{row[2]}" for row in overlaps)
+    raise RuntimeError(
+        "Cannot add ex_bookings_active_master_slot: overlapping active bookings exist "
+        f"(first {len(overlaps)} pairs: {pairs}). Cancel or move one booking of each pair, "
+        "see docs/04-delivery/deploy-vm.md (booking overlap cleanup), then rerun the migration."
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS ex_bookings_active_master_slot")
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from threading import Lock
+from typing import Any
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from app.db.bulk import values_statement
+from app.db.timeouts import OPERATION_ADMIN_WRITE, DatabaseTimeoutError, begin_operation, run_after_commit
+from app.observability import emit_event, observe_audit_event
+from app.timezone import utc_now
+
+AUDIT_FLUSH_SECONDS_ENV = "AUDIT_FLUSH_SECONDS"
+AUDIT_QUEUE_MAX_EVENTS_ENV = "AUDIT_QUEUE_MAX_EVENTS"
+AUDIT_FLUSH_BATCH_SIZE = 200
+
+_AUDIT_FLUSH_SECONDS_DEFAULT = 15.0
+_AUDIT_QUEUE_MAX_EVENTS_DEFAULT = 5000
+# Failures worth retrying the same rows later: the database is slow or unreachable, not the rows bad.
+_TRANSIENT_FLUSH_ERRORS = (DatabaseTimeoutError, OperationalError)
+# One `audit_events` row; the actor id falls back to a lookup by Telegram user id. PostgreSQL
+# stores the payload as JSONB, other dialects (tests) as text.
+_AUDIT_ROW_SQL = (
+    "(COALESCE(:actor_user_id_{index}, "
+    "(SELECT id FROM users WHERE telegram_user_id = :actor_telegram_user_id_{index})), "
+    ":event_type_{index}, :entity_type_{index}, :entity_id_{index}, :payload_{index}, :created_at_{index})"
+)
+_AUDIT_ROW_SQL_POSTGRESQL = (
+    "(COALESCE(:actor_user_id_{index}, "
+    "(SELECT id FROM users WHERE telegram_user_id = :actor_telegram_user_id_{index})), "
+    ":event_type_{index}, :entity_type_{index}, :entity_id_{index}, CAST(:payload_{index} AS JSONB), "
+    ":created_at_{index})"
+)
+
+# Security-relevant log events mirrored into `audit_events`: event -> (entity_type, entity id field, actor field).
+_AUDITED_LOG_EVENTS: dict[str, tuple[str, str, str]] = {
+    "abuse_throttle_deny": ("telegram_user", "telegram_user_id", "telegram_user_id"),
+    "rbac_deny": ("command", "command", "telegram_user_id"),
+    "master_admin_action": ("master_admin", "target_telegram_user_id", "actor_telegram_user_id"),
+}
+
+_BUFFER: AuditEventBuffer | None = None
+
+
+@dataclass(frozen=True)
+class PendingAuditEvent:
+    event_type: str
+    entity_type: str
+    entity_id: str
+    created_at: datetime
+    payload: dict[str, Any] = field(default_factory=dict)
+    actor_user_id: int | None = None
+    actor_telegram_user_id: int | None = None
+
+
+def resolve_audit_flush_seconds() -> float:
+    raw_value = (os.getenv(AUDIT_FLUSH_SECONDS_ENV) or "").strip()
+    if not raw_value:
+        return _AUDIT_FLUSH_SECONDS_DEFAULT
+    try:
+        value = float(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"{AUDIT_FLUSH_SECONDS_ENV} must be a number, got {raw_value!r}") from exc
+    if value <= 0:
+        raise ValueError(f"{AUDIT_FLUSH_SECONDS_ENV} must be > 0, got {value}")
+    return value
+
+
+def resolve_audit_queue_max_events() -> int:
+    raw_value = (os.getenv(AUDIT_QUEUE_MAX_EVENTS_ENV) or "").strip()
+    if not raw_value:
+        return _AUDIT_QUEUE_MAX_EVENTS_DEFAULT
+    try:
+        value = int(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"{AUDIT_QUEUE_MAX_EVENTS_ENV} must be an integer, got {raw_value!r}") from exc
+    if value <= 0:
+        raise ValueError(f"{AUDIT_QUEUE_MAX_EVENTS_ENV} must be > 0, got {value}")
+    return value
+
+
+class AuditEventBuffer:
+    """Bounded in-memory queue of audit rows waiting for `AuditEventWriter.flush`.
+
+    `offer` never blocks on the database; when the queue is full the new event is dropped and
+    counted, so a stalled database costs audit rows, not request latency.
+    """
+
+    def __init__(self, *, max_events: int) -> None:
+        self.max_events = max(1, int(max_events))
+        self._events: deque[PendingAuditEvent] = deque()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def offer(self, event: PendingAuditEvent) -> bool:
+        with self._lock:
+            accepted = len(self._events) < self.max_events
+            if accepted:
+                self._events.append(event)
+        observe_audit_event("queued" if accepted else "dropped")
+        return accepted
+
+    def take(self, limit: int) -> list[PendingAuditEvent]:
+        with self._lock:
+            return [self._events.popleft() for _ in range(min(limit, len(self._events)))]
+
+    def requeue(self, events: list[PendingAuditEvent]) -> None:
+        """Put a failed batch back at the head; events that no longer fit are dropped."""
+        with self._lock:
+            room = max(0, self.max_events - len(self._events))
+            kept = events[:room]
+            self._events.extendleft(reversed(kept))
+        for _ in range(len(events) - len(kept)):
+            observe_audit_event("dropped")
+
+
+class AuditEventWriter:
+    """Drains an `AuditEventBuffer` into `audit_events` with one multi-row INSERT per batch.
+
+    A batch that fails on a timeout or a lost connection is requeued for the next flush. Any other
+    error is blamed on the rows: the batch is bisected until the offending events are isolated,
+    and those are dropped and counted as `failed` so one bad row cannot block the queue.
+    """
+
+    def __init__(self, engine: Engine, buffer: AuditEventBuffer) -> None:
+        self._engine = engine
+        self._buffer = buffer
+
+    def flush(self, *, batch_size: int = AUDIT_FLUSH_BATCH_SIZE) -> int:
+        """Write everything queued so far; returns rows written. Flushing stops at the first transient error."""
+        written = 0
+        while True:
+            batch = self._buffer.take(batch_size)
+            if not batch:
+                return written
+            pending = [batch]
+            while pending:
+                part = pending.pop(0)
+                try:
+                    with begin_operation(self._engine, OPERATION_ADMIN_WRITE) as conn:
+                        _insert_batch(conn, part)
+                except _TRANSIENT_FLUSH_ERRORS as exc:
+                    unwritten = [item for chunk in (part, *pending) for item in chunk]
+                    self._buffer.requeue(unwritten)
+                    for _ in unwritten:
+                        observe_audit_event("retried")
+                    emit_event("audit_flush_failed", events=len(unwritten), error=str(exc))
+                    return written
+                except Exception as exc:  # noqa: BLE001
+                    if len(part) > 1:
+                        middle = len(part) // 2
+                        pending[:0] = [part[:middle], part[middle:]]
+                        continue
+                    observe_audit_event("failed")
+                    emit_event("audit_event_dropped", event_type=part[0].event_type, error=str(exc))
+                    continue
+                for _ in part:
+                    observe_audit_event("written")
+                written += len(part)
+
+
+def configure_audit_buffer(buffer: AuditEventBuffer | None) -> None:
+    global _BUFFER
+    _BUFFER = buffer
+
+
+def get_audit_buffer() -> AuditEventBuffer | None:
+    return _BUFFER
+
+
+def record_audit_event(
+    event_type: str,
+    *,
+    entity_type: str,
+    entity_id: object,
+    actor_user_id: int | None = None,
+    actor_telegram_user_id: int | None = None,
+    payload: dict[str, Any] | None = None,
+) -> bool:
+    """Queue one audit row for the background writer; a no-op returning False when no buffer is configured."""
+    buffer = _BUFFER
+    if buffer is None:
+        return False
+    return buffer.offer(
+        PendingAuditEvent(
+            event_type=event_type,
+            entity_type=entity_type,
+            entity_id="" if entity_id is None else str(entity_id),
+            created_at=utc_now(),
+            payload=dict(payload or {}),
+            actor_user_id=actor_user_id,
+            actor_telegram_user_id=actor_telegram_user_id,
+        )
+    )
+
+
+def record_audit_event_on_commit(conn: Connection, event_type: str, **fields: Any) -> None:
+    """`record_audit_event` once the surrounding `begin_operation` commits; nothing is queued on rollback."""
+    run_after_commit(conn, lambda: record_audit_event(event_type, **fields))
+
+
+def audit_log_event_listener(event: str, fields: dict[str, Any]) -> None:
+    """`set_event_listener` hook: mirror security-relevant `emit_event` lines into the audit queue."""
+    mapping = _AUDITED_LOG_EVENTS.get(event)
+    if mapping is None:
+        return
+    entity_type, entity_field, actor_field = mapping
+    actor = fields.get(actor_field)
+    record_audit_event(
+        event,
+        entity_type=entity_type,
+        entity_id=fields.get(entity_field),
+        actor_telegram_user_id=actor if isinstance(actor, int) else None,
+        payload=fields,
+    )
+
+
+def _insert_batch(conn: Connection, batch: list[PendingAuditEvent]) -> None:
+    statement = values_statement(
+        conn,
+        """
+        INSERT INTO audit_events (actor_user_id, event_type, entity_type, entity_id, payload, created_at)
+        VALUES {values}
+        """,
+        _AUDIT_ROW_SQL_POSTGRESQL if conn.dialect.name == "postgresql" else _AUDIT_ROW_SQL,
+        [
+            {
+                "actor_user_id": event.actor_user_id,
+                "actor_telegram_user_id": event.actor_telegram_user_id,
+                "event_type": event.event_type[:64],
+                "entity_type": event.entity_type[:64],
+                "entity_id": event.entity_id[:64],
+                "payload": json.dumps(event.payload, ensure_ascii=False, sort_keys=True, default=str),
+                "created_at": event.created_at,
+            }
+            for event in batch
+        ],
+    )
+    conn.execute(statement.execution_options(query_name="audit_events_insert"))
@@ -1,4 +1,4 @@
-from app.booking.availability import AvailabilityService
+from app.booking.availability import AvailabilityDaySummary, AvailabilityService, MasterAvailabilitySlot
 from app.booking.cancel_booking import BookingCancelResult, BookingCancellationService
 from app.booking.contracts import (
     BOOKING_STATUS_ACTIVE,
@@ -8,14 +8,37 @@ from app.booking.contracts import (
     can_transition_booking_status,
     is_cancellation_reason_required,
 )
-from app.booking.create_booking import BookingCreateResult, BookingService
+from app.booking.create_booking import (
+    BookingCreateResult,
+    BookingService,
+    GroupBookingResult,
+    GroupParticipantBooking,
+    GroupParticipantRequest,
+)
 from app.booking.flow import BookingFlowRepository, BookingNotification, BookingNotificationService, TelegramBookingFlowService
-from app.booking.intervals import intervals_overlap, is_interval_blocked
+from app.booking.intervals import BlockedIntervals, DayOccupancy, intervals_overlap, is_interval_blocked, merge_intervals
+from app.booking.manual_import import (
+    ManualBookingImportService,
+    ManualImportResult,
+    ManualImportRow,
+    ManualImportRowResult,
+)
 from app.booking.master_admin import MasterAdminResult, MasterAdminService
 from app.booking.messages import RU_BOOKING_MESSAGES
-from app.booking.reminders import BookingReminderService, is_reminder_eligible
+from app.booking.next_free_slot import NextFreeSlotService, resolve_next_free_slot_reconcile_seconds
+from app.booking.reminders import AsyncBookingReminderService, BookingReminderService, is_reminder_eligible
+from app.booking.roster_cache import (
+    MasterRosterCache,
+    RosterMaster,
+    get_master_roster,
+    invalidate_master_roster,
+    resolve_master_roster_ttl_seconds,
+)
 from app.booking.schedule import (
+    MasterBulkDayOffCommand,
+    MasterBulkDayOffResult,
     MasterDayOffCommand,
+    MasterDayOffRecurrence,
     MasterDayOffResult,
     MasterLunchBreakCommand,
     MasterLunchBreakResult,
@@ -23,6 +46,9 @@ from app.booking.schedule import (
     MasterManualBookingCommand,
     MasterScheduleContext,
     MasterScheduleService,
+    MasterWeekBooking,
+    MasterWeekDay,
+    MasterWeekSchedule,
 )
 from app.booking.service_options import (
     SERVICE_OPTION_CODES,
@@ -33,13 +59,17 @@ from app.booking.service_options import (
     DEFAULT_SLOT_STEP_MINUTES,
     SERVICE_OPTION_DURATION_MINUTES,
     SERVICE_OPTION_LABELS_RU,
+    invalidate_service_catalog,
     list_service_catalog_defaults,
     list_service_options,
+    load_service_catalog,
+    resolve_service_catalog_refresh_seconds,
     resolve_service_duration_minutes,
     validate_duration_minutes,
 )
 
 __all__ = [
+    "AvailabilityDaySummary",
     "AvailabilityService",
     "BookingCancelResult",
     "BookingCancellationService",
@@ -48,7 +78,13 @@ __all__ = [
     "BookingFlowRepository",
     "BookingNotification",
     "BookingNotificationService",
+    "GroupBookingResult",
+    "GroupParticipantBooking",
+    "GroupParticipantRequest",
+    "MasterBulkDayOffCommand",
+    "MasterBulkDayOffResult",
     "MasterDayOffCommand",
+    "MasterDayOffRecurrence",
     "MasterDayOffResult",
     "MasterLunchBreakCommand",
     "MasterLunchBreakResult",
@@ -56,10 +92,28 @@ __all__ = [
     "MasterManualBookingCommand",
     "MasterScheduleContext",
     "MasterScheduleService",
+    "MasterWeekBooking",
+    "MasterWeekDay",
+    "MasterWeekSchedule",
+    "ManualBookingImportService",
+    "ManualImportResult",
+    "ManualImportRow",
+    "ManualImportRowResult",
     "MasterAdminResult",
     "MasterAdminService",
+    "MasterAvailabilitySlot",
+    "MasterRosterCache",
+    "RosterMaster",
+    "get_master_roster",
+    "invalidate_master_roster",
+    "resolve_master_roster_ttl_seconds",
+    "NextFreeSlotService",
+    "resolve_next_free_slot_reconcile_seconds",
+    "BlockedIntervals",
+    "DayOccupancy",
     "intervals_overlap",
     "is_interval_blocked",
+    "merge_intervals",
     "BOOKING_STATUS_ACTIVE",
     "BOOKING_STATUS_CANCELLED_BY_CLIENT",
     "BOOKING_STATUS_CANCELLED_BY_MASTER",
@@ -69,6 +123,7 @@ __all__ = [
     "TelegramBookingFlowService",
     "RU_BOOKING_MESSAGES",
     "BookingReminderService",
+    "AsyncBookingReminderService",
     "is_reminder_eligible",
     "SERVICE_OPTION_CODES",
     "SERVICE_OPTION_HAIRCUT",
@@ -81,5 +136,8 @@ __all__ = [
     "validate_duration_minutes",
     "list_service_catalog_defaults",
     "resolve_service_duration_minutes",
+    "resolve_service_catalog_refresh_seconds",
+    "load_service_catalog",
+    "invalidate_service_catalog",
     "list_service_options",
 ]
@@ -4,15 +4,20 @@ from dataclasses import dataclass
 from datetime import UTC, date, datetime, time, timedelta
 
 from sqlalchemy import text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 
 from app.booking.guardrails import same_day_min_slot_start
-from app.booking.intervals import is_interval_blocked
+from app.booking.intervals import DayOccupancy
+from app.booking.occupancy_cache import DayOccupancyCache, get_day_occupancy_cache
 from app.booking.service_options import (
     DEFAULT_SLOT_STEP_MINUTES,
     resolve_service_duration_minutes,
 )
-from app.timezone import business_day_bounds, combine_business_date_time, normalize_utc
+from app.db.routing import route_read
+from app.db.timeouts import OPERATION_INTERACTIVE_READ, connect_operation
+from app.timezone import business_date, business_day_bounds, get_business_calendar, normalize_utc
+
+_EARLIEST_SEARCH_CHUNK_DAYS = 7
 
 
 @dataclass(frozen=True)
@@ -21,6 +26,34 @@ class AvailabilitySlot:
     end_at: datetime
 
 
+@dataclass(frozen=True)
+class AvailabilityDaySummary:
+    on_date: date
+    free_slots: int
+    slots: tuple[AvailabilitySlot, ...] = ()
+
+
+@dataclass(frozen=True)
+class MasterAvailabilitySlot:
+    master_id: int
+    start_at: datetime
+    end_at: datetime
+
+
+@dataclass(frozen=True)
+class _MasterHours:
+    work_start: time
+    work_end: time
+    lunch_start: time
+    lunch_end: time
+
+
+@dataclass(frozen=True)
+class _CachedDay:
+    hours: _MasterHours
+    occupancy: DayOccupancy
+
+
 class AvailabilityService:
     def __init__(self, engine: Engine) -> None:
         self._engine = engine
@@ -33,98 +66,435 @@ class AvailabilityService:
         now: datetime | None = None,
     ) -> list[AvailabilitySlot]:
         """Return available [start, end) slots for a master/day."""
-        with self._engine.connect() as conn:
-            master = conn.execute(
-                text(
-                    """
-                    SELECT work_start, work_end, lunch_start, lunch_end
-                    FROM masters
-                    WHERE id = :master_id AND is_active = true
-                    """
-                ),
-                {"master_id": master_id},
-            ).mappings().first()
-
-            if master is None:
+        cache = get_day_occupancy_cache(self._engine)
+        generation = cache.generation(master_id) if cache is not None else 0
+        cached_day = cache.get(master_id, on_date) if cache is not None else None
+        read_engine = route_read(self._engine, master_id=master_id)
+        with connect_operation(read_engine, OPERATION_INTERACTIVE_READ) as conn:
+            hours = cached_day.hours if isinstance(cached_day, _CachedDay) else _load_master_hours(conn, master_id)
+            if hours is None:
                 return []
 
             duration_minutes = resolve_service_duration_minutes(service_type, connection=conn)
             if duration_minutes is None:
                 return []
-            slot_duration = timedelta(minutes=duration_minutes)
-            slot_step = timedelta(minutes=DEFAULT_SLOT_STEP_MINUTES)
 
-            work_start = _as_time(master["work_start"])
-            work_end = _as_time(master["work_end"])
-            lunch_start = _as_time(master["lunch_start"])
-            lunch_end = _as_time(master["lunch_end"])
+            if not isinstance(cached_day, _CachedDay):
+                day_start, day_end = business_day_bounds(on_date)
+                cached_day = _CachedDay(
+                    hours=hours,
+                    occupancy=DayOccupancy.for_business_date(
+                        on_date,
+                        _load_busy_ranges(
+                            conn,
+                            master_id=master_id,
+                            range_start=day_start,
+                            range_end=day_end,
+                            bookings_query_name="availability_day_bookings",
+                            blocks_query_name="availability_day_blocks",
+                        ),
+                    ),
+                )
+                if cache is not None:
+                    cache.put(master_id, on_date, cached_day, generation=generation)
+
+        return _compute_day_slots(
+            on_date=on_date,
+            hours=hours,
+            slot_duration=timedelta(minutes=duration_minutes),
+            occupancy=cached_day.occupancy,
+            now_utc=_normalize_now(now),
+        )
 
-            day_start, day_end = business_day_bounds(on_date)
+    def summarize_range(
+        self,
+        master_id: int,
+        start_date: date,
+        days: int,
+        service_type: str,
+        now: datetime | None = None,
+        include_slots: bool = False,
+    ) -> list[AvailabilityDaySummary]:
+        """Return per-day free-slot counts for `days` consecutive dates from one bookings/blocks load."""
+        if days <= 0:
+            return []
+        last_date = start_date + timedelta(days=days - 1)
+        dates = [start_date + timedelta(days=offset) for offset in range(days)]
+        cache = get_day_occupancy_cache(self._engine)
+        generation = cache.generation(master_id) if cache is not None else 0
+        cached = _get_cached_days(cache, master_id, dates)
+        read_engine = route_read(self._engine, master_id=master_id)
+        with connect_operation(read_engine, OPERATION_INTERACTIVE_READ) as conn:
+            hours = cached[start_date].hours if cached is not None else _load_master_hours(conn, master_id)
+            if hours is None:
+                return []
 
-            blocked_ranges = [
-                (
-                    combine_business_date_time(on_date, lunch_start),
-                    combine_business_date_time(on_date, lunch_end),
+            duration_minutes = resolve_service_duration_minutes(service_type, connection=conn)
+            if duration_minutes is None:
+                return []
+
+            if cached is not None:
+                occupancy_by_date = {on_date: cached_day.occupancy for on_date, cached_day in cached.items()}
+            else:
+                range_start, _ = business_day_bounds(start_date)
+                _, range_end = business_day_bounds(last_date)
+                busy_ranges = _load_busy_ranges(
+                    conn,
+                    master_id=master_id,
+                    range_start=range_start,
+                    range_end=range_end,
+                    bookings_query_name="availability_range_bookings",
+                    blocks_query_name="availability_range_blocks",
                 )
-            ]
-
-            booking_rows = conn.execute(
-                text(
-                    """
-                    SELECT slot_start, slot_end
-                    FROM bookings
-                    WHERE master_id = :master_id
-                      AND status = 'active'
-                      AND slot_end > :day_start
-                      AND slot_start < :day_end
-                    """
-                ),
-                {"master_id": master_id, "day_start": day_start, "day_end": day_end},
-            ).mappings().all()
-
-            block_rows = conn.execute(
-                text(
-                    """
-                    SELECT start_at, end_at
-                    FROM availability_blocks
-                    WHERE master_id = :master_id
-                      AND end_at > :day_start
-                      AND start_at < :day_end
-                    """
-                ),
-                {"master_id": master_id, "day_start": day_start, "day_end": day_end},
-            ).mappings().all()
-
-            for row in booking_rows:
-                blocked_ranges.append((_as_datetime(row["slot_start"]), _as_datetime(row["slot_end"])))
-
-            for row in block_rows:
-                blocked_ranges.append((_as_datetime(row["start_at"]), _as_datetime(row["end_at"])))
-
-            slots: list[AvailabilitySlot] = []
-            slot_start = combine_business_date_time(on_date, work_start)
-            slot_cutoff = combine_business_date_time(on_date, work_end)
-
-            now_utc = _normalize_now(now)
-            same_day_min_start = None
-            if now_utc is not None:
-                same_day_min_start = same_day_min_slot_start(
+                busy_by_date = _bucket_ranges_by_business_date(busy_ranges, start_date=start_date, last_date=last_date)
+                occupancy_by_date = {
+                    on_date: DayOccupancy.for_business_date(on_date, busy_by_date.get(on_date, ())) for on_date in dates
+                }
+                if cache is not None:
+                    for on_date in dates:
+                        cached_day = _CachedDay(hours=hours, occupancy=occupancy_by_date[on_date])
+                        cache.put(master_id, on_date, cached_day, generation=generation)
+
+        now_utc = _normalize_now(now)
+        today = business_date(now_utc) if now_utc is not None else None
+        slot_duration = timedelta(minutes=duration_minutes)
+        summaries: list[AvailabilityDaySummary] = []
+        for offset in range(days):
+            on_date = start_date + timedelta(days=offset)
+            if today is not None and on_date < today:
+                summaries.append(AvailabilityDaySummary(on_date=on_date, free_slots=0))
+                continue
+            slots = _compute_day_slots(
+                on_date=on_date,
+                hours=hours,
+                slot_duration=slot_duration,
+                occupancy=occupancy_by_date[on_date],
+                now_utc=now_utc,
+            )
+            summaries.append(
+                AvailabilityDaySummary(
                     on_date=on_date,
-                    now=now_utc,
-                    slot_step_minutes=slot_step.seconds // 60,
+                    free_slots=len(slots),
+                    slots=tuple(slots) if include_slots else (),
                 )
-            while slot_start + slot_duration <= slot_cutoff:
-                slot_end = slot_start + slot_duration
-                if same_day_min_start is not None and slot_start < same_day_min_start:
-                    slot_start = slot_start + slot_step
-                    continue
+            )
+        return summaries
+
+    def find_earliest_slots(
+        self,
+        service_type: str,
+        start_date: date,
+        days: int,
+        limit: int,
+        now: datetime | None = None,
+    ) -> list[MasterAvailabilitySlot]:
+        """Return the earliest `limit` free slots across all active masters within `days` dates.
+
+        Bookings and blocks are loaded for every master at once, one chunk of dates at a time,
+        so the statement count depends on how far the first free slots are, not on roster size.
+        """
+        if days <= 0 or limit <= 0:
+            return []
+        last_date = start_date + timedelta(days=days - 1)
+        now_utc = _normalize_now(now)
+        today = business_date(now_utc) if now_utc is not None else None
+        found: list[MasterAvailabilitySlot] = []
+        with connect_operation(route_read(self._engine), OPERATION_INTERACTIVE_READ) as conn:
+            hours_by_master = _load_active_master_hours(conn)
+            if not hours_by_master:
+                return []
+
+            duration_minutes = resolve_service_duration_minutes(service_type, connection=conn)
+            if duration_minutes is None:
+                return []
+            slot_duration = timedelta(minutes=duration_minutes)
+
+            chunk_start = start_date if today is None else max(start_date, today)
+            while chunk_start <= last_date and len(found) < limit:
+                chunk_end = min(chunk_start + timedelta(days=_EARLIEST_SEARCH_CHUNK_DAYS - 1), last_date)
+                range_start, _ = business_day_bounds(chunk_start)
+                _, range_end = business_day_bounds(chunk_end)
+                busy_by_master = _load_all_busy_ranges(conn, range_start=range_start, range_end=range_end)
+                busy_by_master_date = {
+                    master_id: _bucket_ranges_by_business_date(ranges, start_date=chunk_start, last_date=chunk_end)
+                    for master_id, ranges in busy_by_master.items()
+                }
+
+                on_date = chunk_start
+                while on_date <= chunk_end and len(found) < limit:
+                    day_slots = [
+                        MasterAvailabilitySlot(master_id=master_id, start_at=slot.start_at, end_at=slot.end_at)
+                        for master_id, hours in hours_by_master.items()
+                        for slot in _compute_day_slots(
+                            on_date=on_date,
+                            hours=hours,
+                            slot_duration=slot_duration,
+                            occupancy=DayOccupancy.for_business_date(
+                                on_date,
+                                busy_by_master_date.get(master_id, {}).get(on_date, ()),
+                            ),
+                            now_utc=now_utc,
+                        )
+                    ]
+                    day_slots.sort(key=lambda slot: (slot.start_at, slot.master_id))
+                    found.extend(day_slots[: limit - len(found)])
+                    on_date += timedelta(days=1)
+                chunk_start = chunk_end + timedelta(days=1)
+        return found
+
+    def find_first_free_slot(
+        self,
+        master_id: int,
+        service_type: str,
+        start_date: date,
+        days: int,
+        now: datetime | None = None,
+    ) -> AvailabilitySlot | None:
+        """Return the master's earliest free slot within `days` dates, or None.
+
+        Reads the bound engine directly, bypassing read routing and the occupancy cache, so
+        maintenance jobs see committed state and it can run through a `ConnectionBoundEngine`.
+        """
+        if days <= 0:
+            return None
+        now_utc = _normalize_now(now)
+        first_date = start_date if now_utc is None else max(start_date, business_date(now_utc))
+        last_date = start_date + timedelta(days=days - 1)
+        if first_date > last_date:
+            return None
+        with connect_operation(self._engine, OPERATION_INTERACTIVE_READ) as conn:
+            hours = _load_master_hours(conn, master_id)
+            if hours is None:
+                return None
+            duration_minutes = resolve_service_duration_minutes(service_type, connection=conn)
+            if duration_minutes is None:
+                return None
+            range_start, _ = business_day_bounds(first_date)
+            _, range_end = business_day_bounds(last_date)
+            busy_ranges = _load_busy_ranges(
+                conn,
+                master_id=master_id,
+                range_start=range_start,
+                range_end=range_end,
+                bookings_query_name="availability_first_free_bookings",
+                blocks_query_name="availability_first_free_blocks",
+            )
+        busy_by_date = _bucket_ranges_by_business_date(busy_ranges, start_date=first_date, last_date=last_date)
+        on_date = first_date
+        while on_date <= last_date:
+            slots = _compute_day_slots(
+                on_date=on_date,
+                hours=hours,
+                slot_duration=timedelta(minutes=duration_minutes),
+                occupancy=DayOccupancy.for_business_date(on_date, busy_by_date.get(on_date, ())),
+                now_utc=now_utc,
+            )
+            if slots:
+                return slots[0]
+            on_date += timedelta(days=1)
+        return None
+
+
+def _get_cached_days(
+    cache: DayOccupancyCache | None,
+    master_id: int,
+    dates: list[date],
+) -> dict[date, _CachedDay] | None:
+    """Return cached occupancy for every date, or None as soon as one date is missing."""
+    if cache is None:
+        return None
+    cached: dict[date, _CachedDay] = {}
+    for on_date in dates:
+        cached_day = cache.get(master_id, on_date)
+        if not isinstance(cached_day, _CachedDay):
+            return None
+        cached[on_date] = cached_day
+    return cached
+
+
+def _load_master_hours(conn: Connection, master_id: int) -> _MasterHours | None:
+    master = conn.execute(
+        text(
+            """
+            SELECT work_start, work_end, lunch_start, lunch_end
+            FROM masters
+            WHERE id = :master_id AND is_active = true
+            """
+        ).execution_options(query_name="availability_master_hours"),
+        {"master_id": master_id},
+    ).mappings().first()
+    if master is None:
+        return None
+    return _MasterHours(
+        work_start=_as_time(master["work_start"]),
+        work_end=_as_time(master["work_end"]),
+        lunch_start=_as_time(master["lunch_start"]),
+        lunch_end=_as_time(master["lunch_end"]),
+    )
+
+
+def _load_busy_ranges(
+    conn: Connection,
+    *,
+    master_id: int,
+    range_start: datetime,
+    range_end: datetime,
+    bookings_query_name: str,
+    blocks_query_name: str,
+) -> list[tuple[datetime, datetime]]:
+    params = {"master_id": master_id, "range_start": range_start, "range_end": range_end}
+    booking_rows = conn.execute(
+        text(
+            """
+            SELECT slot_start, slot_end
+            FROM bookings
+            WHERE master_id = :master_id
+              AND status = 'active'
+              AND slot_end > :range_start
+              AND slot_start < :range_end
+            """
+        ).execution_options(query_name=bookings_query_name),
+        params,
+    ).mappings().all()
+
+    block_rows = conn.execute(
+        text(
+            """
+            SELECT start_at, end_at
+            FROM availability_blocks
+            WHERE master_id = :master_id
+              AND end_at > :range_start
+              AND start_at < :range_end
+            """
+        ).execution_options(query_name=blocks_query_name),
+        params,
+    ).mappings().all()
+
+    busy_ranges = [(_as_datetime(row["slot_start"]), _as_datetime(row["slot_end"])) for row in booking_rows]
+    busy_ranges.extend((_as_datetime(row["start_at"]), _as_datetime(row["end_at"])) for row in block_rows)
+    return busy_ranges
+
+
+def _load_active_master_hours(conn: Connection) -> dict[int, _MasterHours]:
+    rows = conn.execute(
+        text(
+            """
+            SELECT id, work_start, work_end, lunch_start, lunch_end
+            FROM masters
+            WHERE is_active = true
+            ORDER BY id
+            """
+        ).execution_options(query_name="availability_active_master_hours")
+    ).mappings()
+    return {
+        int(row["id"]): _MasterHours(
+            work_start=_as_time(row["work_start"]),
+            work_end=_as_time(row["work_end"]),
+            lunch_start=_as_time(row["lunch_start"]),
+            lunch_end=_as_time(row["lunch_end"]),
+        )
+        for row in rows
+    }
+
+
+def _load_all_busy_ranges(
+    conn: Connection,
+    *,
+    range_start: datetime,
+    range_end: datetime,
+) -> dict[int, list[tuple[datetime, datetime]]]:
+    params = {"range_start": range_start, "range_end": range_end}
+    booking_rows = conn.execute(
+        text(
+            """
+            SELECT b.master_id, b.slot_start, b.slot_end
+            FROM bookings b
+            JOIN masters m ON m.id = b.master_id
+            WHERE m.is_active = true
+              AND b.status = 'active'
+              AND b.slot_end > :range_start
+              AND b.slot_start < :range_end
+            """
+        ).execution_options(query_name="availability_all_masters_bookings"),
+        params,
+    ).mappings().all()
+
+    block_rows = conn.execute(
+        text(
+            """
+            SELECT ab.master_id, ab.start_at, ab.end_at
+            FROM availability_blocks ab
+            JOIN masters m ON m.id = ab.master_id
+            WHERE m.is_active = true
+              AND ab.end_at > :range_start
+              AND ab.start_at < :range_end
+            """
+        ).execution_options(query_name="availability_all_masters_blocks"),
+        params,
+    ).mappings().all()
+
+    busy_by_master: dict[int, list[tuple[datetime, datetime]]] = {}
+    for row in booking_rows:
+        busy_by_master.setdefault(int(row["master_id"]), []).append(
+            (_as_datetime(row["slot_start"]), _as_datetime(row["slot_end"]))
+        )
+    for row in block_rows:
+        busy_by_master.setdefault(int(row["master_id"]), []).append(
+            (_as_datetime(row["start_at"]), _as_datetime(row["end_at"]))
+        )
+    return busy_by_master
+
+
+def _bucket_ranges_by_business_date(
+    busy_ranges: list[tuple[datetime, datetime]],
+    *,
+    start_date: date,
+    last_date: date,
+) -> dict[date, list[tuple[datetime, datetime]]]:
+    calendar = get_business_calendar()
+    buckets: dict[date, list[tuple[datetime, datetime]]] = {}
+    for busy_start, busy_end in busy_ranges:
+        first_day = max(calendar.business_date(busy_start), start_date)
+        last_day = min(calendar.business_date(busy_end - timedelta(microseconds=1)), last_date)
+        day = first_day
+        while day <= last_day:
+            buckets.setdefault(day, []).append((busy_start, busy_end))
+            day += timedelta(days=1)
+    return buckets
 
-                if not is_interval_blocked(start_at=slot_start, end_at=slot_end, blocked_ranges=blocked_ranges):
-                    slots.append(AvailabilitySlot(start_at=slot_start, end_at=slot_end))
 
-                slot_start = slot_start + slot_step
+def _compute_day_slots(
+    *,
+    on_date: date,
+    hours: _MasterHours,
+    slot_duration: timedelta,
+    occupancy: DayOccupancy,
+    now_utc: datetime | None,
+) -> list[AvailabilitySlot]:
+    calendar = get_business_calendar()
+    slot_step = timedelta(minutes=DEFAULT_SLOT_STEP_MINUTES)
+    occupancy = occupancy.apply_booking(
+        calendar.combine(on_date, hours.lunch_start),
+        calendar.combine(on_date, hours.lunch_end),
+    )
 
-            return slots
+    same_day_min_start = None
+    if now_utc is not None:
+        same_day_min_start = same_day_min_slot_start(
+            on_date=on_date,
+            now=now_utc,
+            slot_step_minutes=slot_step.seconds // 60,
+        )
+    return [
+        AvailabilitySlot(start_at=slot_start, end_at=slot_end)
+        for slot_start, slot_end in occupancy.free_slots(
+            window_start=calendar.combine(on_date, hours.work_start),
+            window_end=calendar.combine(on_date, hours.work_end),
+            duration=slot_duration,
+            step=slot_step,
+            not_before=same_day_min_start,
+        )
+    ]
 
 
 def _normalize_now(now: datetime | None) -> datetime | None:
@@ -3,16 +3,22 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Engine
 
+from app.audit import record_audit_event_on_commit
 from app.booking.contracts import (
+    BOOKING_STATUS_ACTIVE,
     BOOKING_STATUS_CANCELLED_BY_CLIENT,
     BOOKING_STATUS_CANCELLED_BY_MASTER,
     can_transition_booking_status,
     is_cancellation_reason_required,
 )
 from app.booking.messages import RU_BOOKING_MESSAGES
+from app.booking.next_free_slot import refresh_next_free_slot_on_commit
+from app.booking.occupancy_cache import invalidate_day_occupancy_on_commit
+from app.booking.reminders import REMINDER_STATUS_PENDING, REMINDER_STATUS_SKIPPED
+from app.db.timeouts import OPERATION_BOOKING_WRITE, begin_operation
 from app.timezone import normalize_utc, utc_now
 
 
@@ -28,6 +34,22 @@ class BookingCancelResult:
     slot_start: datetime | None = None
 
 
+@dataclass(frozen=True)
+class RangeCancelledBooking:
+    booking_id: int
+    slot_start: datetime
+    recipient_telegram_user_id: int | None
+
+
+@dataclass(frozen=True)
+class BookingRangeCancelResult:
+    cancelled: bool
+    message: str
+    bookings: tuple[RangeCancelledBooking, ...] = ()
+    master_id: int | None = None
+    cancellation_reason: str | None = None
+
+
 class BookingCancellationService:
     def __init__(self, engine: Engine) -> None:
         self._engine = engine
@@ -41,7 +63,7 @@ class BookingCancellationService:
     ) -> BookingCancelResult:
         now_utc = _to_utc(now) if now is not None else utc_now()
 
-        with self._engine.begin() as conn:
+        with begin_operation(self._engine, OPERATION_BOOKING_WRITE) as conn:
             try:
                 booking = conn.execute(
                     text(
@@ -105,6 +127,19 @@ class BookingCancellationService:
             )
             if updated.rowcount != 1:
                 return BookingCancelResult(cancelled=False, message=RU_BOOKING_MESSAGES["cancel_not_allowed"])
+            # Bookings never cross midnight, so only the slot's business day is affected.
+            invalidate_day_occupancy_on_commit(conn, (int(booking["master_id"]),), start_at=slot_start, end_at=slot_start)
+            refresh_next_free_slot_on_commit(
+                conn, int(booking["master_id"]), start_at=slot_start, end_at=slot_start, freed=True
+            )
+            record_audit_event_on_commit(
+                conn,
+                "booking_cancelled_by_client",
+                entity_type="booking",
+                entity_id=int(booking["id"]),
+                actor_user_id=client_user_id,
+                payload={"master_id": int(booking["master_id"]), "slot_start": slot_start.isoformat()},
+            )
 
             return BookingCancelResult(
                 cancelled=True,
@@ -134,7 +169,7 @@ class BookingCancellationService:
         if is_cancellation_reason_required(target_status=BOOKING_STATUS_CANCELLED_BY_MASTER) and not normalized_reason:
             return BookingCancelResult(cancelled=False, message=RU_BOOKING_MESSAGES["cancel_reason_required"])
 
-        with self._engine.begin() as conn:
+        with begin_operation(self._engine, OPERATION_BOOKING_WRITE) as conn:
             try:
                 booking = conn.execute(
                     text(
@@ -201,6 +236,23 @@ class BookingCancellationService:
             )
             if updated.rowcount != 1:
                 return BookingCancelResult(cancelled=False, message=RU_BOOKING_MESSAGES["cancel_not_allowed"])
+            # Bookings never cross midnight, so only the slot's business day is affected.
+            invalidate_day_occupancy_on_commit(conn, (int(booking["master_id"]),), start_at=slot_start, end_at=slot_start)
+            refresh_next_free_slot_on_commit(
+                conn, int(booking["master_id"]), start_at=slot_start, end_at=slot_start, freed=True
+            )
+            record_audit_event_on_commit(
+                conn,
+                "booking_cancelled_by_master",
+                entity_type="booking",
+                entity_id=int(booking["id"]),
+                actor_user_id=master_user_id,
+                payload={
+                    "master_id": int(booking["master_id"]),
+                    "slot_start": slot_start.isoformat(),
+                    "reason": normalized_reason,
+                },
+            )
 
             return BookingCancelResult(
                 cancelled=True,
@@ -217,6 +269,142 @@ class BookingCancellationService:
                 slot_start=slot_start,
             )
 
+    def cancel_range_by_master(
+        self,
+        *,
+        master_user_id: int,
+        start_at: datetime,
+        end_at: datetime,
+        reason: str,
+        now: datetime | None = None,
+    ) -> BookingRangeCancelResult:
+        """Cancel every future active booking of the master overlapping [start_at, end_at).
+
+        One `UPDATE ... RETURNING` cancels the bookings, their pending reminders are skipped and
+        the clients' Telegram ids are read in the same transaction.
+        """
+        now_utc = _to_utc(now) if now is not None else utc_now()
+        start_utc = _to_utc(start_at)
+        end_utc = _to_utc(end_at)
+        normalized_reason = reason.strip()
+        if not normalized_reason:
+            return BookingRangeCancelResult(cancelled=False, message=RU_BOOKING_MESSAGES["cancel_reason_required"])
+        if start_utc >= end_utc:
+            return BookingRangeCancelResult(
+                cancelled=False,
+                message=RU_BOOKING_MESSAGES["cancel_range_invalid_interval"],
+            )
+
+        with begin_operation(self._engine, OPERATION_BOOKING_WRITE) as conn:
+            rows = conn.execute(
+                text(
+                    """
+                    UPDATE bookings
+                    SET status = :target_status,
+                        cancellation_reason = :cancellation_reason
+                    WHERE master_id IN (SELECT id FROM masters WHERE user_id = :master_user_id)
+                      AND status = :current_status
+                      AND slot_start < :end_at
+                      AND :start_at < slot_end
+                      AND slot_start > :now_at
+                    RETURNING id, master_id, client_user_id, organizer_user_id, slot_start
+                    """
+                ).execution_options(query_name="booking_cancel_range"),
+                {
+                    "target_status": BOOKING_STATUS_CANCELLED_BY_MASTER,
+                    "current_status": BOOKING_STATUS_ACTIVE,
+                    "cancellation_reason": normalized_reason,
+                    "master_user_id": master_user_id,
+                    "start_at": start_utc,
+                    "end_at": end_utc,
+                    "now_at": now_utc,
+                },
+            ).mappings().all()
+            if not rows:
+                return BookingRangeCancelResult(cancelled=False, message=RU_BOOKING_MESSAGES["cancel_range_empty"])
+
+            booking_ids = [int(row["id"]) for row in rows]
+            conn.execute(
+                text(
+                    """
+                    UPDATE booking_reminders
+                    SET status = :status_skipped,
+                        updated_at = :updated_at
+                    WHERE booking_id IN :booking_ids
+                      AND status = :status_pending
+                    """
+                )
+                .bindparams(bindparam("booking_ids", expanding=True))
+                .execution_options(query_name="booking_cancel_range_reminders"),
+                {
+                    "status_skipped": REMINDER_STATUS_SKIPPED,
+                    "status_pending": REMINDER_STATUS_PENDING,
+                    "updated_at": now_utc,
+                    "booking_ids": booking_ids,
+                },
+            )
+            # Group participants carry no client user; their organizer is told instead.
+            recipient_user_ids = {
+                int(row["id"]): int(row["client_user_id"] or row["organizer_user_id"])
+                for row in rows
+                if (row["client_user_id"] or row["organizer_user_id"]) is not None
+            }
+            telegram_user_ids: dict[int, int] = {}
+            if recipient_user_ids:
+                telegram_user_ids = {
+                    int(row["id"]): int(row["telegram_user_id"])
+                    for row in conn.execute(
+                        text(
+                            """
+                            SELECT id, telegram_user_id
+                            FROM users
+                            WHERE id IN :user_ids
+                              AND telegram_user_id > 0
+                            """
+                        )
+                        .bindparams(bindparam("user_ids", expanding=True))
+                        .execution_options(query_name="booking_cancel_range_recipients"),
+                        {"user_ids": sorted(set(recipient_user_ids.values()))},
+                    ).mappings()
+                }
+
+            master_id = int(rows[0]["master_id"])
+            invalidate_day_occupancy_on_commit(conn, (master_id,), start_at=start_utc, end_at=end_utc)
+            refresh_next_free_slot_on_commit(conn, master_id, start_at=start_utc, end_at=end_utc, freed=True)
+            for row in rows:
+                record_audit_event_on_commit(
+                    conn,
+                    "booking_cancelled_by_master",
+                    entity_type="booking",
+                    entity_id=int(row["id"]),
+                    actor_user_id=master_user_id,
+                    payload={
+                        "master_id": master_id,
+                        "slot_start": _coerce_datetime(row["slot_start"]).isoformat(),
+                        "reason": normalized_reason,
+                        "range_start": start_utc.isoformat(),
+                        "range_end": end_utc.isoformat(),
+                    },
+                )
+            bookings = sorted(
+                (
+                    RangeCancelledBooking(
+                        booking_id=int(row["id"]),
+                        slot_start=_coerce_datetime(row["slot_start"]),
+                        recipient_telegram_user_id=telegram_user_ids.get(recipient_user_ids.get(int(row["id"]), 0)),
+                    )
+                    for row in rows
+                ),
+                key=lambda item: (item.slot_start, item.booking_id),
+            )
+            return BookingRangeCancelResult(
+                cancelled=True,
+                message=RU_BOOKING_MESSAGES["cancel_range_done"].format(count=len(bookings)),
+                bookings=tuple(bookings),
+                master_id=master_id,
+                cancellation_reason=normalized_reason,
+            )
+
 
 def _to_utc(value: datetime) -> datetime:
     return normalize_utc(value)
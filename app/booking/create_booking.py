@@ -1,23 +1,110 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, time, timedelta
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time, timedelta
+from typing import Sequence
 
-from sqlalchemy import text
-from sqlalchemy.engine import Engine
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
 
 from app.booking.contracts import BOOKING_STATUS_ACTIVE
 from app.booking.guardrails import is_slot_start_allowed
+from app.booking.intervals import DayOccupancy, intervals_overlap
 from app.booking.messages import RU_BOOKING_MESSAGES
+from app.booking.next_free_slot import refresh_next_free_slot_on_commit
+from app.booking.occupancy_cache import invalidate_day_occupancy_on_commit
 from app.booking.service_options import DEFAULT_SLOT_STEP_MINUTES, resolve_service_duration_minutes
+from app.db.bulk import values_statement
+from app.db.timeouts import OPERATION_BOOKING_WRITE, begin_operation
 from app.timezone import business_date, combine_business_date_time, normalize_utc, utc_now
 
+BOOKING_OVERLAP_CONSTRAINT = "ex_bookings_active_master_slot"
+# exclusion_violation: a concurrent transaction committed an overlapping active booking first.
+_EXCLUSION_VIOLATION_SQLSTATE = "23P01"
+
+# Appended to `INSERT INTO bookings (...) SELECT ...`: the insert returns no row when the slot is
+# taken by an active booking or an availability block. Blocks are not covered by the constraint, and
+# on PostgreSQL `BOOKING_OVERLAP_CONSTRAINT` rejects the overlap this guard cannot see (a concurrent
+# insert that has not committed yet), so writers need no pre-check or row lock.
+_SLOT_FREE_CONDITION_TEMPLATE = """
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM bookings
+    WHERE bookings.master_id = {master_id}
+      AND bookings.status = 'active'
+      AND bookings.slot_start < {slot_end}
+      AND {slot_start} < bookings.slot_end
+)
+AND NOT EXISTS (
+    SELECT 1
+    FROM availability_blocks
+    WHERE availability_blocks.master_id = {master_id}
+      AND availability_blocks.start_at < {slot_end}
+      AND {slot_start} < availability_blocks.end_at
+)
+"""
+
+
+def booking_slot_free_condition(*, master_id: str, slot_start: str, slot_end: str) -> str:
+    """`BOOKING_SLOT_FREE_CONDITION` over arbitrary SQL expressions, e.g. columns of a `VALUES` CTE."""
+    return _SLOT_FREE_CONDITION_TEMPLATE.format(master_id=master_id, slot_start=slot_start, slot_end=slot_end)
+
+
+BOOKING_SLOT_FREE_CONDITION = booking_slot_free_condition(
+    master_id=":master_id",
+    slot_start=":slot_start",
+    slot_end=":slot_end",
+)
+
 
 @dataclass(frozen=True)
 class BookingCreateResult:
     created: bool
     message: str
     booking_id: int | None = None
+    slot_start: datetime | None = None
+    slot_end: datetime | None = None
+
+
+@dataclass(frozen=True)
+class GroupParticipantRequest:
+    participant_name: str
+    master_id: int
+    service_type: str
+    slot_start: datetime
+
+
+@dataclass(frozen=True)
+class GroupParticipantBooking:
+    booking_id: int
+    participant_name: str
+    master_id: int
+    service_type: str
+    slot_start: datetime
+    slot_end: datetime
+
+
+@dataclass(frozen=True)
+class GroupBookingResult:
+    created: bool
+    message: str
+    bookings: tuple[GroupParticipantBooking, ...] = ()
+    participant_name: str | None = None
+
+
+@dataclass(frozen=True)
+class BookingClientSnapshot:
+    telegram_username: str | None
+    phone_number: str | None
+
+
+class _GroupSlotTaken(Exception):
+    """Raised inside the group transaction so a partially inserted group rolls back."""
+
+    def __init__(self, participant_name: str) -> None:
+        super().__init__(participant_name)
+        self.participant_name = participant_name
 
 
 class BookingService:
@@ -32,357 +119,477 @@ class BookingService:
         service_type: str,
         slot_start: datetime,
         now: datetime | None = None,
+        client_snapshot: BookingClientSnapshot | None = None,
     ) -> BookingCreateResult:
         slot_start_utc = _to_utc(slot_start)
         now_utc = _to_utc(now) if now is not None else utc_now()
 
-        with self._engine.begin() as conn:
-            duration_minutes = resolve_service_duration_minutes(service_type, connection=conn)
-            if duration_minutes is None:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["invalid_service_type"])
-
-            slot_end_utc = slot_start_utc + timedelta(minutes=duration_minutes)
-
-            master = conn.execute(
-                text(
-                    """
-                    SELECT work_start, work_end, lunch_start, lunch_end
-                    FROM masters
-                    WHERE id = :master_id AND is_active = true
-                    """
-                ),
-                {"master_id": master_id},
-            ).mappings().first()
-            if master is None:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["master_not_found"])
-
-            work_start = _as_time(master["work_start"])
-            work_end = _as_time(master["work_end"])
-            lunch_start = _as_time(master["lunch_start"])
-            lunch_end = _as_time(master["lunch_end"])
-
-            business_slot_date = business_date(slot_start_utc)
-            day_work_start = combine_business_date_time(business_slot_date, work_start)
-            day_work_end = combine_business_date_time(business_slot_date, work_end)
-            day_lunch_start = combine_business_date_time(business_slot_date, lunch_start)
-            day_lunch_end = combine_business_date_time(business_slot_date, lunch_end)
-
-            if not is_slot_start_allowed(
-                slot_start=slot_start_utc,
-                now=now_utc,
-                slot_step_minutes=DEFAULT_SLOT_STEP_MINUTES,
-            ):
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_already_passed"])
-
-            if slot_start_utc < day_work_start or slot_end_utc > day_work_end:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
-
-            if slot_start_utc < day_lunch_end and day_lunch_start < slot_end_utc:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
-
-            existing_future = conn.execute(
-                text(
-                    """
-                    SELECT 1
-                    FROM bookings
-                    WHERE client_user_id = :client_user_id
-                      AND status = 'active'
-                      AND slot_start > :now_at
-                    LIMIT 1
-                    """
-                ),
-                {
-                    "client_user_id": client_user_id,
-                    "now_at": now_utc,
-                },
-            ).first()
-            if existing_future is not None:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["client_future_booking_exists"])
-
-            overlaps = conn.execute(
-                text(
-                    """
-                    SELECT 1
-                    FROM bookings
-                    WHERE master_id = :master_id
-                      AND status = 'active'
-                      AND slot_start < :slot_end
-                      AND :slot_start < slot_end
-                    LIMIT 1
-                    """
-                ),
-                {
-                    "master_id": master_id,
-                    "slot_start": slot_start_utc,
-                    "slot_end": slot_end_utc,
-                },
-            ).first()
-            if overlaps is not None:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
+        try:
+            with begin_operation(self._engine, OPERATION_BOOKING_WRITE) as conn:
+                duration_minutes = resolve_service_duration_minutes(service_type, connection=conn)
+                if duration_minutes is None:
+                    return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["invalid_service_type"])
 
-            blocked = conn.execute(
-                text(
-                    """
-                    SELECT 1
-                    FROM availability_blocks
-                    WHERE master_id = :master_id
-                      AND start_at < :slot_end
-                      AND :slot_start < end_at
-                    LIMIT 1
-                    """
-                ),
-                {
-                    "master_id": master_id,
-                    "slot_start": slot_start_utc,
-                    "slot_end": slot_end_utc,
-                },
-            ).first()
-            if blocked is not None:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
+                slot_end_utc = slot_start_utc + timedelta(minutes=duration_minutes)
 
-            client_username_snapshot: str | None = None
-            client_phone_snapshot: str | None = None
-            try:
-                client_row = conn.execute(
+                master = conn.execute(
                     text(
                         """
-                        SELECT telegram_username, phone_number
-                        FROM users
-                        WHERE id = :client_user_id
+                        SELECT work_start, work_end, lunch_start, lunch_end
+                        FROM masters
+                        WHERE id = :master_id AND is_active = true
                         """
-                    ),
-                    {"client_user_id": client_user_id},
+                    ).execution_options(query_name="booking_master_hours"),
+                    {"master_id": master_id},
                 ).mappings().first()
-                if client_row is not None:
-                    client_username_snapshot = (
-                        str(client_row["telegram_username"]) if client_row["telegram_username"] is not None else None
-                    )
-                    client_phone_snapshot = (
-                        str(client_row["phone_number"]) if client_row["phone_number"] is not None else None
-                    )
-            except Exception:
-                # Some tests use reduced schemas without users table; snapshots are optional.
-                client_username_snapshot = None
-                client_phone_snapshot = None
-
-            booking_id = conn.execute(
-                text(
-                    """
-                    INSERT INTO bookings (
-                        master_id,
-                        client_user_id,
-                        service_type,
-                        slot_start,
-                        slot_end,
-                        status,
-                        client_username_snapshot,
-                        client_phone_snapshot
-                    )
-                    VALUES (
-                        :master_id,
-                        :client_user_id,
-                        :service_type,
-                        :slot_start,
-                        :slot_end,
-                        :status,
-                        :client_username_snapshot,
-                        :client_phone_snapshot
+                if master is None:
+                    return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["master_not_found"])
+
+                work_start = _as_time(master["work_start"])
+                work_end = _as_time(master["work_end"])
+                lunch_start = _as_time(master["lunch_start"])
+                lunch_end = _as_time(master["lunch_end"])
+
+                business_slot_date = business_date(slot_start_utc)
+                day_work_start = combine_business_date_time(business_slot_date, work_start)
+                day_work_end = combine_business_date_time(business_slot_date, work_end)
+                day_lunch_start = combine_business_date_time(business_slot_date, lunch_start)
+                day_lunch_end = combine_business_date_time(business_slot_date, lunch_end)
+
+                if not is_slot_start_allowed(
+                    slot_start=slot_start_utc,
+                    now=now_utc,
+                    slot_step_minutes=DEFAULT_SLOT_STEP_MINUTES,
+                ):
+                    return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_already_passed"])
+
+                if slot_start_utc < day_work_start or slot_end_utc > day_work_end:
+                    return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
+
+                if intervals_overlap(
+                    start_at=slot_start_utc,
+                    end_at=slot_end_utc,
+                    other_start=day_lunch_start,
+                    other_end=day_lunch_end,
+                ):
+                    return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
+
+                existing_future = conn.execute(
+                    text(
+                        """
+                        SELECT 1
+                        FROM bookings
+                        WHERE client_user_id = :client_user_id
+                          AND status = 'active'
+                          AND slot_start > :now_at
+                        LIMIT 1
+                        """
+                    ).execution_options(query_name="booking_client_future_exists"),
+                    {
+                        "client_user_id": client_user_id,
+                        "now_at": now_utc,
+                    },
+                ).first()
+                if existing_future is not None:
+                    return BookingCreateResult(
+                        created=False,
+                        message=RU_BOOKING_MESSAGES["client_future_booking_exists"],
                     )
-                    RETURNING id
-                    """
-                ),
-                {
-                    "master_id": master_id,
-                    "client_user_id": client_user_id,
-                    "service_type": service_type,
-                    "slot_start": slot_start_utc,
-                    "slot_end": slot_end_utc,
-                    "status": BOOKING_STATUS_ACTIVE,
-                    "client_username_snapshot": client_username_snapshot,
-                    "client_phone_snapshot": client_phone_snapshot,
-                },
-            ).scalar_one()
-
-            return BookingCreateResult(
-                created=True,
-                message=RU_BOOKING_MESSAGES["created"],
-                booking_id=int(booking_id),
-            )
 
-    def create_grouped_participant_booking(
+                if client_snapshot is None:
+                    client_snapshot = _read_client_snapshot(conn, client_user_id)
+
+                booking_id = conn.execute(
+                    text(
+                        f"""
+                        INSERT INTO bookings (
+                            master_id,
+                            client_user_id,
+                            service_type,
+                            slot_start,
+                            slot_end,
+                            status,
+                            client_username_snapshot,
+                            client_phone_snapshot
+                        )
+                        SELECT
+                            :master_id,
+                            :client_user_id,
+                            :service_type,
+                            :slot_start,
+                            :slot_end,
+                            :status,
+                            :client_username_snapshot,
+                            :client_phone_snapshot
+                        {BOOKING_SLOT_FREE_CONDITION}
+                        RETURNING id
+                        """
+                    ).execution_options(query_name="booking_insert"),
+                    {
+                        "master_id": master_id,
+                        "client_user_id": client_user_id,
+                        "service_type": service_type,
+                        "slot_start": slot_start_utc,
+                        "slot_end": slot_end_utc,
+                        "status": BOOKING_STATUS_ACTIVE,
+                        "client_username_snapshot": client_snapshot.telegram_username,
+                        "client_phone_snapshot": client_snapshot.phone_number,
+                    },
+                ).scalar_one_or_none()
+                if booking_id is None:
+                    return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
+                invalidate_day_occupancy_on_commit(conn, (master_id,), start_at=slot_start_utc, end_at=slot_end_utc)
+                refresh_next_free_slot_on_commit(conn, master_id, start_at=slot_start_utc, end_at=slot_end_utc)
+
+                return BookingCreateResult(
+                    created=True,
+                    message=RU_BOOKING_MESSAGES["created"],
+                    booking_id=int(booking_id),
+                    slot_start=slot_start_utc,
+                    slot_end=slot_end_utc,
+                )
+        except IntegrityError as exc:
+            if is_booking_overlap_violation(exc):
+                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
+            raise
+
+    def create_group_bookings(
         self,
         *,
-        master_id: int,
         organizer_user_id: int,
-        service_type: str,
-        slot_start: datetime,
-        participant_name: str,
         booking_group_key: str,
+        participants: Sequence[GroupParticipantRequest],
         now: datetime | None = None,
-    ) -> BookingCreateResult:
-        slot_start_utc = _to_utc(slot_start)
+        organizer_snapshot: BookingClientSnapshot | None = None,
+    ) -> GroupBookingResult:
+        """Book every participant of a group or none of them.
+
+        All slots are validated against one load of the involved masters' hours and occupancy,
+        then inserted with one guarded `INSERT ... SELECT ... RETURNING`; a row the guard skips
+        (a booking or block committed since the load) rejects the whole group. On a
+        `ConnectionBoundEngine` inside the caller's transaction, rolling back a rejected group is
+        up to the caller.
+        """
         now_utc = _to_utc(now) if now is not None else utc_now()
-        normalized_name = participant_name.strip()
-        if not normalized_name:
-            return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["manual_booking_client_required"])
-        if len(normalized_name) > 160:
-            return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["manual_booking_client_too_long"])
-
-        with self._engine.begin() as conn:
-            duration_minutes = resolve_service_duration_minutes(service_type, connection=conn)
-            if duration_minutes is None:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["invalid_service_type"])
-
-            slot_end_utc = slot_start_utc + timedelta(minutes=duration_minutes)
-            master = conn.execute(
-                text(
-                    """
-                    SELECT work_start, work_end, lunch_start, lunch_end
-                    FROM masters
-                    WHERE id = :master_id AND is_active = true
-                    """
-                ),
-                {"master_id": master_id},
-            ).mappings().first()
-            if master is None:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["master_not_found"])
-
-            work_start = _as_time(master["work_start"])
-            work_end = _as_time(master["work_end"])
-            lunch_start = _as_time(master["lunch_start"])
-            lunch_end = _as_time(master["lunch_end"])
-            business_slot_date = business_date(slot_start_utc)
-            day_work_start = combine_business_date_time(business_slot_date, work_start)
-            day_work_end = combine_business_date_time(business_slot_date, work_end)
-            day_lunch_start = combine_business_date_time(business_slot_date, lunch_start)
-            day_lunch_end = combine_business_date_time(business_slot_date, lunch_end)
-
-            if not is_slot_start_allowed(
-                slot_start=slot_start_utc,
-                now=now_utc,
-                slot_step_minutes=DEFAULT_SLOT_STEP_MINUTES,
-            ):
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_already_passed"])
-            if slot_start_utc < day_work_start or slot_end_utc > day_work_end:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
-            if slot_start_utc < day_lunch_end and day_lunch_start < slot_end_utc:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
-
-            overlaps = conn.execute(
-                text(
-                    """
-                    SELECT 1
-                    FROM bookings
-                    WHERE master_id = :master_id
-                      AND status = 'active'
-                      AND slot_start < :slot_end
-                      AND :slot_start < slot_end
-                    LIMIT 1
-                    """
-                ),
-                {
-                    "master_id": master_id,
-                    "slot_start": slot_start_utc,
-                    "slot_end": slot_end_utc,
-                },
-            ).first()
-            if overlaps is not None:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
-
-            blocked = conn.execute(
-                text(
-                    """
-                    SELECT 1
-                    FROM availability_blocks
-                    WHERE master_id = :master_id
-                      AND start_at < :slot_end
-                      AND :slot_start < end_at
-                    LIMIT 1
-                    """
-                ),
-                {
-                    "master_id": master_id,
-                    "slot_start": slot_start_utc,
-                    "slot_end": slot_end_utc,
-                },
-            ).first()
-            if blocked is not None:
-                return BookingCreateResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
-
-            organizer_snapshot = conn.execute(
-                text(
-                    """
-                    SELECT telegram_username, phone_number
-                    FROM users
-                    WHERE id = :organizer_user_id
-                    """
-                ),
-                {"organizer_user_id": organizer_user_id},
-            ).mappings().first()
-            organizer_username = (
-                str(organizer_snapshot["telegram_username"])
-                if organizer_snapshot is not None and organizer_snapshot["telegram_username"] is not None
-                else None
-            )
-            organizer_phone = (
-                str(organizer_snapshot["phone_number"])
-                if organizer_snapshot is not None and organizer_snapshot["phone_number"] is not None
-                else None
-            )
+        if not participants:
+            return GroupBookingResult(created=False, message=RU_BOOKING_MESSAGES["group_booking_empty"])
+        names: list[str] = []
+        for participant in participants:
+            name = participant.participant_name.strip()
+            if not name:
+                return GroupBookingResult(
+                    created=False,
+                    message=RU_BOOKING_MESSAGES["manual_booking_client_required"],
+                    participant_name=participant.participant_name,
+                )
+            if len(name) > 160:
+                return GroupBookingResult(
+                    created=False,
+                    message=RU_BOOKING_MESSAGES["manual_booking_client_too_long"],
+                    participant_name=name,
+                )
+            names.append(name)
+
+        try:
+            with begin_operation(self._engine, OPERATION_BOOKING_WRITE) as conn:
+                planned: list[GroupParticipantBooking] = []
+                for participant, name in zip(participants, names):
+                    duration_minutes = resolve_service_duration_minutes(participant.service_type, connection=conn)
+                    if duration_minutes is None:
+                        return GroupBookingResult(
+                            created=False,
+                            message=RU_BOOKING_MESSAGES["invalid_service_type"],
+                            participant_name=name,
+                        )
+                    slot_start_utc = _to_utc(participant.slot_start)
+                    planned.append(
+                        GroupParticipantBooking(
+                            booking_id=0,
+                            participant_name=name,
+                            master_id=participant.master_id,
+                            service_type=participant.service_type,
+                            slot_start=slot_start_utc,
+                            slot_end=slot_start_utc + timedelta(minutes=duration_minutes),
+                        )
+                    )
 
-            booking_id = conn.execute(
-                text(
-                    """
-                    INSERT INTO bookings (
-                        master_id,
-                        client_user_id,
-                        organizer_user_id,
-                        booking_group_key,
-                        service_type,
-                        slot_start,
-                        slot_end,
-                        status,
-                        manual_client_name,
-                        client_username_snapshot,
-                        client_phone_snapshot
+                master_ids = sorted({item.master_id for item in planned})
+                hours = _load_group_master_hours(conn, master_ids)
+                busy = _load_group_occupancy(
+                    conn,
+                    master_ids,
+                    range_start=min(item.slot_start for item in planned),
+                    range_end=max(item.slot_end for item in planned),
+                )
+                occupancy: dict[tuple[int, date], DayOccupancy] = {}
+                for item in planned:
+                    master = hours.get(item.master_id)
+                    if master is None:
+                        return GroupBookingResult(
+                            created=False,
+                            message=RU_BOOKING_MESSAGES["master_not_found"],
+                            participant_name=item.participant_name,
+                        )
+                    if not is_slot_start_allowed(
+                        slot_start=item.slot_start,
+                        now=now_utc,
+                        slot_step_minutes=DEFAULT_SLOT_STEP_MINUTES,
+                    ):
+                        return GroupBookingResult(
+                            created=False,
+                            message=RU_BOOKING_MESSAGES["slot_already_passed"],
+                            participant_name=item.participant_name,
+                        )
+                    day_key = (item.master_id, business_date(item.slot_start))
+                    day = occupancy.get(day_key)
+                    if day is None:
+                        day = DayOccupancy.for_business_date(day_key[1], busy.get(item.master_id, ()))
+                    if not _fits_master_day(master, slot_start=item.slot_start, slot_end=item.slot_end) or (
+                        not day.is_free(item.slot_start, item.slot_end - item.slot_start)
+                    ):
+                        return GroupBookingResult(
+                            created=False,
+                            message=RU_BOOKING_MESSAGES["slot_not_available"],
+                            participant_name=item.participant_name,
+                        )
+                    # Later participants must not overlap earlier ones at the same master either.
+                    occupancy[day_key] = day.apply_booking(item.slot_start, item.slot_end)
+
+                if organizer_snapshot is None:
+                    organizer_snapshot = _read_client_snapshot(conn, organizer_user_id)
+                inserted = _insert_group_bookings(
+                    conn,
+                    planned,
+                    organizer_user_id=organizer_user_id,
+                    booking_group_key=booking_group_key,
+                    organizer_snapshot=organizer_snapshot,
+                )
+                for item in inserted:
+                    invalidate_day_occupancy_on_commit(
+                        conn,
+                        (item.master_id,),
+                        start_at=item.slot_start,
+                        end_at=item.slot_end,
                     )
-                    VALUES (
-                        :master_id,
-                        NULL,
-                        :organizer_user_id,
-                        :booking_group_key,
-                        :service_type,
-                        :slot_start,
-                        :slot_end,
-                        :status,
-                        :manual_client_name,
-                        :client_username_snapshot,
-                        :client_phone_snapshot
+                    refresh_next_free_slot_on_commit(
+                        conn,
+                        item.master_id,
+                        start_at=item.slot_start,
+                        end_at=item.slot_end,
                     )
-                    RETURNING id
-                    """
-                ),
-                {
-                    "master_id": master_id,
-                    "organizer_user_id": organizer_user_id,
-                    "booking_group_key": booking_group_key,
-                    "service_type": service_type,
-                    "slot_start": slot_start_utc,
-                    "slot_end": slot_end_utc,
-                    "status": BOOKING_STATUS_ACTIVE,
-                    "manual_client_name": normalized_name,
-                    "client_username_snapshot": organizer_username,
-                    "client_phone_snapshot": organizer_phone,
-                },
-            ).scalar_one()
-
-            return BookingCreateResult(created=True, message=RU_BOOKING_MESSAGES["created"], booking_id=int(booking_id))
+                return GroupBookingResult(
+                    created=True,
+                    message=RU_BOOKING_MESSAGES["group_booking_created"],
+                    bookings=tuple(inserted),
+                )
+        except _GroupSlotTaken as exc:
+            return GroupBookingResult(
+                created=False,
+                message=RU_BOOKING_MESSAGES["slot_not_available"],
+                participant_name=exc.participant_name,
+            )
+        except IntegrityError as exc:
+            if is_booking_overlap_violation(exc):
+                return GroupBookingResult(created=False, message=RU_BOOKING_MESSAGES["slot_not_available"])
+            raise
+
+
+def is_booking_overlap_violation(exc: IntegrityError) -> bool:
+    orig = exc.orig
+    if getattr(orig, "pgcode", None) != _EXCLUSION_VIOLATION_SQLSTATE:
+        return False
+    diag = getattr(orig, "diag", None)
+    constraint_name = getattr(diag, "constraint_name", None)
+    return constraint_name is None or constraint_name == BOOKING_OVERLAP_CONSTRAINT
+
+
+def _load_group_master_hours(conn: Connection, master_ids: Sequence[int]) -> dict[int, dict[str, time]]:
+    rows = conn.execute(
+        text(
+            """
+            SELECT id, work_start, work_end, lunch_start, lunch_end
+            FROM masters
+            WHERE id IN :master_ids AND is_active = true
+            """
+        )
+        .bindparams(bindparam("master_ids", expanding=True))
+        .execution_options(query_name="booking_group_master_hours"),
+        {"master_ids": list(master_ids)},
+    ).mappings()
+    return {
+        int(row["id"]): {
+            key: _as_time(row[key]) for key in ("work_start", "work_end", "lunch_start", "lunch_end")
+        }
+        for row in rows
+    }
+
+
+def _load_group_occupancy(
+    conn: Connection,
+    master_ids: Sequence[int],
+    *,
+    range_start: datetime,
+    range_end: datetime,
+) -> dict[int, list[tuple[datetime, datetime]]]:
+    rows = conn.execute(
+        text(
+            """
+            SELECT master_id, slot_start AS busy_start, slot_end AS busy_end
+            FROM bookings
+            WHERE master_id IN :master_ids
+              AND status = 'active'
+              AND slot_start < :range_end
+              AND :range_start < slot_end
+            UNION ALL
+            SELECT master_id, start_at AS busy_start, end_at AS busy_end
+            FROM availability_blocks
+            WHERE master_id IN :master_ids
+              AND start_at < :range_end
+              AND :range_start < end_at
+            """
+        )
+        .bindparams(bindparam("master_ids", expanding=True))
+        .execution_options(query_name="booking_group_occupancy"),
+        {"master_ids": list(master_ids), "range_start": range_start, "range_end": range_end},
+    ).mappings()
+    busy: dict[int, list[tuple[datetime, datetime]]] = {}
+    for row in rows:
+        busy.setdefault(int(row["master_id"]), []).append(
+            (_as_datetime(row["busy_start"]), _as_datetime(row["busy_end"]))
+        )
+    return busy
+
+
+def _fits_master_day(master: dict[str, time], *, slot_start: datetime, slot_end: datetime) -> bool:
+    on_date = business_date(slot_start)
+    day_work_start = combine_business_date_time(on_date, master["work_start"])
+    day_work_end = combine_business_date_time(on_date, master["work_end"])
+    if slot_start < day_work_start or slot_end > day_work_end:
+        return False
+    return not intervals_overlap(
+        start_at=slot_start,
+        end_at=slot_end,
+        other_start=combine_business_date_time(on_date, master["lunch_start"]),
+        other_end=combine_business_date_time(on_date, master["lunch_end"]),
+    )
+
+
+def _insert_group_bookings(
+    conn: Connection,
+    planned: Sequence[GroupParticipantBooking],
+    *,
+    organizer_user_id: int,
+    booking_group_key: str,
+    organizer_snapshot: BookingClientSnapshot,
+) -> list[GroupParticipantBooking]:
+    params: dict[str, object] = {
+        "organizer_user_id": organizer_user_id,
+        "booking_group_key": booking_group_key,
+        "status": BOOKING_STATUS_ACTIVE,
+        "client_username_snapshot": organizer_snapshot.telegram_username,
+        "client_phone_snapshot": organizer_snapshot.phone_number,
+    }
+    # The CTE follows `INSERT INTO` so the statement still starts with INSERT (pysqlite only opens
+    # its implicit transaction for statements that do); rows the guard skips come back missing.
+    statement = values_statement(
+        conn,
+        """
+        INSERT INTO bookings (
+            master_id,
+            client_user_id,
+            organizer_user_id,
+            booking_group_key,
+            service_type,
+            slot_start,
+            slot_end,
+            status,
+            manual_client_name,
+            client_username_snapshot,
+            client_phone_snapshot
+        )
+        WITH planned (master_id, service_type, slot_start, slot_end, manual_client_name) AS (
+            VALUES
+            {values}
+        )
+        SELECT
+            planned.master_id,
+            NULL,
+            :organizer_user_id,
+            :booking_group_key,
+            planned.service_type,
+            planned.slot_start,
+            planned.slot_end,
+            :status,
+            planned.manual_client_name,
+            :client_username_snapshot,
+            :client_phone_snapshot
+        FROM planned
+        {slot_free}
+        RETURNING id, master_id, slot_start
+        """,
+        "(:master_id_{index}, :service_type_{index}, :slot_start_{index}, :slot_end_{index}, "
+        ":manual_client_name_{index})",
+        [
+            {
+                "master_id": item.master_id,
+                "service_type": item.service_type,
+                "slot_start": item.slot_start,
+                "slot_end": item.slot_end,
+                "manual_client_name": item.participant_name,
+            }
+            for item in planned
+        ],
+        slot_free=booking_slot_free_condition(
+            master_id="planned.master_id",
+            slot_start="planned.slot_start",
+            slot_end="planned.slot_end",
+        ),
+    )
+    rows = conn.execute(
+        statement.execution_options(query_name="booking_group_insert"),
+        params,
+    ).mappings().all()
+    # Slots of one master never overlap inside a validated batch, so (master, start) names a row.
+    booking_ids = {(int(row["master_id"]), _as_datetime(row["slot_start"])): int(row["id"]) for row in rows}
+    for item in planned:
+        if (item.master_id, item.slot_start) not in booking_ids:
+            raise _GroupSlotTaken(item.participant_name)
+    return [replace(item, booking_id=booking_ids[(item.master_id, item.slot_start)]) for item in planned]
+
+
+def _read_client_snapshot(conn: Connection, client_user_id: int) -> BookingClientSnapshot:
+    try:
+        client_row = conn.execute(
+            text(
+                """
+                SELECT telegram_username, phone_number
+                FROM users
+                WHERE id = :client_user_id
+                """
+            ).execution_options(query_name="booking_client_snapshot"),
+            {"client_user_id": client_user_id},
+        ).mappings().first()
+    except Exception:
+        # Some tests use reduced schemas without users table; snapshots are optional.
+        return BookingClientSnapshot(telegram_username=None, phone_number=None)
+    if client_row is None:
+        return BookingClientSnapshot(telegram_username=None, phone_number=None)
+    return BookingClientSnapshot(
+        telegram_username=str(client_row["telegram_username"]) if client_row["telegram_username"] is not None else None,
+        phone_number=str(client_row["phone_number"]) if client_row["phone_number"] is not None else None,
+    )
 
 
 def _to_utc(value: datetime) -> datetime:
     return normalize_utc(value)
 
 
+def _as_datetime(value: datetime | str) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return normalize_utc(value)
+
+
 def _as_time(value: time | str) -> time:
     if isinstance(value, time):
         return value
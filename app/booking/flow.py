@@ -2,18 +2,41 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date, datetime
+from typing import Sequence
 
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 from app.booking.availability import AvailabilityService
-from app.booking.cancel_booking import BookingCancellationService
-from app.booking.create_booking import BookingService
+from app.booking.cancel_booking import BookingCancellationService, RangeCancelledBooking
+from app.booking.create_booking import (
+    BookingClientSnapshot,
+    BookingService,
+    GroupBookingResult,
+    GroupParticipantBooking,
+    GroupParticipantRequest,
+)
 from app.booking.messages import RU_BOOKING_MESSAGES
+from app.booking.next_free_slot import NextFreeSlotService
 from app.booking.reminders import BookingReminderService
+from app.booking.roster_cache import RosterMaster, get_master_roster
 from app.booking.service_options import SERVICE_OPTION_LABELS_RU, list_service_options
+from app.db.bridge import ConnectionBoundEngine
+from app.db.routing import mark_recent_write
+from app.db.timeouts import OPERATION_BOOKING_WRITE, begin_operation
 from app.observability import emit_event, observe_telegram_delivery_outcome
-from app.timezone import normalize_utc, to_business, utc_now
+from app.timezone import business_date, normalize_utc, to_business, utc_now
+
+EARLIEST_SLOTS_DEFAULT_DAYS = 14
+EARLIEST_SLOTS_DEFAULT_LIMIT = 6
+
+
+class _GroupBookingRejected(Exception):
+    """Raised inside `confirm_group`'s transaction so rows of a rejected group are rolled back."""
+
+    def __init__(self, result: GroupBookingResult) -> None:
+        super().__init__(result.message)
+        self.result = result
 
 
 @dataclass(frozen=True)
@@ -27,26 +50,17 @@ class BookingFlowRepository:
         self._engine = engine
 
     def list_active_masters(self) -> list[dict[str, int | str]]:
-        with self._engine.connect() as conn:
-            rows = conn.execute(
-                text(
-                    """
-                    SELECT m.id, m.display_name, u.telegram_user_id
-                    FROM masters m
-                    JOIN users u ON u.id = m.user_id
-                    WHERE m.is_active = true
-                    ORDER BY m.id
-                    """
-                )
-            ).mappings()
-            return [
-                {
-                    "id": int(row["id"]),
-                    "display_name": str(row["display_name"]),
-                    "telegram_user_id": int(row["telegram_user_id"]),
-                }
-                for row in rows
-            ]
+        return [
+            {
+                "id": master.id,
+                "display_name": master.display_name,
+                "telegram_user_id": master.telegram_user_id,
+            }
+            for master in get_master_roster(self._engine).values()
+        ]
+
+    def get_active_master(self, master_id: int) -> RosterMaster | None:
+        return get_master_roster(self._engine).get(master_id)
 
     def resolve_client_user_id(self, telegram_user_id: int) -> int | None:
         with self._engine.connect() as conn:
@@ -64,6 +78,40 @@ class BookingFlowRepository:
             ).first()
             return int(row[0]) if row else None
 
+    def resolve_client_booking_identity(self, *, telegram_user_id: int, master_id: int) -> dict[str, object] | None:
+        with self._engine.connect() as conn:
+            row = conn.execute(
+                text(
+                    """
+                    SELECT
+                        u.id,
+                        u.telegram_username,
+                        u.phone_number,
+                        (
+                            SELECT mu.telegram_user_id
+                            FROM masters m
+                            JOIN users mu ON mu.id = m.user_id
+                            WHERE m.id = :master_id
+                        ) AS master_telegram_user_id
+                    FROM users u
+                    JOIN roles r ON r.id = u.role_id
+                    WHERE u.telegram_user_id = :telegram_user_id
+                      AND r.name = 'Client'
+                    """
+                ).execution_options(query_name="booking_flow_client_identity"),
+                {"telegram_user_id": telegram_user_id, "master_id": master_id},
+            ).mappings().first()
+            if row is None:
+                return None
+            return {
+                "client_user_id": int(row["id"]),
+                "telegram_username": row["telegram_username"],
+                "phone_number": row["phone_number"],
+                "master_telegram_user_id": (
+                    int(row["master_telegram_user_id"]) if row["master_telegram_user_id"] is not None else None
+                ),
+            }
+
     def resolve_master_user_id(self, telegram_user_id: int) -> int | None:
         with self._engine.connect() as conn:
             row = conn.execute(
@@ -174,6 +222,47 @@ class BookingNotificationService:
             ),
         ]
 
+    def build_group_booking_confirmation(
+        self,
+        *,
+        client_telegram_user_id: int,
+        master_telegram_user_ids: dict[int, int],
+        bookings: Sequence[GroupParticipantBooking],
+        client_username: str | None = None,
+        client_phone: str | None = None,
+    ) -> list[BookingNotification]:
+        """One message for the organizer and one per master listing that master's participants."""
+        organizer_text = _build_client_identity_text(
+            manual_client_name=None,
+            client_username=client_username,
+            client_phone=client_phone,
+            fallback_client_telegram_user_id=client_telegram_user_id,
+        ).replace("Клиент:", "Организатор:", 1)
+        notifications = [
+            BookingNotification(
+                recipient_telegram_user_id=client_telegram_user_id,
+                message=f"{RU_BOOKING_MESSAGES['booking_confirmed_client']}\nУчастников: {len(bookings)}",
+            )
+        ]
+        for master_id, master_telegram_user_id in master_telegram_user_ids.items():
+            lines = [
+                f"- {item.participant_name} · {_format_slot_datetime(item.slot_start)} · "
+                f"{_resolve_service_label(item.service_type)}"
+                for item in sorted(bookings, key=lambda item: item.slot_start)
+                if item.master_id == master_id
+            ]
+            if not lines:
+                continue
+            notifications.append(
+                BookingNotification(
+                    recipient_telegram_user_id=master_telegram_user_id,
+                    message="\n".join(
+                        [RU_BOOKING_MESSAGES["booking_confirmed_group_master"], organizer_text, *lines]
+                    ),
+                )
+            )
+        return notifications
+
     def build_client_cancellation(
         self,
         *,
@@ -214,6 +303,23 @@ class BookingNotificationService:
             ),
         ]
 
+    def build_master_range_cancellation(
+        self,
+        *,
+        reason: str,
+        bookings: Sequence[RangeCancelledBooking],
+    ) -> list[BookingNotification]:
+        """One message per affected client; the master's summary is the command reply itself."""
+        prefix = RU_BOOKING_MESSAGES["booking_cancelled_by_master_client_prefix"].format(reason=reason)
+        return [
+            BookingNotification(
+                recipient_telegram_user_id=booking.recipient_telegram_user_id,
+                message=f"{prefix}\nСлот: {_format_slot_datetime(booking.slot_start)}",
+            )
+            for booking in bookings
+            if booking.recipient_telegram_user_id is not None
+        ]
+
 
 class TelegramBookingFlowService:
     def __init__(self, engine: Engine) -> None:
@@ -224,16 +330,22 @@ class TelegramBookingFlowService:
         self._cancellations = BookingCancellationService(engine)
         self._notifications = BookingNotificationService()
         self._reminders = BookingReminderService(engine)
+        self._next_free_slots = NextFreeSlotService(engine)
 
     def start(self) -> dict[str, object]:
         masters = self._repository.list_active_masters()
+        next_free = self._next_free_slots.list_next_free_slots(now=utc_now())
+        for master in masters:
+            slot_start = next_free.get(int(master["id"]))
+            if slot_start is not None:
+                master["next_free_at"] = slot_start.isoformat()
         return {
             "message": RU_BOOKING_MESSAGES["choose_master"],
             "masters": masters,
         }
 
     def select_master(self, master_id: int) -> dict[str, object]:
-        if not any(master["id"] == master_id for master in self._repository.list_active_masters()):
+        if self._repository.get_active_master(master_id) is None:
             return {"message": RU_BOOKING_MESSAGES["master_not_found"], "service_options": []}
 
         return {
@@ -242,7 +354,7 @@ class TelegramBookingFlowService:
         }
 
     def select_service(self, *, master_id: int, on_date: date, service_type: str) -> dict[str, object]:
-        if not any(master["id"] == master_id for master in self._repository.list_active_masters()):
+        if self._repository.get_active_master(master_id) is None:
             return {"message": RU_BOOKING_MESSAGES["master_not_found"], "slots": []}
 
         slots = self._availability.list_slots(
@@ -259,6 +371,42 @@ class TelegramBookingFlowService:
             ],
         }
 
+    def find_earliest_slots(
+        self,
+        *,
+        service_type: str,
+        date_from: date | None = None,
+        days: int = EARLIEST_SLOTS_DEFAULT_DAYS,
+        limit: int = EARLIEST_SLOTS_DEFAULT_LIMIT,
+    ) -> dict[str, object]:
+        if service_type not in SERVICE_OPTION_LABELS_RU:
+            return {"message": RU_BOOKING_MESSAGES["invalid_service_type"], "slots": []}
+
+        now = utc_now()
+        slots = self._availability.find_earliest_slots(
+            service_type,
+            date_from or business_date(now),
+            days,
+            limit,
+            now=now,
+        )
+        if not slots:
+            return {"message": RU_BOOKING_MESSAGES["no_free_slots"], "slots": []}
+
+        roster = get_master_roster(self._engine)
+        return {
+            "message": RU_BOOKING_MESSAGES["choose_earliest_slot"],
+            "slots": [
+                {
+                    "master_id": slot.master_id,
+                    "master_name": roster[slot.master_id].display_name if slot.master_id in roster else "",
+                    "start_at": slot.start_at.isoformat(),
+                    "end_at": slot.end_at.isoformat(),
+                }
+                for slot in slots
+            ],
+        }
+
     def confirm(
         self,
         *,
@@ -267,64 +415,68 @@ class TelegramBookingFlowService:
         service_type: str,
         slot_start: datetime,
     ) -> dict[str, object]:
-        client_user_id = self._repository.resolve_client_user_id(client_telegram_user_id)
-        if client_user_id is None:
-            return {
-                "created": False,
-                "booking_id": None,
-                "message": RU_BOOKING_MESSAGES["client_not_found"],
-                "notifications": [],
-            }
-
-        result = self._bookings.create_booking(
-            master_id=master_id,
-            client_user_id=client_user_id,
-            service_type=service_type,
-            slot_start=slot_start,
-        )
-
-        if not result.created:
-            return {
-                "created": False,
-                "booking_id": None,
-                "message": result.message,
-                "notifications": [],
-            }
+        with begin_operation(self._engine, OPERATION_BOOKING_WRITE) as conn:
+            # One connection and one transaction for the whole confirm: identity, booking, reminder.
+            unit = ConnectionBoundEngine(conn)
+            identity = BookingFlowRepository(unit).resolve_client_booking_identity(
+                telegram_user_id=client_telegram_user_id,
+                master_id=master_id,
+            )
+            if identity is None:
+                return {
+                    "created": False,
+                    "booking_id": None,
+                    "message": RU_BOOKING_MESSAGES["client_not_found"],
+                    "notifications": [],
+                }
 
-        result_context = (
-            self._repository.get_booking_notification_context(result.booking_id)
-            if result.booking_id is not None
-            else None
-        )
-        master_telegram_user_id = self._repository.get_master_telegram_user_id(master_id)
-        if result.booking_id is not None:
-            now_utc = utc_now()
-            reminder_outcome = self._reminders.schedule_for_booking(
-                booking_id=result.booking_id,
-                slot_start=slot_start,
-                booking_created_at=now_utc,
+            client_snapshot = BookingClientSnapshot(
+                telegram_username=_as_str_or_none(identity["telegram_username"]),
+                phone_number=_as_str_or_none(identity["phone_number"]),
             )
-            observe_telegram_delivery_outcome(
-                path="/internal/telegram/client/booking-reminder",
-                outcome=reminder_outcome,
+            result = BookingService(unit).create_booking(
+                master_id=master_id,
+                client_user_id=int(identity["client_user_id"]),
+                service_type=service_type,
+                slot_start=slot_start,
+                client_snapshot=client_snapshot,
             )
-            emit_event(
-                "booking_reminder_schedule",
+            if not result.created or result.booking_id is None:
+                return {
+                    "created": False,
+                    "booking_id": None,
+                    "message": result.message,
+                    "notifications": [],
+                }
+
+            reminder_outcome = BookingReminderService(unit).schedule_for_booking(
                 booking_id=result.booking_id,
-                client_telegram_user_id=client_telegram_user_id,
-                outcome=reminder_outcome,
+                slot_start=slot_start,
+                booking_created_at=utc_now(),
             )
+
+        mark_recent_write(telegram_user_ids=(client_telegram_user_id,), master_ids=(master_id,))
+        observe_telegram_delivery_outcome(
+            path="/internal/telegram/client/booking-reminder",
+            outcome=reminder_outcome,
+        )
+        emit_event(
+            "booking_reminder_schedule",
+            booking_id=result.booking_id,
+            client_telegram_user_id=client_telegram_user_id,
+            outcome=reminder_outcome,
+        )
+        master_telegram_user_id = identity["master_telegram_user_id"]
         notifications = (
             self._notifications.build_booking_confirmation(
                 client_telegram_user_id=client_telegram_user_id,
                 master_telegram_user_id=master_telegram_user_id,
-                slot_start=_as_datetime_or_none(result_context.get("slot_start") if result_context else None),
-                service_type=_as_str_or_none(result_context.get("service_type") if result_context else None),
-                manual_client_name=_as_str_or_none(result_context.get("manual_client_name") if result_context else None),
-                client_username=_as_str_or_none(result_context.get("client_username") if result_context else None),
-                client_phone=_as_str_or_none(result_context.get("client_phone") if result_context else None),
+                slot_start=result.slot_start,
+                service_type=service_type,
+                client_username=client_snapshot.telegram_username,
+                client_phone=client_snapshot.phone_number,
             )
-            if master_telegram_user_id is not None
+            if isinstance(master_telegram_user_id, int)
             else []
         )
 
@@ -341,64 +493,81 @@ class TelegramBookingFlowService:
             ],
         }
 
-    def confirm_group_participant(
+    def confirm_group(
         self,
         *,
         client_telegram_user_id: int,
-        master_id: int,
-        service_type: str,
-        slot_start: datetime,
-        participant_name: str,
         booking_group_key: str,
+        participants: Sequence[GroupParticipantRequest],
     ) -> dict[str, object]:
-        organizer_user_id = self._repository.resolve_client_user_id(client_telegram_user_id)
-        if organizer_user_id is None:
+        if not participants:
             return {
                 "created": False,
-                "booking_id": None,
-                "message": RU_BOOKING_MESSAGES["client_not_found"],
+                "booking_ids": [],
+                "message": RU_BOOKING_MESSAGES["group_booking_empty"],
+                "participant_name": None,
                 "notifications": [],
             }
-
-        result = self._bookings.create_grouped_participant_booking(
-            master_id=master_id,
-            organizer_user_id=organizer_user_id,
-            service_type=service_type,
-            slot_start=slot_start,
-            participant_name=participant_name,
-            booking_group_key=booking_group_key,
-        )
+        try:
+            with begin_operation(self._engine, OPERATION_BOOKING_WRITE) as conn:
+                # One connection and one transaction for the whole group: organizer identity and every participant.
+                unit = ConnectionBoundEngine(conn)
+                identity = BookingFlowRepository(unit).resolve_client_booking_identity(
+                    telegram_user_id=client_telegram_user_id,
+                    master_id=participants[0].master_id,
+                )
+                if identity is None:
+                    return {
+                        "created": False,
+                        "booking_ids": [],
+                        "message": RU_BOOKING_MESSAGES["client_not_found"],
+                        "participant_name": None,
+                        "notifications": [],
+                    }
+                organizer_snapshot = BookingClientSnapshot(
+                    telegram_username=_as_str_or_none(identity["telegram_username"]),
+                    phone_number=_as_str_or_none(identity["phone_number"]),
+                )
+                result = BookingService(unit).create_group_bookings(
+                    organizer_user_id=int(identity["client_user_id"]),
+                    booking_group_key=booking_group_key,
+                    participants=participants,
+                    organizer_snapshot=organizer_snapshot,
+                )
+                if not result.created:
+                    # The service joined this transaction, so its own rollback never ran: a group
+                    # rejected after a partial insert must be undone here.
+                    raise _GroupBookingRejected(result)
+        except _GroupBookingRejected as exc:
+            result = exc.result
         if not result.created:
             return {
                 "created": False,
-                "booking_id": None,
+                "booking_ids": [],
                 "message": result.message,
+                "participant_name": result.participant_name,
                 "notifications": [],
             }
 
-        result_context = (
-            self._repository.get_booking_notification_context(result.booking_id)
-            if result.booking_id is not None
-            else None
-        )
-        master_telegram_user_id = self._repository.get_master_telegram_user_id(master_id)
-        notifications = (
-            self._notifications.build_booking_confirmation(
-                client_telegram_user_id=client_telegram_user_id,
-                master_telegram_user_id=master_telegram_user_id,
-                slot_start=_as_datetime_or_none(result_context.get("slot_start") if result_context else None),
-                service_type=_as_str_or_none(result_context.get("service_type") if result_context else None),
-                manual_client_name=_as_str_or_none(result_context.get("manual_client_name") if result_context else None),
-                client_username=_as_str_or_none(result_context.get("client_username") if result_context else None),
-                client_phone=_as_str_or_none(result_context.get("client_phone") if result_context else None),
-            )
-            if master_telegram_user_id is not None
-            else []
+        master_ids = tuple(sorted({item.master_id for item in result.bookings}))
+        mark_recent_write(telegram_user_ids=(client_telegram_user_id,), master_ids=master_ids)
+        master_telegram_user_ids: dict[int, int] = {}
+        for master_id in master_ids:
+            master = self._repository.get_active_master(master_id)
+            if master is not None:
+                master_telegram_user_ids[master_id] = master.telegram_user_id
+        notifications = self._notifications.build_group_booking_confirmation(
+            client_telegram_user_id=client_telegram_user_id,
+            master_telegram_user_ids=master_telegram_user_ids,
+            bookings=result.bookings,
+            client_username=organizer_snapshot.telegram_username,
+            client_phone=organizer_snapshot.phone_number,
         )
         return {
             "created": True,
-            "booking_id": result.booking_id,
+            "booking_ids": [item.booking_id for item in result.bookings],
             "message": result.message,
+            "participant_name": None,
             "notifications": [
                 {
                     "recipient_telegram_user_id": n.recipient_telegram_user_id,
@@ -431,6 +600,7 @@ class TelegramBookingFlowService:
                 "message": result.message,
                 "notifications": [],
             }
+        mark_recent_write(telegram_user_ids=(client_telegram_user_id,), master_ids=(result.master_id,))
 
         notifications: list[BookingNotification] = [
             BookingNotification(
@@ -487,6 +657,7 @@ class TelegramBookingFlowService:
                 "message": result.message,
                 "notifications": [],
             }
+        mark_recent_write(telegram_user_ids=(master_telegram_user_id,), master_ids=(result.master_id,))
 
         notifications: list[BookingNotification] = [
             BookingNotification(
@@ -498,6 +669,7 @@ class TelegramBookingFlowService:
         if recipient_user_id is not None and result.cancellation_reason is not None:
             client_telegram_user_id = self._repository.get_client_telegram_user_id(recipient_user_id)
             if client_telegram_user_id is not None:
+                mark_recent_write(telegram_user_ids=(client_telegram_user_id,))
                 notifications = self._notifications.build_master_cancellation(
                     client_telegram_user_id=client_telegram_user_id,
                     master_telegram_user_id=master_telegram_user_id,
@@ -518,6 +690,57 @@ class TelegramBookingFlowService:
             ],
         }
 
+    def cancel_range_by_master(
+        self,
+        *,
+        master_telegram_user_id: int,
+        start_at: datetime,
+        end_at: datetime,
+        reason: str,
+    ) -> dict[str, object]:
+        master_user_id = self._repository.resolve_master_user_id(master_telegram_user_id)
+        if master_user_id is None:
+            return {
+                "cancelled": False,
+                "booking_ids": [],
+                "message": RU_BOOKING_MESSAGES["master_not_found"],
+                "notifications": [],
+            }
+
+        result = self._cancellations.cancel_range_by_master(
+            master_user_id=master_user_id,
+            start_at=start_at,
+            end_at=end_at,
+            reason=reason,
+        )
+        if not result.cancelled or result.cancellation_reason is None:
+            return {
+                "cancelled": False,
+                "booking_ids": [],
+                "message": result.message,
+                "notifications": [],
+            }
+        notifications = self._notifications.build_master_range_cancellation(
+            reason=result.cancellation_reason,
+            bookings=result.bookings,
+        )
+        mark_recent_write(
+            telegram_user_ids=(master_telegram_user_id, *(n.recipient_telegram_user_id for n in notifications)),
+            master_ids=(result.master_id,),
+        )
+        return {
+            "cancelled": True,
+            "booking_ids": [booking.booking_id for booking in result.bookings],
+            "message": result.message,
+            "notifications": [
+                {
+                    "recipient_telegram_user_id": n.recipient_telegram_user_id,
+                    "message": n.message,
+                }
+                for n in notifications
+            ],
+        }
+
 
 def _build_client_identity_text(
     *,
@@ -550,14 +773,6 @@ def _resolve_service_label(service_type: str | None) -> str:
     return SERVICE_OPTION_LABELS_RU.get(service_type, service_type)
 
 
-def _as_datetime_or_none(value: object) -> datetime | None:
-    if isinstance(value, datetime):
-        return normalize_utc(value)
-    if isinstance(value, str):
-        return normalize_utc(datetime.fromisoformat(value))
-    return None
-
-
 def _as_str_or_none(value: object) -> str | None:
     if isinstance(value, str):
         return value
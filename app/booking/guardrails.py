@@ -3,7 +3,7 @@ from __future__ import annotations
 import math
 from datetime import date, datetime, time, timedelta
 
-from app.timezone import get_business_timezone, normalize_utc
+from app.timezone import get_business_calendar, normalize_utc
 
 DEFAULT_MIN_LEAD_MINUTES = 30
 
@@ -14,15 +14,17 @@ def same_day_min_slot_start(
     slot_step_minutes: int,
     min_lead_minutes: int = DEFAULT_MIN_LEAD_MINUTES,
 ) -> datetime | None:
-    now_business = normalize_utc(now).astimezone(get_business_timezone())
+    calendar = get_business_calendar()
+    now_business = calendar.to_business(now)
     if on_date != now_business.date():
         return None
 
-    threshold = now_business + timedelta(minutes=min_lead_minutes)
-    day_start = datetime.combine(on_date, time.min, tzinfo=get_business_timezone())
-    total_minutes = (threshold - day_start).total_seconds() / 60
+    # Lead time and step rounding are wall-clock minutes since local midnight.
+    threshold = now_business.replace(tzinfo=None) + timedelta(minutes=min_lead_minutes)
+    total_minutes = (threshold - datetime.combine(on_date, time.min)).total_seconds() / 60
     rounded_minutes = int(math.ceil(total_minutes / slot_step_minutes) * slot_step_minutes)
-    return normalize_utc(day_start + timedelta(minutes=rounded_minutes))
+    day_offset, minute_of_day = divmod(rounded_minutes, 24 * 60)
+    return calendar.combine(on_date + timedelta(days=day_offset), time(*divmod(minute_of_day, 60)))
 
 
 def is_slot_start_allowed(
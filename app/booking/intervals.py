@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator
+
+from app.timezone import business_day_bounds
+
+_MINUTE = timedelta(minutes=1)
 
 
 def intervals_overlap(*, start_at: datetime, end_at: datetime, other_start: datetime, other_end: datetime) -> bool:
@@ -12,3 +18,162 @@ def is_interval_blocked(*, start_at: datetime, end_at: datetime, blocked_ranges:
         if intervals_overlap(start_at=start_at, end_at=end_at, other_start=blocked_start, other_end=blocked_end):
             return True
     return False
+
+
+def merge_intervals(ranges: Iterable[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+    """Sort [start, end) ranges and coalesce overlapping or touching ones; empty ranges are dropped."""
+    merged: list[tuple[datetime, datetime]] = []
+    for start_at, end_at in sorted(item for item in ranges if item[0] < item[1]):
+        if merged and start_at <= merged[-1][1]:
+            if end_at > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end_at)
+            continue
+        merged.append((start_at, end_at))
+    return merged
+
+
+class BlockedIntervals:
+    """Blocked ranges merged once, then probed with bisect instead of a scan per candidate."""
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, ranges: Iterable[tuple[datetime, datetime]]) -> None:
+        merged = merge_intervals(ranges)
+        self._starts = [start_at for start_at, _ in merged]
+        self._ends = [end_at for _, end_at in merged]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def overlaps(self, start_at: datetime, end_at: datetime) -> bool:
+        # Merged ranges are disjoint, so ends are sorted too: the first range ending after
+        # `start_at` is the only one that can overlap.
+        index = bisect_right(self._ends, start_at)
+        return index < len(self._starts) and self._starts[index] < end_at
+
+    def free_slots(
+        self,
+        *,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        step: timedelta,
+        not_before: datetime | None = None,
+    ) -> Iterator[tuple[datetime, datetime]]:
+        """Yield step-aligned [start, end) slots inside the window that overlap no blocked range.
+
+        Candidates and ranges are walked together with one moving pointer; a blocked candidate
+        jumps straight to the first aligned start after the blocking range.
+        """
+        if duration <= timedelta(0) or step <= timedelta(0):
+            raise ValueError("duration and step must be positive")
+        slot_start = window_start
+        if not_before is not None:
+            slot_start = _align_up(not_before, origin=window_start, step=step)
+        index = bisect_right(self._ends, slot_start)
+        while slot_start + duration <= window_end:
+            slot_end = slot_start + duration
+            while index < len(self._ends) and self._ends[index] <= slot_start:
+                index += 1
+            if index < len(self._starts) and self._starts[index] < slot_end:
+                slot_start = _align_up(self._ends[index], origin=window_start, step=step)
+                continue
+            yield slot_start, slot_end
+            slot_start += step
+
+
+class DayOccupancy:
+    """Busy minutes of one business day as an int bitset: bit `i` is minute `i` after midnight.
+
+    Instances are immutable, so one cached value can be shared by concurrent readers; applying a
+    booking returns a new instance. Busy ranges are widened to whole minutes.
+    """
+
+    __slots__ = ("day_start", "minutes", "bits")
+
+    def __init__(self, day_start: datetime, minutes: int, bits: int = 0) -> None:
+        self.day_start = day_start
+        self.minutes = minutes
+        self.bits = bits
+
+    @classmethod
+    def for_business_date(
+        cls,
+        on_date: date,
+        busy_ranges: Iterable[tuple[datetime, datetime]] = (),
+    ) -> DayOccupancy:
+        day_start, day_end = business_day_bounds(on_date)
+        occupancy = cls(day_start, (day_end - day_start) // _MINUTE)
+        return occupancy.apply_bookings(busy_ranges)
+
+    def apply_booking(self, start_at: datetime, end_at: datetime) -> DayOccupancy:
+        return self.apply_bookings(((start_at, end_at),))
+
+    def apply_bookings(self, ranges: Iterable[tuple[datetime, datetime]]) -> DayOccupancy:
+        bits = self.bits
+        for start_at, end_at in ranges:
+            low = max(self._floor_minute(start_at), 0)
+            high = min(self._ceil_minute(end_at), self.minutes)
+            if low < high:
+                bits |= ((1 << (high - low)) - 1) << low
+        return DayOccupancy(self.day_start, self.minutes, bits)
+
+    def is_free(self, start_at: datetime, duration: timedelta) -> bool:
+        low = self._floor_minute(start_at)
+        high = self._ceil_minute(start_at + duration)
+        if low < 0 or high > self.minutes or low >= high:
+            return False
+        return (self.bits >> low) & ((1 << (high - low)) - 1) == 0
+
+    def free_runs(
+        self,
+        window_start: datetime | None = None,
+        window_end: datetime | None = None,
+    ) -> Iterator[tuple[datetime, datetime]]:
+        """Yield maximal free [start, end) runs, optionally clipped to a window."""
+        low = 0 if window_start is None else max(self._ceil_minute(window_start), 0)
+        high = self.minutes if window_end is None else min(self._floor_minute(window_end), self.minutes)
+        if low >= high:
+            return
+        free = ~self.bits & (((1 << (high - low)) - 1) << low)
+        while free:
+            run_start = (free & -free).bit_length() - 1
+            shifted = free >> run_start
+            run_length = (shifted ^ (shifted + 1)).bit_length() - 1
+            yield self._at(run_start), self._at(run_start + run_length)
+            free &= ~(((1 << run_length) - 1) << run_start)
+
+    def free_slots(
+        self,
+        *,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        step: timedelta,
+        not_before: datetime | None = None,
+    ) -> Iterator[tuple[datetime, datetime]]:
+        """Yield step-aligned [start, end) slots inside the window that fit in one free run."""
+        if duration <= timedelta(0) or step <= timedelta(0):
+            raise ValueError("duration and step must be positive")
+        for run_start, run_end in self.free_runs(window_start, window_end):
+            if not_before is not None and not_before > run_start:
+                run_start = not_before
+            slot_start = _align_up(run_start, origin=window_start, step=step)
+            while slot_start + duration <= run_end:
+                yield slot_start, slot_start + duration
+                slot_start += step
+
+    def _floor_minute(self, value: datetime) -> int:
+        return (value - self.day_start) // _MINUTE
+
+    def _ceil_minute(self, value: datetime) -> int:
+        return -((self.day_start - value) // _MINUTE)
+
+    def _at(self, minute: int) -> datetime:
+        return self.day_start + minute * _MINUTE
+
+
+def _align_up(value: datetime, *, origin: datetime, step: timedelta) -> datetime:
+    if value <= origin:
+        return origin
+    return origin + step * -((origin - value) // step)
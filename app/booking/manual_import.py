@@ -0,0 +1,505 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from app.booking.contracts import BOOKING_STATUS_ACTIVE
+from app.booking.create_booking import booking_slot_free_condition, is_booking_overlap_violation
+from app.booking.intervals import DayOccupancy, intervals_overlap
+from app.booking.messages import RU_BOOKING_MESSAGES
+from app.booking.next_free_slot import refresh_next_free_slot_on_commit
+from app.booking.occupancy_cache import invalidate_day_occupancy_on_commit
+from app.booking.schedule import ensure_manual_client_user
+from app.booking.service_options import SERVICE_OPTION_CODES, SERVICE_OPTION_DURATION_MINUTES, load_service_catalog
+from app.db.bulk import values_statement
+from app.db.routing import mark_recent_write
+from app.db.timeouts import OPERATION_ADMIN_WRITE, begin_operation
+from app.timezone import get_business_calendar, normalize_utc
+
+MANUAL_IMPORT_FORMAT_CSV = "csv"
+MANUAL_IMPORT_FORMAT_JSON = "json"
+MANUAL_IMPORT_FORMATS = (MANUAL_IMPORT_FORMAT_CSV, MANUAL_IMPORT_FORMAT_JSON)
+MANUAL_IMPORT_MAX_BYTES = 512 * 1024
+MANUAL_IMPORT_MAX_ROWS = 1000
+MANUAL_IMPORT_INSERT_BATCH_SIZE = 200
+
+_MANUAL_CLIENT_NAME_MAX_LENGTH = 160
+_IMPORT_FIELDS = ("slot_start", "service_type", "client_name")
+
+
+@dataclass(frozen=True)
+class ManualImportRow:
+    row_number: int
+    client_name: str
+    service_type: str
+    slot_start: datetime
+
+
+@dataclass(frozen=True)
+class ManualImportRowResult:
+    row_number: int
+    accepted: bool
+    message: str
+    booking_id: int | None = None
+    slot_start: datetime | None = None
+
+
+@dataclass(frozen=True)
+class ManualImportResult:
+    applied: bool
+    message: str
+    rows: tuple[ManualImportRowResult, ...] = ()
+
+    @property
+    def accepted_count(self) -> int:
+        return sum(1 for row in self.rows if row.accepted)
+
+    @property
+    def rejected_count(self) -> int:
+        return sum(1 for row in self.rows if not row.accepted)
+
+
+@dataclass(frozen=True)
+class _PlannedBooking:
+    row: ManualImportRow
+    slot_start: datetime
+    slot_end: datetime
+
+
+class ManualBookingImportError(ValueError):
+    """Raised when an import file cannot be read as CSV or JSON rows."""
+
+
+class _ImportSlotTaken(Exception):
+    """Raised inside the import transaction when the insert guard skipped a row, so nothing is kept."""
+
+
+def detect_manual_import_format(content: str, filename: str | None = None) -> str:
+    if filename:
+        suffix = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+        if suffix in MANUAL_IMPORT_FORMATS:
+            return suffix
+    return MANUAL_IMPORT_FORMAT_JSON if content.lstrip()[:1] in ("[", "{") else MANUAL_IMPORT_FORMAT_CSV
+
+
+def parse_manual_import(
+    content: str,
+    import_format: str,
+) -> tuple[list[ManualImportRow], list[ManualImportRowResult]]:
+    """Split an import file into well-formed rows and per-row rejections, numbered from 1.
+
+    Naive `slot_start` values are read in the business timezone; offsets are kept as given.
+    """
+    if import_format == MANUAL_IMPORT_FORMAT_JSON:
+        records = _read_json_records(content)
+    elif import_format == MANUAL_IMPORT_FORMAT_CSV:
+        records = _read_csv_records(content)
+    else:
+        raise ManualBookingImportError(f"unsupported import format {import_format!r}")
+
+    rows: list[ManualImportRow] = []
+    rejected: list[ManualImportRowResult] = []
+    for row_number, record in enumerate(records, start=1):
+        row, rejection = _coerce_record(row_number, record)
+        if row is None:
+            rejected.append(
+                ManualImportRowResult(
+                    row_number=row_number,
+                    accepted=False,
+                    message=RU_BOOKING_MESSAGES[rejection or "manual_import_invalid_row"],
+                )
+            )
+        else:
+            rows.append(row)
+    return rows, rejected
+
+
+class ManualBookingImportService:
+    """Creates a master's manual bookings from an uploaded file in one transaction.
+
+    Every row is checked against one occupancy snapshot loaded for the file's whole range, plus
+    the rows accepted before it, so the import costs a fixed number of reads and one multi-row
+    `INSERT` per `MANUAL_IMPORT_INSERT_BATCH_SIZE` rows however long the file is. Rows that do
+    not fit are reported back instead of failing the import.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self._engine = engine
+
+    def import_file(
+        self,
+        *,
+        master_telegram_user_id: int,
+        content: str,
+        import_format: str | None = None,
+        filename: str | None = None,
+        dry_run: bool = False,
+    ) -> ManualImportResult:
+        if len(content.encode("utf-8")) > MANUAL_IMPORT_MAX_BYTES:
+            return ManualImportResult(applied=False, message=RU_BOOKING_MESSAGES["manual_import_file_too_large"])
+        try:
+            rows, rejected = parse_manual_import(
+                content,
+                import_format or detect_manual_import_format(content, filename),
+            )
+        except ManualBookingImportError:
+            return ManualImportResult(applied=False, message=RU_BOOKING_MESSAGES["manual_import_invalid_file"])
+        return self.import_rows(
+            master_telegram_user_id=master_telegram_user_id,
+            rows=rows,
+            rejected=rejected,
+            dry_run=dry_run,
+        )
+
+    def import_rows(
+        self,
+        *,
+        master_telegram_user_id: int,
+        rows: Sequence[ManualImportRow],
+        rejected: Sequence[ManualImportRowResult] = (),
+        dry_run: bool = False,
+    ) -> ManualImportResult:
+        if not rows and not rejected:
+            return ManualImportResult(applied=False, message=RU_BOOKING_MESSAGES["manual_import_empty"])
+        if len(rows) + len(rejected) > MANUAL_IMPORT_MAX_ROWS:
+            return ManualImportResult(
+                applied=False,
+                message=RU_BOOKING_MESSAGES["manual_import_too_many_rows"].format(limit=MANUAL_IMPORT_MAX_ROWS),
+            )
+
+        results: list[ManualImportRowResult] = list(rejected)
+        try:
+            with begin_operation(self._engine, OPERATION_ADMIN_WRITE) as conn:
+                master = _load_master(conn, master_telegram_user_id)
+                if master is None:
+                    return ManualImportResult(applied=False, message=RU_BOOKING_MESSAGES["master_not_found"])
+                master_id = int(master["id"])
+
+                durations = {**SERVICE_OPTION_DURATION_MINUTES, **(load_service_catalog(conn) or {})}
+                planned: list[_PlannedBooking] = []
+                for row in rows:
+                    duration_minutes = durations.get(row.service_type)
+                    if row.service_type not in SERVICE_OPTION_CODES or duration_minutes is None:
+                        results.append(_rejected(row, "invalid_service_type"))
+                        continue
+                    slot_start = normalize_utc(row.slot_start)
+                    planned.append(
+                        _PlannedBooking(
+                            row=row,
+                            slot_start=slot_start,
+                            slot_end=slot_start + timedelta(minutes=duration_minutes),
+                        )
+                    )
+
+                accepted: list[_PlannedBooking] = []
+                if planned:
+                    range_start = min(item.slot_start for item in planned)
+                    range_end = max(item.slot_end for item in planned)
+                    occupancy_by_date = _load_occupancy_by_date(
+                        conn,
+                        master_id,
+                        range_start=range_start,
+                        range_end=range_end,
+                    )
+                    hours = {
+                        key: _as_time(master[key]) for key in ("work_start", "work_end", "lunch_start", "lunch_end")
+                    }
+                    for item in planned:
+                        on_date = _business_date(item.slot_start)
+                        occupancy = occupancy_by_date.get(on_date)
+                        if occupancy is None:
+                            occupancy = DayOccupancy.for_business_date(on_date)
+                        rejection = _validate_planned(item, hours=hours, occupancy=occupancy)
+                        if rejection is not None:
+                            results.append(_rejected(item.row, rejection))
+                            continue
+                        # Later rows must not overlap the ones accepted before them.
+                        occupancy_by_date[on_date] = occupancy.apply_booking(item.slot_start, item.slot_end)
+                        accepted.append(item)
+
+                if dry_run or not accepted:
+                    results.extend(
+                        ManualImportRowResult(
+                            row_number=item.row.row_number,
+                            accepted=True,
+                            message=RU_BOOKING_MESSAGES["manual_import_row_valid"],
+                            slot_start=item.slot_start,
+                        )
+                        for item in accepted
+                    )
+                    return _finish(results, applied=False, dry_run=dry_run)
+
+                mark_recent_write(telegram_user_ids=(master_telegram_user_id,), master_ids=(master_id,))
+                client_user_id = ensure_manual_client_user(conn, master_id)
+                for offset in range(0, len(accepted), MANUAL_IMPORT_INSERT_BATCH_SIZE):
+                    batch = accepted[offset : offset + MANUAL_IMPORT_INSERT_BATCH_SIZE]
+                    booking_ids = _insert_batch(conn, batch, master_id=master_id, client_user_id=client_user_id)
+                    results.extend(
+                        ManualImportRowResult(
+                            row_number=item.row.row_number,
+                            accepted=True,
+                            message=RU_BOOKING_MESSAGES["manual_booking_created"],
+                            booking_id=booking_ids[item.slot_start],
+                            slot_start=item.slot_start,
+                        )
+                        for item in batch
+                    )
+
+                changed_start = min(item.slot_start for item in accepted)
+                changed_end = max(item.slot_end for item in accepted)
+                invalidate_day_occupancy_on_commit(conn, (master_id,), start_at=changed_start, end_at=changed_end)
+                refresh_next_free_slot_on_commit(conn, master_id, start_at=changed_start, end_at=changed_end)
+                return _finish(results, applied=True, dry_run=False)
+        except _ImportSlotTaken:
+            # A booking or block committed after the snapshot took a slot; the whole import rolled back.
+            return ManualImportResult(applied=False, message=RU_BOOKING_MESSAGES["manual_import_retry"])
+        except IntegrityError as exc:
+            if is_booking_overlap_violation(exc):
+                # A concurrent writer took a slot after the snapshot; the whole import rolled back.
+                return ManualImportResult(applied=False, message=RU_BOOKING_MESSAGES["manual_import_retry"])
+            raise
+
+
+def _finish(results: list[ManualImportRowResult], *, applied: bool, dry_run: bool) -> ManualImportResult:
+    rows = tuple(sorted(results, key=lambda item: item.row_number))
+    accepted = sum(1 for row in rows if row.accepted)
+    template = RU_BOOKING_MESSAGES["manual_import_checked" if dry_run else "manual_import_completed"]
+    return ManualImportResult(
+        applied=applied,
+        message=template.format(accepted=accepted, rejected=len(rows) - accepted),
+        rows=rows,
+    )
+
+
+def _rejected(row: ManualImportRow, message_key: str) -> ManualImportRowResult:
+    return ManualImportRowResult(
+        row_number=row.row_number,
+        accepted=False,
+        message=RU_BOOKING_MESSAGES[message_key],
+        slot_start=normalize_utc(row.slot_start),
+    )
+
+
+def _validate_planned(
+    item: _PlannedBooking,
+    *,
+    hours: dict[str, time],
+    occupancy: DayOccupancy,
+) -> str | None:
+    calendar = get_business_calendar()
+    on_date = calendar.business_date(item.slot_start)
+    if item.slot_start < calendar.combine(on_date, hours["work_start"]) or item.slot_end > calendar.combine(
+        on_date, hours["work_end"]
+    ):
+        return "slot_not_available"
+    if intervals_overlap(
+        start_at=item.slot_start,
+        end_at=item.slot_end,
+        other_start=calendar.combine(on_date, hours["lunch_start"]),
+        other_end=calendar.combine(on_date, hours["lunch_end"]),
+    ):
+        return "slot_not_available"
+    if not occupancy.is_free(item.slot_start, item.slot_end - item.slot_start):
+        return "manual_booking_conflict"
+    return None
+
+
+def _load_master(conn: Connection, master_telegram_user_id: int):  # type: ignore[no-untyped-def]
+    return conn.execute(
+        text(
+            """
+            SELECT m.id, m.work_start, m.work_end, m.lunch_start, m.lunch_end
+            FROM users u
+            JOIN roles r ON r.id = u.role_id
+            JOIN masters m ON m.user_id = u.id
+            WHERE u.telegram_user_id = :master_telegram_user_id
+              AND r.name = 'Master'
+              AND m.is_active = true
+            """
+        ).execution_options(query_name="manual_import_master"),
+        {"master_telegram_user_id": master_telegram_user_id},
+    ).mappings().first()
+
+
+def _load_occupancy_by_date(
+    conn: Connection,
+    master_id: int,
+    *,
+    range_start: datetime,
+    range_end: datetime,
+) -> dict[date, DayOccupancy]:
+    """Bucket the master's bookings and blocks over the import range by every business date they touch."""
+    rows = conn.execute(
+        text(
+            """
+            SELECT slot_start AS busy_start, slot_end AS busy_end
+            FROM bookings
+            WHERE master_id = :master_id
+              AND status = 'active'
+              AND slot_start < :range_end
+              AND :range_start < slot_end
+            UNION ALL
+            SELECT start_at AS busy_start, end_at AS busy_end
+            FROM availability_blocks
+            WHERE master_id = :master_id
+              AND start_at < :range_end
+              AND :range_start < end_at
+            """
+        ).execution_options(query_name="manual_import_occupancy"),
+        {"master_id": master_id, "range_start": range_start, "range_end": range_end},
+    ).mappings()
+    busy_by_date: dict[date, list[tuple[datetime, datetime]]] = {}
+    for row in rows:
+        busy_start = _as_datetime(row["busy_start"])
+        busy_end = _as_datetime(row["busy_end"])
+        on_date = _business_date(max(busy_start, range_start))
+        last_date = _business_date(min(busy_end, range_end) - timedelta(microseconds=1))
+        while on_date <= last_date:
+            busy_by_date.setdefault(on_date, []).append((busy_start, busy_end))
+            on_date += timedelta(days=1)
+    return {on_date: DayOccupancy.for_business_date(on_date, ranges) for on_date, ranges in busy_by_date.items()}
+
+
+def _insert_batch(
+    conn: Connection,
+    batch: Sequence[_PlannedBooking],
+    *,
+    master_id: int,
+    client_user_id: int,
+) -> dict[datetime, int]:
+    params: dict[str, object] = {
+        "master_id": master_id,
+        "client_user_id": client_user_id,
+        "status": BOOKING_STATUS_ACTIVE,
+    }
+    statement = values_statement(
+        conn,
+        """
+        INSERT INTO bookings (
+            master_id,
+            client_user_id,
+            service_type,
+            slot_start,
+            slot_end,
+            status,
+            manual_client_name
+        )
+        WITH planned (service_type, slot_start, slot_end, manual_client_name) AS (
+            VALUES
+            {values}
+        )
+        SELECT
+            :master_id,
+            :client_user_id,
+            planned.service_type,
+            planned.slot_start,
+            planned.slot_end,
+            :status,
+            planned.manual_client_name
+        FROM planned
+        {slot_free}
+        RETURNING id, slot_start
+        """,
+        "(:service_type_{index}, :slot_start_{index}, :slot_end_{index}, :manual_client_name_{index})",
+        [
+            {
+                "service_type": item.row.service_type,
+                "slot_start": item.slot_start,
+                "slot_end": item.slot_end,
+                "manual_client_name": item.row.client_name,
+            }
+            for item in batch
+        ],
+        slot_free=booking_slot_free_condition(
+            master_id=":master_id",
+            slot_start="planned.slot_start",
+            slot_end="planned.slot_end",
+        ),
+    )
+    rows = conn.execute(
+        statement.execution_options(query_name="manual_import_insert"),
+        params,
+    ).mappings().all()
+    if len(rows) < len(batch):
+        raise _ImportSlotTaken()
+    # Accepted rows never overlap each other, so the start names a row within the master.
+    return {_as_datetime(row["slot_start"]): int(row["id"]) for row in rows}
+
+
+def _read_json_records(content: str) -> list[object]:
+    try:
+        payload = json.loads(content)
+    except json.JSONDecodeError as exc:
+        raise ManualBookingImportError("invalid JSON") from exc
+    if isinstance(payload, dict):
+        payload = payload.get("bookings")
+    if not isinstance(payload, list):
+        raise ManualBookingImportError("expected a list of bookings")
+    return payload
+
+
+def _read_csv_records(content: str) -> list[object]:
+    sample = content[:4096]
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.DictReader(io.StringIO(content), dialect=dialect)
+    if reader.fieldnames is None:
+        return []
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    if not set(_IMPORT_FIELDS).issubset(reader.fieldnames):
+        raise ManualBookingImportError("missing CSV columns")
+    # Blank lines in spreadsheet exports are not rows.
+    return [record for record in reader if any(isinstance(value, str) and value.strip() for value in record.values())]
+
+
+def _coerce_record(row_number: int, record: object) -> tuple[ManualImportRow | None, str | None]:
+    """Return the row, or None with the message key explaining why it was rejected."""
+    if not isinstance(record, dict):
+        return None, "manual_import_invalid_row"
+    values = {field: record.get(field) for field in _IMPORT_FIELDS}
+    if not all(isinstance(value, str) for value in values.values()):
+        return None, "manual_import_invalid_row"
+    client_name = values["client_name"].strip()
+    if not client_name:
+        return None, "manual_booking_client_required"
+    if len(client_name) > _MANUAL_CLIENT_NAME_MAX_LENGTH:
+        return None, "manual_booking_client_too_long"
+    try:
+        slot_start = datetime.fromisoformat(values["slot_start"].strip())
+    except ValueError:
+        return None, "manual_import_invalid_row"
+    if slot_start.tzinfo is None:
+        slot_start = get_business_calendar().combine(slot_start.date(), slot_start.time())
+    row = ManualImportRow(
+        row_number=row_number,
+        client_name=client_name,
+        service_type=values["service_type"].strip(),
+        slot_start=slot_start,
+    )
+    return row, None
+
+
+def _business_date(value: datetime) -> date:
+    return get_business_calendar().business_date(value)
+
+
+def _as_datetime(value: datetime | str) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return normalize_utc(value)
+
+
+def _as_time(value: time | str) -> time:
+    if isinstance(value, time):
+        return value
+    return time.fromisoformat(value)
@@ -7,6 +7,10 @@ from datetime import time
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from app.booking.occupancy_cache import invalidate_day_occupancy_on_commit
+from app.booking.roster_cache import invalidate_master_roster_on_commit
+from app.db.timeouts import OPERATION_ADMIN_WRITE, begin_operation
+
 _MASTER_WORK_START = time(10, 0)
 _MASTER_WORK_END = time(21, 0)
 _MASTER_LUNCH_START = time(13, 0)
@@ -102,7 +106,7 @@ class MasterAdminService:
             ]
 
     def add_master(self, *, telegram_user_id: int) -> MasterAdminResult:
-        with self._engine.begin() as conn:
+        with begin_operation(self._engine, OPERATION_ADMIN_WRITE) as conn:
             master_role_id = conn.execute(text("SELECT id FROM roles WHERE name = 'Master'")).scalar_one_or_none()
             if master_role_id is None:
                 return MasterAdminResult(
@@ -192,6 +196,7 @@ class MasterAdminService:
                         "lunch_end": _MASTER_LUNCH_END,
                     },
                 )
+                invalidate_master_roster_on_commit(conn)
                 return MasterAdminResult(
                     applied=True,
                     message=f"Мастер {telegram_user_id} добавлен.",
@@ -217,6 +222,7 @@ class MasterAdminService:
                 ),
                 {"master_id": int(master["id"])}
             )
+            invalidate_master_roster_on_commit(conn)
             return MasterAdminResult(
                 applied=True,
                 message=f"Мастер {telegram_user_id} добавлен.",
@@ -288,7 +294,7 @@ class MasterAdminService:
                 reason="bootstrap_blocked",
             )
 
-        with self._engine.begin() as conn:
+        with begin_operation(self._engine, OPERATION_ADMIN_WRITE) as conn:
             row = conn.execute(
                 text(
                     """
@@ -327,6 +333,8 @@ class MasterAdminService:
                 ),
                 {"master_id": int(row["master_id"])}
             )
+            invalidate_day_occupancy_on_commit(conn, (int(row["master_id"]),))
+            invalidate_master_roster_on_commit(conn)
             return MasterAdminResult(
                 applied=True,
                 message=f"Мастер {telegram_user_id} удален из активных.",
@@ -349,7 +357,7 @@ class MasterAdminService:
                 reason="invalid_display_name_format",
             )
 
-        with self._engine.begin() as conn:
+        with begin_operation(self._engine, OPERATION_ADMIN_WRITE) as conn:
             row = conn.execute(
                 text(
                     """
@@ -393,6 +401,7 @@ class MasterAdminService:
                     "master_id": int(row["master_id"]),
                 },
             )
+            invalidate_master_roster_on_commit(conn)
             return MasterAdminResult(
                 applied=True,
                 message=f"Имя мастера {telegram_user_id} обновлено: {display_name}.",
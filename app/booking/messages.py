@@ -3,6 +3,9 @@ RU_BOOKING_MESSAGES = {
     "cancelled": "Запись успешно отменена.",
     "cancel_not_allowed": "Эту запись нельзя отменить.",
     "cancel_reason_required": "Укажите причину отмены.",
+    "cancel_range_done": "Отменено записей: {count}. Клиенты получат уведомления.",
+    "cancel_range_empty": "В выбранном интервале нет активных записей.",
+    "cancel_range_invalid_interval": "Некорректный интервал отмены.",
     "invalid_service_type": "Недопустимый тип услуги.",
     "master_not_found": "Мастер не найден.",
     "slot_not_available": "Выбранный слот недоступен.",
@@ -12,6 +15,8 @@ RU_BOOKING_MESSAGES = {
     "choose_master": "Выберите мастера.",
     "choose_service": "Выберите услугу.",
     "choose_slot": "Выберите доступный слот.",
+    "choose_earliest_slot": "Ближайшие свободные слоты у всех мастеров. Выберите подходящий.",
+    "no_free_slots": "В ближайшие дни свободных слотов нет.",
     "booking_confirmed_client": "Запись подтверждена.",
     "booking_confirmed_master": "Новая запись клиента добавлена в расписание.",
     "booking_cancelled_client": "Ваша запись отменена.",
@@ -25,6 +30,10 @@ RU_BOOKING_MESSAGES = {
     "day_off_invalid_interval": "Некорректный интервал выходного.",
     "day_off_not_found": "Выходной интервал не найден.",
     "day_off_reason_default": "master_day_off",
+    "day_off_bulk_created": "Выходные сохранены: {count}.",
+    "day_off_bulk_empty": "Укажите хотя бы один интервал выходных.",
+    "day_off_bulk_too_many": "Слишком много интервалов выходных (максимум {limit}).",
+    "day_off_recurrence_too_long": "Слишком длинный период повторения выходных (максимум {limit} дней).",
     "lunch_updated": "Обеденный перерыв обновлен.",
     "lunch_invalid_interval": "Некорректный интервал обеда.",
     "lunch_invalid_duration": "Длительность обеда должна быть 60 минут.",
@@ -33,4 +42,17 @@ RU_BOOKING_MESSAGES = {
     "manual_booking_conflict": "Слот для ручной записи недоступен.",
     "manual_booking_client_required": "Укажите клиента для ручной записи.",
     "manual_booking_client_too_long": "Слишком длинное имя клиента для ручной записи.",
+    "group_booking_created": "Групповая запись создана.",
+    "group_booking_empty": "Добавьте хотя бы одного участника.",
+    "booking_confirmed_group_master": "Новые записи группы добавлены в расписание.",
+    "manual_import_completed": "Импорт ручных записей: создано {accepted}, отклонено {rejected}.",
+    "manual_import_checked": "Проверка импорта: можно создать {accepted}, отклонено {rejected}.",
+    "manual_import_row_valid": "Запись можно создать.",
+    "manual_import_invalid_row": "Строка не распознана: нужны slot_start, service_type и client_name.",
+    "manual_import_invalid_file": "Не удалось прочитать файл импорта. Нужен CSV или JSON с полями slot_start, service_type, client_name.",
+    "manual_import_file_too_large": "Файл импорта слишком большой.",
+    "manual_import_empty": "В файле импорта нет записей.",
+    "manual_import_too_many_rows": "Слишком много строк в файле импорта (максимум {limit}).",
+    "manual_import_retry": "Расписание изменилось во время импорта, записи не созданы. Повторите импорт.",
+    "database_busy": "Сервис временно перегружен. Повторите через несколько секунд.",
 }
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.booking.availability import AvailabilityService
+from app.booking.guardrails import is_slot_start_allowed
+from app.booking.service_options import (
+    DEFAULT_SLOT_STEP_MINUTES,
+    SERVICE_OPTION_DURATION_MINUTES,
+    load_service_catalog,
+)
+from app.db.bridge import ConnectionBoundEngine
+from app.db.routing import route_read
+from app.db.timeouts import (
+    OPERATION_ADMIN_WRITE,
+    OPERATION_INTERACTIVE_READ,
+    begin_operation,
+    connect_operation,
+    run_after_commit,
+)
+from app.observability import emit_event
+from app.timezone import business_date, normalize_utc, utc_now
+
+NEXT_FREE_SLOT_RECONCILE_SECONDS_ENV = "NEXT_FREE_SLOT_RECONCILE_SECONDS"
+NEXT_FREE_SLOT_HORIZON_DAYS = 14
+
+_NEXT_FREE_SLOT_RECONCILE_SECONDS_DEFAULT = 300.0
+
+_PENDING_LOCK = Lock()
+_PENDING: dict[int, list[_PendingChange]] = {}
+
+
+@dataclass(frozen=True)
+class _PendingChange:
+    start_at: datetime | None
+    end_at: datetime | None
+    freed: bool
+
+
+def resolve_next_free_slot_reconcile_seconds() -> float:
+    raw_value = (os.getenv(NEXT_FREE_SLOT_RECONCILE_SECONDS_ENV) or "").strip()
+    if not raw_value:
+        return _NEXT_FREE_SLOT_RECONCILE_SECONDS_DEFAULT
+    try:
+        value = float(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"{NEXT_FREE_SLOT_RECONCILE_SECONDS_ENV} must be a number, got {raw_value!r}") from exc
+    if value <= 0:
+        raise ValueError(f"{NEXT_FREE_SLOT_RECONCILE_SECONDS_ENV} must be > 0, got {value}")
+    return value
+
+
+class NextFreeSlotService:
+    """Maintains `master_next_free_slot`: each active master's earliest free slot for the shortest service.
+
+    Writers queue the master after their transaction commits and the background worker applies
+    the queue (`refresh_pending`), recomputing a row only when the change can move the stored
+    slot; `reconcile` recomputes every row so slots that slid into the past or missed a refresh
+    converge within one interval.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self._engine = engine
+
+    def list_next_free_slots(self, now: datetime | None = None) -> dict[int, datetime]:
+        """Return stored next free slot starts by master id; stale or unreadable rows are omitted."""
+        now_utc = normalize_utc(now) if now is not None else utc_now()
+        try:
+            with connect_operation(route_read(self._engine), OPERATION_INTERACTIVE_READ) as conn:
+                rows = conn.execute(
+                    text(
+                        """
+                        SELECT master_id, slot_start
+                        FROM master_next_free_slot
+                        WHERE slot_start IS NOT NULL
+                        """
+                    ).execution_options(query_name="next_free_slots")
+                ).mappings()
+                starts = {int(row["master_id"]): _as_datetime(row["slot_start"]) for row in rows}
+        except SQLAlchemyError as exc:
+            emit_event("next_free_slot_read_failed", error=str(exc))
+            return {}
+        return {
+            master_id: slot_start
+            for master_id, slot_start in starts.items()
+            if slot_start > now_utc
+            and is_slot_start_allowed(slot_start=slot_start, now=now_utc, slot_step_minutes=DEFAULT_SLOT_STEP_MINUTES)
+        }
+
+    def refresh(
+        self,
+        master_id: int,
+        *,
+        start_at: datetime | None = None,
+        end_at: datetime | None = None,
+        freed: bool = False,
+        now: datetime | None = None,
+    ) -> bool:
+        """Recompute the master's row if a change to [start_at, end_at) can move it; returns True if recomputed.
+
+        Without a range the row is always recomputed.
+        """
+        now_utc = normalize_utc(now) if now is not None else utc_now()
+        with begin_operation(self._engine, OPERATION_ADMIN_WRITE) as conn:
+            stored = _lock_row(conn, master_id)
+            if stored is not None and start_at is not None and end_at is not None:
+                if not _change_affects_slot(stored, start_at=start_at, end_at=end_at, freed=freed, now=now_utc):
+                    return False
+            _refresh_locked(conn, master_id, now=now_utc)
+        return True
+
+    def refresh_pending(self, now: datetime | None = None) -> int:
+        """Apply changes queued by `refresh_next_free_slot_on_commit`; returns masters recomputed."""
+        with _PENDING_LOCK:
+            pending = dict(_PENDING)
+            _PENDING.clear()
+        refreshed = 0
+        for master_id, changes in pending.items():
+            try:
+                for change in changes:
+                    # A recompute reads current state, so it already covers the remaining changes.
+                    if self.refresh(
+                        master_id,
+                        start_at=change.start_at,
+                        end_at=change.end_at,
+                        freed=change.freed,
+                        now=now,
+                    ):
+                        refreshed += 1
+                        break
+            except Exception as exc:  # noqa: BLE001
+                emit_event("next_free_slot_refresh_failed", master_id=master_id, error=str(exc))
+        return refreshed
+
+    def reconcile(self, now: datetime | None = None) -> int:
+        """Recompute every active master's row and drop rows of inactive masters; returns rows refreshed."""
+        with _PENDING_LOCK:
+            _PENDING.clear()
+        with connect_operation(self._engine, OPERATION_INTERACTIVE_READ) as conn:
+            master_ids = [
+                int(master_id)
+                for master_id in conn.execute(
+                    text("SELECT id FROM masters WHERE is_active = true ORDER BY id").execution_options(
+                        query_name="next_free_slot_masters"
+                    )
+                ).scalars()
+            ]
+        with begin_operation(self._engine, OPERATION_ADMIN_WRITE) as conn:
+            conn.execute(
+                text(
+                    """
+                    DELETE FROM master_next_free_slot
+                    WHERE master_id NOT IN (SELECT id FROM masters WHERE is_active = true)
+                    """
+                )
+            )
+        for master_id in master_ids:
+            self.refresh(master_id, now=now)
+        return len(master_ids)
+
+
+def refresh_next_free_slot_on_commit(
+    conn: Connection,
+    master_id: int,
+    *,
+    start_at: datetime | None = None,
+    end_at: datetime | None = None,
+    freed: bool = False,
+) -> None:
+    """Queue the master for `NextFreeSlotService.refresh_pending` once the surrounding `begin_operation` commits.
+
+    The refresh runs off the request path, so writers keep their statement and connection budget.
+    """
+    change = _PendingChange(start_at=start_at, end_at=end_at, freed=freed)
+
+    def _enqueue() -> None:
+        with _PENDING_LOCK:
+            _PENDING.setdefault(master_id, []).append(change)
+
+    run_after_commit(conn, _enqueue)
+
+
+def _change_affects_slot(
+    stored: tuple[datetime | None, datetime | None],
+    *,
+    start_at: datetime,
+    end_at: datetime,
+    freed: bool,
+    now: datetime,
+) -> bool:
+    slot_start, slot_end = stored
+    if slot_start is not None and slot_start <= now:
+        return True
+    if slot_start is None or slot_end is None:
+        # Nothing free in the horizon: only freed time can change that.
+        return freed
+    if freed:
+        # Freed time can only open an earlier slot if it starts before the stored one ends.
+        return normalize_utc(start_at) < slot_end
+    return normalize_utc(start_at) < slot_end and slot_start < normalize_utc(end_at)
+
+
+def _lock_row(conn: Connection, master_id: int) -> tuple[datetime | None, datetime | None] | None:
+    """Lock the master's row and return (slot_start, slot_end); None when the row is new."""
+    # Row locks are PostgreSQL-only; SQLite serializes writers on the database file anyway.
+    lock_rows = conn.dialect.name == "postgresql"
+    if lock_rows:
+        statement = text(
+            """
+            SELECT slot_start, slot_end
+            FROM master_next_free_slot
+            WHERE master_id = :master_id
+            FOR UPDATE
+            """
+        )
+    else:
+        statement = text(
+            """
+            SELECT slot_start, slot_end
+            FROM master_next_free_slot
+            WHERE master_id = :master_id
+            """
+        )
+    row = conn.execute(
+        statement.execution_options(query_name="next_free_slot_lock"),
+        {"master_id": master_id},
+    ).mappings().first()
+    if row is not None:
+        return _as_optional_datetime(row["slot_start"]), _as_optional_datetime(row["slot_end"])
+    conn.execute(
+        text(
+            """
+            INSERT INTO master_next_free_slot (master_id, slot_start, slot_end)
+            VALUES (:master_id, NULL, NULL)
+            ON CONFLICT (master_id) DO NOTHING
+            """
+        ),
+        {"master_id": master_id},
+    )
+    if lock_rows:
+        conn.execute(
+            text("SELECT master_id FROM master_next_free_slot WHERE master_id = :master_id FOR UPDATE"),
+            {"master_id": master_id},
+        )
+    return None
+
+
+def _refresh_locked(conn: Connection, master_id: int, *, now: datetime) -> None:
+    durations = load_service_catalog(conn) or SERVICE_OPTION_DURATION_MINUTES
+    service_type = min(durations, key=lambda code: (durations[code], code))
+    slot = AvailabilityService(ConnectionBoundEngine(conn)).find_first_free_slot(  # type: ignore[arg-type]
+        master_id,
+        service_type,
+        business_date(now),
+        NEXT_FREE_SLOT_HORIZON_DAYS,
+        now=now,
+    )
+    conn.execute(
+        text(
+            """
+            UPDATE master_next_free_slot
+            SET slot_start = :slot_start,
+                slot_end = :slot_end,
+                computed_at = :computed_at
+            WHERE master_id = :master_id
+            """
+        ),
+        {
+            "master_id": master_id,
+            "slot_start": slot.start_at if slot is not None else None,
+            "slot_end": slot.end_at if slot is not None else None,
+            "computed_at": now,
+        },
+    )
+
+
+def _as_optional_datetime(value: datetime | str | None) -> datetime | None:
+    if value is None:
+        return None
+    return _as_datetime(value)
+
+
+def _as_datetime(value: datetime | str) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return normalize_utc(value)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from threading import Lock
+from time import monotonic
+from typing import Callable, Iterable
+from weakref import WeakKeyDictionary
+
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.routing import mark_recent_write
+from app.db.session import database_cache_key
+from app.db.timeouts import run_after_commit
+from app.observability import observe_cache_event
+from app.timezone import business_date
+
+AVAILABILITY_CACHE_TTL_SECONDS_ENV = "AVAILABILITY_CACHE_TTL_SECONDS"
+AVAILABILITY_CACHE_MAX_ENTRIES_ENV = "AVAILABILITY_CACHE_MAX_ENTRIES"
+
+_AVAILABILITY_CACHE_TTL_SECONDS_DEFAULT = 30.0
+_AVAILABILITY_CACHE_MAX_ENTRIES_DEFAULT = 4096
+_CACHE_NAME = "availability_day"
+
+_CACHES_LOCK = Lock()
+_CACHES: dict[str, DayOccupancyCache | None] = {}
+_PRIVATE_CACHES: WeakKeyDictionary[Engine, DayOccupancyCache | None] = WeakKeyDictionary()
+
+
+class DayOccupancyCache:
+    """Bounded LRU/TTL cache of occupancy per (master, business date).
+
+    Writers invalidate after their transaction commits. Every invalidation bumps the master's
+    generation and `put` drops values loaded under an older one, so a read that raced a write
+    cannot put pre-write rows back into the cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = _AVAILABILITY_CACHE_TTL_SECONDS_DEFAULT,
+        max_entries: int = _AVAILABILITY_CACHE_MAX_ENTRIES_DEFAULT,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: OrderedDict[tuple[int, date], tuple[float, object]] = OrderedDict()
+        self._generations: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generation(self, master_id: int) -> int:
+        with self._lock:
+            return self._generations.get(master_id, 0)
+
+    def get(self, master_id: int, on_date: date) -> object | None:
+        key = (master_id, on_date)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        observe_cache_event(_CACHE_NAME, "hit" if entry is not None else "miss")
+        return entry[1] if entry is not None else None
+
+    def put(self, master_id: int, on_date: date, value: object, *, generation: int) -> None:
+        key = (master_id, on_date)
+        evicted = 0
+        with self._lock:
+            if self._generations.get(master_id, 0) != generation:
+                return
+            self._entries[key] = (self._clock() + self._ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        for _ in range(evicted):
+            observe_cache_event(_CACHE_NAME, "eviction")
+
+    def invalidate(self, master_id: int, dates: Iterable[date] | None = None) -> None:
+        with self._lock:
+            self._generations[master_id] = self._generations.get(master_id, 0) + 1
+            if dates is None:
+                keys = [key for key in self._entries if key[0] == master_id]
+            else:
+                keys = [(master_id, on_date) for on_date in dates]
+            for key in keys:
+                self._entries.pop(key, None)
+        observe_cache_event(_CACHE_NAME, "invalidation")
+
+
+def _read_env(name: str, default: float) -> float:
+    raw_value = (os.getenv(name) or "").strip()
+    if not raw_value:
+        return default
+    try:
+        value = float(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be a number, got {raw_value!r}") from exc
+    if value < 0:
+        raise ValueError(f"{name} must be >= 0, got {value}")
+    return value
+
+
+def build_day_occupancy_cache() -> DayOccupancyCache | None:
+    """Build a cache from env settings; `AVAILABILITY_CACHE_TTL_SECONDS=0` disables caching."""
+    ttl_seconds = _read_env(AVAILABILITY_CACHE_TTL_SECONDS_ENV, _AVAILABILITY_CACHE_TTL_SECONDS_DEFAULT)
+    max_entries = int(_read_env(AVAILABILITY_CACHE_MAX_ENTRIES_ENV, _AVAILABILITY_CACHE_MAX_ENTRIES_DEFAULT))
+    if ttl_seconds == 0 or max_entries == 0:
+        return None
+    return DayOccupancyCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+
+def get_day_occupancy_cache(engine: Engine) -> DayOccupancyCache | None:
+    """Return the cache shared by every engine on the same database (see `database_cache_key`)."""
+    key = database_cache_key(engine)
+    caches: dict | WeakKeyDictionary = _CACHES if isinstance(key, str) else _PRIVATE_CACHES
+    with _CACHES_LOCK:
+        if key not in caches:
+            caches[key] = build_day_occupancy_cache()
+        return caches[key]
+
+
+def invalidate_day_occupancy(
+    engine: Engine,
+    master_ids: Iterable[int | None],
+    *,
+    start_at: datetime | None = None,
+    end_at: datetime | None = None,
+) -> None:
+    """Drop cached occupancy for the business days touched by [start_at, end_at), or all days.
+
+    Masters are first pinned to the primary for the read-your-writes window, so a reload right
+    after invalidation cannot be served by a replica that has not replayed the write yet.
+    """
+    affected = [master_id for master_id in master_ids if master_id is not None]
+    mark_recent_write(master_ids=affected)
+    cache = get_day_occupancy_cache(engine)
+    if cache is None:
+        return
+    dates = _business_dates(start_at, end_at) if start_at is not None and end_at is not None else None
+    for master_id in affected:
+        cache.invalidate(master_id, dates)
+
+
+def invalidate_day_occupancy_on_commit(
+    conn: Connection,
+    master_ids: Iterable[int | None],
+    *,
+    start_at: datetime | None = None,
+    end_at: datetime | None = None,
+) -> None:
+    """Schedule `invalidate_day_occupancy` for after the surrounding `begin_operation` commits."""
+    engine = conn.engine
+    affected = tuple(master_ids)
+    run_after_commit(
+        conn,
+        lambda: invalidate_day_occupancy(engine, affected, start_at=start_at, end_at=end_at),
+    )
+
+
+def _business_dates(start_at: datetime, end_at: datetime) -> list[date]:
+    first_day = business_date(start_at)
+    last_day = business_date(max(end_at - timedelta(microseconds=1), start_at))
+    return [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
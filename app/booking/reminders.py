@@ -6,9 +6,12 @@ from typing import Awaitable, Callable
 
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from app.booking.service_options import SERVICE_OPTION_LABELS_RU
-from app.timezone import normalize_utc, to_business
+from app.db.bridge import run_on_async_connection
+from app.db.timeouts import OPERATION_REMINDER_WORKER, begin_operation
+from app.timezone import get_business_calendar, normalize_utc, to_business
 
 REMINDER_STATUS_PENDING = "pending"
 REMINDER_STATUS_SENT = "sent"
@@ -50,33 +53,25 @@ class BookingReminderService:
             else REMINDER_STATUS_SKIPPED
         )
         try:
-            with self._engine.begin() as conn:
-                existing = conn.execute(
-                    text(
-                        """
-                        SELECT status
-                        FROM booking_reminders
-                        WHERE booking_id = :booking_id
-                        """
-                    ),
-                    {"booking_id": booking_id},
-                ).first()
-                if existing is not None:
-                    return REMINDER_OUTCOME_REPLAYED
-
-                conn.execute(
+            # The savepoint keeps a failed insert from aborting a caller's transaction (confirm joins one).
+            with self._engine.begin() as conn, conn.begin_nested():
+                inserted = conn.execute(
                     text(
                         """
                         INSERT INTO booking_reminders (booking_id, due_at, status)
                         VALUES (:booking_id, :due_at, :status)
+                        ON CONFLICT (booking_id) DO NOTHING
+                        RETURNING id
                         """
-                    ),
+                    ).execution_options(query_name="booking_reminder_insert"),
                     {
                         "booking_id": booking_id,
                         "due_at": due_at_utc,
                         "status": status,
                     },
-                )
+                ).first()
+                if inserted is None:
+                    return REMINDER_OUTCOME_REPLAYED
                 return REMINDER_OUTCOME_SCHEDULED if status == REMINDER_STATUS_PENDING else REMINDER_OUTCOME_SKIPPED
         except Exception:
             return REMINDER_OUTCOME_FAILED
@@ -89,20 +84,18 @@ class BookingReminderService:
         limit: int = 50,
     ) -> dict[str, int]:
         now_utc = normalize_utc(now or datetime.now(UTC))
-        outcomes = {"sent": 0, "failed": 0, "replayed": 0}
         due = self._claim_due(now=now_utc, limit=limit)
-        for item in due:
-            try:
-                await sender(item.recipient_telegram_user_id, item.message)
-                self._mark_sent(reminder_id=item.reminder_id, sent_at=now_utc)
-                outcomes["sent"] += 1
-            except Exception as exc:
-                self._mark_failed(reminder_id=item.reminder_id, error=str(exc))
-                outcomes["failed"] += 1
-        return outcomes
+
+        async def mark_sent(reminder_id: int) -> None:
+            self._mark_sent(reminder_id=reminder_id, sent_at=now_utc)
+
+        async def mark_failed(reminder_id: int, error: str) -> None:
+            self._mark_failed(reminder_id=reminder_id, error=error)
+
+        return await _deliver_due_reminders(due, sender=sender, mark_sent=mark_sent, mark_failed=mark_failed)
 
     def _claim_due(self, *, now: datetime, limit: int) -> list[ReminderDispatchItem]:
-        with self._engine.begin() as conn:
+        with begin_operation(self._engine, OPERATION_REMINDER_WORKER) as conn:
             rows = conn.execute(
                 text(
                     """
@@ -123,7 +116,7 @@ class BookingReminderService:
                     ORDER BY br.due_at, br.id
                     LIMIT :limit
                     """
-                ),
+                ).execution_options(query_name="booking_reminder_claim_due"),
                 {
                     "status_pending": REMINDER_STATUS_PENDING,
                     "now_at": now,
@@ -147,7 +140,7 @@ class BookingReminderService:
             return items
 
     def _mark_sent(self, *, reminder_id: int, sent_at: datetime) -> None:
-        with self._engine.begin() as conn:
+        with begin_operation(self._engine, OPERATION_REMINDER_WORKER) as conn:
             conn.execute(
                 text(
                     """
@@ -168,7 +161,7 @@ class BookingReminderService:
             )
 
     def _mark_failed(self, *, reminder_id: int, error: str) -> None:
-        with self._engine.begin() as conn:
+        with begin_operation(self._engine, OPERATION_REMINDER_WORKER) as conn:
             conn.execute(
                 text(
                     """
@@ -188,9 +181,61 @@ class BookingReminderService:
             )
 
 
+class AsyncBookingReminderService:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def dispatch_due_reminders(
+        self,
+        *,
+        sender: Callable[[int, str], Awaitable[None]],
+        now: datetime | None = None,
+        limit: int = 50,
+    ) -> dict[str, int]:
+        now_utc = normalize_utc(now or datetime.now(UTC))
+        due = await run_on_async_connection(
+            self._engine,
+            lambda engine: BookingReminderService(engine)._claim_due(now=now_utc, limit=limit),
+        )
+
+        async def mark_sent(reminder_id: int) -> None:
+            await run_on_async_connection(
+                self._engine,
+                lambda engine: BookingReminderService(engine)._mark_sent(reminder_id=reminder_id, sent_at=now_utc),
+            )
+
+        async def mark_failed(reminder_id: int, error: str) -> None:
+            await run_on_async_connection(
+                self._engine,
+                lambda engine: BookingReminderService(engine)._mark_failed(reminder_id=reminder_id, error=error),
+            )
+
+        return await _deliver_due_reminders(due, sender=sender, mark_sent=mark_sent, mark_failed=mark_failed)
+
+
+async def _deliver_due_reminders(
+    due: list[ReminderDispatchItem],
+    *,
+    sender: Callable[[int, str], Awaitable[None]],
+    mark_sent: Callable[[int], Awaitable[None]],
+    mark_failed: Callable[[int, str], Awaitable[None]],
+) -> dict[str, int]:
+    outcomes = {"sent": 0, "failed": 0, "replayed": 0}
+    for item in due:
+        try:
+            await sender(item.recipient_telegram_user_id, item.message)
+            await mark_sent(item.reminder_id)
+            outcomes["sent"] += 1
+        except Exception as exc:
+            await mark_failed(item.reminder_id, str(exc))
+            outcomes["failed"] += 1
+    return outcomes
+
+
 def is_reminder_eligible(*, slot_start: datetime, booking_created_at: datetime) -> bool:
-    slot_business = to_business(normalize_utc(slot_start))
-    created_business = to_business(normalize_utc(booking_created_at))
+    calendar = get_business_calendar()
+    slot_business = calendar.to_business(slot_start)
+    created_business = calendar.to_business(booking_created_at)
     return (slot_business - created_business) >= timedelta(hours=REMINDER_LEAD_HOURS)
 
 
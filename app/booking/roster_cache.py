@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import Callable
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.routing import mark_recent_write, route_read
+from app.db.session import database_cache_key
+from app.db.timeouts import OPERATION_INTERACTIVE_READ, connect_operation, run_after_commit
+from app.observability import observe_cache_event
+
+MASTER_ROSTER_CACHE_TTL_SECONDS_ENV = "MASTER_ROSTER_CACHE_TTL_SECONDS"
+MASTER_ROSTER_READ_SCOPE = "master_roster"
+
+_MASTER_ROSTER_CACHE_TTL_SECONDS_DEFAULT = 60.0
+_CACHE_NAME = "master_roster"
+
+_ROSTERS_LOCK = Lock()
+_ROSTERS: dict[str, MasterRosterCache] = {}
+_PRIVATE_ROSTERS: WeakKeyDictionary[Engine, MasterRosterCache] = WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class RosterMaster:
+    id: int
+    display_name: str
+    telegram_user_id: int
+
+
+class MasterRosterCache:
+    """Active masters keyed by id, reloaded after admin writes or once the TTL passes.
+
+    Invalidation bumps a generation and `store` drops rosters loaded under an older one, so a
+    load that raced an admin write cannot keep the pre-write roster alive until the TTL.
+    """
+
+    def __init__(self, *, ttl_seconds: float, clock: Callable[[], float] = monotonic) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._generation = 0
+        self._entry: tuple[float, dict[int, RosterMaster]] | None = None
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def get(self) -> dict[int, RosterMaster] | None:
+        with self._lock:
+            entry = self._entry
+            if entry is not None and entry[0] <= self._clock():
+                self._entry = entry = None
+        observe_cache_event(_CACHE_NAME, "hit" if entry is not None else "miss")
+        return entry[1] if entry is not None else None
+
+    def store(self, roster: dict[int, RosterMaster], *, generation: int) -> None:
+        if self._ttl_seconds <= 0:
+            return
+        with self._lock:
+            if generation == self._generation:
+                self._entry = (self._clock() + self._ttl_seconds, roster)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entry = None
+        observe_cache_event(_CACHE_NAME, "invalidation")
+
+
+def resolve_master_roster_ttl_seconds() -> float:
+    raw_value = (os.getenv(MASTER_ROSTER_CACHE_TTL_SECONDS_ENV) or "").strip()
+    if not raw_value:
+        return _MASTER_ROSTER_CACHE_TTL_SECONDS_DEFAULT
+    try:
+        value = float(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"{MASTER_ROSTER_CACHE_TTL_SECONDS_ENV} must be a number, got {raw_value!r}") from exc
+    if value < 0:
+        raise ValueError(f"{MASTER_ROSTER_CACHE_TTL_SECONDS_ENV} must be >= 0, got {value}")
+    return value
+
+
+def _roster_cache(engine: Engine) -> MasterRosterCache:
+    key = database_cache_key(engine)
+    rosters: dict | WeakKeyDictionary = _ROSTERS if isinstance(key, str) else _PRIVATE_ROSTERS
+    with _ROSTERS_LOCK:
+        cache = rosters.get(key)
+        if cache is None:
+            cache = rosters[key] = MasterRosterCache(ttl_seconds=resolve_master_roster_ttl_seconds())
+        return cache
+
+
+def get_master_roster(engine: Engine) -> dict[int, RosterMaster]:
+    """Return active masters by id in id order."""
+    cache = _roster_cache(engine)
+    roster = cache.get()
+    if roster is not None:
+        return roster
+    generation = cache.generation
+    read_engine = route_read(engine, scope=MASTER_ROSTER_READ_SCOPE)
+    with connect_operation(read_engine, OPERATION_INTERACTIVE_READ) as conn:
+        rows = conn.execute(
+            text(
+                """
+                SELECT m.id, m.display_name, u.telegram_user_id
+                FROM masters m
+                JOIN users u ON u.id = m.user_id
+                WHERE m.is_active = true
+                ORDER BY m.id
+                """
+            ).execution_options(query_name="active_masters")
+        ).mappings()
+        roster = {
+            int(row["id"]): RosterMaster(
+                id=int(row["id"]),
+                display_name=str(row["display_name"]),
+                telegram_user_id=int(row["telegram_user_id"]),
+            )
+            for row in rows
+        }
+    cache.store(roster, generation=generation)
+    return roster
+
+
+def invalidate_master_roster(engine: Engine) -> None:
+    """Drop the roster; reloads read the primary for the read-your-writes window first."""
+    mark_recent_write(scopes=(MASTER_ROSTER_READ_SCOPE,))
+    _roster_cache(engine).invalidate()
+
+
+def invalidate_master_roster_on_commit(conn: Connection) -> None:
+    """Schedule `invalidate_master_roster` for after the surrounding `begin_operation` commits."""
+    engine = conn.engine
+    run_after_commit(conn, lambda: invalidate_master_roster(engine))
@@ -1,17 +1,34 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta
 
 from sqlalchemy import text
 from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
 
 from app.booking.contracts import BOOKING_STATUS_ACTIVE
+from app.booking.create_booking import BOOKING_SLOT_FREE_CONDITION, is_booking_overlap_violation
+from app.booking.intervals import BlockedIntervals, DayOccupancy, intervals_overlap, merge_intervals
 from app.booking.messages import RU_BOOKING_MESSAGES
+from app.booking.next_free_slot import refresh_next_free_slot_on_commit
+from app.booking.occupancy_cache import invalidate_day_occupancy_on_commit
 from app.booking.service_options import resolve_service_duration_minutes
-from app.timezone import business_date, combine_business_date_time, normalize_utc
+from app.db.bulk import values_statement
+from app.db.routing import mark_recent_write, route_read
+from app.db.timeouts import (
+    OPERATION_ADMIN_WRITE,
+    OPERATION_BOOKING_WRITE,
+    OPERATION_INTERACTIVE_READ,
+    begin_operation,
+    connect_operation,
+)
+from app.timezone import business_date, combine_business_date_time, get_business_calendar, normalize_utc
 
 BLOCK_TYPE_DAY_OFF = "day_off"
+MASTER_WEEK_VIEW_DAYS = 7
+MASTER_DAY_OFF_BULK_MAX_RANGES = 366
+MASTER_DAY_OFF_RECURRENCE_MAX_DAYS = 366
 
 
 @dataclass(frozen=True)
@@ -27,6 +44,26 @@ class MasterDayOffCommand:
     block_id: int | None = None
 
 
+@dataclass(frozen=True)
+class MasterDayOffRecurrence:
+    """Every business date in [start_date, end_date] whose ISO weekday is listed.
+
+    Without `start_time`/`end_time` the whole business day is blocked.
+    """
+
+    start_date: date
+    end_date: date
+    weekdays: tuple[int, ...]
+    start_time: time | None = None
+    end_time: time | None = None
+
+
+@dataclass(frozen=True)
+class MasterBulkDayOffCommand:
+    ranges: tuple[tuple[datetime, datetime], ...] = ()
+    recurrence: MasterDayOffRecurrence | None = None
+
+
 @dataclass(frozen=True)
 class MasterLunchBreakCommand:
     lunch_start: time
@@ -48,6 +85,14 @@ class MasterDayOffResult:
     message: str
 
 
+@dataclass(frozen=True)
+class MasterBulkDayOffResult:
+    applied: bool
+    block_ids: tuple[int, ...]
+    message: str
+    conflicts: tuple[tuple[datetime, datetime], ...] = ()
+
+
 @dataclass(frozen=True)
 class MasterLunchBreakResult:
     applied: bool
@@ -61,6 +106,33 @@ class MasterManualBookingResult:
     message: str
 
 
+@dataclass(frozen=True)
+class MasterWeekBooking:
+    slot_start: datetime
+    slot_end: datetime
+    service_type: str
+    manual_client_name: str | None
+    client_username: str | None
+    client_phone: str | None
+
+
+@dataclass(frozen=True)
+class MasterWeekDay:
+    on_date: date
+    bookings: tuple[MasterWeekBooking, ...]
+    free_windows: tuple[tuple[datetime, datetime], ...]
+    has_day_off: bool
+
+
+@dataclass(frozen=True)
+class MasterWeekSchedule:
+    master_id: int
+    display_name: str
+    lunch_start: time
+    lunch_end: time
+    days: tuple[MasterWeekDay, ...]
+
+
 class MasterScheduleService:
     def __init__(self, engine: Engine) -> None:
         self._engine = engine
@@ -113,7 +185,8 @@ class MasterScheduleService:
                 message=RU_BOOKING_MESSAGES["master_not_found"],
             )
 
-        with self._engine.begin() as conn:
+        mark_recent_write(telegram_user_ids=(master_telegram_user_id,), master_ids=(context.master_id,))
+        with begin_operation(self._engine, OPERATION_ADMIN_WRITE) as conn:
             if self._has_active_booking_overlap(
                 conn=conn,
                 master_id=context.master_id,
@@ -185,6 +258,9 @@ class MasterScheduleService:
                         block_id=None,
                         message=RU_BOOKING_MESSAGES["day_off_not_found"],
                     )
+                # The previous interval may cover other days, so drop the master's whole cache.
+                invalidate_day_occupancy_on_commit(conn, (context.master_id,))
+                refresh_next_free_slot_on_commit(conn, context.master_id)
                 return MasterDayOffResult(
                     applied=True,
                     created=False,
@@ -208,6 +284,8 @@ class MasterScheduleService:
                     "reason": RU_BOOKING_MESSAGES["day_off_reason_default"],
                 },
             ).scalar_one()
+            invalidate_day_occupancy_on_commit(conn, (context.master_id,), start_at=start_at, end_at=end_at)
+            refresh_next_free_slot_on_commit(conn, context.master_id, start_at=start_at, end_at=end_at)
             return MasterDayOffResult(
                 applied=True,
                 created=True,
@@ -215,6 +293,139 @@ class MasterScheduleService:
                 message=RU_BOOKING_MESSAGES["day_off_created"],
             )
 
+    def create_day_off_blocks(
+        self,
+        *,
+        master_telegram_user_id: int,
+        command: MasterBulkDayOffCommand,
+    ) -> MasterBulkDayOffResult:
+        """Create all day-off blocks of a vacation or recurrence, or none of them.
+
+        Requested ranges are merged first, then checked against one range read of active
+        bookings and existing day-offs and inserted with one multi-row `INSERT ... RETURNING`.
+        """
+        requested = list(command.ranges)
+        if command.recurrence is not None:
+            recurrence_days = (command.recurrence.end_date - command.recurrence.start_date).days + 1
+            if recurrence_days > MASTER_DAY_OFF_RECURRENCE_MAX_DAYS:
+                return MasterBulkDayOffResult(
+                    applied=False,
+                    block_ids=(),
+                    message=RU_BOOKING_MESSAGES["day_off_recurrence_too_long"].format(
+                        limit=MASTER_DAY_OFF_RECURRENCE_MAX_DAYS
+                    ),
+                )
+            expanded = _expand_day_off_recurrence(command.recurrence)
+            if expanded is None:
+                return MasterBulkDayOffResult(
+                    applied=False,
+                    block_ids=(),
+                    message=RU_BOOKING_MESSAGES["day_off_invalid_interval"],
+                )
+            requested.extend(expanded)
+        ranges = [(_to_utc(start_at), _to_utc(end_at)) for start_at, end_at in requested]
+        if any(start_at >= end_at for start_at, end_at in ranges):
+            return MasterBulkDayOffResult(
+                applied=False,
+                block_ids=(),
+                message=RU_BOOKING_MESSAGES["day_off_invalid_interval"],
+            )
+        ranges = merge_intervals(ranges)
+        if not ranges:
+            return MasterBulkDayOffResult(
+                applied=False,
+                block_ids=(),
+                message=RU_BOOKING_MESSAGES["day_off_bulk_empty"],
+            )
+        if len(ranges) > MASTER_DAY_OFF_BULK_MAX_RANGES:
+            return MasterBulkDayOffResult(
+                applied=False,
+                block_ids=(),
+                message=RU_BOOKING_MESSAGES["day_off_bulk_too_many"].format(limit=MASTER_DAY_OFF_BULK_MAX_RANGES),
+            )
+
+        context = self.resolve_context(master_telegram_user_id=master_telegram_user_id)
+        if context is None:
+            return MasterBulkDayOffResult(
+                applied=False,
+                block_ids=(),
+                message=RU_BOOKING_MESSAGES["master_not_found"],
+            )
+
+        window_start = ranges[0][0]
+        window_end = max(end_at for _, end_at in ranges)
+        mark_recent_write(telegram_user_ids=(master_telegram_user_id,), master_ids=(context.master_id,))
+        with begin_operation(self._engine, OPERATION_ADMIN_WRITE) as conn:
+            rows = conn.execute(
+                text(
+                    """
+                    SELECT 'booking' AS kind, slot_start AS busy_start, slot_end AS busy_end
+                    FROM bookings
+                    WHERE master_id = :master_id
+                      AND status = 'active'
+                      AND slot_start < :window_end
+                      AND :window_start < slot_end
+                    UNION ALL
+                    SELECT 'day_off' AS kind, start_at AS busy_start, end_at AS busy_end
+                    FROM availability_blocks
+                    WHERE master_id = :master_id
+                      AND block_type = :block_type
+                      AND start_at < :window_end
+                      AND :window_start < end_at
+                    """
+                ).execution_options(query_name="day_off_bulk_occupancy"),
+                {
+                    "master_id": context.master_id,
+                    "block_type": BLOCK_TYPE_DAY_OFF,
+                    "window_start": window_start,
+                    "window_end": window_end,
+                },
+            ).mappings()
+            busy: dict[str, list[tuple[datetime, datetime]]] = {"booking": [], "day_off": []}
+            for row in rows:
+                busy[str(row["kind"])].append((_as_datetime(row["busy_start"]), _as_datetime(row["busy_end"])))
+
+            for kind, message_key in (("booking", "day_off_has_bookings"), ("day_off", "day_off_conflict")):
+                taken = BlockedIntervals(busy[kind])
+                conflicts = tuple(item for item in ranges if taken.overlaps(*item))
+                if conflicts:
+                    return MasterBulkDayOffResult(
+                        applied=False,
+                        block_ids=(),
+                        message=RU_BOOKING_MESSAGES[message_key],
+                        conflicts=conflicts,
+                    )
+
+            params: dict[str, object] = {
+                "master_id": context.master_id,
+                "block_type": BLOCK_TYPE_DAY_OFF,
+                "reason": RU_BOOKING_MESSAGES["day_off_reason_default"],
+            }
+            statement = values_statement(
+                conn,
+                """
+                INSERT INTO availability_blocks (master_id, block_type, start_at, end_at, reason)
+                VALUES
+                {values}
+                RETURNING id, start_at
+                """,
+                "(:master_id, :block_type, :start_at_{index}, :end_at_{index}, :reason)",
+                [{"start_at": start_at, "end_at": end_at} for start_at, end_at in ranges],
+            )
+            created = conn.execute(
+                statement.execution_options(query_name="day_off_bulk_insert"),
+                params,
+            ).mappings().all()
+            # Merged ranges are disjoint, so the start names a row.
+            block_ids = {_as_datetime(row["start_at"]): int(row["id"]) for row in created}
+            invalidate_day_occupancy_on_commit(conn, (context.master_id,), start_at=window_start, end_at=window_end)
+            refresh_next_free_slot_on_commit(conn, context.master_id, start_at=window_start, end_at=window_end)
+            return MasterBulkDayOffResult(
+                applied=True,
+                block_ids=tuple(block_ids[start_at] for start_at, _ in ranges),
+                message=RU_BOOKING_MESSAGES["day_off_bulk_created"].format(count=len(ranges)),
+            )
+
     def _has_active_booking_overlap(
         self,
         *,
@@ -271,7 +482,8 @@ class MasterScheduleService:
                 message=RU_BOOKING_MESSAGES["master_not_found"],
             )
 
-        with self._engine.begin() as conn:
+        mark_recent_write(telegram_user_ids=(master_telegram_user_id,), master_ids=(context.master_id,))
+        with begin_operation(self._engine, OPERATION_ADMIN_WRITE) as conn:
             master = conn.execute(
                 text(
                     """
@@ -316,6 +528,8 @@ class MasterScheduleService:
                     applied=False,
                     message=RU_BOOKING_MESSAGES["master_not_found"],
                 )
+            invalidate_day_occupancy_on_commit(conn, (context.master_id,))
+            refresh_next_free_slot_on_commit(conn, context.master_id)
             return MasterLunchBreakResult(
                 applied=True,
                 message=RU_BOOKING_MESSAGES["lunch_updated"],
@@ -350,168 +564,312 @@ class MasterScheduleService:
                 message=RU_BOOKING_MESSAGES["manual_booking_client_too_long"],
             )
 
-        with self._engine.begin() as conn:
-            duration_minutes = resolve_service_duration_minutes(command.service_type, connection=conn)
-            if duration_minutes is None:
-                return MasterManualBookingResult(
-                    applied=False,
-                    booking_id=None,
-                    message=RU_BOOKING_MESSAGES["invalid_service_type"],
-                )
+        mark_recent_write(telegram_user_ids=(master_telegram_user_id,), master_ids=(context.master_id,))
+        try:
+            with begin_operation(self._engine, OPERATION_BOOKING_WRITE) as conn:
+                duration_minutes = resolve_service_duration_minutes(command.service_type, connection=conn)
+                if duration_minutes is None:
+                    return MasterManualBookingResult(
+                        applied=False,
+                        booking_id=None,
+                        message=RU_BOOKING_MESSAGES["invalid_service_type"],
+                    )
 
-            slot_end = slot_start + timedelta(minutes=duration_minutes)
+                slot_end = slot_start + timedelta(minutes=duration_minutes)
 
-            master = conn.execute(
-                text(
-                    """
-                    SELECT work_start, work_end, lunch_start, lunch_end
-                    FROM masters
-                    WHERE id = :master_id
-                    """
-                ),
-                {"master_id": context.master_id},
-            ).mappings().first()
-            if master is None:
-                return MasterManualBookingResult(
-                    applied=False,
-                    booking_id=None,
-                    message=RU_BOOKING_MESSAGES["master_not_found"],
-                )
+                master = conn.execute(
+                    text(
+                        """
+                        SELECT work_start, work_end, lunch_start, lunch_end
+                        FROM masters
+                        WHERE id = :master_id
+                        """
+                    ),
+                    {"master_id": context.master_id},
+                ).mappings().first()
+                if master is None:
+                    return MasterManualBookingResult(
+                        applied=False,
+                        booking_id=None,
+                        message=RU_BOOKING_MESSAGES["master_not_found"],
+                    )
 
-            work_start = _as_time(master["work_start"])
-            work_end = _as_time(master["work_end"])
-            lunch_start = _as_time(master["lunch_start"])
-            lunch_end = _as_time(master["lunch_end"])
+                work_start = _as_time(master["work_start"])
+                work_end = _as_time(master["work_end"])
+                lunch_start = _as_time(master["lunch_start"])
+                lunch_end = _as_time(master["lunch_end"])
 
-            business_slot_date = business_date(slot_start)
-            day_work_start = combine_business_date_time(business_slot_date, work_start)
-            day_work_end = combine_business_date_time(business_slot_date, work_end)
-            day_lunch_start = combine_business_date_time(business_slot_date, lunch_start)
-            day_lunch_end = combine_business_date_time(business_slot_date, lunch_end)
+                business_slot_date = business_date(slot_start)
+                day_work_start = combine_business_date_time(business_slot_date, work_start)
+                day_work_end = combine_business_date_time(business_slot_date, work_end)
+                day_lunch_start = combine_business_date_time(business_slot_date, lunch_start)
+                day_lunch_end = combine_business_date_time(business_slot_date, lunch_end)
 
-            if slot_start < day_work_start or slot_end > day_work_end:
-                return MasterManualBookingResult(
-                    applied=False,
-                    booking_id=None,
-                    message=RU_BOOKING_MESSAGES["slot_not_available"],
-                )
+                if slot_start < day_work_start or slot_end > day_work_end:
+                    return MasterManualBookingResult(
+                        applied=False,
+                        booking_id=None,
+                        message=RU_BOOKING_MESSAGES["slot_not_available"],
+                    )
 
-            if slot_start < day_lunch_end and day_lunch_start < slot_end:
-                return MasterManualBookingResult(
-                    applied=False,
-                    booking_id=None,
-                    message=RU_BOOKING_MESSAGES["slot_not_available"],
-                )
+                if intervals_overlap(
+                    start_at=slot_start,
+                    end_at=slot_end,
+                    other_start=day_lunch_start,
+                    other_end=day_lunch_end,
+                ):
+                    return MasterManualBookingResult(
+                        applied=False,
+                        booking_id=None,
+                        message=RU_BOOKING_MESSAGES["slot_not_available"],
+                    )
 
-            overlaps = conn.execute(
-                text(
-                    """
-                    SELECT 1
-                    FROM bookings
-                    WHERE master_id = :master_id
-                      AND status = 'active'
-                      AND slot_start < :slot_end
-                      AND :slot_start < slot_end
-                    LIMIT 1
-                    """
-                ),
-                {
-                    "master_id": context.master_id,
-                    "slot_start": slot_start,
-                    "slot_end": slot_end,
-                },
-            ).first()
-            if overlaps is not None:
+                manual_client_user_id = ensure_manual_client_user(conn, context.master_id)
+
+                booking_id = conn.execute(
+                    text(
+                        f"""
+                        INSERT INTO bookings (
+                            master_id,
+                            client_user_id,
+                            service_type,
+                            slot_start,
+                            slot_end,
+                            status,
+                            manual_client_name
+                        )
+                        SELECT
+                            :master_id,
+                            :client_user_id,
+                            :service_type,
+                            :slot_start,
+                            :slot_end,
+                            :status,
+                            :manual_client_name
+                        {BOOKING_SLOT_FREE_CONDITION}
+                        RETURNING id
+                        """
+                    ),
+                    {
+                        "master_id": context.master_id,
+                        "client_user_id": manual_client_user_id,
+                        "service_type": command.service_type,
+                        "slot_start": slot_start,
+                        "slot_end": slot_end,
+                        "status": BOOKING_STATUS_ACTIVE,
+                        "manual_client_name": manual_client_name,
+                    },
+                ).scalar_one_or_none()
+                if booking_id is None:
+                    return MasterManualBookingResult(
+                        applied=False,
+                        booking_id=None,
+                        message=RU_BOOKING_MESSAGES["manual_booking_conflict"],
+                    )
+                invalidate_day_occupancy_on_commit(conn, (context.master_id,), start_at=slot_start, end_at=slot_end)
+                refresh_next_free_slot_on_commit(conn, context.master_id, start_at=slot_start, end_at=slot_end)
                 return MasterManualBookingResult(
-                    applied=False,
-                    booking_id=None,
-                    message=RU_BOOKING_MESSAGES["manual_booking_conflict"],
+                    applied=True,
+                    booking_id=int(booking_id),
+                    message=RU_BOOKING_MESSAGES["manual_booking_created"],
                 )
-
-            blocked = conn.execute(
-                text(
-                    """
-                    SELECT 1
-                    FROM availability_blocks
-                    WHERE master_id = :master_id
-                      AND start_at < :slot_end
-                      AND :slot_start < end_at
-                    LIMIT 1
-                    """
-                ),
-                {
-                    "master_id": context.master_id,
-                    "slot_start": slot_start,
-                    "slot_end": slot_end,
-                },
-            ).first()
-            if blocked is not None:
+        except IntegrityError as exc:
+            if is_booking_overlap_violation(exc):
                 return MasterManualBookingResult(
                     applied=False,
                     booking_id=None,
                     message=RU_BOOKING_MESSAGES["manual_booking_conflict"],
                 )
+            raise
 
-            # Manual bookings use a deterministic synthetic client user to satisfy
-            # non-null client FK while preserving master ownership semantics.
-            manual_client_tg = -(9_000_000_000 + context.master_id)
-            conn.execute(
-                text("INSERT INTO roles (name) VALUES ('Client') ON CONFLICT (name) DO NOTHING")
-            )
-            conn.execute(
+    def get_week_schedule(
+        self,
+        *,
+        master_telegram_user_id: int,
+        start_date: date,
+        days: int = MASTER_WEEK_VIEW_DAYS,
+    ) -> MasterWeekSchedule | None:
+        """Return per-day bookings and free windows for `days` dates from one master read and one range read."""
+        calendar = get_business_calendar()
+        dates = [start_date + timedelta(days=offset) for offset in range(max(days, 0))]
+        if not dates:
+            return None
+        range_start, _ = calendar.day_bounds(dates[0])
+        _, range_end = calendar.day_bounds(dates[-1])
+        read_engine = route_read(self._engine, telegram_user_id=master_telegram_user_id)
+        with connect_operation(read_engine, OPERATION_INTERACTIVE_READ) as conn:
+            master = conn.execute(
                 text(
                     """
-                    INSERT INTO users (telegram_user_id, role_id)
-                    VALUES (:telegram_user_id, (SELECT id FROM roles WHERE name='Client'))
-                    ON CONFLICT (telegram_user_id) DO NOTHING
+                    SELECT m.id, m.display_name, m.work_start, m.work_end, m.lunch_start, m.lunch_end
+                    FROM users u
+                    JOIN roles r ON r.id = u.role_id
+                    JOIN masters m ON m.user_id = u.id
+                    WHERE u.telegram_user_id = :master_telegram_user_id
+                      AND r.name = 'Master'
+                      AND m.is_active = true
                     """
-                ),
-                {"telegram_user_id": manual_client_tg},
-            )
-            manual_client_user_id = conn.execute(
-                text("SELECT id FROM users WHERE telegram_user_id = :telegram_user_id"),
-                {"telegram_user_id": manual_client_tg},
-            ).scalar_one()
-
-            booking_id = conn.execute(
+                ).execution_options(query_name="master_week_master"),
+                {"master_telegram_user_id": master_telegram_user_id},
+            ).mappings().first()
+            if master is None:
+                return None
+            rows = conn.execute(
                 text(
                     """
-                    INSERT INTO bookings (
-                        master_id,
-                        client_user_id,
-                        service_type,
-                        slot_start,
-                        slot_end,
-                        status,
-                        manual_client_name
-                    )
-                    VALUES (
-                        :master_id,
-                        :client_user_id,
-                        :service_type,
-                        :slot_start,
-                        :slot_end,
-                        :status,
-                        :manual_client_name
-                    )
-                    RETURNING id
+                    SELECT
+                        'booking' AS kind,
+                        b.slot_start AS start_at,
+                        b.slot_end AS end_at,
+                        b.service_type,
+                        NULL AS block_type,
+                        b.manual_client_name,
+                        COALESCE(b.client_username_snapshot, u.telegram_username) AS client_username,
+                        COALESCE(b.client_phone_snapshot, u.phone_number) AS client_phone
+                    FROM bookings b
+                    LEFT JOIN users u ON u.id = b.client_user_id
+                    WHERE b.master_id = :master_id
+                      AND b.status = :active_status
+                      AND b.slot_start < :range_end
+                      AND b.slot_end > :range_start
+                    UNION ALL
+                    SELECT
+                        'block' AS kind,
+                        ab.start_at,
+                        ab.end_at,
+                        NULL,
+                        ab.block_type,
+                        NULL,
+                        NULL,
+                        NULL
+                    FROM availability_blocks ab
+                    WHERE ab.master_id = :master_id
+                      AND ab.start_at < :range_end
+                      AND ab.end_at > :range_start
+                    ORDER BY start_at
                     """
-                ),
+                ).execution_options(query_name="master_week_occupancy"),
                 {
-                    "master_id": context.master_id,
-                    "client_user_id": int(manual_client_user_id),
-                    "service_type": command.service_type,
-                    "slot_start": slot_start,
-                    "slot_end": slot_end,
-                    "status": BOOKING_STATUS_ACTIVE,
-                    "manual_client_name": manual_client_name,
+                    "master_id": int(master["id"]),
+                    "active_status": BOOKING_STATUS_ACTIVE,
+                    "range_start": range_start,
+                    "range_end": range_end,
                 },
-            ).scalar_one()
-            return MasterManualBookingResult(
-                applied=True,
-                booking_id=int(booking_id),
-                message=RU_BOOKING_MESSAGES["manual_booking_created"],
+            ).mappings().all()
+
+        work_start = _as_time(master["work_start"])
+        work_end = _as_time(master["work_end"])
+        lunch_start = _as_time(master["lunch_start"])
+        lunch_end = _as_time(master["lunch_end"])
+        bookings: list[MasterWeekBooking] = []
+        blocks: list[tuple[datetime, datetime, bool]] = []
+        for row in rows:
+            start_at = _as_datetime(row["start_at"])
+            end_at = _as_datetime(row["end_at"])
+            if row["kind"] == "booking":
+                bookings.append(
+                    MasterWeekBooking(
+                        slot_start=start_at,
+                        slot_end=end_at,
+                        service_type=str(row["service_type"]),
+                        manual_client_name=row["manual_client_name"],
+                        client_username=row["client_username"],
+                        client_phone=row["client_phone"],
+                    )
+                )
+            else:
+                blocks.append((start_at, end_at, row["block_type"] == BLOCK_TYPE_DAY_OFF))
+
+        week: list[MasterWeekDay] = []
+        for on_date in dates:
+            day_start, day_end = calendar.day_bounds(on_date)
+            day_bookings = tuple(item for item in bookings if day_start <= item.slot_start < day_end)
+            day_blocks = [item for item in blocks if item[0] < day_end and day_start < item[1]]
+            occupancy = DayOccupancy.for_business_date(
+                on_date,
+                [(item.slot_start, item.slot_end) for item in day_bookings]
+                + [(block_start, block_end) for block_start, block_end, _ in day_blocks]
+                + [(calendar.combine(on_date, lunch_start), calendar.combine(on_date, lunch_end))],
             )
+            week.append(
+                MasterWeekDay(
+                    on_date=on_date,
+                    bookings=day_bookings,
+                    free_windows=tuple(
+                        occupancy.free_runs(calendar.combine(on_date, work_start), calendar.combine(on_date, work_end))
+                    ),
+                    has_day_off=any(is_day_off for _, _, is_day_off in day_blocks),
+                )
+            )
+        return MasterWeekSchedule(
+            master_id=int(master["id"]),
+            display_name=str(master["display_name"]),
+            lunch_start=lunch_start,
+            lunch_end=lunch_end,
+            days=tuple(week),
+        )
+
+
+def ensure_manual_client_user(conn: Connection, master_id: int) -> int:
+    """Return the master's synthetic client user id, creating it on first use.
+
+    Manual bookings use a deterministic synthetic client user to satisfy
+    non-null client FK while preserving master ownership semantics.
+    """
+    manual_client_tg = -(9_000_000_000 + master_id)
+    conn.execute(
+        text("INSERT INTO roles (name) VALUES ('Client') ON CONFLICT (name) DO NOTHING")
+    )
+    conn.execute(
+        text(
+            """
+            INSERT INTO users (telegram_user_id, role_id)
+            VALUES (:telegram_user_id, (SELECT id FROM roles WHERE name='Client'))
+            ON CONFLICT (telegram_user_id) DO NOTHING
+            """
+        ),
+        {"telegram_user_id": manual_client_tg},
+    )
+    return int(
+        conn.execute(
+            text("SELECT id FROM users WHERE telegram_user_id = :telegram_user_id"),
+            {"telegram_user_id": manual_client_tg},
+        ).scalar_one()
+    )
+
+
+def _expand_day_off_recurrence(recurrence: MasterDayOffRecurrence) -> list[tuple[datetime, datetime]] | None:
+    """Return the recurrence's [start, end) ranges, or None when the rule itself is invalid.
+
+    Expansion stops once it passes `MASTER_DAY_OFF_BULK_MAX_RANGES`; the caller rejects that count.
+    """
+    weekdays = set(recurrence.weekdays)
+    if (
+        recurrence.start_date > recurrence.end_date
+        or not weekdays
+        or not weekdays <= set(range(1, 8))
+        or (recurrence.start_time is None) != (recurrence.end_time is None)
+    ):
+        return None
+    calendar = get_business_calendar()
+    ranges: list[tuple[datetime, datetime]] = []
+    try:
+        for offset in range((recurrence.end_date - recurrence.start_date).days + 1):
+            on_date = recurrence.start_date + timedelta(days=offset)
+            if on_date.isoweekday() not in weekdays:
+                continue
+            if recurrence.start_time is None or recurrence.end_time is None:
+                ranges.append(calendar.day_bounds(on_date))
+            else:
+                ranges.append(
+                    (calendar.combine(on_date, recurrence.start_time), calendar.combine(on_date, recurrence.end_time))
+                )
+            if len(ranges) > MASTER_DAY_OFF_BULK_MAX_RANGES:
+                break
+    except OverflowError:
+        # Dates at the edge of `date` (e.g. 9999-12-31) have no representable day bounds.
+        return None
+    return ranges
 
 
 def _to_utc(value: datetime) -> datetime:
@@ -522,3 +880,9 @@ def _as_time(value: time | str) -> time:
     if isinstance(value, time):
         return value
     return time.fromisoformat(value)
+
+
+def _as_datetime(value: datetime | str) -> datetime:
+    if isinstance(value, datetime):
+        return normalize_utc(value)
+    return normalize_utc(datetime.fromisoformat(value))
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import os
 from collections.abc import Mapping
+from threading import Lock
+from time import monotonic
+from weakref import WeakKeyDictionary
 
 from sqlalchemy import text
-from sqlalchemy.engine import Connection
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.observability import observe_cache_event
+
 SERVICE_OPTION_HAIRCUT = "haircut"
 SERVICE_OPTION_BEARD = "beard"
 SERVICE_OPTION_HAIRCUT_BEARD = "haircut_beard"
@@ -45,6 +51,14 @@ SERVICE_OPTION_DURATION_MINUTES = {
 DEFAULT_SLOT_DURATION_MINUTES = 60
 DEFAULT_SLOT_STEP_MINUTES = 30
 
+SERVICE_CATALOG_REFRESH_SECONDS_ENV = "SERVICE_CATALOG_REFRESH_SECONDS"
+_SERVICE_CATALOG_REFRESH_SECONDS_DEFAULT = 300.0
+_SERVICE_CATALOG_CACHE_NAME = "service_catalog"
+
+_CATALOG_LOCK = Lock()
+# Active durations by code per engine, with the monotonic deadline after which they are reloaded.
+_CATALOG_SNAPSHOTS: WeakKeyDictionary[Engine, tuple[float, dict[str, int]]] = WeakKeyDictionary()
+
 
 def list_service_options() -> list[dict[str, str]]:
     return [
@@ -64,33 +78,91 @@ def list_service_catalog_defaults() -> list[dict[str, str | int]]:
     ]
 
 
+def resolve_service_catalog_refresh_seconds() -> float:
+    raw_value = (os.getenv(SERVICE_CATALOG_REFRESH_SECONDS_ENV) or "").strip()
+    if not raw_value:
+        return _SERVICE_CATALOG_REFRESH_SECONDS_DEFAULT
+    try:
+        value = float(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"{SERVICE_CATALOG_REFRESH_SECONDS_ENV} must be a number, got {raw_value!r}") from exc
+    if value < 0:
+        raise ValueError(f"{SERVICE_CATALOG_REFRESH_SECONDS_ENV} must be >= 0, got {value}")
+    return value
+
+
+def load_service_catalog(connection: Connection) -> dict[str, int] | None:
+    """Return active service durations by code from the engine's snapshot, reloading it when stale.
+
+    Returns None when the catalog cannot be read; callers fall back to the built-in defaults.
+    """
+    owner = connection.engine
+    durations = _fresh_service_catalog(owner)
+    if durations is not None:
+        return durations
+
+    observe_cache_event(_SERVICE_CATALOG_CACHE_NAME, "miss")
+    now = monotonic()
+    try:
+        rows = connection.execute(
+            text(
+                """
+                SELECT code, duration_minutes
+                FROM services
+                WHERE is_active = true
+                """
+            ).execution_options(query_name="service_catalog"),
+        ).mappings().all()
+    except SQLAlchemyError:
+        return None
+    durations: dict[str, int] = {}
+    for row in rows:
+        duration = _extract_duration_minutes(row)
+        if row["code"] in SERVICE_OPTION_CODES and duration is not None:
+            durations[str(row["code"])] = duration
+    refresh_seconds = resolve_service_catalog_refresh_seconds()
+    if refresh_seconds > 0:
+        with _CATALOG_LOCK:
+            _CATALOG_SNAPSHOTS[owner] = (now + refresh_seconds, durations)
+    return durations
+
+
+def _fresh_service_catalog(owner: Engine) -> dict[str, int] | None:
+    with _CATALOG_LOCK:
+        snapshot = _CATALOG_SNAPSHOTS.get(owner)
+    if snapshot is None or snapshot[0] <= monotonic():
+        return None
+    observe_cache_event(_SERVICE_CATALOG_CACHE_NAME, "hit")
+    return snapshot[1]
+
+
+def invalidate_service_catalog() -> None:
+    """Drop every engine's snapshot so the next lookup reloads the catalog (call after catalog writes)."""
+    with _CATALOG_LOCK:
+        _CATALOG_SNAPSHOTS.clear()
+    observe_cache_event(_SERVICE_CATALOG_CACHE_NAME, "invalidation")
+
+
 def resolve_service_duration_minutes(
     service_type: str,
     *,
     connection: Connection | None = None,
+    engine: Engine | None = None,
 ) -> int | None:
+    """Resolve a duration from the catalog snapshot; `engine` only opens a connection when it is stale."""
     if service_type not in SERVICE_OPTION_CODES:
         return None
 
+    durations = None
     if connection is not None:
-        try:
-            row = connection.execute(
-                text(
-                    """
-                    SELECT duration_minutes
-                    FROM services
-                    WHERE code = :code
-                      AND is_active = true
-                    """
-                ),
-                {"code": service_type},
-            ).mappings().first()
-        except SQLAlchemyError:
-            row = None
-        if row is not None:
-            duration = _extract_duration_minutes(row)
-            if duration is not None:
-                return duration
+        durations = load_service_catalog(connection)
+    elif engine is not None:
+        durations = _fresh_service_catalog(getattr(engine, "engine", engine))
+        if durations is None:
+            with engine.connect() as conn:
+                durations = load_service_catalog(conn)
+    if durations is not None and service_type in durations:
+        return durations[service_type]
 
     return SERVICE_OPTION_DURATION_MINUTES.get(service_type)
 
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Callable, Generic, Iterator, TypeVar
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+ServiceT = TypeVar("ServiceT")
+ResultT = TypeVar("ResultT")
+
+
+class ConnectionBoundEngine:
+    """Engine stand-in that serves every connect()/begin() from one connection.
+
+    Services only use ``engine.connect()`` and ``engine.begin()``, so binding them to a
+    single connection lets a caller run several service calls on one connection (and,
+    when the caller already opened a transaction, inside that transaction).
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        self._connection = connection
+
+    @property
+    def dialect(self):  # type: ignore[no-untyped-def]
+        return self._connection.dialect
+
+    @property
+    def engine(self) -> Engine:
+        return self._connection.engine
+
+    @contextmanager
+    def connect(self) -> Iterator[Connection]:
+        joined = self._connection.in_transaction()
+        try:
+            yield self._connection
+        finally:
+            if not joined and self._connection.in_transaction():
+                self._connection.rollback()
+
+    @contextmanager
+    def begin(self) -> Iterator[Connection]:
+        if self._connection.in_transaction():
+            yield self._connection
+            return
+        with self._connection.begin():
+            yield self._connection
+
+
+async def run_on_async_connection(engine: AsyncEngine, operation: Callable[[Engine], ResultT]) -> ResultT:
+    async with engine.connect() as connection:
+        return await connection.run_sync(
+            lambda sync_connection: operation(ConnectionBoundEngine(sync_connection))  # type: ignore[arg-type]
+        )
+
+
+class AsyncServiceAdapter(Generic[ServiceT]):
+    """Async variant of a sync service: each call runs on a pooled AsyncEngine connection.
+
+    SQL issued by the wrapped service is awaited through the async driver, so the event
+    loop keeps serving other updates while the statement is in flight.
+    """
+
+    def __init__(self, engine: AsyncEngine, factory: Callable[[Engine], ServiceT]) -> None:
+        self._engine = engine
+        self._factory = factory
+
+    async def call(self, operation: Callable[[ServiceT], ResultT]) -> ResultT:
+        return await run_on_async_connection(self._engine, lambda engine: operation(self._factory(engine)))
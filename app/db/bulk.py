@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Mapping, Sequence
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import BindParameter, TextClause
+from sqlalchemy.types import NullType
+
+
+def render_values_rows(
+    conn: Connection,
+    row_sql: str,
+    rows: Sequence[Mapping[str, object]],
+) -> tuple[str, list[BindParameter]]:
+    """Render `row_sql` once per row for a multi-row `VALUES` list; returns (sql, binds).
+
+    `row_sql` names per-row binds `:<key>_{index}` for each key of the row mappings; binds without
+    the suffix are shared and come from the execute parameters. On PostgreSQL the values are bound
+    with their types (datetimes as timestamptz) so a `VALUES` CTE resolves its column types under
+    asyncpg too; other dialects get the raw values, matching plain `text()` binds.
+    """
+    typed = conn.dialect.name == "postgresql"
+    rendered: list[str] = []
+    binds: list[BindParameter] = []
+    for index, row in enumerate(rows):
+        rendered.append(row_sql.format(index=index))
+        for key, value in row.items():
+            name = f"{key}_{index}"
+            if not typed:
+                binds.append(bindparam(name, value, type_=NullType()))
+            elif isinstance(value, datetime):
+                binds.append(bindparam(name, value, type_=DateTime(timezone=True)))
+            else:
+                binds.append(bindparam(name, value))
+    return ",\n".join(rendered), binds
+
+
+def values_statement(
+    conn: Connection,
+    statement_sql: str,
+    row_sql: str,
+    rows: Sequence[Mapping[str, object]],
+    **fragments: str,
+) -> TextClause:
+    """`text(statement_sql)` with its `{values}` placeholder filled by `render_values_rows`.
+
+    Keep `statement_sql` and `fragments` static SQL: the only generated text spliced in is the
+    rendered row tuples, which hold bind names and no values, so nothing user-supplied reaches
+    the SQL string and the statement stays free of string-built values.
+    """
+    values_sql, binds = render_values_rows(conn, row_sql, rows)
+    return text(statement_sql.format(values=values_sql, **fragments)).bindparams(*binds)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import re
+import weakref
+from functools import lru_cache
+from hashlib import sha1
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.observability import (
+    observe_db_pool_checkout,
+    observe_db_pool_connect,
+    observe_sql_statement,
+    register_db_pool_source,
+)
+
+QUERY_NAME_OPTION = "query_name"
+
+_STARTED_AT_KEY = "bot_api_query_started_at"
+_WHITESPACE = re.compile(r"\s+")
+_TARGET_TABLE = re.compile(r"\b(?:from|into|update)\s+([a-z_][a-z0-9_]*)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def derive_query_name(statement: str) -> str:
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    if not normalized:
+        return "empty"
+    verb = normalized.split(" ", 1)[0].lower()
+    table_match = _TARGET_TABLE.search(normalized)
+    table = table_match.group(1).lower() if table_match else "none"
+    digest = sha1(normalized.encode("utf-8"), usedforsecurity=False).hexdigest()[:8]
+    return f"{verb}_{table}_{digest}"
+
+
+def resolve_query_name(statement: str, context: Any) -> str:
+    if context is not None:
+        explicit = context.execution_options.get(QUERY_NAME_OPTION)
+        if isinstance(explicit, str) and explicit:
+            return explicit
+    return derive_query_name(statement)
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
+
+
+class _CheckoutTimingMixin:
+    metrics_role = "primary"
+
+    def _do_get(self):  # type: ignore[no-untyped-def]
+        started = perf_counter()
+        try:
+            record = super()._do_get()  # type: ignore[misc]
+        except sa_exc.TimeoutError:
+            observe_db_pool_checkout(self.metrics_role, perf_counter() - started, timed_out=True)
+            raise
+        observe_db_pool_checkout(self.metrics_role, perf_counter() - started)
+        return record
+
+    def recreate(self):  # type: ignore[no-untyped-def]
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics_role = self.metrics_role
+        return pool
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def resolve_instrumented_pool_class(database_url: str) -> type[Pool] | None:
+    url = make_url(database_url)
+    pool_class = url.get_dialect().get_pool_class(url)
+    if issubclass(pool_class, AsyncAdaptedQueuePool):
+        return InstrumentedAsyncAdaptedQueuePool
+    if issubclass(pool_class, QueuePool):
+        return InstrumentedQueuePool
+    return None
+
+
+def instrument_pool(engine: Engine, role: str) -> Engine:
+    """Label the engine's pool with `role` and publish its saturation to /metrics."""
+    pool = engine.pool
+    if isinstance(pool, _CheckoutTimingMixin):
+        pool.metrics_role = role
+
+    def _on_connect(dbapi_connection, connection_record):  # type: ignore[no-untyped-def]
+        observe_db_pool_connect(role)
+
+    event.listen(engine, "connect", _on_connect)
+    engine_ref = weakref.ref(engine)
+    register_db_pool_source(role, lambda: _pool_status(engine_ref))
+    return engine
+
+
+def _pool_status(engine_ref: weakref.ReferenceType[Engine]) -> tuple[int, int, int] | None:
+    engine = engine_ref()
+    if engine is None:
+        return None
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    return pool.size(), pool.checkedout(), max(pool.overflow(), 0)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+    conn.info.setdefault(_STARTED_AT_KEY, []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+    started = conn.info.get(_STARTED_AT_KEY)
+    if not started:
+        return
+    duration_seconds = perf_counter() - started.pop()
+    rowcount = getattr(cursor, "rowcount", -1)
+    observe_sql_statement(
+        resolve_query_name(statement, context),
+        duration_seconds,
+        rowcount if isinstance(rowcount, int) and rowcount >= 0 else None,
+    )
+
+
+def _handle_error(exception_context):  # type: ignore[no-untyped-def]
+    connection = exception_context.connection
+    if connection is None:
+        return
+    started = connection.info.get(_STARTED_AT_KEY)
+    if started:
+        started.pop()
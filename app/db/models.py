@@ -8,8 +8,9 @@ from sqlalchemy import (
     String,
     Text,
     Time,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -68,6 +69,13 @@ class Booking(Base):
             name="ck_bookings_status",
         ),
         CheckConstraint("slot_end > slot_start", name="ck_bookings_slot_order"),
+        ExcludeConstraint(
+            ("master_id", "="),
+            (text("tstzrange(slot_start, slot_end, '[)')"), "&&"),
+            name="ex_bookings_active_master_slot",
+            using="gist",
+            where="status = 'active'",
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -130,3 +138,22 @@ class BookingReminder(Base):
     updated_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
+
+
+class SeedState(Base):
+    __tablename__ = "seed_state"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+class MasterNextFreeSlot(Base):
+    __tablename__ = "master_next_free_slot"
+
+    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id"), primary_key=True)
+    slot_start: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    slot_end: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    computed_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
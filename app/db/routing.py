@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import os
+from threading import Lock
+from time import monotonic
+from typing import Callable, Iterable, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.observability import emit_event
+
+DATABASE_REPLICA_MAX_LAG_SECONDS_ENV = "DATABASE_REPLICA_MAX_LAG_SECONDS"
+DATABASE_REPLICA_LAG_CHECK_SECONDS_ENV = "DATABASE_REPLICA_LAG_CHECK_SECONDS"
+DATABASE_READ_YOUR_WRITES_SECONDS_ENV = "DATABASE_READ_YOUR_WRITES_SECONDS"
+
+_DATABASE_REPLICA_MAX_LAG_SECONDS_DEFAULT = 2.0
+_DATABASE_REPLICA_LAG_CHECK_SECONDS_DEFAULT = 5.0
+_DATABASE_READ_YOUR_WRITES_SECONDS_DEFAULT = 10.0
+
+_Key = TypeVar("_Key", int, str)
+
+_ROUTER_LOCK = Lock()
+_ROUTER: ReadRouter | None = None
+
+
+def probe_replica_lag_seconds(replica: Engine) -> float | None:
+    """Return replica apply lag in seconds, 0 when fully caught up, None when unknown."""
+    if replica.dialect.name != "postgresql":
+        return 0.0
+    with replica.connect() as conn:
+        value = conn.execute(
+            text(
+                """
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() THEN NULL
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE EXTRACT(EPOCH FROM (now() - pg_last_xact_replay_timestamp()))
+                END
+                """
+            ).execution_options(query_name="replica_lag_probe")
+        ).scalar()
+    return float(value) if value is not None else None
+
+
+class ReadRouter:
+    """Chooses the engine for read-only paths: replica when healthy, primary otherwise.
+
+    Reads fall back to the primary while replica lag is above the threshold (or cannot be
+    measured) and, for a read-your-writes window, for any user or master that just wrote.
+    """
+
+    def __init__(
+        self,
+        *,
+        primary: Engine,
+        replica: Engine,
+        max_lag_seconds: float = _DATABASE_REPLICA_MAX_LAG_SECONDS_DEFAULT,
+        lag_check_seconds: float = _DATABASE_REPLICA_LAG_CHECK_SECONDS_DEFAULT,
+        read_your_writes_seconds: float = _DATABASE_READ_YOUR_WRITES_SECONDS_DEFAULT,
+        lag_probe: Callable[[Engine], float | None] = probe_replica_lag_seconds,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self._max_lag_seconds = max_lag_seconds
+        self._lag_check_seconds = lag_check_seconds
+        self._read_your_writes_seconds = read_your_writes_seconds
+        self._lag_probe = lag_probe
+        self._clock = clock
+        self._lock = Lock()
+        self._lag_checked_at: float | None = None
+        self._replica_healthy = False
+        self._user_writes: dict[int, float] = {}
+        self._master_writes: dict[int, float] = {}
+        self._scope_writes: dict[str, float] = {}
+
+    def engine_for_read(
+        self,
+        *,
+        telegram_user_id: int | None = None,
+        master_id: int | None = None,
+        scope: str | None = None,
+    ) -> Engine:
+        now = self._clock()
+        with self._lock:
+            if (
+                _within_window(self._user_writes, telegram_user_id, now)
+                or _within_window(self._master_writes, master_id, now)
+                or _within_window(self._scope_writes, scope, now)
+            ):
+                return self.primary
+        return self.replica if self._is_replica_healthy(now) else self.primary
+
+    def mark_write(
+        self,
+        *,
+        telegram_user_ids: Iterable[int] = (),
+        master_ids: Iterable[int] = (),
+        scopes: Iterable[str] = (),
+    ) -> None:
+        expires_at = self._clock() + self._read_your_writes_seconds
+        with self._lock:
+            for telegram_user_id in telegram_user_ids:
+                self._user_writes[telegram_user_id] = expires_at
+            for master_id in master_ids:
+                self._master_writes[master_id] = expires_at
+            for scope in scopes:
+                self._scope_writes[scope] = expires_at
+            _prune_expired(self._user_writes, expires_at - self._read_your_writes_seconds)
+            _prune_expired(self._master_writes, expires_at - self._read_your_writes_seconds)
+            _prune_expired(self._scope_writes, expires_at - self._read_your_writes_seconds)
+
+    def _is_replica_healthy(self, now: float) -> bool:
+        with self._lock:
+            checked_at = self._lag_checked_at
+            if checked_at is not None and now - checked_at < self._lag_check_seconds:
+                return self._replica_healthy
+            # Claim the check so concurrent readers keep the cached verdict meanwhile.
+            self._lag_checked_at = now
+        try:
+            lag_seconds = self._lag_probe(self.replica)
+        except Exception as exc:
+            lag_seconds = None
+            emit_event("replica_lag_probe_failed", error=type(exc).__name__)
+        healthy = lag_seconds is not None and lag_seconds <= self._max_lag_seconds
+        with self._lock:
+            if healthy != self._replica_healthy:
+                emit_event("replica_routing_changed", healthy=healthy, lag_seconds=lag_seconds)
+            self._replica_healthy = healthy
+        return healthy
+
+
+def _within_window(stamps: dict[_Key, float], key: _Key | None, now: float) -> bool:
+    if key is None:
+        return False
+    expires_at = stamps.get(key)
+    return expires_at is not None and expires_at > now
+
+
+def _prune_expired(stamps: dict[_Key, float], now: float) -> None:
+    if len(stamps) < 1024:
+        return
+    for key in [key for key, expires_at in stamps.items() if expires_at <= now]:
+        del stamps[key]
+
+
+def _read_float_env(name: str, default: float) -> float:
+    raw_value = (os.getenv(name) or "").strip()
+    if not raw_value:
+        return default
+    try:
+        value = float(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be a number, got {raw_value!r}") from exc
+    if value < 0:
+        raise ValueError(f"{name} must be >= 0, got {value}")
+    return value
+
+
+def build_read_router(*, primary: Engine, replica: Engine) -> ReadRouter:
+    return ReadRouter(
+        primary=primary,
+        replica=replica,
+        max_lag_seconds=_read_float_env(
+            DATABASE_REPLICA_MAX_LAG_SECONDS_ENV,
+            _DATABASE_REPLICA_MAX_LAG_SECONDS_DEFAULT,
+        ),
+        lag_check_seconds=_read_float_env(
+            DATABASE_REPLICA_LAG_CHECK_SECONDS_ENV,
+            _DATABASE_REPLICA_LAG_CHECK_SECONDS_DEFAULT,
+        ),
+        read_your_writes_seconds=_read_float_env(
+            DATABASE_READ_YOUR_WRITES_SECONDS_ENV,
+            _DATABASE_READ_YOUR_WRITES_SECONDS_DEFAULT,
+        ),
+    )
+
+
+def configure_read_router(router: ReadRouter | None) -> None:
+    global _ROUTER
+    with _ROUTER_LOCK:
+        _ROUTER = router
+
+
+def get_read_router() -> ReadRouter | None:
+    return _ROUTER
+
+
+def route_read(
+    engine: Engine,
+    *,
+    telegram_user_id: int | None = None,
+    master_id: int | None = None,
+    scope: str | None = None,
+) -> Engine:
+    """Return the engine a read-only query should use; services bound to other engines are untouched.
+
+    `scope` names shared data (e.g. the master roster) whose writes are not tied to one user or master.
+    """
+    router = _ROUTER
+    if router is None or engine is not router.primary:
+        return engine
+    return router.engine_for_read(telegram_user_id=telegram_user_id, master_id=master_id, scope=scope)
+
+
+def mark_recent_write(
+    *,
+    telegram_user_ids: Iterable[int | None] = (),
+    master_ids: Iterable[int | None] = (),
+    scopes: Iterable[str] = (),
+) -> None:
+    router = _ROUTER
+    if router is None:
+        return
+    router.mark_write(
+        telegram_user_ids=[value for value in telegram_user_ids if value is not None],
+        master_ids=[value for value in master_ids if value is not None],
+        scopes=scopes,
+    )
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+OPERATION_INTERACTIVE_READ = "interactive_read"
+OPERATION_BOOKING_WRITE = "booking_write"
+OPERATION_ADMIN_WRITE = "admin_write"
+OPERATION_REMINDER_WORKER = "reminder_worker"
+
+DATABASE_TIMEOUT_RETRY_AFTER_SECONDS = 2
+
+# statement_timeout / lock_timeout defaults in milliseconds; 0 disables the limit.
+_OPERATION_TIMEOUT_DEFAULTS_MS: dict[str, tuple[int, int]] = {
+    OPERATION_INTERACTIVE_READ: (2000, 1000),
+    OPERATION_BOOKING_WRITE: (3000, 1000),
+    OPERATION_ADMIN_WRITE: (5000, 2000),
+    OPERATION_REMINDER_WORKER: (10000, 3000),
+}
+# query_canceled (statement_timeout) and lock_not_available (lock_timeout).
+_TIMEOUT_SQLSTATES = frozenset({"57014", "55P03"})
+_APPLIED_TRANSACTION_KEY = "bot_api_operation_timeouts_transaction"
+_AFTER_COMMIT_KEY = "bot_api_after_commit_callbacks"
+
+
+@dataclass(frozen=True)
+class OperationTimeouts:
+    statement_timeout_ms: int
+    lock_timeout_ms: int
+
+
+class DatabaseTimeoutError(RuntimeError):
+    def __init__(self, operation: str) -> None:
+        super().__init__(f"Database statement or lock timeout during {operation}")
+        self.operation = operation
+        self.retry_after_seconds = DATABASE_TIMEOUT_RETRY_AFTER_SECONDS
+
+
+def statement_timeout_env(operation: str) -> str:
+    return f"DATABASE_STATEMENT_TIMEOUT_MS_{operation.upper()}"
+
+
+def lock_timeout_env(operation: str) -> str:
+    return f"DATABASE_LOCK_TIMEOUT_MS_{operation.upper()}"
+
+
+def _read_timeout_ms(name: str, default: int) -> int:
+    raw_value = (os.getenv(name) or "").strip()
+    if not raw_value:
+        return default
+    try:
+        value = int(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an integer number of milliseconds, got {raw_value!r}") from exc
+    if value < 0:
+        raise ValueError(f"{name} must be >= 0, got {value}")
+    return value
+
+
+def resolve_operation_timeouts(operation: str) -> OperationTimeouts:
+    statement_default, lock_default = _OPERATION_TIMEOUT_DEFAULTS_MS[operation]
+    return OperationTimeouts(
+        statement_timeout_ms=_read_timeout_ms(statement_timeout_env(operation), statement_default),
+        lock_timeout_ms=_read_timeout_ms(lock_timeout_env(operation), lock_default),
+    )
+
+
+def load_operation_timeouts() -> dict[str, OperationTimeouts]:
+    return {operation: resolve_operation_timeouts(operation) for operation in _OPERATION_TIMEOUT_DEFAULTS_MS}
+
+
+def apply_operation_timeouts(conn: Connection, operation: str) -> None:
+    """Set transaction-local statement/lock timeouts once per transaction (PostgreSQL only)."""
+    if conn.dialect.name != "postgresql":
+        return
+    transaction = conn.get_transaction()
+    if transaction is not None and conn.info.get(_APPLIED_TRANSACTION_KEY) is transaction:
+        return
+    timeouts = resolve_operation_timeouts(operation)
+    conn.execute(
+        text(
+            "SELECT set_config('statement_timeout', :statement_timeout, true), "
+            "set_config('lock_timeout', :lock_timeout, true)"
+        ).execution_options(query_name="operation_timeouts"),
+        {
+            "statement_timeout": str(timeouts.statement_timeout_ms),
+            "lock_timeout": str(timeouts.lock_timeout_ms),
+        },
+    )
+    conn.info[_APPLIED_TRANSACTION_KEY] = conn.get_transaction()
+
+
+def is_database_timeout(exc: BaseException) -> bool:
+    if not isinstance(exc, DBAPIError):
+        return False
+    return getattr(exc.orig, "pgcode", None) in _TIMEOUT_SQLSTATES
+
+
+def run_after_commit(conn: Connection, callback: Callable[[], None]) -> None:
+    """Run `callback` once the outermost `begin_operation` on `conn` commits; dropped on rollback."""
+    callbacks = conn.info.get(_AFTER_COMMIT_KEY)
+    if callbacks is None:
+        raise RuntimeError("run_after_commit requires a transaction opened by begin_operation")
+    callbacks.append(callback)
+
+
+@contextmanager
+def begin_operation(engine: Engine, operation: str) -> Iterator[Connection]:
+    """`engine.begin()` with the operation's timeouts applied; timeouts surface as DatabaseTimeoutError."""
+    callbacks: list[Callable[[], None]] | None = None
+    try:
+        with engine.begin() as conn:
+            apply_operation_timeouts(conn, operation)
+            if _AFTER_COMMIT_KEY not in conn.info:
+                callbacks = conn.info[_AFTER_COMMIT_KEY] = []
+            try:
+                yield conn
+            finally:
+                if callbacks is not None:
+                    conn.info.pop(_AFTER_COMMIT_KEY, None)
+    except DBAPIError as exc:
+        if is_database_timeout(exc):
+            raise DatabaseTimeoutError(operation) from exc
+        raise
+    for callback in callbacks or ():
+        callback()
+
+
+@contextmanager
+def connect_operation(engine: Engine, operation: str) -> Iterator[Connection]:
+    """`engine.connect()` for read paths with the operation's timeouts on the implicit transaction."""
+    try:
+        with engine.connect() as conn:
+            apply_operation_timeouts(conn, operation)
+            yield conn
+    except DBAPIError as exc:
+        if is_database_timeout(exc):
+            raise DatabaseTimeoutError(operation) from exc
+        raise
@@ -1,36 +1,69 @@
 import logging
 import os
-from asyncio import Task, create_task, sleep
+from asyncio import Task, create_task, sleep, to_thread
 from contextlib import asynccontextmanager, suppress
 from json import loads
-from datetime import date, datetime, time
+from datetime import date, datetime, time, timedelta
 from json import JSONDecodeError
-from typing import Any
+from time import monotonic
+from typing import Any, Literal
 
 from aiogram import Bot, Dispatcher
 from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-
+from pydantic import BaseModel, Field
+
+from app.audit import (
+    AUDIT_FLUSH_BATCH_SIZE,
+    AuditEventBuffer,
+    AuditEventWriter,
+    audit_log_event_listener,
+    configure_audit_buffer,
+    resolve_audit_flush_seconds,
+    resolve_audit_queue_max_events,
+)
 from app.auth import RoleRepository, authorize_command
 from app.booking import (
+    AsyncBookingReminderService,
     AvailabilityService,
     BookingService,
     BookingReminderService,
+    ManualBookingImportService,
+    MasterBulkDayOffCommand,
     MasterDayOffCommand,
+    MasterDayOffRecurrence,
     MasterLunchBreakCommand,
     MasterManualBookingCommand,
     MasterScheduleService,
+    NextFreeSlotService,
+    RU_BOOKING_MESSAGES,
     TelegramBookingFlowService,
     list_service_options,
+    resolve_master_roster_ttl_seconds,
+    resolve_next_free_slot_reconcile_seconds,
+    resolve_service_catalog_refresh_seconds,
     resolve_service_duration_minutes,
 )
+from app.booking.flow import EARLIEST_SLOTS_DEFAULT_DAYS, EARLIEST_SLOTS_DEFAULT_LIMIT
+from app.booking.occupancy_cache import build_day_occupancy_cache
+from app.db.routing import build_read_router, configure_read_router
 from app.db.seed import (
     BOOTSTRAP_MASTER_TELEGRAM_ID_ENV,
     resolve_bootstrap_master_telegram_id,
     run_seed,
 )
-from app.db.session import get_database_url, get_engine
+from app.db.session import (
+    dispose_async_engine,
+    dispose_engine,
+    dispose_replica_engine,
+    get_async_engine,
+    get_database_url,
+    get_engine,
+    get_replica_engine,
+    is_async_database_enabled,
+    resolve_async_database_url,
+)
+from app.db.timeouts import DatabaseTimeoutError, load_operation_timeouts
 from app.idempotency import CachedHttpResponse, TelegramIdempotencyStore
 from app.observability import (
     emit_event,
@@ -38,11 +71,15 @@ from app.observability import (
     observe_abuse_outcome,
     observe_telegram_delivery_outcome,
     render_metrics,
+    set_event_listener,
     set_service_health,
 )
 from app.throttling import TelegramCommandThrottle
-from app.timezone import get_business_timezone
-from app.telegram import configure_dispatcher
+from app.timezone import business_now, configure_business_calendar, get_business_calendar, utc_now
+from app.telegram import close_notification_sender, configure_dispatcher, shutdown_handler_executor
+from app.telegram.callbacks import BOOKING_DATE_HORIZON_DAYS
+from app.telegram.executor import TELEGRAM_HANDLER_WORKERS_ENV, resolve_handler_worker_count
+from app.telegram.notifier import TELEGRAM_NOTIFY_RATE_PER_SECOND_ENV, resolve_notify_rate_per_second
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 
@@ -56,6 +93,8 @@ _TELEGRAM_UPDATES_MODES = {
 }
 _REMINDER_POLL_SECONDS_ENV = "BOOKING_REMINDER_POLL_SECONDS"
 _REMINDER_POLL_SECONDS_DEFAULT = 30
+_NEXT_FREE_SLOT_DRAIN_SECONDS = 1.0
+_AUDIT_DRAIN_SECONDS = 1.0
 
 
 def _resolve_telegram_updates_mode(raw_mode: str | None) -> str:
@@ -92,10 +131,13 @@ def _resolve_telegram_runtime_policy(*, raw_mode: str | None, bot_token: str) ->
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     try:
-        business_timezone = get_business_timezone()
+        business_calendar = get_business_calendar()
     except ValueError as exc:
         emit_event("startup_config_failed", reason="invalid_business_timezone", error=str(exc))
         raise RuntimeError(str(exc)) from exc
+    business_timezone = business_calendar.timezone
+    business_calendar.precompute(business_calendar.now().date() - timedelta(days=1), BOOKING_DATE_HORIZON_DAYS + 2)
+    configure_business_calendar(business_calendar)
 
     try:
         bootstrap_master_telegram_user_id = resolve_bootstrap_master_telegram_id(
@@ -105,11 +147,84 @@ async def lifespan(_: FastAPI):
         emit_event("bootstrap_seed_failed", reason="invalid_bootstrap_master_config", error=str(exc))
         raise RuntimeError(str(exc)) from exc
 
-    run_seed(
+    try:
+        resolve_handler_worker_count(os.getenv(TELEGRAM_HANDLER_WORKERS_ENV))
+    except ValueError as exc:
+        emit_event("startup_config_failed", reason="invalid_telegram_handler_workers", error=str(exc))
+        raise RuntimeError(str(exc)) from exc
+
+    try:
+        resolve_notify_rate_per_second(os.getenv(TELEGRAM_NOTIFY_RATE_PER_SECOND_ENV))
+    except ValueError as exc:
+        emit_event("startup_config_failed", reason="invalid_telegram_notify_rate", error=str(exc))
+        raise RuntimeError(str(exc)) from exc
+
+    try:
+        load_operation_timeouts()
+    except ValueError as exc:
+        emit_event("startup_config_failed", reason="invalid_database_timeout_config", error=str(exc))
+        raise RuntimeError(str(exc)) from exc
+
+    try:
+        build_day_occupancy_cache()
+    except ValueError as exc:
+        emit_event("startup_config_failed", reason="invalid_availability_cache_config", error=str(exc))
+        raise RuntimeError(str(exc)) from exc
+
+    try:
+        resolve_service_catalog_refresh_seconds()
+    except ValueError as exc:
+        emit_event("startup_config_failed", reason="invalid_service_catalog_config", error=str(exc))
+        raise RuntimeError(str(exc)) from exc
+
+    try:
+        resolve_master_roster_ttl_seconds()
+    except ValueError as exc:
+        emit_event("startup_config_failed", reason="invalid_master_roster_cache_config", error=str(exc))
+        raise RuntimeError(str(exc)) from exc
+
+    try:
+        next_free_slot_reconcile_seconds = resolve_next_free_slot_reconcile_seconds()
+    except ValueError as exc:
+        emit_event("startup_config_failed", reason="invalid_next_free_slot_config", error=str(exc))
+        raise RuntimeError(str(exc)) from exc
+
+    try:
+        audit_flush_seconds = resolve_audit_flush_seconds()
+        audit_queue_max_events = resolve_audit_queue_max_events()
+    except ValueError as exc:
+        emit_event("startup_config_failed", reason="invalid_audit_config", error=str(exc))
+        raise RuntimeError(str(exc)) from exc
+
+    if is_async_database_enabled():
+        try:
+            resolve_async_database_url(get_database_url())
+        except ValueError as exc:
+            emit_event("startup_config_failed", reason="invalid_database_async_config", error=str(exc))
+            raise RuntimeError(str(exc)) from exc
+
+    try:
+        engine = get_engine()
+        async_engine = get_async_engine() if is_async_database_enabled() else None
+        replica_engine = get_replica_engine()
+        read_router = (
+            build_read_router(primary=engine, replica=replica_engine) if replica_engine is not None else None
+        )
+    except ValueError as exc:
+        emit_event("startup_config_failed", reason="invalid_database_pool_config", error=str(exc))
+        raise RuntimeError(str(exc)) from exc
+    configure_read_router(read_router)
+
+    seed_written = run_seed(
         get_database_url(),
         bootstrap_master_telegram_id=bootstrap_master_telegram_user_id,
+        engine=engine,
+    )
+    emit_event(
+        "bootstrap_seed_applied",
+        bootstrap_master_telegram_user_id=bootstrap_master_telegram_user_id,
+        writes_skipped=not seed_written,
     )
-    emit_event("bootstrap_seed_applied", bootstrap_master_telegram_user_id=bootstrap_master_telegram_user_id)
 
     bot_token = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
     runtime_policy = _resolve_telegram_runtime_policy(
@@ -122,6 +237,7 @@ async def lifespan(_: FastAPI):
     reminder_bot: Bot | None = None
     polling_task: Task[Any] | None = None
     reminder_task: Task[Any] | None = None
+    next_free_slot_task: Task[Any] | None = None
 
     if runtime_policy["start_polling"]:
         bot = Bot(token=bot_token)
@@ -145,7 +261,11 @@ async def lifespan(_: FastAPI):
         reminder_bot = bot if bot is not None else Bot(token=bot_token)
         reminder_task = create_task(
             _run_booking_reminder_worker(
-                engine=get_engine(),
+                service=(
+                    AsyncBookingReminderService(async_engine)
+                    if async_engine is not None
+                    else BookingReminderService(engine)
+                ),
                 bot=reminder_bot,
                 poll_seconds=reminder_poll_seconds,
             ),
@@ -161,6 +281,23 @@ async def lifespan(_: FastAPI):
             reason="missing_token",
         )
 
+    next_free_slot_task = create_task(
+        _run_next_free_slot_reconciler(
+            service=NextFreeSlotService(engine),
+            interval_seconds=next_free_slot_reconcile_seconds,
+        ),
+        name="next-free-slot-reconciler",
+    )
+
+    audit_buffer = AuditEventBuffer(max_events=audit_queue_max_events)
+    audit_writer = AuditEventWriter(engine, audit_buffer)
+    configure_audit_buffer(audit_buffer)
+    set_event_listener(audit_log_event_listener)
+    audit_task = create_task(
+        _run_audit_writer(writer=audit_writer, buffer=audit_buffer, flush_seconds=audit_flush_seconds),
+        name="audit-writer",
+    )
+
     set_service_health(True)
     emit_event(
         "startup",
@@ -169,12 +306,18 @@ async def lifespan(_: FastAPI):
         telegram_updates_runtime=(
             "polling" if runtime_policy["start_polling"] else "disabled"
         ),
+        database_async_enabled=async_engine is not None,
+        database_replica_enabled=read_router is not None,
         business_timezone=str(business_timezone),
     )
     try:
         yield
     finally:
         dispatcher.stop_polling()
+        if next_free_slot_task is not None:
+            next_free_slot_task.cancel()
+            with suppress(Exception):
+                await next_free_slot_task
         if reminder_task is not None:
             reminder_task.cancel()
             with suppress(Exception):
@@ -183,16 +326,35 @@ async def lifespan(_: FastAPI):
             polling_task.cancel()
             with suppress(Exception):
                 await polling_task
+        with suppress(Exception):
+            await close_notification_sender()
         if bot is not None:
             with suppress(Exception):
                 await bot.session.close()
         if reminder_bot is not None and reminder_bot is not bot:
             with suppress(Exception):
                 await reminder_bot.session.close()
-
-
-async def _run_booking_reminder_worker(*, engine, bot: Bot, poll_seconds: int) -> None:  # type: ignore[no-untyped-def]
-    service = BookingReminderService(engine)
+        shutdown_handler_executor()
+        audit_task.cancel()
+        with suppress(Exception):
+            await audit_task
+        set_event_listener(None)
+        configure_audit_buffer(None)
+        with suppress(Exception):
+            await to_thread(audit_writer.flush)
+        configure_read_router(None)
+        configure_business_calendar(None)
+        dispose_replica_engine()
+        dispose_engine()
+        await dispose_async_engine()
+
+
+async def _run_booking_reminder_worker(
+    *,
+    service: BookingReminderService | AsyncBookingReminderService,
+    bot: Bot,
+    poll_seconds: int,
+) -> None:
     while True:
         try:
             outcomes = await service.dispatch_due_reminders(
@@ -210,6 +372,12 @@ async def _run_booking_reminder_worker(*, engine, bot: Bot, poll_seconds: int) -
                     outcome=outcome_key,
                     count=value,
                 )
+        except DatabaseTimeoutError as exc:
+            observe_telegram_delivery_outcome(
+                path="/internal/telegram/client/booking-reminder",
+                outcome="failed_transient",
+            )
+            emit_event("booking_reminder_dispatch_error", error=str(exc), operation=exc.operation)
         except Exception as exc:
             observe_telegram_delivery_outcome(
                 path="/internal/telegram/client/booking-reminder",
@@ -219,6 +387,39 @@ async def _run_booking_reminder_worker(*, engine, bot: Bot, poll_seconds: int) -
         await sleep(poll_seconds)
 
 
+async def _run_next_free_slot_reconciler(*, service: NextFreeSlotService, interval_seconds: float) -> None:
+    next_reconcile_at = 0.0
+    while True:
+        try:
+            if monotonic() >= next_reconcile_at:
+                next_reconcile_at = monotonic() + interval_seconds
+                refreshed = await to_thread(service.reconcile)
+                emit_event("next_free_slot_reconciled", masters=refreshed)
+            else:
+                await to_thread(service.refresh_pending)
+        except DatabaseTimeoutError as exc:
+            emit_event("next_free_slot_reconcile_error", error=str(exc), operation=exc.operation)
+        except Exception as exc:
+            emit_event("next_free_slot_reconcile_error", error=str(exc))
+        await sleep(_NEXT_FREE_SLOT_DRAIN_SECONDS)
+
+
+async def _run_audit_writer(*, writer: AuditEventWriter, buffer: AuditEventBuffer, flush_seconds: float) -> None:
+    # Flush on a full batch or once per interval, whichever comes first; idle ticks only read the queue length.
+    next_flush_at = monotonic() + flush_seconds
+    while True:
+        await sleep(_AUDIT_DRAIN_SECONDS)
+        if len(buffer) < AUDIT_FLUSH_BATCH_SIZE and monotonic() < next_flush_at:
+            continue
+        next_flush_at = monotonic() + flush_seconds
+        try:
+            written = await to_thread(writer.flush)
+            if written:
+                emit_event("audit_events_flushed", events=written)
+        except Exception as exc:
+            emit_event("audit_flush_failed", error=str(exc))
+
+
 app = FastAPI(title="haircuttgbot-api", version="0.1.0", lifespan=lifespan)
 app.state.telegram_throttle = TelegramCommandThrottle(
     limit=int(os.getenv("TELEGRAM_THROTTLE_LIMIT", "8")),
@@ -228,6 +429,27 @@ app.state.telegram_idempotency = TelegramIdempotencyStore(
     window_seconds=int(os.getenv("TELEGRAM_IDEMPOTENCY_WINDOW_SECONDS", "120")),
 )
 
+
+@app.exception_handler(DatabaseTimeoutError)
+async def database_timeout_handler(request: Request, exc: DatabaseTimeoutError) -> JSONResponse:
+    emit_event(
+        "database_timeout",
+        path=request.url.path,
+        method=request.method,
+        operation=exc.operation,
+        retry_after_seconds=exc.retry_after_seconds,
+    )
+    return JSONResponse(
+        status_code=503,
+        content={
+            "detail": RU_BOOKING_MESSAGES["database_busy"],
+            "code": "database_timeout",
+            "retry_after_seconds": exc.retry_after_seconds,
+        },
+        headers={"Retry-After": str(exc.retry_after_seconds)},
+    )
+
+
 _THROTTLED_PATH_PREFIX = "/internal/telegram/"
 _THROTTLED_METHODS = {"POST"}
 _THROTTLED_USER_KEYS = (
@@ -239,9 +461,12 @@ _IDEMPOTENT_OUTCOME_BY_PATH = {
     "/internal/telegram/client/booking-flow/confirm": "created",
     "/internal/telegram/client/booking-flow/cancel": "cancelled",
     "/internal/telegram/master/booking-flow/cancel": "cancelled",
+    "/internal/telegram/master/booking-flow/cancel-range": "cancelled",
     "/internal/telegram/master/schedule/day-off": "applied",
+    "/internal/telegram/master/schedule/day-off/bulk": "applied",
     "/internal/telegram/master/schedule/lunch": "applied",
     "/internal/telegram/master/schedule/manual-booking": "applied",
+    "/internal/telegram/master/schedule/manual-booking/import": "applied",
 }
 
 
@@ -465,6 +690,14 @@ class AvailabilityRequest(BaseModel):
     service_type: str
 
 
+class AvailabilitySummaryRequest(BaseModel):
+    master_id: int
+    service_type: str
+    date_from: date | None = None
+    days: int = Field(default=BOOKING_DATE_HORIZON_DAYS, ge=1, le=BOOKING_DATE_HORIZON_DAYS)
+    include_slots: bool = False
+
+
 class CreateBookingRequest(BaseModel):
     master_id: int
     client_user_id: int
@@ -482,6 +715,13 @@ class TelegramFlowServiceRequest(BaseModel):
     service_type: str
 
 
+class TelegramFlowEarliestSlotsRequest(BaseModel):
+    service_type: str
+    date_from: date | None = None
+    days: int = Field(default=EARLIEST_SLOTS_DEFAULT_DAYS, ge=1, le=BOOKING_DATE_HORIZON_DAYS)
+    limit: int = Field(default=EARLIEST_SLOTS_DEFAULT_LIMIT, ge=1, le=20)
+
+
 class TelegramFlowConfirmRequest(BaseModel):
     client_telegram_user_id: int
     master_id: int
@@ -500,6 +740,13 @@ class TelegramFlowMasterCancelRequest(BaseModel):
     reason: str
 
 
+class TelegramFlowMasterCancelRangeRequest(BaseModel):
+    master_telegram_user_id: int
+    start_at: datetime
+    end_at: datetime
+    reason: str
+
+
 class TelegramMasterDayOffUpsertRequest(BaseModel):
     master_telegram_user_id: int
     start_at: datetime
@@ -507,12 +754,36 @@ class TelegramMasterDayOffUpsertRequest(BaseModel):
     block_id: int | None = None
 
 
+class TelegramMasterDayOffRangeRequest(BaseModel):
+    start_at: datetime
+    end_at: datetime
+
+
+class TelegramMasterDayOffRecurrenceRequest(BaseModel):
+    start_date: date
+    end_date: date
+    weekdays: list[int]
+    start_time: time | None = None
+    end_time: time | None = None
+
+
+class TelegramMasterDayOffBulkRequest(BaseModel):
+    master_telegram_user_id: int
+    ranges: list[TelegramMasterDayOffRangeRequest] = Field(default_factory=list)
+    recurrence: TelegramMasterDayOffRecurrenceRequest | None = None
+
+
 class TelegramMasterLunchUpdateRequest(BaseModel):
     master_telegram_user_id: int
     lunch_start: time
     lunch_end: time
 
 
+class TelegramMasterWeekScheduleRequest(BaseModel):
+    master_telegram_user_id: int
+    start_date: date | None = None
+
+
 class TelegramMasterManualBookingRequest(BaseModel):
     master_telegram_user_id: int
     client_name: str
@@ -520,6 +791,13 @@ class TelegramMasterManualBookingRequest(BaseModel):
     slot_start: datetime
 
 
+class TelegramMasterManualBookingImportRequest(BaseModel):
+    master_telegram_user_id: int
+    content: str
+    format: Literal["csv", "json"] | None = None
+    dry_run: bool = False
+
+
 @app.get("/health")
 @instrument_endpoint("GET", "/health")
 def health() -> dict[str, str]:
@@ -577,8 +855,7 @@ def availability_slots(payload: AvailabilityRequest) -> dict[str, int | list[dic
     engine = get_engine()
     service = AvailabilityService(engine)
     slots = service.list_slots(master_id=payload.master_id, on_date=payload.date, service_type=payload.service_type)
-    with engine.connect() as conn:
-        resolved = resolve_service_duration_minutes(payload.service_type, connection=conn)
+    resolved = resolve_service_duration_minutes(payload.service_type, engine=engine)
     slot_minutes = resolved if resolved is not None else 0
     return {
         "slot_minutes": slot_minutes,
@@ -589,6 +866,30 @@ def availability_slots(payload: AvailabilityRequest) -> dict[str, int | list[dic
     }
 
 
+@app.post("/internal/availability/summary")
+@instrument_endpoint("POST", "/internal/availability/summary")
+def availability_summary(payload: AvailabilitySummaryRequest) -> dict[str, object]:
+    date_from = payload.date_from or business_now().date()
+    summaries = AvailabilityService(get_engine()).summarize_range(
+        master_id=payload.master_id,
+        start_date=date_from,
+        days=payload.days,
+        service_type=payload.service_type,
+        now=utc_now(),
+        include_slots=payload.include_slots,
+    )
+    days: list[dict[str, object]] = []
+    for summary in summaries:
+        day: dict[str, object] = {"date": summary.on_date.isoformat(), "free_slots": summary.free_slots}
+        if payload.include_slots:
+            day["slots"] = [
+                {"start_at": slot.start_at.isoformat(), "end_at": slot.end_at.isoformat()}
+                for slot in summary.slots
+            ]
+        days.append(day)
+    return {"date_from": date_from.isoformat(), "days": days}
+
+
 @app.post("/internal/booking/create")
 @instrument_endpoint(
     "POST",
@@ -642,6 +943,18 @@ def telegram_booking_flow_select_service(payload: TelegramFlowServiceRequest) ->
     return flow.select_service(master_id=payload.master_id, on_date=payload.date, service_type=payload.service_type)
 
 
+@app.post("/internal/telegram/client/booking-flow/earliest-slots")
+@instrument_endpoint("POST", "/internal/telegram/client/booking-flow/earliest-slots")
+def telegram_booking_flow_earliest_slots(payload: TelegramFlowEarliestSlotsRequest) -> dict[str, object]:
+    flow = TelegramBookingFlowService(get_engine())
+    return flow.find_earliest_slots(
+        service_type=payload.service_type,
+        date_from=payload.date_from,
+        days=payload.days,
+        limit=payload.limit,
+    )
+
+
 @app.post("/internal/telegram/client/booking-flow/confirm")
 @instrument_endpoint(
     "POST",
@@ -715,6 +1028,33 @@ def telegram_master_booking_flow_cancel(payload: TelegramFlowMasterCancelRequest
     return response
 
 
+@app.post("/internal/telegram/master/booking-flow/cancel-range")
+@instrument_endpoint(
+    "POST",
+    "/internal/telegram/master/booking-flow/cancel-range",
+    booking_action="booking_flow_cancel_range_master",
+    outcome_key="cancelled",
+)
+def telegram_booking_flow_master_cancel_range(payload: TelegramFlowMasterCancelRangeRequest) -> dict[str, object]:
+    flow = TelegramBookingFlowService(get_engine())
+    response = flow.cancel_range_by_master(
+        master_telegram_user_id=payload.master_telegram_user_id,
+        start_at=payload.start_at,
+        end_at=payload.end_at,
+        reason=payload.reason,
+    )
+    booking_ids = response.get("booking_ids")
+    emit_event(
+        "booking_flow_cancel_range_master",
+        master_telegram_user_id=payload.master_telegram_user_id,
+        start_at=payload.start_at.isoformat(),
+        end_at=payload.end_at.isoformat(),
+        cancelled=response.get("cancelled"),
+        bookings=len(booking_ids) if isinstance(booking_ids, list) else 0,
+    )
+    return response
+
+
 @app.post("/internal/telegram/master/schedule/day-off")
 @instrument_endpoint(
     "POST",
@@ -748,6 +1088,48 @@ def telegram_master_schedule_day_off(payload: TelegramMasterDayOffUpsertRequest)
     return response
 
 
+@app.post("/internal/telegram/master/schedule/day-off/bulk")
+@instrument_endpoint(
+    "POST",
+    "/internal/telegram/master/schedule/day-off/bulk",
+    booking_action="schedule_day_off_bulk",
+    outcome_key="applied",
+)
+def telegram_master_schedule_day_off_bulk(payload: TelegramMasterDayOffBulkRequest) -> dict[str, object]:
+    recurrence = None
+    if payload.recurrence is not None:
+        recurrence = MasterDayOffRecurrence(
+            start_date=payload.recurrence.start_date,
+            end_date=payload.recurrence.end_date,
+            weekdays=tuple(payload.recurrence.weekdays),
+            start_time=payload.recurrence.start_time,
+            end_time=payload.recurrence.end_time,
+        )
+    result = MasterScheduleService(get_engine()).create_day_off_blocks(
+        master_telegram_user_id=payload.master_telegram_user_id,
+        command=MasterBulkDayOffCommand(
+            ranges=tuple((item.start_at, item.end_at) for item in payload.ranges),
+            recurrence=recurrence,
+        ),
+    )
+    response = {
+        "applied": result.applied,
+        "block_ids": list(result.block_ids),
+        "message": result.message,
+        "conflicts": [
+            {"start_at": start_at.isoformat(), "end_at": end_at.isoformat()} for start_at, end_at in result.conflicts
+        ],
+    }
+    emit_event(
+        "schedule_day_off_bulk",
+        master_telegram_user_id=payload.master_telegram_user_id,
+        applied=result.applied,
+        blocks=len(result.block_ids),
+        conflicts=len(result.conflicts),
+    )
+    return response
+
+
 @app.post("/internal/telegram/master/schedule/lunch")
 @instrument_endpoint(
     "POST",
@@ -778,6 +1160,47 @@ def telegram_master_schedule_lunch(payload: TelegramMasterLunchUpdateRequest) ->
     return response
 
 
+@app.post("/internal/telegram/master/schedule/week")
+@instrument_endpoint("POST", "/internal/telegram/master/schedule/week")
+def telegram_master_schedule_week(payload: TelegramMasterWeekScheduleRequest) -> dict[str, object]:
+    start_date = payload.start_date or business_now().date()
+    week = MasterScheduleService(get_engine()).get_week_schedule(
+        master_telegram_user_id=payload.master_telegram_user_id,
+        start_date=start_date,
+    )
+    if week is None:
+        return {"found": False, "message": RU_BOOKING_MESSAGES["master_not_found"], "days": []}
+    return {
+        "found": True,
+        "master_id": week.master_id,
+        "display_name": week.display_name,
+        "lunch_start": week.lunch_start.isoformat(),
+        "lunch_end": week.lunch_end.isoformat(),
+        "days": [
+            {
+                "date": day.on_date.isoformat(),
+                "day_off": day.has_day_off,
+                "bookings": [
+                    {
+                        "start_at": booking.slot_start.isoformat(),
+                        "end_at": booking.slot_end.isoformat(),
+                        "service_type": booking.service_type,
+                        "manual_client_name": booking.manual_client_name,
+                        "client_username": booking.client_username,
+                        "client_phone": booking.client_phone,
+                    }
+                    for booking in day.bookings
+                ],
+                "free_windows": [
+                    {"start_at": start_at.isoformat(), "end_at": end_at.isoformat()}
+                    for start_at, end_at in day.free_windows
+                ],
+            }
+            for day in week.days
+        ],
+    }
+
+
 @app.post("/internal/telegram/master/schedule/manual-booking")
 @instrument_endpoint(
     "POST",
@@ -809,3 +1232,46 @@ def telegram_master_schedule_manual_booking(payload: TelegramMasterManualBooking
         booking_id=result.booking_id,
     )
     return response
+
+
+@app.post("/internal/telegram/master/schedule/manual-booking/import")
+@instrument_endpoint(
+    "POST",
+    "/internal/telegram/master/schedule/manual-booking/import",
+    booking_action="schedule_manual_booking_import",
+    outcome_key="applied",
+)
+def telegram_master_schedule_manual_booking_import(
+    payload: TelegramMasterManualBookingImportRequest,
+) -> dict[str, object]:
+    result = ManualBookingImportService(get_engine()).import_file(
+        master_telegram_user_id=payload.master_telegram_user_id,
+        content=payload.content,
+        import_format=payload.format,
+        dry_run=payload.dry_run,
+    )
+    response = {
+        "applied": result.applied,
+        "message": result.message,
+        "accepted": result.accepted_count,
+        "rejected": result.rejected_count,
+        "rows": [
+            {
+                "row": row.row_number,
+                "accepted": row.accepted,
+                "message": row.message,
+                "booking_id": row.booking_id,
+                "slot_start": row.slot_start.isoformat() if row.slot_start is not None else None,
+            }
+            for row in result.rows
+        ],
+    }
+    emit_event(
+        "schedule_manual_booking_import",
+        master_telegram_user_id=payload.master_telegram_user_id,
+        dry_run=payload.dry_run,
+        applied=result.applied,
+        accepted=result.accepted_count,
+        rejected=result.rejected_count,
+    )
+    return response
@@ -5,10 +5,13 @@ import logging
 import os
 import threading
 import time
+from contextvars import ContextVar
 from datetime import UTC, datetime
 from functools import wraps
 from typing import Any, Callable, TypeVar
 
+from app.db.timeouts import DatabaseTimeoutError
+
 F = TypeVar("F", bound=Callable[..., Any])
 
 SERVICE_NAME = "bot-api"
@@ -25,6 +28,10 @@ _SENSITIVE_KEY_PARTS = (
 _REDACTED = "[REDACTED]"
 _METRICS_LOCK = threading.Lock()
 _REQUEST_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_SQL_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+_SQL_ROWS_BUCKETS = (0.0, 1.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+_REQUEST_QUERY_COUNT_BUCKETS = (0.0, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0, 55.0)
+_DB_POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
 
 _REQUESTS_TOTAL: dict[tuple[str, str, str], float] = {}
 _REQUEST_LATENCY: dict[tuple[str, str], dict[str, float | list[float]]] = {}
@@ -32,6 +39,20 @@ _BOOKING_OUTCOMES_TOTAL: dict[tuple[str, str], float] = {}
 _MASTER_ADMIN_OUTCOMES_TOTAL: dict[tuple[str, str], float] = {}
 _ABUSE_OUTCOMES_TOTAL: dict[tuple[str, str], float] = {}
 _TELEGRAM_DELIVERY_OUTCOMES_TOTAL: dict[tuple[str, str], float] = {}
+_SQL_STATEMENT_LATENCY: dict[tuple[str, ...], dict[str, float | list[float]]] = {}
+_SQL_STATEMENT_ROWS: dict[tuple[str, ...], dict[str, float | list[float]]] = {}
+_REQUEST_QUERY_COUNT: dict[tuple[str, ...], dict[str, float | list[float]]] = {}
+_REQUEST_QUERY_COUNTER: ContextVar[list[int] | None] = ContextVar("bot_api_request_query_counter", default=None)
+_TELEGRAM_HANDLER_WAIT: dict[tuple[str, ...], dict[str, float | list[float]]] = {}
+_DB_POOL_CHECKOUT_WAIT: dict[tuple[str, ...], dict[str, float | list[float]]] = {}
+_DB_POOL_CHECKOUT_TIMEOUTS_TOTAL: dict[str, float] = {}
+_DB_POOL_CONNECTIONS_OPENED_TOTAL: dict[str, float] = {}
+_DB_POOL_SOURCES: dict[str, Callable[[], tuple[int, int, int] | None]] = {}
+_CACHE_EVENTS_TOTAL: dict[tuple[str, str], float] = {}
+_AUDIT_EVENTS_TOTAL: dict[str, float] = {}
+_EVENT_LISTENER: Callable[[str, dict[str, Any]], None] | None = None
+_TELEGRAM_HANDLER_QUEUE_DEPTH = 0.0
+_TELEGRAM_HANDLER_ACTIVE_WORKERS = 0.0
 _SERVICE_HEALTH = 1.0
 
 
@@ -41,6 +62,51 @@ def _coerce_buckets(value: float | list[float]) -> list[float]:
     raise TypeError("Invalid latency buckets payload; expected list[float].")
 
 
+def _observe_histogram(
+    store: dict[tuple[str, ...], dict[str, float | list[float]]],
+    key: tuple[str, ...],
+    value: float,
+    boundaries: tuple[float, ...],
+) -> None:
+    series = store.get(key)
+    if series is None:
+        series = {
+            "count": 0.0,
+            "sum": 0.0,
+            "buckets": [0.0] * (len(boundaries) + 1),
+        }
+        store[key] = series
+
+    series["count"] = float(series["count"]) + 1.0
+    series["sum"] = float(series["sum"]) + value
+
+    buckets = _coerce_buckets(series["buckets"])
+    for index, boundary in enumerate(boundaries):
+        if value <= boundary:
+            buckets[index] += 1.0
+    buckets[-1] += 1.0
+
+
+def _render_histogram(
+    lines: list[str],
+    name: str,
+    label_names: tuple[str, ...],
+    store: dict[tuple[str, ...], dict[str, float | list[float]]],
+    boundaries: tuple[float, ...],
+) -> None:
+    for key, series in sorted(store.items()):
+        labels = ",".join(
+            f'{label_name}="{_escape_label(label_value)}"' for label_name, label_value in zip(label_names, key)
+        )
+        prefix = f"{labels}," if labels else ""
+        buckets = _coerce_buckets(series["buckets"])
+        for index, boundary in enumerate(boundaries):
+            lines.append(f'{name}_bucket{{{prefix}le="{boundary}"}} {buckets[index]:.1f}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {buckets[-1]:.1f}')
+        lines.append(f"{name}_sum{{{labels}}} {float(series['sum']):.6f}")
+        lines.append(f"{name}_count{{{labels}}} {float(series['count']):.1f}")
+
+
 def _is_sensitive_key(key: str) -> bool:
     key_normalized = key.strip().lower()
     if key_normalized.endswith("_configured"):
@@ -82,7 +148,20 @@ def emit_event(event: str, **fields: Any) -> None:
         "ts": datetime.now(UTC).isoformat(),
     }
     payload.update(fields)
-    logger.info(json.dumps(_redact_value(payload), ensure_ascii=False))
+    redacted = _redact_value(payload)
+    logger.info(json.dumps(redacted, ensure_ascii=False))
+    listener = _EVENT_LISTENER
+    if listener is not None:
+        try:
+            listener(event, {key: value for key, value in redacted.items() if key not in ("event", "service", "ts")})
+        except Exception:  # noqa: BLE001
+            logger.exception("event listener failed for %s", event)
+
+
+def set_event_listener(listener: Callable[[str, dict[str, Any]], None] | None) -> None:
+    """Forward every emitted event (redacted fields) to `listener`; it must not block."""
+    global _EVENT_LISTENER
+    _EVENT_LISTENER = listener
 
 
 def set_service_health(healthy: bool) -> None:
@@ -148,9 +227,69 @@ def observe_telegram_delivery_outcome(path: str, outcome: str) -> None:
         )
 
 
+def observe_sql_statement(query: str, duration_seconds: float, rows: int | None) -> None:
+    counter = _REQUEST_QUERY_COUNTER.get()
+    if counter is not None:
+        counter[0] += 1
+    with _METRICS_LOCK:
+        _observe_histogram(_SQL_STATEMENT_LATENCY, (query,), duration_seconds, _SQL_LATENCY_BUCKETS)
+        if rows is not None and rows >= 0:
+            _observe_histogram(_SQL_STATEMENT_ROWS, (query,), float(rows), _SQL_ROWS_BUCKETS)
+
+
+def observe_request_query_count(method: str, path: str, count: int) -> None:
+    with _METRICS_LOCK:
+        _observe_histogram(_REQUEST_QUERY_COUNT, (method, path), float(count), _REQUEST_QUERY_COUNT_BUCKETS)
+
+
+def register_db_pool_source(role: str, source: Callable[[], tuple[int, int, int] | None]) -> None:
+    """Register a (pool_size, checked_out, overflow) reader for an engine role; the latest wins."""
+    with _METRICS_LOCK:
+        _DB_POOL_SOURCES[role] = source
+
+
+def observe_db_pool_checkout(role: str, wait_seconds: float, *, timed_out: bool = False) -> None:
+    with _METRICS_LOCK:
+        _observe_histogram(_DB_POOL_CHECKOUT_WAIT, (role,), wait_seconds, _DB_POOL_WAIT_BUCKETS)
+        if timed_out:
+            _DB_POOL_CHECKOUT_TIMEOUTS_TOTAL[role] = _DB_POOL_CHECKOUT_TIMEOUTS_TOTAL.get(role, 0.0) + 1.0
+
+
+def observe_db_pool_connect(role: str) -> None:
+    with _METRICS_LOCK:
+        _DB_POOL_CONNECTIONS_OPENED_TOTAL[role] = _DB_POOL_CONNECTIONS_OPENED_TOTAL.get(role, 0.0) + 1.0
+
+
+def observe_cache_event(cache: str, event: str) -> None:
+    key = (cache, event)
+    with _METRICS_LOCK:
+        _CACHE_EVENTS_TOTAL[key] = _CACHE_EVENTS_TOTAL.get(key, 0.0) + 1.0
+
+
+def observe_audit_event(outcome: str) -> None:
+    with _METRICS_LOCK:
+        _AUDIT_EVENTS_TOTAL[outcome] = _AUDIT_EVENTS_TOTAL.get(outcome, 0.0) + 1.0
+
+
+def set_telegram_handler_executor_state(*, queue_depth: int, active_workers: int) -> None:
+    global _TELEGRAM_HANDLER_QUEUE_DEPTH, _TELEGRAM_HANDLER_ACTIVE_WORKERS
+    with _METRICS_LOCK:
+        _TELEGRAM_HANDLER_QUEUE_DEPTH = float(queue_depth)
+        _TELEGRAM_HANDLER_ACTIVE_WORKERS = float(active_workers)
+
+
+def observe_telegram_handler_wait(kind: str, wait_seconds: float) -> None:
+    with _METRICS_LOCK:
+        _observe_histogram(_TELEGRAM_HANDLER_WAIT, (kind,), wait_seconds, _REQUEST_LATENCY_BUCKETS)
+
+
 def render_metrics() -> tuple[bytes, str]:
     lines: list[str] = []
 
+    with _METRICS_LOCK:
+        pool_sources = sorted(_DB_POOL_SOURCES.items())
+    pool_states = [(role, state) for role, source in pool_sources if (state := source()) is not None]
+
     with _METRICS_LOCK:
         lines.append("# HELP bot_api_service_health Service health status (1=healthy, 0=unhealthy).")
         lines.append("# TYPE bot_api_service_health gauge")
@@ -222,6 +361,102 @@ def render_metrics() -> tuple[bytes, str]:
                 f'{{path="{_escape_label(path)}",outcome="{_escape_label(outcome)}"}} {value:.1f}'
             )
 
+        lines.append("# HELP bot_api_sql_statement_latency_seconds SQL statement latency by stable query name.")
+        lines.append("# TYPE bot_api_sql_statement_latency_seconds histogram")
+        _render_histogram(
+            lines,
+            "bot_api_sql_statement_latency_seconds",
+            ("query",),
+            _SQL_STATEMENT_LATENCY,
+            _SQL_LATENCY_BUCKETS,
+        )
+
+        lines.append("# HELP bot_api_sql_statement_rows Rows returned or affected per SQL statement.")
+        lines.append("# TYPE bot_api_sql_statement_rows histogram")
+        _render_histogram(lines, "bot_api_sql_statement_rows", ("query",), _SQL_STATEMENT_ROWS, _SQL_ROWS_BUCKETS)
+
+        lines.append("# HELP bot_api_request_queries SQL statements executed per HTTP request.")
+        lines.append("# TYPE bot_api_request_queries histogram")
+        _render_histogram(
+            lines,
+            "bot_api_request_queries",
+            ("method", "path"),
+            _REQUEST_QUERY_COUNT,
+            _REQUEST_QUERY_COUNT_BUCKETS,
+        )
+
+        lines.append("# HELP bot_api_db_pool_size Configured connection pool size by engine role.")
+        lines.append("# TYPE bot_api_db_pool_size gauge")
+        for role, (pool_size, _, _) in pool_states:
+            lines.append(f'bot_api_db_pool_size{{role="{_escape_label(role)}"}} {float(pool_size):.1f}')
+
+        lines.append("# HELP bot_api_db_pool_checked_out Connections currently checked out of the pool by engine role.")
+        lines.append("# TYPE bot_api_db_pool_checked_out gauge")
+        for role, (_, checked_out, _) in pool_states:
+            lines.append(f'bot_api_db_pool_checked_out{{role="{_escape_label(role)}"}} {float(checked_out):.1f}')
+
+        lines.append("# HELP bot_api_db_pool_overflow Overflow connections in use beyond the pool size by engine role.")
+        lines.append("# TYPE bot_api_db_pool_overflow gauge")
+        for role, (_, _, overflow) in pool_states:
+            lines.append(f'bot_api_db_pool_overflow{{role="{_escape_label(role)}"}} {float(overflow):.1f}')
+
+        lines.append("# HELP bot_api_db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.")
+        lines.append("# TYPE bot_api_db_pool_checkout_wait_seconds histogram")
+        _render_histogram(
+            lines,
+            "bot_api_db_pool_checkout_wait_seconds",
+            ("role",),
+            _DB_POOL_CHECKOUT_WAIT,
+            _DB_POOL_WAIT_BUCKETS,
+        )
+
+        lines.append("# HELP bot_api_db_pool_checkout_timeouts_total Pool checkouts that hit the pool timeout.")
+        lines.append("# TYPE bot_api_db_pool_checkout_timeouts_total counter")
+        for role, value in sorted(_DB_POOL_CHECKOUT_TIMEOUTS_TOTAL.items()):
+            lines.append(f'bot_api_db_pool_checkout_timeouts_total{{role="{_escape_label(role)}"}} {value:.1f}')
+
+        lines.append("# HELP bot_api_db_pool_connections_opened_total New database connections opened by the pool.")
+        lines.append("# TYPE bot_api_db_pool_connections_opened_total counter")
+        for role, value in sorted(_DB_POOL_CONNECTIONS_OPENED_TOTAL.items()):
+            lines.append(f'bot_api_db_pool_connections_opened_total{{role="{_escape_label(role)}"}} {value:.1f}')
+
+        lines.append("# HELP bot_api_cache_events_total In-process cache hits, misses, evictions and invalidations.")
+        lines.append("# TYPE bot_api_cache_events_total counter")
+        for (cache, event), value in sorted(_CACHE_EVENTS_TOTAL.items()):
+            lines.append(
+                "bot_api_cache_events_total"
+                f'{{cache="{_escape_label(cache)}",event="{_escape_label(event)}"}} {value:.1f}'
+            )
+
+        lines.append("# HELP bot_api_audit_events_total Audit events queued, written, retried, dropped or failed to write.")
+        lines.append("# TYPE bot_api_audit_events_total counter")
+        for outcome, value in sorted(_AUDIT_EVENTS_TOTAL.items()):
+            lines.append(f'bot_api_audit_events_total{{outcome="{_escape_label(outcome)}"}} {value:.1f}')
+
+        lines.append(
+            "# HELP bot_api_telegram_handler_queue_depth Telegram handler calls waiting for an executor worker."
+        )
+        lines.append("# TYPE bot_api_telegram_handler_queue_depth gauge")
+        lines.append(f"bot_api_telegram_handler_queue_depth {_TELEGRAM_HANDLER_QUEUE_DEPTH:.1f}")
+
+        lines.append(
+            "# HELP bot_api_telegram_handler_active_workers Executor workers running Telegram handler calls."
+        )
+        lines.append("# TYPE bot_api_telegram_handler_active_workers gauge")
+        lines.append(f"bot_api_telegram_handler_active_workers {_TELEGRAM_HANDLER_ACTIVE_WORKERS:.1f}")
+
+        lines.append(
+            "# HELP bot_api_telegram_handler_wait_seconds Time Telegram handler calls waited before a worker picked them up."
+        )
+        lines.append("# TYPE bot_api_telegram_handler_wait_seconds histogram")
+        _render_histogram(
+            lines,
+            "bot_api_telegram_handler_wait_seconds",
+            ("kind",),
+            _TELEGRAM_HANDLER_WAIT,
+            _REQUEST_LATENCY_BUCKETS,
+        )
+
     payload = "\n".join(lines) + "\n"
     return payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
 
@@ -239,19 +474,27 @@ def instrument_endpoint(
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             status_code = "200"
             started_at = time.perf_counter()
+            query_counter = [0]
+            counter_token = _REQUEST_QUERY_COUNTER.set(query_counter)
 
             try:
                 response = func(*args, **kwargs)
+            except DatabaseTimeoutError:
+                # Answered by the app's DatabaseTimeoutError handler as 503 with Retry-After.
+                status_code = "503"
+                raise
             except Exception:
                 status_code = "500"
                 raise
             finally:
+                _REQUEST_QUERY_COUNTER.reset(counter_token)
                 observe_request(
                     method=method_value,
                     path=path,
                     status_code=status_code,
                     duration_seconds=time.perf_counter() - started_at,
                 )
+                observe_request_query_count(method_value, path, query_counter[0])
 
             if booking_action and outcome_key and isinstance(response, dict):
                 observe_booking_outcome(booking_action, response.get(outcome_key) is True)
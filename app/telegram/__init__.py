@@ -1,4 +1,3 @@
-from app.telegram.handlers import configure_dispatcher
-
-__all__ = ["configure_dispatcher"]
+from app.telegram.handlers import close_notification_sender, configure_dispatcher, shutdown_handler_executor
 
+__all__ = ["close_notification_sender", "configure_dispatcher", "shutdown_handler_executor"]
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import json
 import os
 from dataclasses import dataclass, field
 from datetime import UTC, date, datetime, time as dt_time, timedelta
 from re import compile as re_compile
+from threading import RLock
 from time import monotonic
 from typing import Callable
 
@@ -14,18 +16,27 @@ from sqlalchemy.engine import Engine
 from app.auth import RoleRepository, authorize_command
 from app.auth.messages import RU_MESSAGES
 from app.booking import (
+    AvailabilityService,
     BookingFlowRepository,
+    GroupParticipantRequest,
     MasterAdminService,
     MasterDayOffCommand,
     MasterLunchBreakCommand,
     MasterManualBookingCommand,
     MasterScheduleService,
+    MasterWeekSchedule,
+    RU_BOOKING_MESSAGES,
     SERVICE_OPTION_LABELS_RU,
     TelegramBookingFlowService,
+    get_master_roster,
+    intervals_overlap,
     list_service_options,
     resolve_service_duration_minutes,
 )
+from app.booking.schedule import MASTER_WEEK_VIEW_DAYS
+from app.db.routing import route_read
 from app.db.seed import BOOTSTRAP_MASTER_TELEGRAM_ID_ENV, resolve_bootstrap_master_telegram_id
+from app.db.timeouts import OPERATION_INTERACTIVE_READ, connect_operation
 from app.observability import emit_event, observe_master_admin_outcome
 from app.timezone import (
     business_day_bounds,
@@ -40,14 +51,17 @@ from app.telegram.presentation import (
     chunk_inline_buttons,
     format_ru_date,
     format_ru_datetime,
+    format_ru_next_free,
     format_ru_slot_range,
     format_ru_time,
+    format_ru_weekday_date,
 )
 
 CALLBACK_DATA_MAX_LENGTH = 64
 CALLBACK_PREFIX = "hb1"
 BOOKING_DATE_HORIZON_DAYS = 60
 BOOKING_DATE_PAGE_SIZE = 7
+FULL_DAY_LABEL_PREFIX = "✖ "
 _MASTER_CANCEL_REASONS = {
     "busy": "Плотная загрузка мастера.",
     "sick": "Мастер заболел.",
@@ -59,6 +73,7 @@ _MASTER_LUNCH_PRESETS = {
     "p18": ("18:00:00", "19:00:00"),
 }
 _MASTER_ADMIN_LIMIT = 20
+_MASTER_WEEK_MAX_WINDOWS = 4
 
 _ALLOWED_ACTIONS = {
     "hm",
@@ -72,6 +87,9 @@ _ALLOWED_ACTIONS = {
     "cgf",
     "cc",
     "csm",
+    "csa",
+    "cas",
+    "cae",
     "css",
     "csd",
     "cdp",
@@ -80,6 +98,7 @@ _ALLOWED_ACTIONS = {
     "cci",
     "ccn",
     "msv",
+    "mwv",
     "msd",
     "msu",
     "mlm",
@@ -104,6 +123,7 @@ _ALLOWED_ACTIONS = {
 }
 _CONTEXT_PATTERN = re_compile(r"^[A-Za-z0-9_-]{1,32}$")
 _SLOT_TOKEN_PATTERN = re_compile(r"^\d{12}$")
+_MASTER_SLOT_TOKEN_PATTERN = re_compile(r"^(\d{1,19})_(\d{12})$")
 _DATE_TOKEN_PATTERN = re_compile(r"^\d{8}$")
 _PAGE_TOKEN_PATTERN = re_compile(r"^p\d{1,2}$")
 
@@ -114,6 +134,9 @@ _ACTION_REQUIRED_COMMAND = {
     "cga": "client:book",
     "cgf": "client:book",
     "csm": "client:book",
+    "csa": "client:book",
+    "cas": "client:book",
+    "cae": "client:book",
     "css": "client:book",
     "csd": "client:book",
     "cdp": "client:book",
@@ -125,6 +148,7 @@ _ACTION_REQUIRED_COMMAND = {
     "mm": "master:schedule",
     "mr": "master:schedule",
     "msv": "master:schedule",
+    "mwv": "master:schedule",
     "msd": "master:day-off",
     "msu": "master:day-off",
     "mlm": "master:lunch",
@@ -154,6 +178,8 @@ _MENU_MASTER = "master_menu"
 
 _MENU_CLIENT_MASTER_SELECT = "client_master_select"
 _MENU_CLIENT_SERVICE_SELECT = "client_service_select"
+_MENU_CLIENT_ANY_SERVICE_SELECT = "client_any_service_select"
+_MENU_CLIENT_ANY_SLOT_SELECT = "client_any_slot_select"
 _MENU_CLIENT_DATE_SELECT = "client_date_select"
 _MENU_CLIENT_SLOT_SELECT = "client_slot_select"
 _MENU_CLIENT_CONFIRM = "client_confirm"
@@ -163,6 +189,7 @@ _MENU_CLIENT_GROUP_PARTICIPANT_INPUT = "client_group_participant_input"
 _MENU_CLIENT_GROUP_POST_CONFIRM = "client_group_post_confirm"
 
 _MENU_MASTER_SCHEDULE_DATE_SELECT = "master_schedule_date_select"
+_MENU_MASTER_WEEK_VIEW = "master_week_view"
 _MENU_MASTER_DAY_OFF_SELECT = "master_day_off_select"
 _MENU_MASTER_LUNCH_SELECT = "master_lunch_select"
 _MENU_MASTER_MANUAL_SERVICE_SELECT = "master_manual_service_select"
@@ -183,9 +210,11 @@ _MENU_MASTER_ADMIN_RENAME_INPUT = "master_admin_rename_input"
 _MENU_ALLOWED_ACTIONS = {
     _MENU_ROOT: {"hm", "cm", "mm"},
     _MENU_CLIENT: {"hm", "bk", "cb", "cg", "cc"},
-    _MENU_MASTER: {"hm", "bk", "msv", "msd", "mlm", "msb", "msc", "mam"},
-    _MENU_CLIENT_MASTER_SELECT: {"hm", "bk", "csm"},
+    _MENU_MASTER: {"hm", "bk", "msv", "mwv", "msd", "mlm", "msb", "msc", "mam"},
+    _MENU_CLIENT_MASTER_SELECT: {"hm", "bk", "csm", "csa"},
     _MENU_CLIENT_SERVICE_SELECT: {"hm", "bk", "css"},
+    _MENU_CLIENT_ANY_SERVICE_SELECT: {"hm", "bk", "cas"},
+    _MENU_CLIENT_ANY_SLOT_SELECT: {"hm", "bk", "cae"},
     _MENU_CLIENT_DATE_SELECT: {"hm", "bk", "csd", "cdp"},
     _MENU_CLIENT_SLOT_SELECT: {"hm", "bk", "csl"},
     _MENU_CLIENT_CONFIRM: {"hm", "bk", "ccf"},
@@ -194,6 +223,7 @@ _MENU_ALLOWED_ACTIONS = {
     _MENU_CLIENT_GROUP_PARTICIPANT_INPUT: {"hm", "bk"},
     _MENU_CLIENT_GROUP_POST_CONFIRM: {"hm", "bk", "cga", "cgf"},
     _MENU_MASTER_SCHEDULE_DATE_SELECT: {"hm", "mr", "msv"},
+    _MENU_MASTER_WEEK_VIEW: {"hm", "mr", "mwv"},
     _MENU_MASTER_DAY_OFF_SELECT: {"hm", "mr", "msu"},
     _MENU_MASTER_LUNCH_SELECT: {"hm", "mr", "mls"},
     _MENU_MASTER_MANUAL_SERVICE_SELECT: {"hm", "mr", "mbs"},
@@ -220,6 +250,7 @@ _MENU_TEXT = {
 }
 _START_GREETING = "Добро пожаловать в барбершоп."
 _MASTER_DISPLAY_NAME_FALLBACK = "Мастер (имя не указано)"
+_ANY_MASTER_LABEL = "Любой мастер (ближайшее время)"
 _MASTER_ADMIN_ADD_NICKNAME_PROMPT = (
     "Введите nickname пользователя для назначения мастером (формат: @nickname)."
 )
@@ -268,35 +299,40 @@ class CallbackStateStore:
         self._ttl_seconds = ttl_seconds
         self._now = now
         self._states: dict[int, _UserMenuState] = {}
+        self._lock = RLock()
 
     def current_menu(self, telegram_user_id: int) -> str:
-        state = self._get_state(telegram_user_id)
-        return state.menu if state is not None else _MENU_ROOT
+        with self._lock:
+            state = self._get_state(telegram_user_id)
+            return state.menu if state is not None else _MENU_ROOT
 
     def set_menu(self, telegram_user_id: int, menu: str, *, reset_context: bool = False) -> None:
-        context = {}
-        state = self._get_state(telegram_user_id)
-        if state is not None and not reset_context:
-            context = dict(state.context)
-        self._states[telegram_user_id] = _UserMenuState(
-            menu=menu,
-            expires_at=self._now() + self._ttl_seconds,
-            context=context,
-        )
+        with self._lock:
+            context = {}
+            state = self._get_state(telegram_user_id)
+            if state is not None and not reset_context:
+                context = dict(state.context)
+            self._states[telegram_user_id] = _UserMenuState(
+                menu=menu,
+                expires_at=self._now() + self._ttl_seconds,
+                context=context,
+            )
 
     def set_context_value(self, telegram_user_id: int, key: str, value: str) -> None:
-        state = self._get_state(telegram_user_id)
-        if state is None:
-            self.set_menu(telegram_user_id, _MENU_ROOT)
-            state = self._states[telegram_user_id]
-        state.context[key] = value
-        state.expires_at = self._now() + self._ttl_seconds
+        with self._lock:
+            state = self._get_state(telegram_user_id)
+            if state is None:
+                self.set_menu(telegram_user_id, _MENU_ROOT)
+                state = self._states[telegram_user_id]
+            state.context[key] = value
+            state.expires_at = self._now() + self._ttl_seconds
 
     def get_context_value(self, telegram_user_id: int, key: str) -> str | None:
-        state = self._get_state(telegram_user_id)
-        if state is None:
-            return None
-        return state.context.get(key)
+        with self._lock:
+            state = self._get_state(telegram_user_id)
+            if state is None:
+                return None
+            return state.context.get(key)
 
     def mark_stale(self, telegram_user_id: int, *, action: str) -> bool:
         menu = self.current_menu(telegram_user_id)
@@ -325,6 +361,7 @@ class TelegramCallbackRouter:
         self._roles = RoleRepository(engine)
         self._flow = TelegramBookingFlowService(engine)
         self._flow_repo = BookingFlowRepository(engine)
+        self._availability = AvailabilityService(engine)
         self._schedule = MasterScheduleService(engine)
         self._master_admin = MasterAdminService(engine)
         self._bootstrap_master_telegram_user_id = (
@@ -452,6 +489,9 @@ class TelegramCallbackRouter:
             "cga": lambda user_id, _: self._handle_client_group_add_next(telegram_user_id=user_id),
             "cgf": lambda user_id, _: self._handle_client_group_finish(telegram_user_id=user_id),
             "csm": self._handle_client_select_master,
+            "csa": lambda user_id, _: self._handle_client_select_any_master(telegram_user_id=user_id),
+            "cas": self._handle_client_any_select_service,
+            "cae": self._handle_client_any_select_slot,
             "css": self._handle_client_select_service,
             "cdp": self._handle_client_date_page,
             "csd": self._handle_client_select_date,
@@ -461,6 +501,7 @@ class TelegramCallbackRouter:
             "cci": self._handle_client_cancel_prepare,
             "ccn": self._handle_client_cancel_confirm,
             "msv": self._handle_master_view_schedule,
+            "mwv": self._handle_master_week_view,
             "msd": lambda user_id, _: self._handle_master_day_off_start(telegram_user_id=user_id),
             "msu": self._handle_master_day_off_apply,
             "mlm": lambda user_id, _: self._handle_master_lunch_start(telegram_user_id=user_id),
@@ -672,7 +713,7 @@ class TelegramCallbackRouter:
     def _handle_client_group_start(self, *, telegram_user_id: int) -> CallbackHandleResult:
         self._state.set_menu(telegram_user_id, _MENU_CLIENT_GROUP_PARTICIPANT_INPUT, reset_context=True)
         self._state.set_context_value(telegram_user_id, "group_mode", "1")
-        self._state.set_context_value(telegram_user_id, "group_created_count", "0")
+        self._state.set_context_value(telegram_user_id, "group_participants", "[]")
         self._state.set_context_value(telegram_user_id, "group_booking_key", utc_now().strftime("g%Y%m%d%H%M%S"))
         return CallbackHandleResult(
             text=_CLIENT_GROUP_PARTICIPANT_PROMPT,
@@ -689,15 +730,47 @@ class TelegramCallbackRouter:
         )
 
     def _handle_client_group_finish(self, *, telegram_user_id: int) -> CallbackHandleResult:
-        created_count_raw = self._state.get_context_value(telegram_user_id, "group_created_count") or "0"
-        try:
-            created_count = int(created_count_raw)
-        except ValueError:
-            created_count = 0
+        participants = _load_group_participants(self._state.get_context_value(telegram_user_id, "group_participants"))
+        group_booking_key = self._state.get_context_value(telegram_user_id, "group_booking_key") or utc_now().strftime(
+            "g%Y%m%d%H%M%S"
+        )
         self._state.set_menu(telegram_user_id, _MENU_CLIENT, reset_context=True)
+        if not participants:
+            return CallbackHandleResult(
+                text="Групповая запись завершена. Добавлено участников: 0.",
+                reply_markup=build_menu_markup(_MENU_CLIENT),
+            )
+
+        # Every queued participant is booked in one transaction: all of them or none.
+        response = self._flow.confirm_group(
+            client_telegram_user_id=telegram_user_id,
+            booking_group_key=group_booking_key,
+            participants=participants,
+        )
+        if response.get("created") is not True:
+            failed_name = response.get("participant_name")
+            failed_text = f"Участник '{failed_name}': " if failed_name else ""
+            return CallbackHandleResult(
+                text=(
+                    f"{failed_text}{response.get('message', '')}\n"
+                    "Групповая запись не создана, ни один участник не записан."
+                ),
+                reply_markup=build_menu_markup(_MENU_CLIENT),
+            )
+        lines = [
+            f"- {participant.participant_name}: {format_ru_datetime(participant.slot_start)}"
+            for participant in participants
+        ]
         return CallbackHandleResult(
-            text=f"Групповая запись завершена. Добавлено участников: {created_count}.",
+            text="\n".join(
+                [
+                    str(response.get("message", "")),
+                    f"Групповая запись завершена. Добавлено участников: {len(participants)}.",
+                    *lines,
+                ]
+            ),
             reply_markup=build_menu_markup(_MENU_CLIENT),
+            notifications=_coerce_notifications(response.get("notifications")),
         )
 
     def _handle_client_select_master(self, telegram_user_id: int, context: str | None) -> CallbackHandleResult:
@@ -725,10 +798,49 @@ class TelegramCallbackRouter:
             reply_markup=build_client_service_markup(service_options),
         )
 
+    def _handle_client_select_any_master(self, *, telegram_user_id: int) -> CallbackHandleResult:
+        self._state.set_menu(telegram_user_id, _MENU_CLIENT_ANY_SERVICE_SELECT)
+        return CallbackHandleResult(
+            text=RU_BOOKING_MESSAGES["choose_service"],
+            reply_markup=build_client_service_markup(list_service_options(), action="cas"),
+        )
+
+    def _handle_client_any_select_service(self, telegram_user_id: int, context: str | None) -> CallbackHandleResult:
+        if context is None or context not in SERVICE_OPTION_LABELS_RU:
+            return self._invalid_response(telegram_user_id=telegram_user_id)
+
+        response = self._flow.find_earliest_slots(service_type=context)
+        slots = response.get("slots", [])
+        if not isinstance(slots, list) or not slots:
+            self._state.set_menu(telegram_user_id, _MENU_CLIENT_ANY_SERVICE_SELECT)
+            return CallbackHandleResult(
+                text=str(response.get("message", RU_BOOKING_MESSAGES["no_free_slots"])),
+                reply_markup=build_client_service_markup(list_service_options(), action="cas"),
+            )
+
+        self._state.set_context_value(telegram_user_id, "service_type", context)
+        self._state.set_menu(telegram_user_id, _MENU_CLIENT_ANY_SLOT_SELECT)
+        return CallbackHandleResult(
+            text=str(response.get("message", RU_BOOKING_MESSAGES["choose_earliest_slot"])),
+            reply_markup=build_client_earliest_slot_markup(slots),
+        )
+
+    def _handle_client_any_select_slot(self, telegram_user_id: int, context: str | None) -> CallbackHandleResult:
+        match = _MASTER_SLOT_TOKEN_PATTERN.match(context or "")
+        if match is None:
+            return self._invalid_response(telegram_user_id=telegram_user_id)
+        if self._state.get_context_value(telegram_user_id, "service_type") is None:
+            return self._stale_response(telegram_user_id=telegram_user_id)
+        master_id = int(match.group(1))
+        self._state.set_context_value(telegram_user_id, "master_id", str(master_id))
+        self._state.set_context_value(telegram_user_id, "master_name", self._resolve_master_display_name(master_id))
+        return self._handle_client_select_slot(telegram_user_id, match.group(2))
+
     def _handle_client_select_service(self, telegram_user_id: int, context: str | None) -> CallbackHandleResult:
         if context is None or context not in SERVICE_OPTION_LABELS_RU:
             return self._invalid_response(telegram_user_id=telegram_user_id)
-        if self._state.get_context_value(telegram_user_id, "master_id") is None:
+        master_id_raw = self._state.get_context_value(telegram_user_id, "master_id")
+        if master_id_raw is None:
             return self._stale_response(telegram_user_id=telegram_user_id)
 
         self._state.set_context_value(telegram_user_id, "service_type", context)
@@ -736,19 +848,15 @@ class TelegramCallbackRouter:
         self._state.set_menu(telegram_user_id, _MENU_CLIENT_DATE_SELECT)
         return CallbackHandleResult(
             text="Выберите дату для записи.",
-            reply_markup=build_booking_date_markup(
-                date_action="csd",
-                page_action="cdp",
-                page=0,
-            ),
+            reply_markup=self._client_booking_date_markup(master_id_raw=master_id_raw, service_type=context, page=0),
         )
 
     def _handle_client_date_page(self, telegram_user_id: int, context: str | None) -> CallbackHandleResult:
         if context is None or not _PAGE_TOKEN_PATTERN.match(context):
             return self._invalid_response(telegram_user_id=telegram_user_id)
-        if self._state.get_context_value(telegram_user_id, "master_id") is None:
-            return self._stale_response(telegram_user_id=telegram_user_id)
-        if self._state.get_context_value(telegram_user_id, "service_type") is None:
+        master_id_raw = self._state.get_context_value(telegram_user_id, "master_id")
+        service_type = self._state.get_context_value(telegram_user_id, "service_type")
+        if master_id_raw is None or service_type is None:
             return self._stale_response(telegram_user_id=telegram_user_id)
         try:
             page = _parse_page_token(context)
@@ -761,9 +869,9 @@ class TelegramCallbackRouter:
         self._state.set_menu(telegram_user_id, _MENU_CLIENT_DATE_SELECT)
         return CallbackHandleResult(
             text="Выберите дату для записи.",
-            reply_markup=build_booking_date_markup(
-                date_action="csd",
-                page_action="cdp",
+            reply_markup=self._client_booking_date_markup(
+                master_id_raw=master_id_raw,
+                service_type=service_type,
                 page=page,
             ),
         )
@@ -791,9 +899,9 @@ class TelegramCallbackRouter:
             self._state.set_menu(telegram_user_id, _MENU_CLIENT_DATE_SELECT)
             return CallbackHandleResult(
                 text=f"{response.get('message', 'Выберите доступный слот.')}\nНа выбранную дату свободных слотов нет.",
-                reply_markup=build_booking_date_markup(
-                    date_action="csd",
-                    page_action="cdp",
+                reply_markup=self._client_booking_date_markup(
+                    master_id_raw=master_id_raw,
+                    service_type=service_type,
                     page=_booking_page_for_date(on_date),
                 ),
             )
@@ -804,6 +912,30 @@ class TelegramCallbackRouter:
             reply_markup=build_slot_markup(slots, action="csl"),
         )
 
+    def _client_booking_date_markup(self, *, master_id_raw: str, service_type: str, page: int) -> InlineKeyboardMarkup:
+        return build_booking_date_markup(
+            date_action="csd",
+            page_action="cdp",
+            page=page,
+            full_dates=self._full_booking_dates(master_id_raw=master_id_raw, service_type=service_type, page=page),
+        )
+
+    def _full_booking_dates(self, *, master_id_raw: str, service_type: str, page: int) -> frozenset[date]:
+        try:
+            master_id = int(master_id_raw)
+        except ValueError:
+            return frozenset()
+        start_date, _ = _booking_date_horizon()
+        start_index = min(max(page, 0), _booking_max_page_index()) * BOOKING_DATE_PAGE_SIZE
+        summaries = self._availability.summarize_range(
+            master_id,
+            start_date + timedelta(days=start_index),
+            min(BOOKING_DATE_PAGE_SIZE, BOOKING_DATE_HORIZON_DAYS - start_index),
+            service_type,
+            now=utc_now(),
+        )
+        return frozenset(summary.on_date for summary in summaries if summary.free_slots == 0)
+
     def _handle_client_select_slot(self, telegram_user_id: int, context: str | None) -> CallbackHandleResult:
         if context is None or not _SLOT_TOKEN_PATTERN.match(context):
             return self._invalid_response(telegram_user_id=telegram_user_id)
@@ -842,25 +974,22 @@ class TelegramCallbackRouter:
 
         group_mode = self._state.get_context_value(telegram_user_id, "group_mode") == "1"
         group_participant_name = self._state.get_context_value(telegram_user_id, "group_participant_name")
-        group_booking_key = self._state.get_context_value(telegram_user_id, "group_booking_key") or utc_now().strftime(
-            "g%Y%m%d%H%M%S"
-        )
         if group_mode and group_participant_name:
-            response = self._flow.confirm_group_participant(
-                client_telegram_user_id=telegram_user_id,
-                master_id=master_id,
-                service_type=service_type,
-                slot_start=slot_start,
-                participant_name=group_participant_name,
-                booking_group_key=group_booking_key,
-            )
-        else:
-            response = self._flow.confirm(
-                client_telegram_user_id=telegram_user_id,
-                master_id=master_id,
-                service_type=service_type,
-                slot_start=slot_start,
+            return self._queue_group_participant(
+                telegram_user_id=telegram_user_id,
+                participant=GroupParticipantRequest(
+                    participant_name=group_participant_name,
+                    master_id=master_id,
+                    service_type=service_type,
+                    slot_start=slot_start,
+                ),
             )
+        response = self._flow.confirm(
+            client_telegram_user_id=telegram_user_id,
+            master_id=master_id,
+            service_type=service_type,
+            slot_start=slot_start,
+        )
         result_message = str(response.get("message", ""))
         if response.get("created") is True:
             duration_minutes = self._resolve_service_duration_minutes(service_type=service_type)
@@ -873,31 +1002,55 @@ class TelegramCallbackRouter:
                 f"Слот: {format_ru_slot_range(slot_start, duration_minutes=duration_minutes)} "
                 f"({format_ru_datetime(slot_start)})"
             ).strip()
-            if group_mode and group_participant_name:
-                created_count_raw = self._state.get_context_value(telegram_user_id, "group_created_count") or "0"
-                try:
-                    created_count = int(created_count_raw)
-                except ValueError:
-                    created_count = 0
-                created_count += 1
-                self._state.set_context_value(telegram_user_id, "group_created_count", str(created_count))
-                self._state.set_context_value(telegram_user_id, "group_booking_key", group_booking_key)
-                self._state.set_context_value(telegram_user_id, "group_participant_name", "")
-                self._state.set_menu(telegram_user_id, _MENU_CLIENT_GROUP_POST_CONFIRM)
+        self._state.set_menu(telegram_user_id, _MENU_CLIENT, reset_context=True)
+        return CallbackHandleResult(
+            text=result_message,
+            reply_markup=build_menu_markup(_MENU_CLIENT),
+            notifications=_coerce_notifications(response.get("notifications")),
+        )
+
+    def _queue_group_participant(
+        self,
+        *,
+        telegram_user_id: int,
+        participant: GroupParticipantRequest,
+    ) -> CallbackHandleResult:
+        participants = _load_group_participants(self._state.get_context_value(telegram_user_id, "group_participants"))
+        duration_minutes = self._resolve_service_duration_minutes(service_type=participant.service_type)
+        slot_end = participant.slot_start + timedelta(minutes=duration_minutes)
+        self._state.set_menu(telegram_user_id, _MENU_CLIENT_GROUP_POST_CONFIRM)
+        for queued in participants:
+            if queued.master_id != participant.master_id:
+                continue
+            queued_minutes = self._resolve_service_duration_minutes(service_type=queued.service_type)
+            if intervals_overlap(
+                start_at=participant.slot_start,
+                end_at=slot_end,
+                other_start=queued.slot_start,
+                other_end=queued.slot_start + timedelta(minutes=queued_minutes),
+            ):
                 return CallbackHandleResult(
                     text=(
-                        f"Участник '{group_participant_name}' добавлен.\n"
-                        f"{result_message}\n"
-                        "Выберите следующее действие."
+                        f"{RU_BOOKING_MESSAGES['slot_not_available']}\n"
+                        f"Слот уже выбран для участника '{queued.participant_name}'. Выберите следующее действие."
                     ),
                     reply_markup=build_client_group_post_confirm_markup(),
-                    notifications=_coerce_notifications(response.get("notifications")),
                 )
-        self._state.set_menu(telegram_user_id, _MENU_CLIENT, reset_context=True)
+        participants.append(participant)
+        self._state.set_context_value(telegram_user_id, "group_participants", _dump_group_participants(participants))
+        self._state.set_context_value(telegram_user_id, "group_participant_name", "")
+        master_name = self._state.get_context_value(telegram_user_id, "master_name")
+        if master_name is None:
+            master_name = self._resolve_master_display_name(participant.master_id)
+        slot_range = format_ru_slot_range(participant.slot_start, duration_minutes=duration_minutes)
         return CallbackHandleResult(
-            text=result_message,
-            reply_markup=build_menu_markup(_MENU_CLIENT),
-            notifications=_coerce_notifications(response.get("notifications")),
+            text=(
+                f"Участник '{participant.participant_name}' добавлен в группу ({len(participants)}).\n"
+                f"Мастер: {master_name}\n"
+                f"Слот: {slot_range} ({format_ru_datetime(participant.slot_start)})\n"
+                "Записи будут созданы после завершения группы. Выберите следующее действие."
+            ),
+            reply_markup=build_client_group_post_confirm_markup(),
         )
 
     def _handle_client_cancel_list(self, *, telegram_user_id: int) -> CallbackHandleResult:
@@ -997,7 +1150,8 @@ class TelegramCallbackRouter:
             return self._invalid_response(telegram_user_id=telegram_user_id)
 
         day_start, day_end = business_day_bounds(on_date)
-        with self._engine.connect() as conn:
+        read_engine = route_read(self._engine, telegram_user_id=telegram_user_id, master_id=master_ctx.master_id)
+        with connect_operation(read_engine, OPERATION_INTERACTIVE_READ) as conn:
             master = conn.execute(
                 text(
                     """
@@ -1061,6 +1215,31 @@ class TelegramCallbackRouter:
             reply_markup=build_menu_markup(_MENU_MASTER),
         )
 
+    def _handle_master_week_view(self, telegram_user_id: int, context: str | None) -> CallbackHandleResult:
+        today = business_now().date()
+        if context is None:
+            start_date = today
+        else:
+            try:
+                start_date = _parse_date_token(context)
+            except ValueError:
+                return self._invalid_response(telegram_user_id=telegram_user_id)
+            if not _is_date_in_booking_horizon(start_date, today=today):
+                return self._invalid_response(telegram_user_id=telegram_user_id)
+
+        week = self._schedule.get_week_schedule(master_telegram_user_id=telegram_user_id, start_date=start_date)
+        if week is None:
+            return CallbackHandleResult(
+                text="Мастер не найден.",
+                reply_markup=build_menu_markup(_MENU_MASTER),
+            )
+
+        self._state.set_menu(telegram_user_id, _MENU_MASTER_WEEK_VIEW)
+        return CallbackHandleResult(
+            text=format_master_week_schedule(week),
+            reply_markup=build_master_week_markup(start_date=start_date, today=today),
+        )
+
     def _handle_master_day_off_start(self, *, telegram_user_id: int) -> CallbackHandleResult:
         self._state.set_menu(telegram_user_id, _MENU_MASTER_DAY_OFF_SELECT)
         return CallbackHandleResult(
@@ -1498,7 +1677,10 @@ class TelegramCallbackRouter:
             return []
 
         now_utc = utc_now()
-        with self._engine.connect() as conn:
+        with connect_operation(
+            route_read(self._engine, telegram_user_id=telegram_user_id),
+            OPERATION_INTERACTIVE_READ,
+        ) as conn:
             try:
                 rows = conn.execute(
                     text(
@@ -1559,8 +1741,7 @@ class TelegramCallbackRouter:
         return None
 
     def _resolve_service_duration_minutes(self, *, service_type: str) -> int:
-        with self._engine.connect() as conn:
-            duration = resolve_service_duration_minutes(service_type, connection=conn)
+        duration = resolve_service_duration_minutes(service_type, engine=self._engine)
         return duration if duration is not None else 60
 
     def _list_master_future_bookings(self, *, telegram_user_id: int) -> list[dict[str, object]]:
@@ -1569,7 +1750,7 @@ class TelegramCallbackRouter:
             return []
 
         now_utc = utc_now()
-        with self._engine.connect() as conn:
+        with connect_operation(self._engine, OPERATION_INTERACTIVE_READ) as conn:
             rows = conn.execute(
                 text(
                     """
@@ -1638,6 +1819,10 @@ class TelegramCallbackRouter:
         return build_root_menu_markup()
 
     def _resolve_master_display_name(self, master_id: int) -> str:
+        master = get_master_roster(self._engine).get(master_id)
+        if master is not None:
+            return _format_master_display_name(master_id=master_id, raw_display_name=master.display_name)
+        # Inactive masters are not in the roster but still label past bookings.
         with self._engine.connect() as conn:
             row = conn.execute(
                 text(
@@ -1802,6 +1987,7 @@ def build_menu_markup(menu: str) -> InlineKeyboardMarkup:
         rows = chunk_inline_buttons(
             [
                 InlineKeyboardButton(text="Просмотр расписания", callback_data=encode_callback_data(action="msv")),
+                InlineKeyboardButton(text="Неделя", callback_data=encode_callback_data(action="mwv")),
                 InlineKeyboardButton(text="Выходной день", callback_data=encode_callback_data(action="msd")),
                 InlineKeyboardButton(text="Обед", callback_data=encode_callback_data(action="mlm")),
                 InlineKeyboardButton(text="Ручная запись", callback_data=encode_callback_data(action="msb")),
@@ -1831,6 +2017,53 @@ def build_menu_markup(menu: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
+def format_master_week_schedule(week: MasterWeekSchedule) -> str:
+    first_date = week.days[0].on_date
+    last_date = week.days[-1].on_date
+    lines = [
+        f"Неделя {format_ru_date(first_date)} - {format_ru_date(last_date)}:",
+        f"- Профиль: {week.display_name}",
+        f"- Обед: {format_ru_time(week.lunch_start)} - {format_ru_time(week.lunch_end)}",
+    ]
+    for day in week.days:
+        parts = [format_ru_weekday_date(day.on_date), f"записей: {len(day.bookings)}"]
+        if day.free_windows:
+            windows = [
+                f"{format_ru_time(start_at)}-{format_ru_time(end_at)}"
+                for start_at, end_at in day.free_windows[:_MASTER_WEEK_MAX_WINDOWS]
+            ]
+            if len(day.free_windows) > _MASTER_WEEK_MAX_WINDOWS:
+                windows.append("…")
+            parts.append(f"свободно: {', '.join(windows)}")
+        else:
+            parts.append("выходной" if day.has_day_off else "свободных окон нет")
+        lines.append(" · ".join(parts))
+    return "\n".join(lines)
+
+
+def build_master_week_markup(*, start_date: date, today: date) -> InlineKeyboardMarkup:
+    buttons: list[InlineKeyboardButton] = []
+    next_start = start_date + timedelta(days=MASTER_WEEK_VIEW_DAYS)
+    if start_date > today:
+        previous_start = max(start_date - timedelta(days=MASTER_WEEK_VIEW_DAYS), today)
+        buttons.append(
+            InlineKeyboardButton(
+                text="Предыдущая неделя",
+                callback_data=encode_callback_data(action="mwv", context=previous_start.strftime("%Y%m%d")),
+            )
+        )
+    if _is_date_in_booking_horizon(next_start, today=today):
+        buttons.append(
+            InlineKeyboardButton(
+                text="Следующая неделя",
+                callback_data=encode_callback_data(action="mwv", context=next_start.strftime("%Y%m%d")),
+            )
+        )
+    rows = chunk_inline_buttons(buttons, max_per_row=MOBILE_MENU_MAX_BUTTONS_PER_ROW)
+    rows.extend(_back_and_home_rows(action_back="mr"))
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
 def build_client_master_markup(masters: list[object]) -> InlineKeyboardMarkup:
     buttons: list[InlineKeyboardButton] = []
     for item in masters:
@@ -1840,6 +2073,9 @@ def build_client_master_markup(masters: list[object]) -> InlineKeyboardMarkup:
         if not isinstance(master_id, int):
             continue
         name = _format_master_display_name(master_id=master_id, raw_display_name=item.get("display_name"))
+        next_free_at = item.get("next_free_at")
+        if isinstance(next_free_at, str):
+            name = f"{name} · {format_ru_next_free(_as_datetime(next_free_at), today=business_now().date())}"
         buttons.append(
             InlineKeyboardButton(
                 text=name,
@@ -1847,12 +2083,40 @@ def build_client_master_markup(masters: list[object]) -> InlineKeyboardMarkup:
             )
         )
     rows = chunk_inline_buttons(buttons, max_per_row=MOBILE_MENU_MAX_BUTTONS_PER_ROW)
+    if buttons:
+        rows.append([InlineKeyboardButton(text=_ANY_MASTER_LABEL, callback_data=encode_callback_data(action="csa"))])
+    rows.extend(_back_and_home_rows(action_back="bk"))
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def build_client_earliest_slot_markup(slots: list[object]) -> InlineKeyboardMarkup:
+    rows: list[list[InlineKeyboardButton]] = []
+    for item in slots:
+        if not isinstance(item, dict):
+            continue
+        master_id = item.get("master_id")
+        start_at = item.get("start_at")
+        if not isinstance(master_id, int) or not isinstance(start_at, str):
+            continue
+        slot_start = _as_datetime(start_at)
+        name = _format_master_display_name(master_id=master_id, raw_display_name=item.get("master_name"))
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=f"{format_ru_datetime(slot_start)} · {name}",
+                    callback_data=encode_callback_data(
+                        action="cae",
+                        context=f"{master_id}_{_format_slot_token(slot_start)}",
+                    ),
+                )
+            ]
+        )
     rows.extend(_back_and_home_rows(action_back="bk"))
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
-def build_client_service_markup(service_options: list[object]) -> InlineKeyboardMarkup:
-    buttons = _service_buttons(service_options=service_options, action="css")
+def build_client_service_markup(service_options: list[object], *, action: str = "css") -> InlineKeyboardMarkup:
+    buttons = _service_buttons(service_options=service_options, action=action)
     rows = chunk_inline_buttons(buttons, max_per_row=MOBILE_MENU_MAX_BUTTONS_PER_ROW)
     rows.extend(_back_and_home_rows(action_back="bk"))
     return InlineKeyboardMarkup(inline_keyboard=rows)
@@ -1871,6 +2135,7 @@ def build_booking_date_markup(
     page_action: str,
     page: int = 0,
     action_back: str = "bk",
+    full_dates: frozenset[date] = frozenset(),
 ) -> InlineKeyboardMarkup:
     today = business_now().date()
     start_date, _ = _booking_date_horizon(today=today)
@@ -1885,7 +2150,7 @@ def build_booking_date_markup(
         token = day.strftime("%Y%m%d")
         buttons.append(
             InlineKeyboardButton(
-                text=format_ru_date(day),
+                text=f"{FULL_DAY_LABEL_PREFIX}{format_ru_date(day)}" if day in full_dates else format_ru_date(day),
                 callback_data=encode_callback_data(action=date_action, context=token),
             )
         )
@@ -2171,6 +2436,42 @@ def _format_master_display_name(*, master_id: int, raw_display_name: object) ->
     return _MASTER_DISPLAY_NAME_FALLBACK
 
 
+def _load_group_participants(raw: str | None) -> list[GroupParticipantRequest]:
+    try:
+        items = json.loads(raw or "[]")
+    except ValueError:
+        return []
+    participants: list[GroupParticipantRequest] = []
+    for item in items if isinstance(items, list) else []:
+        try:
+            participants.append(
+                GroupParticipantRequest(
+                    participant_name=str(item["name"]),
+                    master_id=int(item["master_id"]),
+                    service_type=str(item["service_type"]),
+                    slot_start=_parse_slot_token(str(item["slot"])),
+                )
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+    return participants
+
+
+def _dump_group_participants(participants: list[GroupParticipantRequest]) -> str:
+    return json.dumps(
+        [
+            {
+                "name": participant.participant_name,
+                "master_id": participant.master_id,
+                "service_type": participant.service_type,
+                "slot": _format_slot_token(participant.slot_start),
+            }
+            for participant in participants
+        ],
+        ensure_ascii=False,
+    )
+
+
 def _coerce_notifications(value: object) -> list[dict[str, object]]:
     if not isinstance(value, list):
         return []
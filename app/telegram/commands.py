@@ -8,7 +8,11 @@ from sqlalchemy.engine import Engine
 from app.auth import RoleRepository, authorize_command
 from app.auth.messages import RU_MESSAGES
 from app.booking import (
+    ManualBookingImportService,
+    ManualImportResult,
+    MasterBulkDayOffCommand,
     MasterDayOffCommand,
+    MasterDayOffRecurrence,
     MasterLunchBreakCommand,
     MasterManualBookingCommand,
     MasterScheduleService,
@@ -24,11 +28,16 @@ _HELP_TEXT = """Доступные команды:
 /client_book <master_id> <service_type> <YYYY-MM-DDTHH:MM:SS+00:00>
 /client_cancel <booking_id>
 /master_cancel <booking_id> <reason>
+/master_cancel_range <YYYY-MM-DDTHH:MM:SS+00:00> <YYYY-MM-DDTHH:MM:SS+00:00> <reason>
 /master_dayoff <YYYY-MM-DDTHH:MM:SS+00:00> <YYYY-MM-DDTHH:MM:SS+00:00> [block_id]
+/master_vacation <YYYY-MM-DD> <YYYY-MM-DD> [1-7,...]
 /master_lunch <HH:MM:SS> <HH:MM:SS>
 /master_manual <service_type> <YYYY-MM-DDTHH:MM:SS+00:00> <client_text>
+Импорт ручных записей: отправьте CSV или JSON файл с полями slot_start, service_type, client_name
 """
 
+_REPORT_MAX_LINES = 20
+
 
 @dataclass(frozen=True)
 class TelegramCommandResult:
@@ -42,6 +51,7 @@ class TelegramCommandService:
         self._roles = RoleRepository(engine)
         self._flow = TelegramBookingFlowService(engine)
         self._schedule = MasterScheduleService(engine)
+        self._manual_import = ManualBookingImportService(engine)
 
     def help(self, *, telegram_user_id: int) -> TelegramCommandResult:
         role = self._roles.resolve_role(telegram_user_id)
@@ -153,6 +163,29 @@ class TelegramCommandService:
             notifications=_coerce_notifications(response.get("notifications")),
         )
 
+    def master_cancel_range(
+        self,
+        *,
+        telegram_user_id: int,
+        start_at: datetime,
+        end_at: datetime,
+        reason: str,
+    ) -> TelegramCommandResult:
+        denied = self._deny_if_forbidden(telegram_user_id=telegram_user_id, command="master:schedule")
+        if denied is not None:
+            return denied
+
+        response = self._flow.cancel_range_by_master(
+            master_telegram_user_id=telegram_user_id,
+            start_at=start_at,
+            end_at=end_at,
+            reason=reason,
+        )
+        return TelegramCommandResult(
+            text=str(response.get("message", "")),
+            notifications=_coerce_notifications(response.get("notifications")),
+        )
+
     def master_day_off(
         self,
         *,
@@ -171,6 +204,29 @@ class TelegramCommandService:
         )
         return TelegramCommandResult(text=result.message, notifications=[])
 
+    def master_vacation(
+        self,
+        *,
+        telegram_user_id: int,
+        start_date: date,
+        end_date: date,
+        weekdays: tuple[int, ...],
+    ) -> TelegramCommandResult:
+        denied = self._deny_if_forbidden(telegram_user_id=telegram_user_id, command="master:day-off")
+        if denied is not None:
+            return denied
+
+        result = self._schedule.create_day_off_blocks(
+            master_telegram_user_id=telegram_user_id,
+            command=MasterBulkDayOffCommand(
+                recurrence=MasterDayOffRecurrence(start_date=start_date, end_date=end_date, weekdays=weekdays),
+            ),
+        )
+        lines = [result.message]
+        for start_at, end_at in result.conflicts[:_REPORT_MAX_LINES]:
+            lines.append(f"- {start_at.isoformat()} - {end_at.isoformat()}")
+        return TelegramCommandResult(text="\n".join(lines), notifications=[])
+
     def master_lunch(
         self,
         *,
@@ -210,6 +266,28 @@ class TelegramCommandService:
         )
         return TelegramCommandResult(text=result.message, notifications=[])
 
+    def master_import(
+        self,
+        *,
+        telegram_user_id: int,
+        content: str,
+        filename: str | None = None,
+    ) -> TelegramCommandResult:
+        denied = self._deny_if_forbidden(telegram_user_id=telegram_user_id, command="master:schedule")
+        if denied is not None:
+            return denied
+
+        result = self._manual_import.import_file(
+            master_telegram_user_id=telegram_user_id,
+            content=content,
+            filename=filename,
+        )
+        return TelegramCommandResult(text=_format_import_report(result), notifications=[])
+
+    def is_command_allowed(self, *, telegram_user_id: int, command: str) -> bool:
+        """Role check without a reply, for handlers that stay silent for everyone else."""
+        return authorize_command(command, self._roles.resolve_role(telegram_user_id)).allowed
+
     def _deny_if_forbidden(self, *, telegram_user_id: int, command: str) -> TelegramCommandResult | None:
         role = self._roles.resolve_role(telegram_user_id)
         decision = authorize_command(command, role)
@@ -218,6 +296,16 @@ class TelegramCommandService:
         return TelegramCommandResult(text=decision.message, notifications=[])
 
 
+def _format_import_report(result: ManualImportResult) -> str:
+    lines = [result.message]
+    rejected = [row for row in result.rows if not row.accepted]
+    for row in rejected[:_REPORT_MAX_LINES]:
+        lines.append(f"- строка {row.row_number}: {row.message}")
+    if len(rejected) > _REPORT_MAX_LINES:
+        lines.append(f"- ... еще {len(rejected) - _REPORT_MAX_LINES}")
+    return "\n".join(lines)
+
+
 def _coerce_notifications(value: object) -> list[dict[str, object]]:
     if not isinstance(value, list):
         return []
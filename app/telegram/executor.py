@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from time import monotonic
+from typing import Callable, TypeVar
+
+from app.observability import observe_telegram_handler_wait, set_telegram_handler_executor_state
+
+TELEGRAM_HANDLER_WORKERS_ENV = "TELEGRAM_HANDLER_WORKERS"
+_TELEGRAM_HANDLER_WORKERS_DEFAULT = 4
+
+ResultT = TypeVar("ResultT")
+
+
+def resolve_handler_worker_count(raw_value: str | None) -> int:
+    value = (raw_value or "").strip()
+    if not value:
+        return _TELEGRAM_HANDLER_WORKERS_DEFAULT
+    try:
+        workers = int(value)
+    except ValueError as exc:
+        raise ValueError(f"{TELEGRAM_HANDLER_WORKERS_ENV} must be a positive integer, got {value!r}") from exc
+    if workers <= 0:
+        raise ValueError(f"{TELEGRAM_HANDLER_WORKERS_ENV} must be a positive integer, got {value!r}")
+    return workers
+
+
+class _Ticket:
+    __slots__ = ("enqueued_at", "started", "abandoned")
+
+    def __init__(self, enqueued_at: float) -> None:
+        self.enqueued_at = enqueued_at
+        self.started = False
+        self.abandoned = False
+
+
+class TelegramHandlerExecutor:
+    """Runs blocking handler calls on a bounded thread pool, one call at a time per user.
+
+    Calls for the same Telegram user are chained through a per-user asyncio lock, so a
+    user's button presses are applied in arrival order while other chats proceed on
+    the remaining workers.
+    """
+
+    def __init__(self, *, max_workers: int) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="telegram-handler")
+        self._user_locks: dict[int, asyncio.Lock] = {}
+        self._user_waiters: dict[int, int] = {}
+        self._state_lock = threading.Lock()
+        self._queue_depth = 0
+        self._active_workers = 0
+
+    async def run(
+        self,
+        *,
+        telegram_user_id: int,
+        kind: str,
+        operation: Callable[[], ResultT],
+    ) -> ResultT:
+        user_lock = self._user_locks.get(telegram_user_id)
+        if user_lock is None:
+            user_lock = asyncio.Lock()
+            self._user_locks[telegram_user_id] = user_lock
+        self._user_waiters[telegram_user_id] = self._user_waiters.get(telegram_user_id, 0) + 1
+        ticket = _Ticket(monotonic())
+        self._update_state(queued_delta=1, active_delta=0)
+        try:
+            async with user_lock:
+                loop = asyncio.get_running_loop()
+                future = loop.run_in_executor(self._pool, self._invoke, kind, ticket, operation)
+                try:
+                    return await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    # A worker thread cannot be interrupted: hold the user's lock until the call
+                    # finishes so the user's next call cannot overlap it.
+                    while not future.done():
+                        with suppress(asyncio.CancelledError):
+                            await asyncio.wait((future,))
+                    if not future.cancelled():
+                        future.exception()
+                    raise
+        finally:
+            with self._state_lock:
+                if not ticket.started:
+                    ticket.abandoned = True
+                    self._queue_depth -= 1
+                    self._publish_state()
+            remaining = self._user_waiters[telegram_user_id] - 1
+            if remaining <= 0:
+                self._user_waiters.pop(telegram_user_id, None)
+                self._user_locks.pop(telegram_user_id, None)
+            else:
+                self._user_waiters[telegram_user_id] = remaining
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _invoke(self, kind: str, ticket: _Ticket, operation: Callable[[], ResultT]) -> ResultT:
+        observe_telegram_handler_wait(kind, monotonic() - ticket.enqueued_at)
+        with self._state_lock:
+            ticket.started = True
+            if not ticket.abandoned:
+                self._queue_depth -= 1
+            self._active_workers += 1
+            self._publish_state()
+        try:
+            return operation()
+        finally:
+            self._update_state(queued_delta=0, active_delta=-1)
+
+    def _update_state(self, *, queued_delta: int, active_delta: int) -> None:
+        with self._state_lock:
+            self._queue_depth += queued_delta
+            self._active_workers += active_delta
+            self._publish_state()
+
+    def _publish_state(self) -> None:
+        set_telegram_handler_executor_state(
+            queue_depth=self._queue_depth,
+            active_workers=self._active_workers,
+        )
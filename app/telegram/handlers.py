@@ -1,18 +1,40 @@
 from __future__ import annotations
 
+import os
 from contextlib import suppress
+from io import BytesIO
 from datetime import date, datetime, time
-
-from aiogram import Bot, Dispatcher, Router
-from aiogram.filters import Command, CommandObject
-from aiogram.types import CallbackQuery, Message
-
-from app.db.session import get_engine
-from app.telegram.callbacks import TelegramCallbackRouter, build_root_menu_markup
+from typing import Callable, TypeVar
+
+from aiogram import Bot, Dispatcher, F, Router
+from aiogram.filters import Command, CommandObject, ExceptionTypeFilter
+from aiogram.types import CallbackQuery, ErrorEvent, Message
+
+from app.booking.manual_import import MANUAL_IMPORT_MAX_BYTES
+from app.booking.messages import RU_BOOKING_MESSAGES
+from app.db.bridge import AsyncServiceAdapter
+from app.db.session import get_async_engine, get_engine, is_async_database_enabled
+from app.db.timeouts import DatabaseTimeoutError
+from app.observability import emit_event
+from app.telegram.callbacks import CallbackStateStore, TelegramCallbackRouter, build_root_menu_markup
 from app.telegram.commands import TelegramCommandService
+from app.telegram.executor import TELEGRAM_HANDLER_WORKERS_ENV, TelegramHandlerExecutor, resolve_handler_worker_count
+from app.telegram.notifier import (
+    TELEGRAM_NOTIFY_RATE_PER_SECOND_ENV,
+    RateLimitedNotificationSender,
+    resolve_notify_rate_per_second,
+)
+
+ResultT = TypeVar("ResultT")
 
 router = Router(name="telegram-runtime")
+_state_store = CallbackStateStore()
 _callback_router: TelegramCallbackRouter | None = None
+_command_service: TelegramCommandService | None = None
+_async_callbacks: AsyncServiceAdapter[TelegramCallbackRouter] | None = None
+_async_commands: AsyncServiceAdapter[TelegramCommandService] | None = None
+_executor: TelegramHandlerExecutor | None = None
+_notification_sender: RateLimitedNotificationSender | None = None
 
 _USAGE = {
     "client_master": "Использование: /client_master <master_id>",
@@ -20,7 +42,11 @@ _USAGE = {
     "client_book": "Использование: /client_book <master_id> <service_type> <YYYY-MM-DDTHH:MM:SS+00:00>",
     "client_cancel": "Использование: /client_cancel <booking_id>",
     "master_cancel": "Использование: /master_cancel <booking_id> <reason>",
+    "master_cancel_range": (
+        "Использование: /master_cancel_range <YYYY-MM-DDTHH:MM:SS+00:00> <YYYY-MM-DDTHH:MM:SS+00:00> <reason>"
+    ),
     "master_dayoff": "Использование: /master_dayoff <YYYY-MM-DDTHH:MM:SS+00:00> <YYYY-MM-DDTHH:MM:SS+00:00> [block_id]",
+    "master_vacation": "Использование: /master_vacation <YYYY-MM-DD> <YYYY-MM-DD> [дни недели 1-7 через запятую]",
     "master_lunch": "Использование: /master_lunch <HH:MM:SS> <HH:MM:SS>",
     "master_manual": "Использование: /master_manual <service_type> <YYYY-MM-DDTHH:MM:SS+00:00> <client_text>",
 }
@@ -31,23 +57,103 @@ def configure_dispatcher(dispatcher: Dispatcher) -> None:
 
 
 def _service() -> TelegramCommandService:
-    return TelegramCommandService(get_engine())
+    global _command_service
+    if _command_service is None:
+        _command_service = TelegramCommandService(get_engine())
+    return _command_service
 
 
 def _callbacks() -> TelegramCallbackRouter:
     global _callback_router
     if _callback_router is None:
-        _callback_router = TelegramCallbackRouter(get_engine())
+        _callback_router = TelegramCallbackRouter(get_engine(), state_store=_state_store)
     return _callback_router
 
 
+def _handler_executor() -> TelegramHandlerExecutor:
+    global _executor
+    if _executor is None:
+        _executor = TelegramHandlerExecutor(
+            max_workers=resolve_handler_worker_count(os.getenv(TELEGRAM_HANDLER_WORKERS_ENV)),
+        )
+    return _executor
+
+
+def _notifications_for(bot: Bot) -> RateLimitedNotificationSender:
+    global _notification_sender
+    if _notification_sender is None:
+        _notification_sender = RateLimitedNotificationSender(
+            send=lambda recipient, text: bot.send_message(chat_id=recipient, text=text),
+            rate_per_second=resolve_notify_rate_per_second(os.getenv(TELEGRAM_NOTIFY_RATE_PER_SECOND_ENV)),
+        )
+    return _notification_sender
+
+
+async def close_notification_sender() -> None:
+    """Drain queued fan-out notifications while the bot session is still open."""
+    global _notification_sender
+    if _notification_sender is not None:
+        sender, _notification_sender = _notification_sender, None
+        await sender.close()
+
+
+def shutdown_handler_executor() -> None:
+    global _executor, _notification_sender
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+    if _notification_sender is not None:
+        _notification_sender.shutdown()
+        _notification_sender = None
+
+
+async def _run_command(
+    telegram_user_id: int,
+    operation: Callable[[TelegramCommandService], ResultT],
+) -> ResultT:
+    global _async_commands
+    if not is_async_database_enabled():
+        service = _service()
+        return await _handler_executor().run(
+            telegram_user_id=telegram_user_id,
+            kind="command",
+            operation=lambda: operation(service),
+        )
+    if _async_commands is None:
+        _async_commands = AsyncServiceAdapter(get_async_engine(), TelegramCommandService)
+    return await _async_commands.call(operation)
+
+
+async def _run_callbacks(
+    telegram_user_id: int,
+    operation: Callable[[TelegramCallbackRouter], ResultT],
+) -> ResultT:
+    global _async_callbacks
+    if not is_async_database_enabled():
+        callbacks = _callbacks()
+        return await _handler_executor().run(
+            telegram_user_id=telegram_user_id,
+            kind="callback",
+            operation=lambda: operation(callbacks),
+        )
+    if _async_callbacks is None:
+        _async_callbacks = AsyncServiceAdapter(
+            get_async_engine(),
+            lambda engine: TelegramCallbackRouter(engine, state_store=_state_store),
+        )
+    return await _async_callbacks.call(operation)
+
+
 @router.message(Command("start"))
 async def show_start(message: Message) -> None:
     if message.from_user is None:
         return
-    result = _callbacks().start_menu(
-        telegram_user_id=message.from_user.id,
-        telegram_username=message.from_user.username,
+    result = await _run_callbacks(
+        message.from_user.id,
+        lambda callbacks: callbacks.start_menu(
+            telegram_user_id=message.from_user.id,
+            telegram_username=message.from_user.username,
+        ),
     )
     await message.answer(result.text, reply_markup=result.reply_markup)
 
@@ -56,7 +162,10 @@ async def show_start(message: Message) -> None:
 async def show_help(message: Message) -> None:
     if message.from_user is None:
         return
-    result = _service().help(telegram_user_id=message.from_user.id)
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.help(telegram_user_id=message.from_user.id),
+    )
     await message.answer(result.text, reply_markup=build_root_menu_markup())
 
 
@@ -64,7 +173,10 @@ async def show_help(message: Message) -> None:
 async def client_start(message: Message) -> None:
     if message.from_user is None:
         return
-    result = _service().client_start(telegram_user_id=message.from_user.id)
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.client_start(telegram_user_id=message.from_user.id),
+    )
     _callbacks().seed_root_menu(message.from_user.id)
     await _reply_with_notifications(
         message=message,
@@ -86,9 +198,12 @@ async def client_master(message: Message, command: CommandObject) -> None:
     except ValueError:
         await message.answer(_USAGE["client_master"])
         return
-    result = _service().client_select_master(
-        telegram_user_id=message.from_user.id,
-        master_id=master_id,
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.client_select_master(
+            telegram_user_id=message.from_user.id,
+            master_id=master_id,
+        ),
     )
     await _reply_with_notifications(message=message, text=result.text, notifications=result.notifications)
 
@@ -111,11 +226,14 @@ async def client_slots(message: Message, command: CommandObject) -> None:
     except ValueError:
         await message.answer(_USAGE["client_slots"])
         return
-    result = _service().client_slots(
-        telegram_user_id=message.from_user.id,
-        master_id=master_id,
-        service_type=service_type,
-        on_date=on_date,
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.client_slots(
+            telegram_user_id=message.from_user.id,
+            master_id=master_id,
+            service_type=service_type,
+            on_date=on_date,
+        ),
     )
     await _reply_with_notifications(message=message, text=result.text, notifications=result.notifications)
 
@@ -138,11 +256,14 @@ async def client_book(message: Message, command: CommandObject) -> None:
     except ValueError:
         await message.answer(_USAGE["client_book"])
         return
-    result = _service().client_confirm(
-        telegram_user_id=message.from_user.id,
-        master_id=master_id,
-        service_type=service_type,
-        slot_start=slot_start,
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.client_confirm(
+            telegram_user_id=message.from_user.id,
+            master_id=master_id,
+            service_type=service_type,
+            slot_start=slot_start,
+        ),
     )
     await _reply_with_notifications(message=message, text=result.text, notifications=result.notifications)
 
@@ -159,9 +280,12 @@ async def client_cancel(message: Message, command: CommandObject) -> None:
     except ValueError:
         await message.answer(_USAGE["client_cancel"])
         return
-    result = _service().client_cancel(
-        telegram_user_id=message.from_user.id,
-        booking_id=booking_id,
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.client_cancel(
+            telegram_user_id=message.from_user.id,
+            booking_id=booking_id,
+        ),
     )
     await _reply_with_notifications(message=message, text=result.text, notifications=result.notifications)
 
@@ -182,14 +306,52 @@ async def master_cancel(message: Message, command: CommandObject) -> None:
     except ValueError:
         await message.answer(_USAGE["master_cancel"])
         return
-    result = _service().master_cancel(
-        telegram_user_id=message.from_user.id,
-        booking_id=booking_id,
-        reason=parts[1],
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.master_cancel(
+            telegram_user_id=message.from_user.id,
+            booking_id=booking_id,
+            reason=parts[1],
+        ),
     )
     await _reply_with_notifications(message=message, text=result.text, notifications=result.notifications)
 
 
+@router.message(Command("master_cancel_range"))
+async def master_cancel_range(message: Message, command: CommandObject) -> None:
+    if message.from_user is None:
+        return
+    if not command.args:
+        await message.answer(_USAGE["master_cancel_range"])
+        return
+    parts = command.args.split(maxsplit=2)
+    if len(parts) != 3:
+        await message.answer(_USAGE["master_cancel_range"])
+        return
+    try:
+        start_at = datetime.fromisoformat(parts[0])
+        end_at = datetime.fromisoformat(parts[1])
+    except ValueError:
+        await message.answer(_USAGE["master_cancel_range"])
+        return
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.master_cancel_range(
+            telegram_user_id=message.from_user.id,
+            start_at=start_at,
+            end_at=end_at,
+            reason=parts[2],
+        ),
+    )
+    await message.answer(result.text)
+    # One summary for the master; the client fan-out is paced in the background.
+    _notifications_for(message.bot).enqueue(
+        (notification["recipient_telegram_user_id"], notification["message"])
+        for notification in result.notifications
+        if notification["recipient_telegram_user_id"] != message.from_user.id
+    )
+
+
 @router.message(Command("master_dayoff"))
 async def master_dayoff(message: Message, command: CommandObject) -> None:
     if message.from_user is None:
@@ -208,11 +370,44 @@ async def master_dayoff(message: Message, command: CommandObject) -> None:
     except ValueError:
         await message.answer(_USAGE["master_dayoff"])
         return
-    result = _service().master_day_off(
-        telegram_user_id=message.from_user.id,
-        start_at=start_at,
-        end_at=end_at,
-        block_id=block_id,
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.master_day_off(
+            telegram_user_id=message.from_user.id,
+            start_at=start_at,
+            end_at=end_at,
+            block_id=block_id,
+        ),
+    )
+    await _reply_with_notifications(message=message, text=result.text, notifications=result.notifications)
+
+
+@router.message(Command("master_vacation"))
+async def master_vacation(message: Message, command: CommandObject) -> None:
+    if message.from_user is None:
+        return
+    if not command.args:
+        await message.answer(_USAGE["master_vacation"])
+        return
+    parts = command.args.split()
+    if len(parts) not in {2, 3}:
+        await message.answer(_USAGE["master_vacation"])
+        return
+    try:
+        start_date = date.fromisoformat(parts[0])
+        end_date = date.fromisoformat(parts[1])
+        weekdays = tuple(int(item) for item in parts[2].split(",")) if len(parts) == 3 else tuple(range(1, 8))
+    except ValueError:
+        await message.answer(_USAGE["master_vacation"])
+        return
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.master_vacation(
+            telegram_user_id=message.from_user.id,
+            start_date=start_date,
+            end_date=end_date,
+            weekdays=weekdays,
+        ),
     )
     await _reply_with_notifications(message=message, text=result.text, notifications=result.notifications)
 
@@ -234,10 +429,13 @@ async def master_lunch(message: Message, command: CommandObject) -> None:
     except ValueError:
         await message.answer(_USAGE["master_lunch"])
         return
-    result = _service().master_lunch(
-        telegram_user_id=message.from_user.id,
-        lunch_start=lunch_start,
-        lunch_end=lunch_end,
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.master_lunch(
+            telegram_user_id=message.from_user.id,
+            lunch_start=lunch_start,
+            lunch_end=lunch_end,
+        ),
     )
     await _reply_with_notifications(message=message, text=result.text, notifications=result.notifications)
 
@@ -260,11 +458,47 @@ async def master_manual(message: Message, command: CommandObject) -> None:
     except ValueError:
         await message.answer(_USAGE["master_manual"])
         return
-    result = _service().master_manual(
-        telegram_user_id=message.from_user.id,
-        service_type=service_type,
-        slot_start=slot_start,
-        client_name=client_name,
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.master_manual(
+            telegram_user_id=message.from_user.id,
+            service_type=service_type,
+            slot_start=slot_start,
+            client_name=client_name,
+        ),
+    )
+    await _reply_with_notifications(message=message, text=result.text, notifications=result.notifications)
+
+
+@router.message(F.document)
+async def master_import(message: Message) -> None:
+    if message.from_user is None or message.document is None:
+        return
+    # Any user can send a document; only masters get it downloaded and imported.
+    allowed = await _run_command(
+        message.from_user.id,
+        lambda service: service.is_command_allowed(telegram_user_id=message.from_user.id, command="master:schedule"),
+    )
+    if not allowed:
+        return
+    document = message.document
+    if document.file_size is not None and document.file_size > MANUAL_IMPORT_MAX_BYTES:
+        await message.answer(RU_BOOKING_MESSAGES["manual_import_file_too_large"])
+        return
+    buffer = BytesIO()
+    await message.bot.download(document, destination=buffer)
+    try:
+        content = buffer.getvalue().decode("utf-8-sig")
+    except UnicodeDecodeError:
+        await message.answer(RU_BOOKING_MESSAGES["manual_import_invalid_file"])
+        return
+    result = await _run_command(
+        message.from_user.id,
+        lambda service: service.master_import(
+            telegram_user_id=message.from_user.id,
+            content=content,
+            filename=document.file_name,
+        ),
     )
     await _reply_with_notifications(message=message, text=result.text, notifications=result.notifications)
 
@@ -307,9 +541,12 @@ async def _send_notifications(
 async def callback_router(callback: CallbackQuery) -> None:
     if callback.from_user is None:
         return
-    result = _callbacks().handle(
-        telegram_user_id=callback.from_user.id,
-        data=callback.data,
+    result = await _run_callbacks(
+        callback.from_user.id,
+        lambda callbacks: callbacks.handle(
+            telegram_user_id=callback.from_user.id,
+            data=callback.data,
+        ),
     )
     with suppress(Exception):
         await callback.answer()
@@ -332,9 +569,12 @@ async def text_router(message: Message) -> None:
     if message.text.strip().startswith("/"):
         return
 
-    result = _callbacks().handle_text(
-        telegram_user_id=message.from_user.id,
-        text_value=message.text,
+    result = await _run_callbacks(
+        message.from_user.id,
+        lambda callbacks: callbacks.handle_text(
+            telegram_user_id=message.from_user.id,
+            text_value=message.text,
+        ),
     )
     if result is None:
         return
@@ -345,3 +585,21 @@ async def text_router(message: Message) -> None:
         notifications=result.notifications,
         reply_markup=result.reply_markup,
     )
+
+
+@router.errors(ExceptionTypeFilter(DatabaseTimeoutError))
+async def database_timeout_error(event: ErrorEvent) -> None:
+    exception = event.exception
+    operation = exception.operation if isinstance(exception, DatabaseTimeoutError) else None
+    update = event.update
+    if update.callback_query is not None:
+        with suppress(Exception):
+            await update.callback_query.answer()
+        target = update.callback_query.message
+    else:
+        target = update.message
+    emit_event("telegram_handler_database_timeout", operation=operation)
+    if target is None:
+        return
+    with suppress(Exception):
+        await target.answer(RU_BOOKING_MESSAGES["database_busy"])
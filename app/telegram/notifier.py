@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+from typing import Awaitable, Callable, Iterable
+
+from app.observability import emit_event, observe_telegram_delivery_outcome
+
+TELEGRAM_NOTIFY_RATE_PER_SECOND_ENV = "TELEGRAM_NOTIFY_RATE_PER_SECOND"
+_TELEGRAM_NOTIFY_RATE_PER_SECOND_DEFAULT = 20.0
+NOTIFICATION_DRAIN_TIMEOUT_SECONDS = 10.0
+_DELIVERY_PATH = "/internal/telegram/notifications/fan-out"
+
+
+def resolve_notify_rate_per_second(raw_value: str | None) -> float:
+    value = (raw_value or "").strip()
+    if not value:
+        return _TELEGRAM_NOTIFY_RATE_PER_SECOND_DEFAULT
+    try:
+        rate = float(value)
+    except ValueError as exc:
+        raise ValueError(f"{TELEGRAM_NOTIFY_RATE_PER_SECOND_ENV} must be a positive number, got {value!r}") from exc
+    if rate <= 0:
+        raise ValueError(f"{TELEGRAM_NOTIFY_RATE_PER_SECOND_ENV} must be a positive number, got {value!r}")
+    return rate
+
+
+class RateLimitedNotificationSender:
+    """Delivers queued notifications in the background, at most `rate_per_second` messages.
+
+    Bulk operations enqueue their fan-out and reply right away instead of awaiting one send per
+    recipient, and the spacing keeps the bot under Telegram's flood limits. A failed send is
+    logged and skipped; it does not stall the queue.
+    """
+
+    def __init__(
+        self,
+        *,
+        send: Callable[[int, str], Awaitable[object]],
+        rate_per_second: float,
+        clock: Callable[[], float] = monotonic,
+        sleep: Callable[[float], Awaitable[object]] = asyncio.sleep,
+    ) -> None:
+        self._send = send
+        self._interval = 1.0 / rate_per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+        self._worker: asyncio.Task[None] | None = None
+        self._next_send_at = 0.0
+
+    def enqueue(self, notifications: Iterable[tuple[int, str]]) -> int:
+        """Queue (recipient, text) pairs and return how many were queued; needs a running loop."""
+        queued = 0
+        for recipient, message in notifications:
+            self._queue.put_nowait((recipient, message))
+            queued += 1
+        if queued and (self._worker is None or self._worker.done()):
+            self._worker = asyncio.get_running_loop().create_task(self._drain(), name="telegram-notification-sender")
+        return queued
+
+    async def join(self) -> None:
+        await self._queue.join()
+
+    async def close(self, *, timeout_seconds: float = NOTIFICATION_DRAIN_TIMEOUT_SECONDS) -> int:
+        """Let the queue drain for up to `timeout_seconds`, then stop; returns how many were dropped."""
+        if self._worker is not None and not self._worker.done():
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=timeout_seconds)
+            except asyncio.TimeoutError:
+                pass
+        return self.shutdown()
+
+    def shutdown(self) -> int:
+        """Stop the worker at once; notifications still queued are dropped, counted and logged."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        dropped = 0
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            dropped += 1
+        if dropped:
+            for _ in range(dropped):
+                observe_telegram_delivery_outcome(path=_DELIVERY_PATH, outcome="dropped")
+            emit_event("telegram_notifications_dropped", count=dropped)
+        return dropped
+
+    async def _drain(self) -> None:
+        while True:
+            recipient, message = await self._queue.get()
+            try:
+                delay = self._next_send_at - self._clock()
+                if delay > 0:
+                    await self._sleep(delay)
+                self._next_send_at = max(self._clock(), self._next_send_at) + self._interval
+                await self._send(recipient, message)
+                observe_telegram_delivery_outcome(path=_DELIVERY_PATH, outcome="processed_success")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                observe_telegram_delivery_outcome(path=_DELIVERY_PATH, outcome="failed")
+                emit_event("telegram_notification_send_failed", recipient_telegram_user_id=recipient, error=str(exc))
+            finally:
+                self._queue.task_done()
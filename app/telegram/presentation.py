@@ -8,6 +8,7 @@ from app.timezone import to_business
 RU_DATE_FORMAT = "%d.%m.%Y"
 RU_TIME_FORMAT = "%H:%M"
 RU_DATETIME_FORMAT = "%d.%m.%Y %H:%M"
+RU_WEEKDAYS_SHORT = ("Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс")
 
 MOBILE_MENU_MAX_BUTTONS_PER_ROW = 2
 MOBILE_DATE_SLOT_MAX_BUTTONS_PER_ROW = 3
@@ -17,6 +18,10 @@ def format_ru_date(value: date) -> str:
     return value.strftime(RU_DATE_FORMAT)
 
 
+def format_ru_weekday_date(value: date) -> str:
+    return f"{RU_WEEKDAYS_SHORT[value.weekday()]} {value.strftime('%d.%m')}"
+
+
 def format_ru_time(value: datetime | time) -> str:
     if isinstance(value, datetime):
         normalized = to_business(value)
@@ -33,6 +38,15 @@ def format_ru_slot_range(start_at: datetime, *, duration_minutes: int) -> str:
     return f"{format_ru_time(start_at)}-{format_ru_time(end_at)}"
 
 
+def format_ru_next_free(value: datetime, *, today: date) -> str:
+    local = to_business(value)
+    if local.date() == today:
+        return f"сегодня {local.strftime(RU_TIME_FORMAT)}"
+    if local.date() == today + timedelta(days=1):
+        return f"завтра {local.strftime(RU_TIME_FORMAT)}"
+    return local.strftime(RU_DATETIME_FORMAT)
+
+
 def chunk_inline_buttons(
     buttons: list[InlineKeyboardButton],
     *,
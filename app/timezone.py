@@ -7,6 +7,10 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 BUSINESS_TIMEZONE_ENV = "BUSINESS_TIMEZONE"
 BUSINESS_TIMEZONE_DEFAULT = "Europe/Moscow"
 
+_CALENDAR_MEMO_MAX_ENTRIES = 4096
+_CALENDARS: dict[str, BusinessCalendar] = {}
+_CONFIGURED_CALENDAR: BusinessCalendar | None = None
+
 
 def resolve_business_timezone(raw_timezone: str | None) -> ZoneInfo:
     timezone_name = (raw_timezone or "").strip()
@@ -20,8 +24,85 @@ def resolve_business_timezone(raw_timezone: str | None) -> ZoneInfo:
         ) from exc
 
 
+class BusinessCalendar:
+    """Business timezone resolved once, with memoized UTC conversions of business dates.
+
+    Day bounds and (date, wall-clock time) conversions go through `ZoneInfo` once per key and are
+    then dictionary lookups, so slot loops stop redoing tz arithmetic. Memoized values are exact
+    per date, so DST transition days keep their 23/25 hour bounds.
+    """
+
+    __slots__ = ("timezone", "_day_bounds", "_instants", "_offset_hint")
+
+    def __init__(self, timezone: ZoneInfo) -> None:
+        self.timezone = timezone
+        self._day_bounds: dict[date, tuple[datetime, datetime]] = {}
+        self._instants: dict[tuple[date, time], datetime] = {}
+        self._offset_hint = utc_now().astimezone(timezone).utcoffset() or timedelta(0)
+
+    def precompute(self, start_date: date, days: int) -> None:
+        for offset in range(days):
+            self.day_bounds(start_date + timedelta(days=offset))
+
+    def to_business(self, value: datetime) -> datetime:
+        return normalize_utc(value).astimezone(self.timezone)
+
+    def business_date(self, value: datetime) -> date:
+        # Guess with the usual offset, then settle against the exact memoized day bounds.
+        value = normalize_utc(value)
+        on_date = (value + self._offset_hint).date()
+        day_start, day_end = self.day_bounds(on_date)
+        while value < day_start:
+            on_date -= timedelta(days=1)
+            day_start = self.day_bounds(on_date)[0]
+        while value >= day_end:
+            on_date += timedelta(days=1)
+            day_end = self.day_bounds(on_date)[1]
+        return on_date
+
+    def now(self) -> datetime:
+        return utc_now().astimezone(self.timezone)
+
+    def combine(self, on_date: date, at_time: time) -> datetime:
+        key = (on_date, at_time)
+        instant = self._instants.get(key)
+        if instant is None:
+            if len(self._instants) >= _CALENDAR_MEMO_MAX_ENTRIES:
+                self._instants.clear()
+            instant = datetime.combine(on_date, at_time, tzinfo=self.timezone).astimezone(UTC)
+            self._instants[key] = instant
+        return instant
+
+    def day_bounds(self, on_date: date) -> tuple[datetime, datetime]:
+        bounds = self._day_bounds.get(on_date)
+        if bounds is None:
+            if len(self._day_bounds) >= _CALENDAR_MEMO_MAX_ENTRIES:
+                self._day_bounds.clear()
+            start_local = datetime.combine(on_date, time.min, tzinfo=self.timezone)
+            end_local = start_local + timedelta(days=1)
+            bounds = self._day_bounds[on_date] = (start_local.astimezone(UTC), end_local.astimezone(UTC))
+        return bounds
+
+
+def configure_business_calendar(calendar: BusinessCalendar | None) -> None:
+    """Pin the calendar resolved at startup so hot paths skip the env lookup; None restores env reads."""
+    global _CONFIGURED_CALENDAR
+    _CONFIGURED_CALENDAR = calendar
+
+
+def get_business_calendar() -> BusinessCalendar:
+    """Return the pinned calendar, else the one for the current `BUSINESS_TIMEZONE` (built once per value)."""
+    if _CONFIGURED_CALENDAR is not None:
+        return _CONFIGURED_CALENDAR
+    raw_timezone = os.getenv(BUSINESS_TIMEZONE_ENV) or ""
+    calendar = _CALENDARS.get(raw_timezone)
+    if calendar is None:
+        calendar = _CALENDARS[raw_timezone] = BusinessCalendar(resolve_business_timezone(raw_timezone))
+    return calendar
+
+
 def get_business_timezone() -> ZoneInfo:
-    return resolve_business_timezone(os.getenv(BUSINESS_TIMEZONE_ENV))
+    return get_business_calendar().timezone
 
 
 def normalize_utc(value: datetime) -> datetime:
@@ -35,23 +116,20 @@ def utc_now() -> datetime:
 
 
 def to_business(value: datetime) -> datetime:
-    return normalize_utc(value).astimezone(get_business_timezone())
+    return get_business_calendar().to_business(value)
 
 
 def business_now() -> datetime:
-    return utc_now().astimezone(get_business_timezone())
+    return get_business_calendar().now()
 
 
 def business_date(value: datetime) -> date:
-    return to_business(value).date()
+    return get_business_calendar().business_date(value)
 
 
 def combine_business_date_time(on_date: date, at_time: time) -> datetime:
-    local = datetime.combine(on_date, at_time, tzinfo=get_business_timezone())
-    return local.astimezone(UTC)
+    return get_business_calendar().combine(on_date, at_time)
 
 
 def business_day_bounds(on_date: date) -> tuple[datetime, datetime]:
-    start_local = datetime.combine(on_date, time.min, tzinfo=get_business_timezone())
-    end_local = start_local + timedelta(days=1)
-    return start_local.astimezone(UTC), end_local.astimezone(UTC)
+    return get_business_calendar().day_bounds(on_date)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+from datetime import UTC, date, datetime, timedelta
+from datetime import time as clock_time
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.booking.guardrails import same_day_min_slot_start
+from app.timezone import (
+    BUSINESS_TIMEZONE_ENV,
+    BusinessCalendar,
+    configure_business_calendar,
+    get_business_calendar,
+    resolve_business_timezone,
+)
+
+START_DATE = date(2026, 3, 1)
+WORK_START = clock_time(10, 0)
+WORK_END = clock_time(21, 0)
+LUNCH_START = clock_time(13, 0)
+LUNCH_END = clock_time(14, 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-call timezone resolution with the business calendar.")
+    parser.add_argument("--iterations", type=int, default=20, help="Timing iterations per scenario.")
+    parser.add_argument("--masters", type=int, default=20)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--busy-per-day", type=int, default=12, help="Busy ranges bucketed per master-day.")
+    args = parser.parse_args()
+
+    print("| timezone | master-days | per-call tz ms (p50) | calendar ms (p50) | speedup |")
+    print("|---|---:|---:|---:|---:|")
+    for timezone_name in ("Europe/Moscow", "Europe/Berlin"):
+        os.environ[BUSINESS_TIMEZONE_ENV] = timezone_name
+        # Resolved and pinned once, as the app lifespan does at startup.
+        configure_business_calendar(BusinessCalendar(resolve_business_timezone(timezone_name)))
+        now = datetime.combine(START_DATE, clock_time(9, 0), tzinfo=UTC)
+        busy_ranges = _busy_ranges(days=args.days, per_day=args.busy_per_day)
+        expected = _legacy_horizon(now, busy_ranges, masters=args.masters, days=args.days)
+        if expected != _calendar_horizon(now, busy_ranges, masters=args.masters, days=args.days):
+            raise SystemExit(f"calendar mismatch for {timezone_name}")
+        legacy = _measure(
+            lambda: _legacy_horizon(now, busy_ranges, masters=args.masters, days=args.days), args.iterations
+        )
+        calendar = _measure(
+            lambda: _calendar_horizon(now, busy_ranges, masters=args.masters, days=args.days), args.iterations
+        )
+        print(
+            f"| {timezone_name} | {args.masters * args.days} | {legacy:.2f} | {calendar:.2f} | {legacy / calendar:.1f}x |"
+        )
+        configure_business_calendar(None)
+
+
+def _busy_ranges(*, days: int, per_day: int) -> list[tuple[datetime, datetime]]:
+    ranges = []
+    for offset in range(days):
+        day_start = datetime.combine(START_DATE + timedelta(days=offset), clock_time(7, 0), tzinfo=UTC)
+        for index in range(per_day):
+            start_at = day_start + timedelta(minutes=45 * index)
+            ranges.append((start_at, start_at + timedelta(minutes=30)))
+    return ranges
+
+
+def _legacy_horizon(
+    now: datetime,
+    busy_ranges: list[tuple[datetime, datetime]],
+    *,
+    masters: int,
+    days: int,
+) -> list[object]:
+    """Pre-calendar shape: every helper re-reads the env and resolves `ZoneInfo`."""
+    results: list[object] = []
+    for _ in range(masters):
+        buckets: dict[date, int] = {}
+        for busy_start, busy_end in busy_ranges:
+            first_day = _legacy_business_date(busy_start)
+            last_day = _legacy_business_date(busy_end - timedelta(microseconds=1))
+            buckets[first_day] = buckets.get(first_day, 0) + 1
+            if last_day != first_day:
+                buckets[last_day] = buckets.get(last_day, 0) + 1
+        for offset in range(days):
+            on_date = START_DATE + timedelta(days=offset)
+            results.append(
+                (
+                    _legacy_day_bounds(on_date),
+                    _legacy_combine(on_date, LUNCH_START),
+                    _legacy_combine(on_date, LUNCH_END),
+                    _legacy_combine(on_date, WORK_START),
+                    _legacy_combine(on_date, WORK_END),
+                    _legacy_min_slot_start(on_date, now),
+                    buckets.get(on_date, 0),
+                )
+            )
+    return results
+
+
+def _calendar_horizon(
+    now: datetime,
+    busy_ranges: list[tuple[datetime, datetime]],
+    *,
+    masters: int,
+    days: int,
+) -> list[object]:
+    results: list[object] = []
+    for _ in range(masters):
+        calendar = get_business_calendar()
+        buckets: dict[date, int] = {}
+        for busy_start, busy_end in busy_ranges:
+            first_day = calendar.business_date(busy_start)
+            last_day = calendar.business_date(busy_end - timedelta(microseconds=1))
+            buckets[first_day] = buckets.get(first_day, 0) + 1
+            if last_day != first_day:
+                buckets[last_day] = buckets.get(last_day, 0) + 1
+        for offset in range(days):
+            on_date = START_DATE + timedelta(days=offset)
+            results.append(
+                (
+                    calendar.day_bounds(on_date),
+                    calendar.combine(on_date, LUNCH_START),
+                    calendar.combine(on_date, LUNCH_END),
+                    calendar.combine(on_date, WORK_START),
+                    calendar.combine(on_date, WORK_END),
+                    same_day_min_slot_start(on_date=on_date, now=now, slot_step_minutes=30),
+                    buckets.get(on_date, 0),
+                )
+            )
+    return results
+
+
+def _legacy_timezone() -> ZoneInfo:
+    return resolve_business_timezone(os.getenv(BUSINESS_TIMEZONE_ENV))
+
+
+def _legacy_business_date(value: datetime) -> date:
+    return value.astimezone(UTC).astimezone(_legacy_timezone()).date()
+
+
+def _legacy_combine(on_date: date, at_time: clock_time) -> datetime:
+    return datetime.combine(on_date, at_time, tzinfo=_legacy_timezone()).astimezone(UTC)
+
+
+def _legacy_day_bounds(on_date: date) -> tuple[datetime, datetime]:
+    start_local = datetime.combine(on_date, clock_time.min, tzinfo=_legacy_timezone())
+    return start_local.astimezone(UTC), (start_local + timedelta(days=1)).astimezone(UTC)
+
+
+def _legacy_min_slot_start(on_date: date, now: datetime) -> datetime | None:
+    now_business = now.astimezone(UTC).astimezone(_legacy_timezone())
+    if on_date != now_business.date():
+        return None
+    threshold = now_business + timedelta(minutes=30)
+    day_start = datetime.combine(on_date, clock_time.min, tzinfo=_legacy_timezone())
+    total_minutes = (threshold - day_start).total_seconds() / 60
+    rounded_minutes = int(math.ceil(total_minutes / 30) * 30)
+    return (day_start + timedelta(minutes=rounded_minutes)).astimezone(UTC)
+
+
+def _measure(fn, iterations: int) -> float:  # type: ignore[no-untyped-def]
+    timings = []
+    for _ in range(max(1, iterations)):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as clock_time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.booking.intervals import BlockedIntervals, DayOccupancy, is_interval_blocked
+from app.timezone import combine_business_date_time
+
+BUSINESS_DATE = date(2026, 2, 20)
+DAY_START = combine_business_date_time(BUSINESS_DATE, clock_time(6, 0))
+DAY_END = combine_business_date_time(BUSINESS_DATE, clock_time(23, 0))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare slot computation strategies and day bitset memory.")
+    parser.add_argument("--iterations", type=int, default=50, help="Timing iterations per scenario.")
+    parser.add_argument("--seed", type=int, default=20260220)
+    parser.add_argument("--masters", type=int, default=20, help="Masters in the memory horizon.")
+    parser.add_argument("--days", type=int, default=60, help="Days in the memory horizon.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print("| step min | busy ranges | slots | linear ms (p50) | sweep ms (p50) | bitset build ms (p50) | bitset cached ms (p50) |")
+    print("|---:|---:|---:|---:|---:|---:|---:|")
+    for step_minutes, busy_count in ((30, 10), (15, 40), (5, 100), (5, 400)):
+        busy_ranges = _dense_day(rng, busy_count)
+        step = timedelta(minutes=step_minutes)
+        duration = timedelta(minutes=60)
+        linear = _measure(lambda: _linear_slots(busy_ranges, duration=duration, step=step), args.iterations)
+        sweep = _measure(lambda: _sweep_slots(busy_ranges, duration=duration, step=step), args.iterations)
+        build = _measure(lambda: DayOccupancy.for_business_date(BUSINESS_DATE, busy_ranges), args.iterations)
+        occupancy = DayOccupancy.for_business_date(BUSINESS_DATE, busy_ranges)
+        cached = _measure(lambda: _bitset_slots(occupancy, duration=duration, step=step), args.iterations)
+        expected = _linear_slots(busy_ranges, duration=duration, step=step)
+        if expected != _sweep_slots(busy_ranges, duration=duration, step=step) or expected != _bitset_slots(
+            occupancy, duration=duration, step=step
+        ):
+            raise SystemExit(f"slot mismatch for step={step_minutes} busy={busy_count}")
+        candidates = int((DAY_END - DAY_START - duration) / step) + 1
+        print(f"| {step_minutes} | {busy_count} | {candidates} | {linear:.3f} | {sweep:.3f} | {build:.3f} | {cached:.3f} |")
+
+    _print_bitset_memory(rng, masters=args.masters, days=args.days)
+
+
+def _print_bitset_memory(rng: random.Random, *, masters: int, days: int) -> None:
+    busy_ranges = _dense_day(rng, 20)
+    horizon = [
+        DayOccupancy.for_business_date(
+            BUSINESS_DATE + timedelta(days=offset),
+            [(start_at + timedelta(days=offset), end_at + timedelta(days=offset)) for start_at, end_at in busy_ranges],
+        )
+        for _ in range(masters)
+        for offset in range(days)
+    ]
+    bits_bytes = sum(sys.getsizeof(occupancy.bits) for occupancy in horizon)
+    object_bytes = bits_bytes + sum(sys.getsizeof(occupancy) for occupancy in horizon)
+    tuples_bytes = sum(
+        sys.getsizeof(busy_ranges) + sum(sys.getsizeof(item) + 2 * sys.getsizeof(item[0]) for item in busy_ranges)
+        for _ in horizon
+    )
+    print()
+    print(f"Horizon: {masters} masters x {days} days = {len(horizon)} master-days, 20 busy ranges each")
+    print(f"- bitset ints: {bits_bytes / 1024:.1f} KiB ({bits_bytes / len(horizon):.0f} B per day)")
+    print(f"- bitset objects incl. ints: {object_bytes / 1024:.1f} KiB")
+    print(f"- (datetime, datetime) tuple lists: {tuples_bytes / 1024:.1f} KiB")
+
+
+def _dense_day(rng: random.Random, count: int) -> list[tuple[datetime, datetime]]:
+    ranges = []
+    for _ in range(count):
+        start_at = DAY_START + timedelta(minutes=rng.randrange(0, 17 * 60, 5))
+        ranges.append((start_at, start_at + timedelta(minutes=rng.randrange(5, 45, 5))))
+    return ranges
+
+
+def _linear_slots(
+    busy_ranges: list[tuple[datetime, datetime]],
+    *,
+    duration: timedelta,
+    step: timedelta,
+) -> list[tuple[datetime, datetime]]:
+    slots = []
+    slot_start = DAY_START
+    while slot_start + duration <= DAY_END:
+        if not is_interval_blocked(start_at=slot_start, end_at=slot_start + duration, blocked_ranges=busy_ranges):
+            slots.append((slot_start, slot_start + duration))
+        slot_start += step
+    return slots
+
+
+def _sweep_slots(
+    busy_ranges: list[tuple[datetime, datetime]],
+    *,
+    duration: timedelta,
+    step: timedelta,
+) -> list[tuple[datetime, datetime]]:
+    blocked = BlockedIntervals(busy_ranges)
+    return list(blocked.free_slots(window_start=DAY_START, window_end=DAY_END, duration=duration, step=step))
+
+
+def _bitset_slots(
+    occupancy: DayOccupancy,
+    *,
+    duration: timedelta,
+    step: timedelta,
+) -> list[tuple[datetime, datetime]]:
+    return list(occupancy.free_slots(window_start=DAY_START, window_end=DAY_END, duration=duration, step=step))
+
+
+def _measure(fn, iterations: int) -> float:  # type: ignore[no-untyped-def]
+    timings = []
+    for _ in range(max(1, iterations)):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    main()
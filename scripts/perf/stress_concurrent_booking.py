@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import text
+
+from app.booking.create_booking import BookingService
+from app.db.session import get_engine
+from app.timezone import business_date, combine_business_date_time
+
+PERF_TAG = "__booking_contention__"
+CLIENT_TG_BASE = -920000000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fire concurrent confirms at the same master slot and check exactly one booking wins."
+    )
+    parser.add_argument("--master-id", type=int, default=1)
+    parser.add_argument("--rounds", type=int, default=20, help="Distinct contended slots.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent confirms per slot.")
+    parser.add_argument("--days-ahead", type=int, default=30, help="Business day used for contended slots.")
+    parser.add_argument("--keep-data", action="store_true", help="Keep synthetic clients and bookings.")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    service = BookingService(engine)
+    client_ids = _seed_clients(engine, count=args.rounds * args.concurrency)
+    slot_starts = _contended_slots(engine, master_id=args.master_id, days_ahead=args.days_ahead, rounds=args.rounds)
+
+    latencies_ms: list[float] = []
+    latencies_lock = threading.Lock()
+    violations = 0
+    try:
+        for round_index, slot_start in enumerate(slot_starts):
+            barrier = threading.Barrier(args.concurrency)
+            round_clients = client_ids[round_index * args.concurrency : (round_index + 1) * args.concurrency]
+
+            def confirm(client_user_id: int, slot_start: datetime = slot_start, barrier=barrier) -> bool:  # type: ignore[no-untyped-def]
+                barrier.wait()
+                started = time.perf_counter()
+                result = service.create_booking(
+                    master_id=args.master_id,
+                    client_user_id=client_user_id,
+                    service_type="haircut",
+                    slot_start=slot_start,
+                )
+                with latencies_lock:
+                    latencies_ms.append((time.perf_counter() - started) * 1000)
+                return result.created
+
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                created = sum(pool.map(confirm, round_clients))
+            active = _active_overlaps(engine, master_id=args.master_id, slot_start=slot_start)
+            if created != 1 or active != 1:
+                violations += 1
+                print(f"round {round_index}: slot {slot_start.isoformat()} created={created} active={active}")
+    finally:
+        if not args.keep_data:
+            _cleanup(engine, client_ids)
+
+    latencies_ms.sort()
+    print("| rounds | concurrency | violations | confirm p50 ms | confirm p95 ms |")
+    print("|---:|---:|---:|---:|---:|")
+    print(
+        f"| {len(slot_starts)} | {args.concurrency} | {violations} | {statistics.median(latencies_ms):.2f} "
+        f"| {latencies_ms[int(len(latencies_ms) * 0.95) - 1]:.2f} |"
+    )
+    if violations:
+        raise SystemExit(f"{violations} contended slots did not end with exactly one active booking")
+
+
+def _seed_clients(engine, *, count: int) -> list[int]:  # type: ignore[no-untyped-def]
+    with engine.begin() as conn:
+        role_id = conn.execute(text("SELECT id FROM roles WHERE name = 'Client'")).scalar_one()
+        conn.execute(
+            text(
+                """
+                INSERT INTO users (telegram_user_id, telegram_username, role_id)
+                SELECT :tg_base - g.n, :perf_tag, :role_id
+                FROM generate_series(0, :count - 1) AS g(n)
+                ON CONFLICT (telegram_user_id) DO NOTHING
+                """
+            ),
+            {"tg_base": CLIENT_TG_BASE, "perf_tag": PERF_TAG, "role_id": int(role_id), "count": count},
+        )
+        rows = conn.execute(
+            text(
+                """
+                SELECT id
+                FROM users
+                WHERE telegram_user_id <= :tg_base AND telegram_user_id > :tg_base - :count
+                ORDER BY telegram_user_id DESC
+                """
+            ),
+            {"tg_base": CLIENT_TG_BASE, "count": count},
+        ).scalars()
+        client_ids = [int(row) for row in rows]
+        conn.execute(
+            text("DELETE FROM bookings WHERE client_user_id = ANY(:client_ids)"),
+            {"client_ids": client_ids},
+        )
+    return client_ids
+
+
+def _contended_slots(engine, *, master_id: int, days_ahead: int, rounds: int) -> list[datetime]:  # type: ignore[no-untyped-def]
+    """Free-of-lunch 30-minute starts inside the master's hours, from `days_ahead` days onward."""
+    with engine.connect() as conn:
+        master = conn.execute(
+            text("SELECT work_start, work_end, lunch_start, lunch_end FROM masters WHERE id = :master_id"),
+            {"master_id": master_id},
+        ).mappings().one()
+    step = timedelta(minutes=30)
+    on_date = business_date(datetime.now(UTC)) + timedelta(days=days_ahead)
+    slot_starts: list[datetime] = []
+    while len(slot_starts) < rounds:
+        slot_start = combine_business_date_time(on_date, master["work_start"])
+        day_end = combine_business_date_time(on_date, master["work_end"])
+        lunch_start = combine_business_date_time(on_date, master["lunch_start"])
+        lunch_end = combine_business_date_time(on_date, master["lunch_end"])
+        while slot_start + step <= day_end and len(slot_starts) < rounds:
+            if not (slot_start < lunch_end and lunch_start < slot_start + step):
+                slot_starts.append(slot_start)
+            slot_start += step
+        on_date += timedelta(days=1)
+    return slot_starts
+
+
+def _active_overlaps(engine, *, master_id: int, slot_start: datetime) -> int:  # type: ignore[no-untyped-def]
+    with engine.connect() as conn:
+        return int(
+            conn.execute(
+                text(
+                    """
+                    SELECT COUNT(*)
+                    FROM bookings
+                    WHERE master_id = :master_id
+                      AND status = 'active'
+                      AND slot_start < :slot_end
+                      AND :slot_start < slot_end
+                    """
+                ),
+                {"master_id": master_id, "slot_start": slot_start, "slot_end": slot_start + timedelta(minutes=30)},
+            ).scalar_one()
+        )
+
+
+def _cleanup(engine, client_ids: list[int]) -> None:  # type: ignore[no-untyped-def]
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM bookings WHERE client_user_id = ANY(:client_ids)"), {"client_ids": client_ids})
+        conn.execute(text("DELETE FROM users WHERE id = ANY(:client_ids)"), {"client_ids": client_ids})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+from app.audit import (
+    AUDIT_QUEUE_MAX_EVENTS_ENV,
+    AuditEventBuffer,
+    AuditEventWriter,
+    audit_log_event_listener,
+    configure_audit_buffer,
+    record_audit_event,
+    record_audit_event_on_commit,
+    resolve_audit_queue_max_events,
+)
+from app.db.timeouts import OPERATION_ADMIN_WRITE, begin_operation
+from app.observability import emit_event, render_metrics, set_event_listener
+
+
+def _metric_value(exposition: str, metric_name: str, labels: dict[str, str]) -> float:
+    for line in exposition.splitlines():
+        if not line.startswith(f"{metric_name}{{"):
+            continue
+        if all(f'{key}="{value}"' in line for key, value in labels.items()):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def _setup_audit_schema() -> Engine:
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, telegram_user_id INTEGER UNIQUE)"))
+        conn.execute(
+            text(
+                """
+                CREATE TABLE audit_events (
+                    id INTEGER PRIMARY KEY,
+                    actor_user_id INTEGER NULL REFERENCES users(id),
+                    event_type TEXT NOT NULL,
+                    entity_type TEXT NOT NULL,
+                    entity_id TEXT NOT NULL,
+                    payload TEXT NOT NULL DEFAULT '{}',
+                    created_at TEXT NOT NULL
+                )
+                """
+            )
+        )
+        conn.execute(text("INSERT INTO users (id, telegram_user_id) VALUES (7, 1000001)"))
+    return engine
+
+
+@pytest.fixture
+def audit_buffer():  # type: ignore[no-untyped-def]
+    buffer = AuditEventBuffer(max_events=500)
+    configure_audit_buffer(buffer)
+    try:
+        yield buffer
+    finally:
+        set_event_listener(None)
+        configure_audit_buffer(None)
+
+
+def test_resolve_audit_queue_max_events_defaults_and_validation(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv(AUDIT_QUEUE_MAX_EVENTS_ENV, raising=False)
+    assert resolve_audit_queue_max_events() == 5000
+    monkeypatch.setenv(AUDIT_QUEUE_MAX_EVENTS_ENV, "0")
+    with pytest.raises(ValueError):
+        resolve_audit_queue_max_events()
+
+
+def test_record_audit_event_is_noop_without_configured_buffer() -> None:
+    configure_audit_buffer(None)
+    assert record_audit_event("booking_cancelled_by_client", entity_type="booking", entity_id=1) is False
+
+
+def test_audit_writer_flushes_queue_in_batched_inserts_and_resolves_actors(audit_buffer: AuditEventBuffer) -> None:
+    engine = _setup_audit_schema()
+    for index in range(450):
+        assert record_audit_event(
+            "booking_cancelled_by_master",
+            entity_type="booking",
+            entity_id=index,
+            actor_user_id=7 if index % 2 else None,
+            actor_telegram_user_id=None if index % 2 else 1000001,
+            payload={"reason": "Болезнь"},
+        )
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert AuditEventWriter(engine, audit_buffer).flush() == 450
+
+    assert len(audit_buffer) == 0
+    assert sum(1 for statement in statements if "INSERT INTO audit_events" in statement) == 3
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT actor_user_id, entity_id, payload FROM audit_events ORDER BY id")).all()
+    assert len(rows) == 450
+    assert {row[0] for row in rows} == {7}
+    assert [row[1] for row in rows[:3]] == ["0", "1", "2"]
+    assert json.loads(rows[0][2]) == {"reason": "Болезнь"}
+
+
+def test_audit_buffer_drops_when_full_and_requeues_failed_batches() -> None:
+    buffer = AuditEventBuffer(max_events=3)
+    configure_audit_buffer(buffer)
+    try:
+        dropped_before = _metric_value(render_metrics()[0].decode(), "bot_api_audit_events_total", {"outcome": "dropped"})
+        accepted = [record_audit_event("rbac_deny", entity_type="command", entity_id=index) for index in range(5)]
+    finally:
+        configure_audit_buffer(None)
+    assert accepted == [True, True, True, False, False]
+    dropped_after = _metric_value(render_metrics()[0].decode(), "bot_api_audit_events_total", {"outcome": "dropped"})
+    assert dropped_after - dropped_before == 2
+
+    engine = create_engine("sqlite+pysqlite:///:memory:", poolclass=StaticPool)
+    writer = AuditEventWriter(engine, buffer)
+    assert writer.flush() == 0
+    assert len(buffer) == 3
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, telegram_user_id INTEGER)"))
+        conn.execute(
+            text(
+                """
+                CREATE TABLE audit_events (
+                    id INTEGER PRIMARY KEY, actor_user_id INTEGER, event_type TEXT, entity_type TEXT,
+                    entity_id TEXT, payload TEXT, created_at TEXT
+                )
+                """
+            )
+        )
+    assert writer.flush() == 3
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT entity_id FROM audit_events ORDER BY id")).scalars().all() == ["0", "1", "2"]
+
+
+def test_audit_writer_drops_only_a_permanently_failing_event() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, telegram_user_id INTEGER)"))
+        conn.execute(
+            text(
+                """
+                CREATE TABLE audit_events (
+                    id INTEGER PRIMARY KEY, actor_user_id INTEGER, event_type TEXT, entity_type TEXT,
+                    entity_id TEXT CHECK (entity_id <> 'poison'), payload TEXT, created_at TEXT
+                )
+                """
+            )
+        )
+    buffer = AuditEventBuffer(max_events=50)
+    configure_audit_buffer(buffer)
+    try:
+        for entity_id in ("1", "2", "poison", "4", "5"):
+            record_audit_event("booking_cancelled_by_client", entity_type="booking", entity_id=entity_id)
+    finally:
+        configure_audit_buffer(None)
+    failed_before = _metric_value(render_metrics()[0].decode(), "bot_api_audit_events_total", {"outcome": "failed"})
+    writer = AuditEventWriter(engine, buffer)
+
+    assert writer.flush() == 4
+    assert len(buffer) == 0
+    assert writer.flush() == 0
+    failed_after = _metric_value(render_metrics()[0].decode(), "bot_api_audit_events_total", {"outcome": "failed"})
+    assert failed_after - failed_before == 1
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT entity_id FROM audit_events ORDER BY id")).scalars().all() == ["1", "2", "4", "5"]
+
+
+def test_audit_events_are_queued_on_commit_and_from_security_log_events(audit_buffer: AuditEventBuffer) -> None:
+    engine = _setup_audit_schema()
+    with pytest.raises(RuntimeError):
+        with begin_operation(engine, OPERATION_ADMIN_WRITE) as conn:
+            record_audit_event_on_commit(conn, "booking_cancelled_by_client", entity_type="booking", entity_id=1)
+            raise RuntimeError("rollback")
+    assert len(audit_buffer) == 0
+    with begin_operation(engine, OPERATION_ADMIN_WRITE) as conn:
+        record_audit_event_on_commit(conn, "booking_cancelled_by_client", entity_type="booking", entity_id=2)
+        assert len(audit_buffer) == 0
+    assert len(audit_buffer) == 1
+
+    set_event_listener(audit_log_event_listener)
+    emit_event("booking_flow_confirm", client_telegram_user_id=2000001)
+    emit_event("rbac_deny", telegram_user_id=1000001, command="master:schedule", role="Client", reason="forbidden")
+    assert len(audit_buffer) == 2
+
+    AuditEventWriter(engine, audit_buffer).flush()
+    with engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT actor_user_id, entity_type, entity_id, payload FROM audit_events WHERE event_type = 'rbac_deny'")
+        ).one()
+    assert row[:3] == (7, "command", "master:schedule")
+    assert json.loads(row[3])["reason"] == "forbidden"
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import json
+import random
 import sqlite3
-from datetime import UTC, date, datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, date, datetime, time, timedelta
 
-from sqlalchemy import create_engine, text
+import pytest
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
 
 from app.booking.availability import AvailabilityService
 from app.booking.cancel_booking import BookingCancellationService
@@ -15,11 +21,24 @@ from app.booking.contracts import (
     can_transition_booking_status,
     is_cancellation_reason_required,
 )
-from app.booking.create_booking import BookingService
+from app.booking.create_booking import (
+    BOOKING_OVERLAP_CONSTRAINT,
+    BookingClientSnapshot,
+    BookingService,
+    GroupParticipantRequest,
+    is_booking_overlap_violation,
+)
 from app.booking.flow import TelegramBookingFlowService
+from app.booking.intervals import BlockedIntervals, DayOccupancy, is_interval_blocked, merge_intervals
+from app.booking.manual_import import MANUAL_IMPORT_INSERT_BATCH_SIZE, ManualBookingImportService
+from app.booking.messages import RU_BOOKING_MESSAGES
+from app.booking.next_free_slot import NextFreeSlotService
+from app.booking.occupancy_cache import DayOccupancyCache
 from app.booking.reminders import BookingReminderService, is_reminder_eligible
 from app.booking.schedule import (
+    MasterBulkDayOffCommand,
     MasterDayOffCommand,
+    MasterDayOffRecurrence,
     MasterLunchBreakCommand,
     MasterManualBookingCommand,
     MasterScheduleService,
@@ -28,15 +47,20 @@ from app.booking.service_options import (
     SERVICE_OPTION_CODES,
     SERVICE_OPTION_DURATION_MINUTES,
     SERVICE_OPTION_LABELS_RU,
+    invalidate_service_catalog,
     list_service_options,
+    resolve_service_catalog_refresh_seconds,
+    resolve_service_duration_minutes,
     validate_duration_minutes,
 )
+from app.observability import render_metrics
+from app.timezone import business_date, combine_business_date_time, utc_now
 
 sqlite3.register_adapter(datetime, lambda value: value.isoformat())
 
 
-def _setup_availability_schema() -> Engine:
-    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+def _setup_availability_schema(url: str = "sqlite+pysqlite:///:memory:") -> Engine:
+    engine = create_engine(url, future=True)
 
     with engine.begin() as conn:
         conn.execute(
@@ -287,6 +311,40 @@ def test_service_options_contract() -> None:
     assert all(minutes > 0 for minutes in SERVICE_OPTION_DURATION_MINUTES.values())
 
 
+def test_service_catalog_snapshot_serves_durations_until_invalidated(monkeypatch) -> None:
+    engine = _setup_availability_schema()
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert resolve_service_duration_minutes("haircut_beard", engine=engine) == 60
+    with engine.connect() as conn:
+        assert resolve_service_duration_minutes("beard", connection=conn) == 30
+    assert len(statements) == 1
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE services SET duration_minutes = 45 WHERE code = 'beard'"))
+        conn.execute(text("UPDATE services SET is_active = 0 WHERE code = 'haircut'"))
+    statements.clear()
+    assert resolve_service_duration_minutes("beard", engine=engine) == 30
+    assert statements == []
+
+    invalidate_service_catalog()
+    assert resolve_service_duration_minutes("beard", engine=engine) == 45
+    assert resolve_service_duration_minutes("haircut", engine=engine) == SERVICE_OPTION_DURATION_MINUTES["haircut"]
+    assert resolve_service_duration_minutes("unknown", engine=engine) is None
+    assert len(statements) == 1
+
+    monkeypatch.setenv("SERVICE_CATALOG_REFRESH_SECONDS", "0")
+    invalidate_service_catalog()
+    resolve_service_duration_minutes("beard", engine=engine)
+    resolve_service_duration_minutes("beard", engine=engine)
+    assert len(statements) == 3
+
+    monkeypatch.setenv("SERVICE_CATALOG_REFRESH_SECONDS", "soon")
+    with pytest.raises(ValueError):
+        resolve_service_catalog_refresh_seconds()
+
+
 def test_validate_duration_minutes_contract() -> None:
     assert validate_duration_minutes(30) == 30
     assert validate_duration_minutes(60) == 60
@@ -380,6 +438,71 @@ def test_availability_half_open_overlap_boundaries() -> None:
     assert "16:00" not in starts
 
 
+def test_interval_sweep_and_day_bitset_match_linear_scan_on_dense_days() -> None:
+    day_start = datetime(2026, 2, 10, 9, 0, tzinfo=UTC)
+    day_end = datetime(2026, 2, 10, 21, 0, tzinfo=UTC)
+    rng = random.Random(20260210)
+
+    assert merge_intervals(
+        [
+            (day_start + timedelta(minutes=30), day_start + timedelta(minutes=60)),
+            (day_start, day_start + timedelta(minutes=30)),
+            (day_start + timedelta(minutes=90), day_start + timedelta(minutes=90)),
+        ]
+    ) == [(day_start, day_start + timedelta(minutes=60))]
+
+    for _ in range(200):
+        ranges = []
+        for _ in range(rng.randint(0, 40)):
+            start_at = day_start + timedelta(minutes=rng.randrange(-60, 13 * 60, 5))
+            ranges.append((start_at, start_at + timedelta(minutes=rng.randrange(5, 120, 5))))
+        duration = timedelta(minutes=rng.choice((30, 45, 60, 90)))
+        step = timedelta(minutes=rng.choice((5, 15, 30)))
+        not_before = day_start + timedelta(minutes=rng.randrange(0, 12 * 60, 7)) if rng.random() < 0.3 else None
+
+        expected = []
+        slot_start = day_start
+        while slot_start + duration <= day_end:
+            if (not_before is None or slot_start >= not_before) and not is_interval_blocked(
+                start_at=slot_start,
+                end_at=slot_start + duration,
+                blocked_ranges=ranges,
+            ):
+                expected.append((slot_start, slot_start + duration))
+            slot_start += step
+
+        blocked = BlockedIntervals(ranges)
+        occupancy = DayOccupancy.for_business_date(date(2026, 2, 10), ranges)
+        for structure in (blocked, occupancy):
+            assert list(
+                structure.free_slots(
+                    window_start=day_start,
+                    window_end=day_end,
+                    duration=duration,
+                    step=step,
+                    not_before=not_before,
+                )
+            ) == expected
+        probe_start = day_start + timedelta(minutes=rng.randrange(0, 12 * 60, 5))
+        probe_blocked = is_interval_blocked(
+            start_at=probe_start,
+            end_at=probe_start + duration,
+            blocked_ranges=ranges,
+        )
+        assert blocked.overlaps(probe_start, probe_start + duration) == probe_blocked
+        assert occupancy.is_free(probe_start, duration) is not probe_blocked
+
+    occupancy = DayOccupancy.for_business_date(date(2026, 2, 10)).apply_booking(
+        day_start + timedelta(minutes=61, seconds=10),
+        day_start + timedelta(minutes=90),
+    )
+    assert list(occupancy.free_runs(day_start, day_end)) == [
+        (day_start, day_start + timedelta(minutes=61)),
+        (day_start + timedelta(minutes=90), day_end),
+    ]
+    assert occupancy.minutes == 24 * 60
+
+
 def test_availability_supports_duration_aware_service_slots() -> None:
     engine = _setup_availability_schema()
 
@@ -447,6 +570,210 @@ def test_availability_same_day_applies_30_minute_lead_time_rounding() -> None:
     assert "15:00" not in starts
 
 
+def test_availability_range_summary_matches_per_day_slots_with_one_load() -> None:
+    engine = _setup_availability_schema()
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO bookings (master_id, status, slot_start, slot_end)
+                VALUES (1, 'active', :slot_start, :slot_end)
+                """
+            ),
+            {
+                "slot_start": datetime(2026, 2, 10, 11, 0, tzinfo=UTC),
+                "slot_end": datetime(2026, 2, 10, 12, 0, tzinfo=UTC),
+            },
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO availability_blocks (master_id, block_type, start_at, end_at)
+                VALUES (1, 'day_off', :block_start, :block_end)
+                """
+            ),
+            {
+                "block_start": datetime(2026, 2, 11, 0, 0, tzinfo=UTC),
+                "block_end": datetime(2026, 2, 12, 0, 0, tzinfo=UTC),
+            },
+        )
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    now = datetime(2026, 2, 9, 15, 0, tzinfo=UTC)
+    service = AvailabilityService(engine)
+
+    summaries = service.summarize_range(1, date(2026, 2, 8), 4, "haircut", now=now, include_slots=True)
+    range_statements = len(statements)
+    statements.clear()
+    service.list_slots(master_id=1, on_date=date(2026, 2, 12), service_type="haircut", now=now)
+
+    # Same loads as one day; only the first lookup also reads the service catalog snapshot.
+    assert range_statements == len(statements) + 1
+    assert [summary.on_date for summary in summaries] == [date(2026, 2, 8) + timedelta(days=i) for i in range(4)]
+    assert summaries[0].free_slots == 0
+    assert summaries[3].free_slots == 0
+    for summary in summaries[1:]:
+        expected = service.list_slots(master_id=1, on_date=summary.on_date, service_type="haircut", now=now)
+        assert summary.free_slots == len(expected)
+        assert [slot.start_at for slot in summary.slots] == [slot.start_at for slot in expected]
+    assert service.summarize_range(99, date(2026, 2, 8), 4, "haircut", now=now) == []
+
+
+def test_availability_earliest_slots_across_masters_use_batched_loads() -> None:
+    engine = _setup_availability_schema()
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO masters (id, user_id, is_active, work_start, work_end, lunch_start, lunch_end)
+                VALUES
+                    (2, 11, 1, '10:00:00', '21:00:00', '13:00:00', '14:00:00'),
+                    (3, 12, 0, '08:00:00', '21:00:00', '13:00:00', '14:00:00')
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO availability_blocks (master_id, block_type, start_at, end_at)
+                VALUES (1, 'day_off', :block_start, :block_end)
+                """
+            ),
+            {
+                "block_start": datetime(2026, 2, 9, 0, 0, tzinfo=UTC),
+                "block_end": datetime(2026, 2, 10, 0, 0, tzinfo=UTC),
+            },
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO bookings (master_id, status, slot_start, slot_end)
+                VALUES (2, 'active', :slot_start, :slot_end)
+                """
+            ),
+            {
+                "slot_start": datetime(2026, 2, 9, 10, 0, tzinfo=UTC),
+                "slot_end": datetime(2026, 2, 9, 10, 30, tzinfo=UTC),
+            },
+        )
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    service = AvailabilityService(engine)
+    now = datetime(2026, 2, 8, 20, 0, tzinfo=UTC)
+
+    slots = service.find_earliest_slots("haircut", date(2026, 2, 9), 14, 3, now=now)
+    assert [(slot.master_id, slot.start_at.strftime("%H:%M")) for slot in slots] == [
+        (2, "10:30"),
+        (2, "11:00"),
+        (2, "11:30"),
+    ]
+    first_statement_count = len(statements)
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO masters (id, user_id, is_active, work_start, work_end, lunch_start, lunch_end)
+                VALUES (4, 13, 1, '10:00:00', '21:00:00', '13:00:00', '14:00:00')
+                """
+            )
+        )
+    statements.clear()
+    slots = service.find_earliest_slots("haircut", date(2026, 2, 9), 14, 3, now=now)
+    assert [(slot.master_id, slot.start_at.strftime("%H:%M")) for slot in slots] == [
+        (4, "10:00"),
+        (2, "10:30"),
+        (4, "10:30"),
+    ]
+    # Roster size does not change the statement count; the repeat search also reuses the catalog snapshot.
+    assert len(statements) == first_statement_count - 1
+    assert service.find_earliest_slots("invalid", date(2026, 2, 9), 14, 3, now=now) == []
+
+
+def test_day_occupancy_cache_lru_ttl_and_generation_guard() -> None:
+    clock = [100.0]
+    cache = DayOccupancyCache(ttl_seconds=10, max_entries=2, clock=lambda: clock[0])
+    day = date(2026, 2, 9)
+
+    cache.put(1, day, "a", generation=cache.generation(1))
+    cache.put(2, day, "b", generation=cache.generation(2))
+    assert cache.get(1, day) == "a"
+    cache.put(3, day, "c", generation=cache.generation(3))
+    assert cache.get(2, day) is None
+    assert len(cache) == 2
+
+    stale_generation = cache.generation(1)
+    cache.invalidate(1, [day])
+    assert cache.get(1, day) is None
+    cache.put(1, day, "stale", generation=stale_generation)
+    assert cache.get(1, day) is None
+
+    clock[0] += 11
+    assert cache.get(3, day) is None
+
+
+def test_availability_cache_serves_repeat_reads_and_never_shows_booked_slot_free() -> None:
+    engine = _setup_availability_schema()
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    availability = AvailabilityService(engine)
+    now = datetime(2026, 2, 10, 10, 0, tzinfo=UTC)
+    on_date = date(2026, 2, 11)
+
+    first = availability.list_slots(master_id=1, on_date=on_date, service_type="haircut", now=now)
+    statements.clear()
+    assert availability.list_slots(master_id=1, on_date=on_date, service_type="haircut", now=now) == first
+    assert not any("FROM bookings" in statement for statement in statements)
+
+    booked = BookingService(engine).create_booking(
+        master_id=1,
+        client_user_id=5001,
+        service_type="haircut",
+        slot_start=first[0].start_at,
+        now=now,
+    )
+    assert booked.created is True
+    after_booking = availability.list_slots(master_id=1, on_date=on_date, service_type="haircut", now=now)
+    assert first[0] not in after_booking
+
+    cancelled = BookingCancellationService(engine).cancel_by_client(
+        booking_id=int(booked.booking_id or 0),
+        client_user_id=5001,
+        now=now,
+    )
+    assert cancelled.cancelled is True
+    assert availability.list_slots(master_id=1, on_date=on_date, service_type="haircut", now=now) == first
+
+    metrics = render_metrics()[0].decode("utf-8")
+    assert 'bot_api_cache_events_total{cache="availability_day",event="hit"}' in metrics
+    assert 'bot_api_cache_events_total{cache="availability_day",event="invalidation"}' in metrics
+
+
+def test_availability_cache_is_shared_by_engines_on_the_same_database(tmp_path) -> None:
+    database_path = tmp_path / "shared.sqlite3"
+    write_engine = _setup_availability_schema(f"sqlite+pysqlite:///{database_path}")
+    read_engine = create_engine(f"sqlite:///{database_path}", future=True)
+    now = datetime(2026, 2, 10, 10, 0, tzinfo=UTC)
+    on_date = date(2026, 2, 11)
+    reader = AvailabilityService(read_engine)
+
+    first = reader.list_slots(master_id=1, on_date=on_date, service_type="haircut", now=now)
+    booked = BookingService(write_engine).create_booking(
+        master_id=1,
+        client_user_id=5001,
+        service_type="haircut",
+        slot_start=first[0].start_at,
+        now=now,
+    )
+
+    assert booked.created is True
+    assert first[0] not in reader.list_slots(master_id=1, on_date=on_date, service_type="haircut", now=now)
+
+
 def test_create_booking_success() -> None:
     engine = _setup_availability_schema()
 
@@ -510,6 +837,235 @@ def test_create_booking_rejects_overlapping_master_slot() -> None:
     assert "недоступен" in result.message
 
 
+def test_concurrent_confirms_for_overlapping_slots_create_exactly_one_booking(tmp_path) -> None:
+    engine = _setup_availability_schema(f"sqlite+pysqlite:///{tmp_path / 'contention.db'}")
+    service = BookingService(engine)
+    contenders = 12
+    barrier = threading.Barrier(contenders)
+    now = datetime(2026, 2, 10, 10, 0, tzinfo=UTC)
+
+    def confirm(index: int) -> bool:
+        # Half ask for 10:00 haircut_beard, half for the overlapping 10:30 haircut.
+        service_type, slot_start = (
+            ("haircut_beard", datetime(2026, 2, 11, 10, 0, tzinfo=UTC))
+            if index % 2 == 0
+            else ("haircut", datetime(2026, 2, 11, 10, 30, tzinfo=UTC))
+        )
+        barrier.wait()
+        result = service.create_booking(
+            master_id=1,
+            client_user_id=7000 + index,
+            service_type=service_type,
+            slot_start=slot_start,
+            now=now,
+        )
+        if not result.created:
+            assert "недоступен" in result.message
+        return result.created
+
+    with ThreadPoolExecutor(max_workers=contenders) as pool:
+        outcomes = list(pool.map(confirm, range(contenders)))
+
+    assert outcomes.count(True) == 1
+    with engine.connect() as conn:
+        active = conn.execute(text("SELECT COUNT(*) FROM bookings WHERE status = 'active'")).scalar_one()
+    assert active == 1
+
+
+def test_booking_overlap_violation_is_recognized_by_sqlstate_and_constraint() -> None:
+    class _Diag:
+        def __init__(self, constraint_name: str | None) -> None:
+            self.constraint_name = constraint_name
+
+    class _PgError(Exception):
+        def __init__(self, pgcode: str, constraint_name: str | None) -> None:
+            super().__init__(pgcode)
+            self.pgcode = pgcode
+            self.diag = _Diag(constraint_name)
+
+    def violation(pgcode: str, constraint_name: str | None) -> IntegrityError:
+        return IntegrityError("INSERT INTO bookings", {}, _PgError(pgcode, constraint_name))
+
+    assert is_booking_overlap_violation(violation("23P01", BOOKING_OVERLAP_CONSTRAINT)) is True
+    assert is_booking_overlap_violation(violation("23P01", None)) is True
+    assert is_booking_overlap_violation(violation("23P01", "ex_other_constraint")) is False
+    assert is_booking_overlap_violation(violation("23505", BOOKING_OVERLAP_CONSTRAINT)) is False
+
+
+def test_create_group_bookings_is_all_or_nothing_with_one_multi_row_insert() -> None:
+    engine = _setup_availability_schema()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO masters (id, user_id, is_active, work_start, work_end, lunch_start, lunch_end)
+                VALUES (2, 11, 1, '10:00:00', '21:00:00', '13:00:00', '14:00:00')
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO bookings (master_id, client_user_id, service_type, status, slot_start, slot_end)
+                VALUES (1, 9001, 'haircut', 'active', :slot_start, :slot_end)
+                """
+            ),
+            {
+                "slot_start": datetime(2026, 2, 11, 11, 0, tzinfo=UTC),
+                "slot_end": datetime(2026, 2, 11, 11, 30, tzinfo=UTC),
+            },
+        )
+    service = BookingService(engine)
+    now = datetime(2026, 2, 10, 10, 0, tzinfo=UTC)
+    snapshot = BookingClientSnapshot(telegram_username="organizer", phone_number=None)
+
+    def participant(name: str, master_id: int, hour: int, minute: int = 0) -> GroupParticipantRequest:
+        return GroupParticipantRequest(
+            participant_name=name,
+            master_id=master_id,
+            service_type="haircut",
+            slot_start=datetime(2026, 2, 11, hour, minute, tzinfo=UTC),
+        )
+
+    def group_rows() -> int:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT COUNT(*) FROM bookings WHERE organizer_user_id = 20")).scalar_one()
+
+    taken = service.create_group_bookings(
+        organizer_user_id=20,
+        booking_group_key="g1",
+        participants=[participant("Анна", 1, 10), participant("Борис", 2, 10), participant("Вера", 1, 11)],
+        now=now,
+        organizer_snapshot=snapshot,
+    )
+    assert taken.created is False
+    assert taken.participant_name == "Вера"
+    assert "недоступен" in taken.message
+    assert group_rows() == 0
+
+    clashing = service.create_group_bookings(
+        organizer_user_id=20,
+        booking_group_key="g1",
+        participants=[participant("Анна", 1, 10), participant("Борис", 1, 10, 15)],
+        now=now,
+        organizer_snapshot=snapshot,
+    )
+    assert clashing.created is False
+    assert clashing.participant_name == "Борис"
+    assert group_rows() == 0
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(str(args[2])))
+    created = service.create_group_bookings(
+        organizer_user_id=20,
+        booking_group_key="g1",
+        participants=[
+            participant("Анна", 1, 10),
+            participant("Борис", 1, 10, 30),
+            participant("Вера", 2, 10),
+            participant("Глеб", 2, 11),
+        ],
+        now=now,
+        organizer_snapshot=snapshot,
+    )
+    assert created.created is True
+    assert [item.participant_name for item in created.bookings] == ["Анна", "Борис", "Вера", "Глеб"]
+    assert len({item.booking_id for item in created.bookings}) == 4
+    assert sum("INSERT INTO bookings" in statement for statement in statements) == 1
+    assert len(statements) <= 4
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                """
+                SELECT id, master_id, manual_client_name, booking_group_key, client_user_id
+                FROM bookings
+                WHERE organizer_user_id = 20
+                ORDER BY id
+                """
+            )
+        ).mappings().all()
+    assert [(row["id"], row["master_id"], row["manual_client_name"]) for row in rows] == [
+        (item.booking_id, item.master_id, item.participant_name) for item in created.bookings
+    ]
+    assert {row["booking_group_key"] for row in rows} == {"g1"}
+    assert all(row["client_user_id"] is None for row in rows)
+
+
+def test_create_group_bookings_insert_guard_rejects_whole_group_on_block_added_after_load(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = _setup_availability_schema()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO masters (id, user_id, is_active, work_start, work_end, lunch_start, lunch_end)
+                VALUES (2, 11, 1, '10:00:00', '21:00:00', '13:00:00', '14:00:00')
+                """
+            )
+        )
+        conn.execute(
+            text("INSERT INTO availability_blocks (master_id, block_type, start_at, end_at) VALUES (2, 'day_off', :s, :e)"),
+            {"s": datetime(2027, 2, 11, 0, 0, tzinfo=UTC), "e": datetime(2027, 2, 12, 0, 0, tzinfo=UTC)},
+        )
+    # The validation read misses the day off, as if it was committed after the occupancy load.
+    monkeypatch.setattr("app.booking.create_booking._load_group_occupancy", lambda *args, **kwargs: {})
+
+    result = BookingService(engine).create_group_bookings(
+        organizer_user_id=20,
+        booking_group_key="g-stale",
+        participants=[
+            GroupParticipantRequest(
+                participant_name=name,
+                master_id=master_id,
+                service_type="haircut",
+                slot_start=datetime(2027, 2, 11, 10, 0, tzinfo=UTC),
+            )
+            for name, master_id in (("Анна", 1), ("Борис", 2))
+        ],
+        now=datetime(2027, 2, 10, 10, 0, tzinfo=UTC),
+        organizer_snapshot=BookingClientSnapshot(telegram_username="organizer", phone_number=None),
+    )
+
+    assert result.created is False
+    assert result.message == RU_BOOKING_MESSAGES["slot_not_available"]
+    assert result.participant_name == "Борис"
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM bookings WHERE organizer_user_id = 20")).scalar_one() == 0
+
+
+def test_telegram_confirm_group_rolls_back_partial_insert_on_guard_miss(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = _setup_telegram_flow_schema()
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO availability_blocks (master_id, block_type, start_at, end_at) VALUES (2, 'day_off', :s, :e)"),
+            {"s": datetime(2027, 2, 11, 0, 0, tzinfo=UTC), "e": datetime(2027, 2, 12, 0, 0, tzinfo=UTC)},
+        )
+    # The validation read misses the day off, as if it was committed after the occupancy load.
+    monkeypatch.setattr("app.booking.create_booking._load_group_occupancy", lambda *args, **kwargs: {})
+
+    response = TelegramBookingFlowService(engine).confirm_group(
+        client_telegram_user_id=2000001,
+        booking_group_key="g2",
+        participants=[
+            GroupParticipantRequest(
+                participant_name=name,
+                master_id=master_id,
+                service_type="haircut",
+                slot_start=datetime(2027, 2, 11, 10, 0, tzinfo=UTC),
+            )
+            for name, master_id in (("Анна", 1), ("Борис", 2))
+        ],
+    )
+
+    assert response["created"] is False
+    assert response["message"] == RU_BOOKING_MESSAGES["slot_not_available"]
+    assert response["participant_name"] == "Борис"
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM bookings")).scalar_one() == 0
+
+
 def test_create_booking_rejects_second_future_booking_for_client() -> None:
     engine = _setup_availability_schema()
 
@@ -1126,6 +1682,254 @@ def test_master_manual_booking_rejects_overlap_and_unavailable_slots() -> None:
     assert "Укажите клиента" in empty_name.message
 
 
+def test_bulk_day_off_merges_ranges_and_recurrence_into_one_insert() -> None:
+    engine = _setup_telegram_flow_schema()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO bookings (master_id, client_user_id, service_type, status, slot_start, slot_end)
+                VALUES (1, 20, 'haircut', 'active', :slot_start, :slot_end)
+                """
+            ),
+            {
+                "slot_start": datetime(2026, 3, 4, 11, 0, tzinfo=UTC),
+                "slot_end": datetime(2026, 3, 4, 11, 30, tzinfo=UTC),
+            },
+        )
+    service = MasterScheduleService(engine)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    vacation = service.create_day_off_blocks(
+        master_telegram_user_id=1000001,
+        command=MasterBulkDayOffCommand(
+            ranges=((datetime(2026, 3, 9, tzinfo=UTC), datetime(2026, 3, 16, tzinfo=UTC)),),
+            recurrence=MasterDayOffRecurrence(start_date=date(2026, 3, 1), end_date=date(2026, 3, 31), weekdays=(6, 7)),
+        ),
+    )
+
+    assert vacation.applied is True
+    assert vacation.message == "Выходные сохранены: 4."
+    assert len(statements) == 3
+    assert sum(1 for statement in statements if "INSERT INTO availability_blocks" in statement) == 1
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, start_at, end_at FROM availability_blocks ORDER BY start_at")).all()
+    assert [row[0] for row in rows] == list(vacation.block_ids)
+    assert [(datetime.fromisoformat(row[1]).day, datetime.fromisoformat(row[2]).day) for row in rows] == [
+        (1, 2),
+        (7, 16),
+        (21, 23),
+        (28, 30),
+    ]
+
+    with_booking = service.create_day_off_blocks(
+        master_telegram_user_id=1000001,
+        command=MasterBulkDayOffCommand(
+            recurrence=MasterDayOffRecurrence(
+                start_date=date(2026, 3, 2),
+                end_date=date(2026, 3, 6),
+                weekdays=(1, 2, 3, 4, 5),
+            ),
+        ),
+    )
+    assert with_booking.applied is False
+    assert with_booking.message == RU_BOOKING_MESSAGES["day_off_has_bookings"]
+    assert with_booking.conflicts == ((datetime(2026, 3, 2, tzinfo=UTC), datetime(2026, 3, 7, tzinfo=UTC)),)
+
+    overlapping = service.create_day_off_blocks(
+        master_telegram_user_id=1000001,
+        command=MasterBulkDayOffCommand(
+            ranges=(
+                (datetime(2026, 3, 24, 10, 0, tzinfo=UTC), datetime(2026, 3, 24, 12, 0, tzinfo=UTC)),
+                (datetime(2026, 3, 29, 10, 0, tzinfo=UTC), datetime(2026, 3, 29, 12, 0, tzinfo=UTC)),
+            ),
+        ),
+    )
+    assert overlapping.applied is False
+    assert overlapping.message == RU_BOOKING_MESSAGES["day_off_conflict"]
+    assert len(overlapping.conflicts) == 1
+
+    invalid = service.create_day_off_blocks(
+        master_telegram_user_id=1000001,
+        command=MasterBulkDayOffCommand(
+            recurrence=MasterDayOffRecurrence(start_date=date(2026, 3, 2), end_date=date(2026, 3, 6), weekdays=(8,)),
+        ),
+    )
+    assert invalid.applied is False
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM availability_blocks")).scalar_one() == 4
+
+
+def test_bulk_day_off_rejects_recurrence_beyond_horizon_before_expanding() -> None:
+    engine = _setup_telegram_flow_schema()
+    service = MasterScheduleService(engine)
+
+    def create(  # type: ignore[no-untyped-def]
+        start_date: date,
+        end_date: date,
+        weekdays: tuple[int, ...] = (1, 2, 3, 4, 5, 6, 7),
+    ):
+        return service.create_day_off_blocks(
+            master_telegram_user_id=1000001,
+            command=MasterBulkDayOffCommand(
+                recurrence=MasterDayOffRecurrence(start_date=start_date, end_date=end_date, weekdays=weekdays),
+            ),
+        )
+
+    endless = create(date(2027, 1, 1), date(9999, 12, 31), weekdays=(1,))
+    assert endless.applied is False
+    assert endless.message == RU_BOOKING_MESSAGES["day_off_recurrence_too_long"].format(limit=366)
+
+    at_calendar_edge = create(date(9999, 12, 31), date(9999, 12, 31))
+    assert at_calendar_edge.applied is False
+    assert at_calendar_edge.message == RU_BOOKING_MESSAGES["day_off_invalid_interval"]
+
+    # Adjacent whole days merge into one range, so the full horizon stays within the range cap.
+    year = create(date(2027, 1, 1), date(2028, 1, 1))
+    assert year.applied is True
+    assert len(year.block_ids) == 1
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM availability_blocks")).scalar_one() == 1
+
+
+def test_manual_import_reports_each_row_against_one_snapshot() -> None:
+    engine = _setup_telegram_flow_schema()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO bookings (master_id, client_user_id, service_type, status, slot_start, slot_end)
+                VALUES (1, 20, 'haircut', 'active', :slot_start, :slot_end)
+                """
+            ),
+            {
+                "slot_start": datetime(2026, 3, 2, 15, 0, tzinfo=UTC),
+                "slot_end": datetime(2026, 3, 2, 15, 30, tzinfo=UTC),
+            },
+        )
+    content = "\n".join(
+        [
+            "slot_start;service_type;client_name",
+            "2026-03-02T10:00:00+00:00;haircut;Анна",
+            "2026-03-02 11:00;haircut_beard;Борис",
+            "2026-03-02T11:30:00+00:00;beard;Вера",
+            "2026-03-02T13:00:00+00:00;haircut;Галина",
+            "2026-03-02T15:00:00+00:00;haircut;Денис",
+            "2026-03-02T16:00:00+00:00;massage;Евгения",
+            "not-a-date;haircut;Жанна",
+            "2026-03-02T17:00:00+00:00;haircut;   ",
+        ]
+    )
+    service = ManualBookingImportService(engine)
+
+    dry_run = service.import_file(master_telegram_user_id=1000001, content=content, dry_run=True)
+    assert dry_run.applied is False
+    assert (dry_run.accepted_count, dry_run.rejected_count) == (2, 6)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM bookings")).scalar_one() == 1
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    result = service.import_file(master_telegram_user_id=1000001, content=content, filename="march.csv")
+
+    assert result.applied is True
+    assert result.message == "Импорт ручных записей: создано 2, отклонено 6."
+    assert [(row.row_number, row.accepted) for row in result.rows] == [
+        (1, True),
+        (2, True),
+        (3, False),
+        (4, False),
+        (5, False),
+        (6, False),
+        (7, False),
+        (8, False),
+    ]
+    assert "недоступен" in result.rows[2].message
+    assert "недоступен" in result.rows[4].message
+    assert result.rows[5].message == RU_BOOKING_MESSAGES["invalid_service_type"]
+    assert result.rows[6].message == RU_BOOKING_MESSAGES["manual_import_invalid_row"]
+    assert result.rows[7].message == RU_BOOKING_MESSAGES["manual_booking_client_required"]
+    assert sum(1 for statement in statements if "INSERT INTO bookings" in statement) == 1
+    assert sum(
+        1 for statement in statements if "FROM bookings" in statement and "INSERT INTO bookings" not in statement
+    ) == 1
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                """
+                SELECT id, manual_client_name, slot_start
+                FROM bookings
+                WHERE manual_client_name IS NOT NULL
+                ORDER BY slot_start
+                """
+            )
+        ).mappings().all()
+    assert [row["manual_client_name"] for row in rows] == ["Анна", "Борис"]
+    assert [row["id"] for row in rows] == [result.rows[0].booking_id, result.rows[1].booking_id]
+
+
+def test_manual_import_insert_guard_rolls_back_on_block_added_after_snapshot(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = _setup_telegram_flow_schema()
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO availability_blocks (master_id, block_type, start_at, end_at) VALUES (1, 'day_off', :s, :e)"),
+            {"s": datetime(2027, 3, 2, 14, 0, tzinfo=UTC), "e": datetime(2027, 3, 2, 16, 0, tzinfo=UTC)},
+        )
+    # The snapshot misses the block, as if it was committed after the occupancy load.
+    monkeypatch.setattr("app.booking.manual_import._load_occupancy_by_date", lambda *args, **kwargs: {})
+    content = "\n".join(
+        [
+            "slot_start;service_type;client_name",
+            "2027-03-02T10:00:00+00:00;haircut;Анна",
+            "2027-03-02T15:00:00+00:00;haircut;Борис",
+        ]
+    )
+
+    result = ManualBookingImportService(engine).import_file(master_telegram_user_id=1000001, content=content)
+
+    assert result.applied is False
+    assert result.message == RU_BOOKING_MESSAGES["manual_import_retry"]
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM bookings")).scalar_one() == 0
+
+
+def test_manual_import_of_five_hundred_rows_uses_batched_inserts() -> None:
+    engine = _setup_telegram_flow_schema()
+    starts: list[datetime] = []
+    on_date = date(2026, 3, 2)
+    while len(starts) < 500:
+        for hour in (10, 11, 12, 14, 15, 16, 17, 18, 19, 20):
+            for minute in (0, 30):
+                starts.append(datetime.combine(on_date, time(hour, minute), tzinfo=UTC))
+        on_date += timedelta(days=1)
+    payload = [
+        {"slot_start": slot_start.isoformat(), "service_type": "haircut", "client_name": f"Клиент {index}"}
+        for index, slot_start in enumerate(starts[:500])
+    ]
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    started = datetime.now(UTC)
+    result = ManualBookingImportService(engine).import_file(
+        master_telegram_user_id=1000001,
+        content=json.dumps({"bookings": payload}, ensure_ascii=False),
+    )
+    elapsed = datetime.now(UTC) - started
+
+    assert result.applied is True
+    assert result.accepted_count == 500
+    assert result.rejected_count == 0
+    assert len({row.booking_id for row in result.rows}) == 500
+    inserts = sum(1 for statement in statements if "INSERT INTO bookings" in statement)
+    assert inserts == -(-500 // MANUAL_IMPORT_INSERT_BATCH_SIZE)
+    assert len(statements) <= inserts + 6
+    assert elapsed < timedelta(seconds=5)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM bookings WHERE status = 'active'")).scalar_one() == 500
+
+
 def test_telegram_booking_flow_start_and_select_steps() -> None:
     engine = _setup_telegram_flow_schema()
     flow = TelegramBookingFlowService(engine)
@@ -1181,6 +1985,31 @@ def test_telegram_booking_flow_start_and_select_steps() -> None:
     )
 
 
+def test_telegram_booking_flow_confirm_keeps_booking_when_reminder_insert_fails() -> None:
+    engine = _setup_telegram_flow_schema()
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE booking_reminders"))
+    flow = TelegramBookingFlowService(engine)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    created = flow.confirm(
+        client_telegram_user_id=2000001,
+        master_id=1,
+        service_type="haircut",
+        slot_start=datetime(2027, 2, 12, 10, 0, tzinfo=UTC),
+    )
+
+    assert created["created"] is True
+    assert any(statement.startswith("SAVEPOINT") for statement in statements)
+    with engine.connect() as conn:
+        status = conn.execute(
+            text("SELECT status FROM bookings WHERE id = :booking_id"),
+            {"booking_id": int(created["booking_id"])},
+        ).scalar_one()
+    assert status == "active"
+
+
 def test_telegram_booking_flow_confirm_sends_notifications_and_rejects_second_future_booking() -> None:
     engine = _setup_telegram_flow_schema()
     flow = TelegramBookingFlowService(engine)
@@ -1219,6 +2048,31 @@ def test_telegram_booking_flow_confirm_sends_notifications_and_rejects_second_fu
     assert "активная будущая" in str(second["message"])
 
 
+def test_telegram_booking_flow_confirm_runs_as_single_unit_of_work(monkeypatch) -> None:
+    fixed_now = datetime(2026, 2, 10, 8, 0, tzinfo=UTC)
+    monkeypatch.setattr("app.booking.create_booking.utc_now", lambda: fixed_now)
+    monkeypatch.setattr("app.booking.flow.utc_now", lambda: fixed_now)
+    engine = _setup_telegram_flow_schema()
+    flow = TelegramBookingFlowService(engine)
+    statements: list[str] = []
+    checkouts: list[int] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(str(args[2])))
+    event.listen(engine.pool, "checkout", lambda *args: checkouts.append(1))
+
+    result = flow.confirm(
+        client_telegram_user_id=2000001,
+        master_id=1,
+        service_type="haircut",
+        slot_start=datetime(2026, 2, 12, 10, 0, tzinfo=UTC),
+    )
+
+    assert result["created"] is True
+    assert len(result["notifications"]) == 2
+    assert len(checkouts) == 1
+    # Includes SAVEPOINT/RELEASE around the reminder insert.
+    assert len(statements) <= 8
+
+
 def test_telegram_booking_flow_cancel_sends_notifications_and_rejects_non_owner() -> None:
     engine = _setup_telegram_flow_schema()
     flow = TelegramBookingFlowService(engine)
@@ -1280,6 +2134,90 @@ def test_telegram_master_cancel_sends_reason_to_client_and_rejects_without_reaso
     assert "Слот:" in client_message
 
 
+def test_master_cancel_range_cancels_window_in_one_update_and_skips_reminders() -> None:
+    engine = _setup_telegram_flow_schema()
+    with engine.begin() as conn:
+        for booking_id, master_id, client_user_id, hour, day in (
+            (1, 1, 20, 10, 2),
+            (2, 1, 21, 12, 2),
+            (3, 1, 9999, 15, 2),
+            (4, 2, 20, 10, 2),
+            (5, 1, 21, 10, 3),
+        ):
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO bookings (id, master_id, client_user_id, service_type, status, slot_start, slot_end)
+                    VALUES (:id, :master_id, :client_user_id, 'haircut', 'active', :slot_start, :slot_end)
+                    """
+                ),
+                {
+                    "id": booking_id,
+                    "master_id": master_id,
+                    "client_user_id": client_user_id,
+                    "slot_start": datetime(2027, 3, day, hour, 0, tzinfo=UTC),
+                    "slot_end": datetime(2027, 3, day, hour, 30, tzinfo=UTC),
+                },
+            )
+        conn.execute(
+            text(
+                """
+                INSERT INTO booking_reminders (booking_id, due_at, status)
+                VALUES (1, :due_at, 'pending'), (2, :due_at, 'pending'), (5, :due_at, 'pending')
+                """
+            ),
+            {"due_at": datetime(2027, 3, 1, 8, 0, tzinfo=UTC)},
+        )
+    flow = TelegramBookingFlowService(engine)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    response = flow.cancel_range_by_master(
+        master_telegram_user_id=1000001,
+        start_at=datetime(2027, 3, 2, tzinfo=UTC),
+        end_at=datetime(2027, 3, 3, tzinfo=UTC),
+        reason="Болезнь",
+    )
+
+    assert response["cancelled"] is True
+    assert response["booking_ids"] == [1, 2, 3]
+    assert response["message"] == "Отменено записей: 3. Клиенты получат уведомления."
+    notifications = response["notifications"]
+    assert [item["recipient_telegram_user_id"] for item in notifications] == [2000001, 2000002]
+    assert all("Болезнь" in item["message"] and "Слот:" in item["message"] for item in notifications)
+    assert sum(1 for statement in statements if statement.lstrip().startswith("UPDATE bookings")) == 1
+    assert len(statements) == 4
+    with engine.connect() as conn:
+        statuses = dict(conn.execute(text("SELECT id, status FROM bookings ORDER BY id")).all())
+        reminders = dict(conn.execute(text("SELECT booking_id, status FROM booking_reminders")).all())
+    assert statuses == {
+        1: "cancelled_by_master",
+        2: "cancelled_by_master",
+        3: "cancelled_by_master",
+        4: "active",
+        5: "active",
+    }
+    assert reminders == {1: "skipped", 2: "skipped", 5: "pending"}
+
+    empty = flow.cancel_range_by_master(
+        master_telegram_user_id=1000001,
+        start_at=datetime(2027, 3, 2, tzinfo=UTC),
+        end_at=datetime(2027, 3, 3, tzinfo=UTC),
+        reason="Болезнь",
+    )
+    assert empty["cancelled"] is False
+    assert empty["message"] == RU_BOOKING_MESSAGES["cancel_range_empty"]
+
+    no_reason = flow.cancel_range_by_master(
+        master_telegram_user_id=1000001,
+        start_at=datetime(2027, 3, 3, tzinfo=UTC),
+        end_at=datetime(2027, 3, 4, tzinfo=UTC),
+        reason=" ",
+    )
+    assert no_reason["cancelled"] is False
+    assert no_reason["message"] == RU_BOOKING_MESSAGES["cancel_reason_required"]
+
+
 def test_reminder_eligibility_boundary() -> None:
     slot = datetime(2026, 2, 12, 12, 0, tzinfo=UTC)
     assert is_reminder_eligible(slot_start=slot, booking_created_at=datetime(2026, 2, 12, 10, 0, tzinfo=UTC))
@@ -1333,3 +2271,78 @@ def test_reminder_dispatch_sends_once_for_single_booking() -> None:
     )
     assert len(sent) == 1
     assert sent[0][0] == 2000001
+
+
+def test_next_free_slot_table_is_maintained_incrementally_and_reconciled() -> None:
+    engine = _setup_telegram_flow_schema()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE master_next_free_slot (
+                    master_id INTEGER PRIMARY KEY,
+                    slot_start DATETIME,
+                    slot_end DATETIME,
+                    computed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+        )
+    service = NextFreeSlotService(engine)
+    on_date = business_date(utc_now()) + timedelta(days=2)
+    now = combine_business_date_time(on_date, time(9, 0))
+
+    def at(hour: int) -> datetime:
+        return combine_business_date_time(on_date, time(hour, 0))
+
+    def add_booking(booking_id: int, hour: int) -> None:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO bookings (id, master_id, client_user_id, service_type, status, slot_start, slot_end)
+                    VALUES (:id, 1, 20, 'haircut_beard', 'active', :slot_start, :slot_end)
+                    """
+                ),
+                {"id": booking_id, "slot_start": at(hour), "slot_end": at(hour + 1)},
+            )
+
+    assert service.reconcile(now=now) == 2
+    assert service.list_next_free_slots(now=now) == {1: at(10), 2: at(10)}
+
+    add_booking(900, 10)
+    assert service.refresh(1, start_at=at(10), end_at=at(11), now=now) is True
+    assert service.list_next_free_slots(now=now)[1] == at(11)
+
+    add_booking(901, 15)
+    assert service.refresh(1, start_at=at(15), end_at=at(16), now=now) is False
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE bookings SET status = 'cancelled_by_client' WHERE id IN (900, 901)"))
+    assert service.refresh(1, start_at=at(15), end_at=at(16), freed=True, now=now) is False
+    assert service.refresh(1, start_at=at(10), end_at=at(11), freed=True, now=now) is True
+    assert service.list_next_free_slots(now=now)[1] == at(10)
+    assert service.list_next_free_slots(now=at(12)) == {}
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE masters SET is_active = 0 WHERE id = 2"))
+    assert service.reconcile(now=now) == 1
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT master_id FROM master_next_free_slot")).scalars().all() == [1]
+
+    service.refresh(1)
+    next_free = service.list_next_free_slots()[1]
+    created = BookingService(engine).create_booking(
+        master_id=1,
+        client_user_id=20,
+        service_type="beard",
+        slot_start=next_free,
+    )
+    assert created.created is True
+    assert service.list_next_free_slots()[1] == next_free
+    assert service.refresh_pending() == 1
+    assert service.list_next_free_slots()[1] > next_free
+
+    start_payload = TelegramBookingFlowService(engine).start()
+    masters = {master["id"]: master for master in start_payload["masters"]}
+    assert masters[1]["next_free_at"] == service.list_next_free_slots()[1].isoformat()
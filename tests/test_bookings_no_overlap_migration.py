@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, text
+
+_MIGRATION_PATH = Path("alembic/versions/20261017_0010_bookings_no_overlap.py")
+
+
+def _load_migration():  # type: ignore[no-untyped-def]
+    spec = importlib.util.spec_from_file_location("bookings_no_overlap_migration", _MIGRATION_PATH)
+    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+def test_bookings_no_overlap_migration_reports_existing_overlaps_before_adding_constraint() -> None:
+    migration = _load_migration()
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE bookings (
+                    id INTEGER PRIMARY KEY, master_id INTEGER, status TEXT, slot_start TEXT, slot_end TEXT
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO bookings (id, master_id, status, slot_start, slot_end) VALUES
+                    (1, 1, 'active', '2026-03-02 10:00', '2026-03-02 11:00'),
+                    (2, 1, 'active', '2026-03-02 10:30', '2026-03-02 11:00'),
+                    (3, 1, 'cancelled_by_client', '2026-03-02 10:00', '2026-03-02 10:30'),
+                    (4, 1, 'active', '2026-03-02 11:00', '2026-03-02 11:30'),
+                    (5, 2, 'active', '2026-03-02 10:00', '2026-03-02 10:30')
+                """
+            )
+        )
+        with Operations.context(MigrationContext.configure(conn)):
+            with pytest.raises(RuntimeError, match="master 1: 1/2\\)"):
+                migration._fail_on_existing_overlaps()
+            conn.execute(text("UPDATE bookings SET status = 'cancelled_by_master' WHERE id = 2"))
+            migration._fail_on_existing_overlaps()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from app.auth.repository import RoleRepository
+from app.db.bridge import AsyncServiceAdapter, ConnectionBoundEngine, run_on_async_connection
+from app.db.session import resolve_async_database_url
+
+
+def _setup_roles_schema(database_url: str) -> Engine:
+    engine = create_engine(database_url, future=True)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE roles (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)"))
+        conn.execute(
+            text(
+                "CREATE TABLE users (id INTEGER PRIMARY KEY, telegram_user_id BIGINT UNIQUE NOT NULL, role_id INTEGER NOT NULL)"
+            )
+        )
+        conn.execute(text("INSERT INTO roles (id, name) VALUES (1, 'Client'), (2, 'Master')"))
+        conn.execute(text("INSERT INTO users (telegram_user_id, role_id) VALUES (1000001, 2)"))
+    return engine
+
+
+def test_resolve_async_database_url_maps_sync_drivers() -> None:
+    assert (
+        resolve_async_database_url("postgresql+psycopg2://u:p@db:5432/app")
+        == "postgresql+asyncpg://u:p@db:5432/app"
+    )
+    with pytest.raises(ValueError, match="DATABASE_ASYNC_ENABLED"):
+        resolve_async_database_url("sqlite+pysqlite:///tmp/app.db")
+    with pytest.raises(ValueError):
+        resolve_async_database_url("mysql+pymysql://u:p@db/app")
+
+
+def test_connection_bound_engine_joins_outer_transaction() -> None:
+    engine = _setup_roles_schema("sqlite+pysqlite:///:memory:")
+
+    with engine.connect() as conn:
+        with conn.begin() as outer:
+            bound = ConnectionBoundEngine(conn)
+            with bound.begin() as inner:
+                inner.execute(text("INSERT INTO users (telegram_user_id, role_id) VALUES (2000001, 1)"))
+            assert conn.in_transaction()
+            outer.rollback()
+
+        assert RoleRepository(ConnectionBoundEngine(conn)).resolve_role(2000001) is None  # type: ignore[arg-type]
+        assert not conn.in_transaction()
+
+
+def test_connection_bound_engine_commits_own_transactions() -> None:
+    engine = _setup_roles_schema("sqlite+pysqlite:///:memory:")
+
+    with engine.connect() as conn:
+        bound = ConnectionBoundEngine(conn)
+        with bound.begin() as inner:
+            inner.execute(text("INSERT INTO users (telegram_user_id, role_id) VALUES (2000001, 1)"))
+        assert RoleRepository(bound).resolve_role(2000001) == "Client"  # type: ignore[arg-type]
+
+
+def test_async_service_adapter_runs_sync_service_on_async_engine(tmp_path: Path) -> None:
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    database_path = tmp_path / "bridge.db"
+    _setup_roles_schema(f"sqlite+pysqlite:///{database_path}").dispose()
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+
+    async def _scenario() -> tuple[str | None, str | None, int]:
+        roles = AsyncServiceAdapter(async_engine, RoleRepository)
+        known, unknown = await asyncio.gather(
+            roles.call(lambda repository: repository.resolve_role(1000001)),
+            roles.call(lambda repository: repository.resolve_role(9999999)),
+        )
+        count = await run_on_async_connection(
+            async_engine,
+            lambda engine: _count_users(engine),
+        )
+        await async_engine.dispose()
+        return known, unknown, count
+
+    known, unknown, count = asyncio.run(_scenario())
+    assert known == "Master"
+    assert unknown is None
+    assert count == 1
+
+
+def _count_users(engine: Engine) -> int:
+    with engine.connect() as conn:
+        return int(conn.execute(text("SELECT count(*) FROM users")).scalar_one())
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from app.booking.flow import BookingFlowRepository
+from app.db.routing import ReadRouter, configure_read_router, mark_recent_write, route_read
+
+# Point both variables at two local Postgres instances to run these checks against real servers.
+_PRIMARY_URL_ENV = "TEST_DATABASE_URL"
+_REPLICA_URL_ENV = "TEST_DATABASE_REPLICA_URL"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _setup_masters(engine: Engine, display_name: str) -> Engine:
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS masters"))
+        conn.execute(text("DROP TABLE IF EXISTS users"))
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, telegram_user_id BIGINT NOT NULL)"))
+        conn.execute(
+            text(
+                "CREATE TABLE masters (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+                "display_name TEXT NOT NULL, is_active BOOLEAN NOT NULL)"
+            )
+        )
+        conn.execute(text("INSERT INTO users (id, telegram_user_id) VALUES (1, 1000001)"))
+        conn.execute(
+            text("INSERT INTO masters (id, user_id, display_name, is_active) VALUES (1, 1, :name, true)"),
+            {"name": display_name},
+        )
+    return engine
+
+
+@pytest.fixture
+def engines(tmp_path: Path) -> Iterator[tuple[Engine, Engine]]:
+    primary_url = os.getenv(_PRIMARY_URL_ENV) or f"sqlite+pysqlite:///{tmp_path / 'primary.db'}"
+    replica_url = os.getenv(_REPLICA_URL_ENV) or f"sqlite+pysqlite:///{tmp_path / 'replica.db'}"
+    primary = _setup_masters(create_engine(primary_url, future=True), "Primary")
+    replica = _setup_masters(create_engine(replica_url, future=True), "Replica")
+    yield primary, replica
+    configure_read_router(None)
+    primary.dispose()
+    replica.dispose()
+
+
+def _master_name(engine: Engine) -> str:
+    return str(BookingFlowRepository(engine).list_active_masters()[0]["display_name"])
+
+
+def test_route_read_is_passthrough_without_router(engines: tuple[Engine, Engine]) -> None:
+    primary, replica = engines
+    configure_read_router(None)
+    assert route_read(primary) is primary
+
+    configure_read_router(ReadRouter(primary=primary, replica=replica, lag_probe=lambda _: 0.0))
+    other = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    assert route_read(other) is other
+
+
+def test_reads_go_to_replica_until_user_or_master_writes(engines: tuple[Engine, Engine]) -> None:
+    primary, replica = engines
+    clock = _Clock()
+    configure_read_router(
+        ReadRouter(
+            primary=primary,
+            replica=replica,
+            read_your_writes_seconds=10,
+            lag_probe=lambda _: 0.0,
+            clock=clock,
+        )
+    )
+
+    assert _master_name(primary) == "Replica"
+    assert route_read(primary, telegram_user_id=2000001) is replica
+
+    mark_recent_write(telegram_user_ids=(2000001,), master_ids=(1,))
+    assert route_read(primary, telegram_user_id=2000001) is primary
+    assert route_read(primary, master_id=1) is primary
+    assert route_read(primary, telegram_user_id=2000002, master_id=2) is replica
+
+    mark_recent_write(scopes=("master_roster",))
+    assert route_read(primary, scope="master_roster") is primary
+    assert route_read(primary, scope="other") is replica
+
+    clock.now += 11
+    assert route_read(primary, telegram_user_id=2000001, master_id=1) is replica
+    assert route_read(primary, scope="master_roster") is replica
+
+
+def test_lagging_or_unreachable_replica_falls_back_to_primary(engines: tuple[Engine, Engine]) -> None:
+    primary, replica = engines
+    clock = _Clock()
+    observed_lag: list[float | None] = [5.0]
+    probe_calls: list[int] = []
+
+    def _probe(_: Engine) -> float | None:
+        probe_calls.append(1)
+        value = observed_lag[0]
+        if value is None:
+            raise RuntimeError("replica down")
+        return value
+
+    configure_read_router(
+        ReadRouter(
+            primary=primary,
+            replica=replica,
+            max_lag_seconds=2,
+            lag_check_seconds=5,
+            lag_probe=_probe,
+            clock=clock,
+        )
+    )
+
+    assert _master_name(primary) == "Primary"
+    observed_lag[0] = 0.5
+    assert route_read(primary) is primary
+    assert len(probe_calls) == 1
+
+    clock.now += 6
+    assert route_read(primary) is replica
+    assert len(probe_calls) == 2
+
+    observed_lag[0] = None
+    clock.now += 6
+    assert route_read(primary) is primary
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from app.db import session
+from app.db.session import dispose_engine, get_engine, resolve_pool_options
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_engine():
+    dispose_engine()
+    yield
+    dispose_engine()
+
+
+def test_get_engine_returns_process_wide_shared_engine(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    engine = get_engine()
+    assert get_engine() is engine
+
+
+def test_dispose_engine_drops_shared_engine(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    engine = get_engine()
+    dispose_engine()
+
+    assert session._ENGINE is None
+    assert get_engine() is not engine
+
+
+def test_resolve_pool_options_reads_env_for_server_databases(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "12")
+    monkeypatch.setenv("DATABASE_MAX_OVERFLOW", "3")
+    monkeypatch.setenv("DATABASE_POOL_TIMEOUT_SECONDS", "4")
+    monkeypatch.setenv("DATABASE_POOL_RECYCLE_SECONDS", "600")
+    monkeypatch.setenv("DATABASE_POOL_PRE_PING", "false")
+
+    options = resolve_pool_options("postgresql+psycopg2://u:p@localhost:5432/db")
+
+    assert options == {
+        "pool_pre_ping": False,
+        "pool_size": 12,
+        "max_overflow": 3,
+        "pool_timeout": 4,
+        "pool_recycle": 600,
+    }
+
+
+def test_resolve_pool_options_skips_queue_pool_settings_for_sqlite() -> None:
+    assert resolve_pool_options("sqlite+pysqlite:///:memory:") == {"pool_pre_ping": True}
+
+
+def test_resolve_pool_options_rejects_invalid_values(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "zero")
+    with pytest.raises(ValueError):
+        resolve_pool_options("postgresql+psycopg2://u:p@localhost:5432/db")
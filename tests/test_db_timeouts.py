@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from starlette.requests import Request
+
+from app.db.timeouts import (
+    OPERATION_BOOKING_WRITE,
+    OPERATION_INTERACTIVE_READ,
+    DatabaseTimeoutError,
+    begin_operation,
+    connect_operation,
+    is_database_timeout,
+    load_operation_timeouts,
+    resolve_operation_timeouts,
+    run_after_commit,
+)
+from app.db.bridge import ConnectionBoundEngine
+from app.main import _classify_delivery_outcome, database_timeout_handler
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode: str) -> None:
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def test_resolve_operation_timeouts_defaults_env_override_and_validation(monkeypatch: pytest.MonkeyPatch) -> None:
+    defaults = resolve_operation_timeouts(OPERATION_BOOKING_WRITE)
+    assert (defaults.statement_timeout_ms, defaults.lock_timeout_ms) == (3000, 1000)
+
+    monkeypatch.setenv("DATABASE_STATEMENT_TIMEOUT_MS_BOOKING_WRITE", "1500")
+    monkeypatch.setenv("DATABASE_LOCK_TIMEOUT_MS_BOOKING_WRITE", "0")
+    overridden = resolve_operation_timeouts(OPERATION_BOOKING_WRITE)
+    assert (overridden.statement_timeout_ms, overridden.lock_timeout_ms) == (1500, 0)
+
+    monkeypatch.setenv("DATABASE_LOCK_TIMEOUT_MS_INTERACTIVE_READ", "-1")
+    with pytest.raises(ValueError):
+        load_operation_timeouts()
+
+
+def test_is_database_timeout_matches_statement_and_lock_timeouts_only() -> None:
+    assert is_database_timeout(OperationalError("SELECT 1", {}, _PgError("57014")))
+    assert is_database_timeout(OperationalError("SELECT 1", {}, _PgError("55P03")))
+    assert not is_database_timeout(OperationalError("SELECT 1", {}, _PgError("40001")))
+    assert not is_database_timeout(RuntimeError("57014"))
+
+
+def test_operation_helpers_skip_timeouts_off_postgres_and_translate_timeouts() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with connect_operation(engine, OPERATION_INTERACTIVE_READ) as conn:
+        assert conn.execute(text("SELECT 1")).scalar_one() == 1
+    assert statements == ["SELECT 1"]
+
+    with pytest.raises(DatabaseTimeoutError) as raised:
+        with begin_operation(engine, OPERATION_BOOKING_WRITE):
+            raise OperationalError("UPDATE bookings", {}, _PgError("55P03"))
+    assert raised.value.operation == OPERATION_BOOKING_WRITE
+
+    with pytest.raises(OperationalError):
+        with begin_operation(engine, OPERATION_BOOKING_WRITE):
+            raise OperationalError("UPDATE bookings", {}, _PgError("23505"))
+
+
+def test_after_commit_callbacks_run_once_outermost_transaction_commits() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    calls: list[str] = []
+
+    with begin_operation(engine, OPERATION_BOOKING_WRITE) as conn:
+        with begin_operation(ConnectionBoundEngine(conn), OPERATION_BOOKING_WRITE) as nested:  # type: ignore[arg-type]
+            run_after_commit(nested, lambda: calls.append("nested"))
+        assert calls == []
+    assert calls == ["nested"]
+
+    with pytest.raises(RuntimeError):
+        with begin_operation(engine, OPERATION_BOOKING_WRITE) as conn:
+            run_after_commit(conn, lambda: calls.append("rolled_back"))
+            raise RuntimeError("boom")
+    assert calls == ["nested"]
+
+    with engine.connect() as conn:
+        with pytest.raises(RuntimeError):
+            run_after_commit(conn, lambda: None)
+
+
+def test_database_timeout_response_is_transient_with_retry_hint() -> None:
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/internal/telegram/client/booking-flow/confirm",
+            "headers": [],
+            "query_string": b"",
+        }
+    )
+
+    response = asyncio.run(database_timeout_handler(request, DatabaseTimeoutError(OPERATION_BOOKING_WRITE)))
+    payload = json.loads(response.body)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(payload["retry_after_seconds"])
+    assert payload["code"] == "database_timeout"
+    assert _classify_delivery_outcome(
+        status_code=response.status_code,
+        response_payload=payload,
+        outcome_key="created",
+    ) == ("failed_transient", True)
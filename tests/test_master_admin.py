@@ -3,16 +3,18 @@ from __future__ import annotations
 import sqlite3
 from datetime import time
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
 
+from app.booking.flow import BookingFlowRepository
 from app.booking.master_admin import MasterAdminService
+from app.booking.roster_cache import MasterRosterCache, RosterMaster
 
 sqlite3.register_adapter(time, lambda value: value.isoformat())
 
 
-def _setup_schema() -> Engine:
-    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+def _setup_schema(url: str = "sqlite+pysqlite:///:memory:") -> Engine:
+    engine = create_engine(url, future=True)
 
     with engine.begin() as conn:
         conn.execute(text("CREATE TABLE roles (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)"))
@@ -218,3 +220,49 @@ def test_rename_master_display_name_handles_success_and_validation_paths() -> No
             )
         ).scalar_one()
         assert display_name == "Top Barber"
+
+
+def test_master_roster_is_cached_and_refreshed_by_admin_writes() -> None:
+    engine = _setup_schema()
+    service = MasterAdminService(engine)
+    repository = BookingFlowRepository(engine)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert [master["id"] for master in repository.list_active_masters()] == [1, 2]
+    assert repository.get_active_master(2) == RosterMaster(id=2, display_name="Master Demo 2", telegram_user_id=1000002)
+    assert repository.get_active_master(3) is None
+    assert len(statements) == 1
+
+    assert service.rename_master_display_name(telegram_user_id=1000002, raw_display_name="Top Barber").applied
+    assert repository.get_active_master(2).display_name == "Top Barber"  # type: ignore[union-attr]
+
+    assert service.add_master(telegram_user_id=2000002).reason == "added"
+    assert [master["display_name"] for master in repository.list_active_masters()] == [
+        "Master Owner",
+        "Top Barber",
+        "Master 2000002",
+    ]
+
+    assert service.remove_master(telegram_user_id=1000002, bootstrap_master_telegram_user_id=1000001).applied
+    assert repository.get_active_master(2) is None
+
+    roster = MasterRosterCache(ttl_seconds=60)
+    generation = roster.generation
+    roster.invalidate()
+    roster.store({}, generation=generation)
+    assert roster.get() is None
+
+
+def test_master_roster_cache_is_shared_by_engines_on_the_same_database(tmp_path) -> None:
+    database_path = tmp_path / "shared.sqlite3"
+    write_engine = _setup_schema(f"sqlite+pysqlite:///{database_path}")
+    repository = BookingFlowRepository(create_engine(f"sqlite:///{database_path}", future=True))
+
+    assert repository.get_active_master(2) is not None
+    assert MasterAdminService(write_engine).remove_master(
+        telegram_user_id=1000002,
+        bootstrap_master_telegram_user_id=1000001,
+    ).applied
+
+    assert repository.get_active_master(2) is None
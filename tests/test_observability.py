@@ -4,12 +4,17 @@ import json
 import logging
 import sqlite3
 from datetime import UTC, datetime
+from pathlib import Path
 
+import pytest
 from sqlalchemy import create_engine, text
+from sqlalchemy import exc as sa_exc
 from sqlalchemy.engine import Engine
 
+from app.db.instrumentation import InstrumentedQueuePool, derive_query_name, instrument_engine, instrument_pool
 from app.main import CreateBookingRequest, create_booking, health, metrics
-from app.observability import emit_event, observe_master_admin_outcome
+from app.db.timeouts import DatabaseTimeoutError
+from app.observability import emit_event, instrument_endpoint, observe_master_admin_outcome, render_metrics
 
 sqlite3.register_adapter(datetime, lambda value: value.isoformat())
 
@@ -259,3 +264,111 @@ def test_metrics_include_master_admin_outcomes_counter() -> None:
     )
     assert after_add_value >= before_add_value + 1.0
     assert after_rename_value >= before_rename_value + 1.0
+
+
+def test_derive_query_name_is_stable_and_whitespace_insensitive() -> None:
+    compact = derive_query_name("SELECT id FROM bookings WHERE master_id = :master_id")
+    spaced = derive_query_name(
+        """
+        SELECT id
+        FROM bookings
+        WHERE master_id = :master_id
+        """
+    )
+    assert compact == spaced
+    assert compact.startswith("select_bookings_")
+    assert derive_query_name("INSERT INTO audit_events (event_type) VALUES (:e)").startswith("insert_audit_events_")
+
+
+def test_metrics_track_sql_statement_latency_and_request_query_count(monkeypatch) -> None:
+    engine = instrument_engine(_setup_booking_schema())
+    monkeypatch.setattr("app.main.get_engine", lambda: engine)
+
+    before = metrics().body.decode("utf-8")
+    before_inserts = _metric_value(
+        before,
+        "bot_api_sql_statement_latency_seconds_count",
+        {"query": "booking_insert"},
+        default=0.0,
+    )
+    before_requests = _metric_value(
+        before,
+        "bot_api_request_queries_count",
+        {"method": "POST", "path": "/internal/booking/create"},
+        default=0.0,
+    )
+
+    result = create_booking(
+        CreateBookingRequest(
+            master_id=1,
+            client_user_id=5101,
+            service_type="haircut",
+            slot_start=datetime(2026, 2, 11, 11, 0, tzinfo=UTC),
+        )
+    )
+    assert result["created"] is True
+
+    after = metrics().body.decode("utf-8")
+    assert (
+        _metric_value(after, "bot_api_sql_statement_latency_seconds_count", {"query": "booking_insert"})
+        == before_inserts + 1.0
+    )
+    assert (
+        _metric_value(after, "bot_api_request_queries_count", {"method": "POST", "path": "/internal/booking/create"})
+        == before_requests + 1.0
+    )
+    assert 'query="booking_slot_conflict"' not in after
+    assert 'bot_api_request_queries_bucket{method="POST",path="/internal/booking/create",le="0.0"}' in after
+
+
+def test_metrics_expose_pool_saturation_and_checkout_wait_by_role(tmp_path: Path) -> None:
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'pool.db'}",
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    instrument_pool(engine, "test_pool")
+
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("SELECT 1"))
+        second.execute(text("SELECT 1"))
+        with pytest.raises(sa_exc.TimeoutError):
+            engine.connect()
+        during = metrics().body.decode("utf-8")
+
+    after = metrics().body.decode("utf-8")
+    engine.dispose()
+
+    role = {"role": "test_pool"}
+    assert _metric_value(during, "bot_api_db_pool_size", role) == 1.0
+    assert _metric_value(during, "bot_api_db_pool_checked_out", role) == 2.0
+    assert _metric_value(during, "bot_api_db_pool_overflow", role) == 1.0
+    assert _metric_value(after, "bot_api_db_pool_checked_out", role) == 0.0
+    assert _metric_value(after, "bot_api_db_pool_checkout_wait_seconds_count", role) == 3.0
+    assert _metric_value(after, "bot_api_db_pool_checkout_timeouts_total", role) == 1.0
+    assert _metric_value(after, "bot_api_db_pool_connections_opened_total", role) == 2.0
+
+
+def test_instrument_endpoint_records_database_timeouts_as_503() -> None:
+    @instrument_endpoint("GET", "/internal/test/timeout")
+    def timed_out() -> None:
+        raise DatabaseTimeoutError("booking_read")
+
+    @instrument_endpoint("GET", "/internal/test/crash")
+    def crashed() -> None:
+        raise RuntimeError("boom")
+
+    with pytest.raises(DatabaseTimeoutError):
+        timed_out()
+    with pytest.raises(RuntimeError):
+        crashed()
+
+    exposition = render_metrics()[0].decode("utf-8")
+    labels = {"method": "GET", "path": "/internal/test/timeout"}
+    assert _metric_value(exposition, "bot_api_requests_total", {**labels, "status_code": "503"}) == 1.0
+    assert _metric_value(exposition, "bot_api_requests_total", {**labels, "status_code": "500"}, default=0.0) == 0.0
+    crash_labels = {"method": "GET", "path": "/internal/test/crash", "status_code": "500"}
+    assert _metric_value(exposition, "bot_api_requests_total", crash_labels) == 1.0
@@ -3,7 +3,8 @@ from __future__ import annotations
 import sqlite3
 from datetime import time
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 
 from app.db.seed import resolve_bootstrap_master_telegram_id, run_seed
 
@@ -11,21 +12,7 @@ sqlite3.register_adapter(bool, int)
 sqlite3.register_adapter(time, lambda value: value.isoformat())
 
 
-def test_resolve_bootstrap_master_telegram_id_validates_input() -> None:
-    assert resolve_bootstrap_master_telegram_id("1000001") == 1000001
-
-    for invalid in (None, "", "  ", "abc", "0", "-1"):
-        try:
-            resolve_bootstrap_master_telegram_id(invalid)
-            raise AssertionError("expected ValueError for invalid bootstrap telegram id")
-        except ValueError:
-            pass
-
-
-def test_run_seed_idempotency_with_file_backed_sqlite(tmp_path) -> None:
-    db_path = tmp_path / "seed.db"
-    database_url = f"sqlite+pysqlite:///{db_path}"
-
+def _create_seed_schema(database_url: str, *, with_seed_state: bool = False) -> Engine:
     engine = create_engine(database_url, future=True)
     with engine.begin() as conn:
         conn.execute(text("CREATE TABLE roles (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)"))
@@ -71,6 +58,38 @@ def test_run_seed_idempotency_with_file_backed_sqlite(tmp_path) -> None:
                 """
             )
         )
+        if with_seed_state:
+            conn.execute(
+                text(
+                    """
+                    CREATE TABLE seed_state (
+                        key TEXT PRIMARY KEY,
+                        fingerprint TEXT NOT NULL,
+                        updated_at TIMESTAMP NOT NULL
+                    )
+                    """
+                )
+            )
+    return engine
+
+
+def test_resolve_bootstrap_master_telegram_id_validates_input() -> None:
+    assert resolve_bootstrap_master_telegram_id("1000001") == 1000001
+
+    for invalid in (None, "", "  ", "abc", "0", "-1"):
+        try:
+            resolve_bootstrap_master_telegram_id(invalid)
+            raise AssertionError("expected ValueError for invalid bootstrap telegram id")
+        except ValueError:
+            pass
+
+
+def test_run_seed_idempotency_with_file_backed_sqlite(tmp_path) -> None:
+    db_path = tmp_path / "seed.db"
+    database_url = f"sqlite+pysqlite:///{db_path}"
+
+    engine = _create_seed_schema(database_url)
+    with engine.begin() as conn:
         conn.execute(text("INSERT INTO roles (id, name) VALUES (1, 'Client')"))
         conn.execute(text("INSERT INTO users (telegram_user_id, telegram_username, role_id) VALUES (1000001, NULL, 1)"))
 
@@ -127,3 +146,27 @@ def test_run_seed_idempotency_with_file_backed_sqlite(tmp_path) -> None:
             ("haircut", "Стрижка", 30, 1),
             ("haircut_beard", "Стрижка + борода", 60, 1),
         ]
+
+
+def test_run_seed_skips_writes_when_fingerprint_matches(tmp_path) -> None:
+    database_url = f"sqlite+pysqlite:///{tmp_path / 'seed.db'}"
+    engine = _create_seed_schema(database_url, with_seed_state=True)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert run_seed(bootstrap_master_telegram_id=1000001, engine=engine) is True
+
+    statements.clear()
+    assert run_seed(bootstrap_master_telegram_id=1000001, engine=engine) is False
+    assert not any(statement.lstrip().upper().startswith(("INSERT", "UPDATE")) for statement in statements)
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE services SET duration_minutes = 45 WHERE code = 'beard'"))
+        assert conn.execute(text("SELECT count(*) FROM seed_state")).scalar_one() == 1
+
+    # A different desired state (new bootstrap master) re-applies the seed.
+    assert run_seed(bootstrap_master_telegram_id=1000002, engine=engine) is True
+    with engine.begin() as conn:
+        assert conn.execute(text("SELECT duration_minutes FROM services WHERE code = 'beard'")).scalar_one() == 30
+        assert conn.execute(text("SELECT count(*) FROM masters")).scalar_one() == 2
+    assert run_seed(bootstrap_master_telegram_id=1000002, engine=engine) is False
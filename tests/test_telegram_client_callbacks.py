@@ -8,6 +8,7 @@ from datetime import UTC
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 
+from app.booking.occupancy_cache import invalidate_day_occupancy
 from app.telegram.callbacks import TelegramCallbackRouter
 
 sqlite3.register_adapter(datetime, lambda value: value.isoformat())
@@ -257,6 +258,47 @@ def test_client_flow_uses_fallback_master_name_when_profile_name_missing() -> No
     assert "Слот:" in result.text
 
 
+def test_client_any_master_flow_offers_earliest_slots_across_masters() -> None:
+    engine = _setup_flow_schema()
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, telegram_user_id, telegram_username, role_id) VALUES (11, 1000002, 'm2', 2)"))
+        conn.execute(
+            text(
+                """
+                INSERT INTO masters (id, user_id, display_name, is_active, work_start, work_end, lunch_start, lunch_end)
+                VALUES (2, 11, 'Master Demo 2', 1, '10:00:00', '21:00:00', '13:00:00', '14:00:00')
+                """
+            )
+        )
+    router = TelegramCallbackRouter(engine)
+    router.seed_root_menu(telegram_user_id=2000001)
+
+    router.handle(telegram_user_id=2000001, data="hb1|cm")
+    result = router.handle(telegram_user_id=2000001, data="hb1|cb")
+    assert _callbacks_for_action(result.reply_markup, "csa") == ["hb1|csa"]
+
+    result = router.handle(telegram_user_id=2000001, data="hb1|csa")
+    service_callbacks = _callbacks_for_action(result.reply_markup, "cas")
+    assert len(service_callbacks) == 3
+
+    result = router.handle(telegram_user_id=2000001, data=service_callbacks[0])
+    assert "всех мастеров" in result.text
+    earliest_callbacks = _callbacks_for_action(result.reply_markup, "cae")
+    assert earliest_callbacks
+    assert {callback.split("|")[-1].split("_")[0] for callback in earliest_callbacks} == {"1", "2"}
+    assert all(len(callback.encode("utf-8")) <= 64 for callback in earliest_callbacks)
+
+    second_master_callback = next(callback for callback in earliest_callbacks if callback.split("|")[-1].startswith("2_"))
+    result = router.handle(telegram_user_id=2000001, data=second_master_callback)
+    assert "Подтвердите запись" in result.text
+    assert "Мастер: Master Demo 2" in result.text
+
+    result = router.handle(telegram_user_id=2000001, data="hb1|ccf")
+    assert "успешно создана" in result.text
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT master_id FROM bookings")).scalar_one() == 2
+
+
 def test_client_interactive_flow_preserves_one_active_future_booking_limit() -> None:
     router = TelegramCallbackRouter(_setup_flow_schema())
     router.seed_root_menu(telegram_user_id=2000001)
@@ -313,6 +355,8 @@ def test_client_service_selection_controls_slot_granularity() -> None:
                 "slot_end": target_date.replace(hour=11, minute=0),
             },
         )
+    # Raw SQL bypasses the booking services, so drop the cached occupancy they would have invalidated.
+    invalidate_day_occupancy(engine, (1,))
 
     result = router.handle(telegram_user_id=2000001, data=date_callbacks[1])
     haircut_slot_callbacks = _callbacks_for_action(result.reply_markup, "csl")
@@ -503,8 +547,20 @@ def test_client_grouped_booking_allows_multiple_participants_across_masters_and_
     action_callbacks = _callbacks_for_action(result.reply_markup, "cga")
     assert action_callbacks
 
+    with engine.begin() as conn:
+        queued = conn.execute(text("SELECT COUNT(*) FROM bookings WHERE organizer_user_id = 20")).scalar_one()
+    assert queued == 0
+
     result = router.handle(telegram_user_id=2000001, data="hb1|cgf")
     assert "Добавлено участников: 2" in result.text
+    # One message for the organizer and one consolidated message per master.
+    recipients = [item["recipient_telegram_user_id"] for item in result.notifications]
+    assert sorted(recipients) == [1000001, 1000002, 2000001]
+    assert all(
+        "Иван" in item["message"] or "Петр" in item["message"]
+        for item in result.notifications
+        if item["recipient_telegram_user_id"] != 2000001
+    )
 
     with engine.begin() as conn:
         rows = conn.execute(
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import sqlite3
 from datetime import UTC, date, datetime, time
+from types import SimpleNamespace
 
+import pytest
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 
+from app.db.session import DATABASE_ASYNC_ENABLED_ENV
+from app.telegram import handlers
 from app.telegram.commands import TelegramCommandService
 
 sqlite3.register_adapter(datetime, lambda value: value.isoformat())
 
 
-def _setup_schema() -> Engine:
-    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+def _setup_schema(url: str = "sqlite+pysqlite:///:memory:") -> Engine:
+    engine = create_engine(url, future=True)
 
     with engine.begin() as conn:
         conn.execute(text("CREATE TABLE roles (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)"))
@@ -199,6 +204,57 @@ def test_master_schedule_commands_and_cancel_mapping() -> None:
     assert len(cancelled.notifications) == 2
 
 
+def test_master_import_replies_with_row_report_and_is_role_protected() -> None:
+    service = TelegramCommandService(_setup_schema())
+    content = "slot_start,service_type,client_name\n2026-03-02T10:00:00+00:00,haircut,Анна\nnope,haircut,Борис\n"
+
+    denied = service.master_import(telegram_user_id=2000001, content=content, filename="import.csv")
+    assert "Недостаточно прав" in denied.text
+    assert service.is_command_allowed(telegram_user_id=2000001, command="master:schedule") is False
+    assert service.is_command_allowed(telegram_user_id=1000001, command="master:schedule") is True
+
+    result = service.master_import(telegram_user_id=1000001, content=content, filename="import.csv")
+    assert result.text.splitlines() == [
+        "Импорт ручных записей: создано 1, отклонено 1.",
+        "- строка 2: Строка не распознана: нужны slot_start, service_type и client_name.",
+    ]
+
+
+def test_master_import_handler_ignores_documents_from_non_masters(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    # File-backed, since the handler runs the service on an executor thread.
+    service = TelegramCommandService(_setup_schema(f"sqlite+pysqlite:///{tmp_path / 'bot.db'}"))
+    monkeypatch.setenv(DATABASE_ASYNC_ENABLED_ENV, "false")
+    monkeypatch.setattr(handlers, "_service", lambda: service)
+    downloads: list[int] = []
+    answers: list[str] = []
+
+    async def _download(document, destination) -> None:  # type: ignore[no-untyped-def]
+        downloads.append(document.file_size)
+        destination.write(b"slot_start,service_type,client_name\n")
+
+    async def _answer(text: str, reply_markup=None) -> None:  # type: ignore[no-untyped-def]
+        answers.append(text)
+
+    def _document_from(telegram_user_id: int) -> SimpleNamespace:
+        return SimpleNamespace(
+            from_user=SimpleNamespace(id=telegram_user_id),
+            document=SimpleNamespace(file_size=64, file_name="import.csv"),
+            bot=SimpleNamespace(download=_download),
+            answer=_answer,
+        )
+
+    try:
+        asyncio.run(handlers.master_import(_document_from(2000001)))  # type: ignore[arg-type]
+        assert downloads == []
+        assert answers == []
+
+        asyncio.run(handlers.master_import(_document_from(1000001)))  # type: ignore[arg-type]
+        assert downloads == [64]
+        assert len(answers) == 1
+    finally:
+        handlers.shutdown_handler_executor()
+
+
 def test_client_slots_command_formats_slots() -> None:
     service = TelegramCommandService(_setup_schema())
 
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.observability import render_metrics
+from app.telegram.executor import TelegramHandlerExecutor, resolve_handler_worker_count
+
+
+def test_resolve_handler_worker_count_defaults_and_validation() -> None:
+    assert resolve_handler_worker_count(None) == 4
+    assert resolve_handler_worker_count(" 8 ") == 8
+    with pytest.raises(ValueError):
+        resolve_handler_worker_count("0")
+    with pytest.raises(ValueError):
+        resolve_handler_worker_count("many")
+
+
+def test_executor_preserves_per_user_order() -> None:
+    executor = TelegramHandlerExecutor(max_workers=4)
+    applied: list[int] = []
+
+    def _operation(index: int) -> int:
+        # Earlier presses sleep longer; ordering must still follow arrival.
+        time.sleep(0.01 * (5 - index))
+        applied.append(index)
+        return index
+
+    async def _scenario() -> list[int]:
+        return await asyncio.gather(
+            *(
+                executor.run(telegram_user_id=1, kind="callback", operation=lambda index=index: _operation(index))
+                for index in range(5)
+            )
+        )
+
+    try:
+        results = asyncio.run(_scenario())
+    finally:
+        executor.shutdown()
+
+    assert results == [0, 1, 2, 3, 4]
+    assert applied == [0, 1, 2, 3, 4]
+
+
+def test_executor_slow_user_does_not_block_other_users() -> None:
+    executor = TelegramHandlerExecutor(max_workers=2)
+    release_slow = threading.Event()
+
+    def _slow() -> str:
+        release_slow.wait(timeout=5)
+        return "slow"
+
+    async def _scenario() -> tuple[str, str]:
+        slow_task = asyncio.create_task(executor.run(telegram_user_id=1, kind="callback", operation=_slow))
+        fast_result = await asyncio.wait_for(
+            executor.run(telegram_user_id=2, kind="callback", operation=lambda: "fast"),
+            timeout=2,
+        )
+        release_slow.set()
+        return fast_result, await slow_task
+
+    try:
+        assert asyncio.run(_scenario()) == ("fast", "slow")
+    finally:
+        release_slow.set()
+        executor.shutdown()
+
+    payload, _ = render_metrics()
+    body = payload.decode("utf-8")
+    assert "bot_api_telegram_handler_queue_depth 0.0" in body
+    assert "bot_api_telegram_handler_active_workers 0.0" in body
+    assert 'bot_api_telegram_handler_wait_seconds_count{kind="callback"}' in body
+
+
+def test_executor_keeps_user_lock_until_cancelled_call_finishes() -> None:
+    executor = TelegramHandlerExecutor(max_workers=2)
+    release_first = threading.Event()
+    events: list[str] = []
+
+    def _first() -> str:
+        events.append("first:start")
+        release_first.wait(timeout=5)
+        events.append("first:end")
+        return "first"
+
+    def _second() -> str:
+        events.append("second")
+        return "second"
+
+    async def _scenario() -> str:
+        first = asyncio.create_task(executor.run(telegram_user_id=1, kind="callback", operation=_first))
+        while "first:start" not in events:
+            await asyncio.sleep(0.005)
+        first.cancel()
+        second = asyncio.create_task(executor.run(telegram_user_id=1, kind="callback", operation=_second))
+        await asyncio.sleep(0.05)
+        assert events == ["first:start"]
+        release_first.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await asyncio.wait_for(second, timeout=2)
+
+    try:
+        assert asyncio.run(_scenario()) == "second"
+    finally:
+        release_first.set()
+        executor.shutdown()
+    assert events == ["first:start", "first:end", "second"]
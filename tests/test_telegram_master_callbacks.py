@@ -4,10 +4,11 @@ import re
 import sqlite3
 from datetime import UTC, date, datetime, time, timedelta
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
 
 from app.telegram.callbacks import TelegramCallbackRouter
+from app.timezone import business_now, combine_business_date_time
 
 sqlite3.register_adapter(datetime, lambda value: value.isoformat())
 sqlite3.register_adapter(time, lambda value: value.isoformat())
@@ -239,6 +240,49 @@ def test_master_interactive_schedule_dayoff_lunch_manual_flow() -> None:
     assert re.search(r"\d{2}:\d{2}-\d{2}:\d{2}", result.text)
 
 
+def test_master_week_view_loads_seven_days_with_one_range_query() -> None:
+    engine = _setup_flow_schema()
+    router = TelegramCallbackRouter(engine)
+    router.seed_root_menu(telegram_user_id=1000001)
+    tomorrow = business_now().date() + timedelta(days=1)
+    _create_client_booking(engine, slot_start=combine_business_date_time(tomorrow, time(10, 0)))
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO availability_blocks (master_id, block_type, start_at, end_at, reason)
+                VALUES (1, 'day_off', :start_at, :end_at, 'off')
+                """
+            ),
+            {
+                "start_at": combine_business_date_time(tomorrow + timedelta(days=1), time(0, 0)),
+                "end_at": combine_business_date_time(tomorrow + timedelta(days=2), time(0, 0)),
+            },
+        )
+    router.handle(telegram_user_id=1000001, data="hb1|mm")
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(str(args[2])))
+
+    result = router.handle(telegram_user_id=1000001, data="hb1|mwv")
+
+    assert sum("FROM bookings" in statement for statement in statements) == 1
+    lines = result.text.splitlines()
+    assert lines[0].startswith("Неделя ")
+    tomorrow_line = next(line for line in lines if tomorrow.strftime("%d.%m") in line and "записей" in line)
+    assert "записей: 1" in tomorrow_line
+    assert "свободно: 11:00-13:00, 14:00-21:00" in tomorrow_line
+    assert "выходной" in next(
+        line for line in lines if (tomorrow + timedelta(days=1)).strftime("%d.%m") in line and "записей" in line
+    )
+    assert len([line for line in lines if "записей:" in line]) == 7
+
+    next_week = _callbacks_for_action(result.reply_markup, "mwv")
+    assert next_week == [f"hb1|mwv|{(tomorrow + timedelta(days=6)).strftime('%Y%m%d')}"]
+    result = router.handle(telegram_user_id=1000001, data=next_week[0])
+    assert "Неделя" in result.text
+    assert len(_callbacks_for_action(result.reply_markup, "mwv")) == 2
+
+
 def test_start_menu_lands_master_directly_with_greeting() -> None:
     router = TelegramCallbackRouter(_setup_flow_schema())
 
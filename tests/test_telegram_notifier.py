@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.telegram.notifier import RateLimitedNotificationSender, resolve_notify_rate_per_second
+
+
+def test_resolve_notify_rate_defaults_and_validation() -> None:
+    assert resolve_notify_rate_per_second(None) == 20.0
+    assert resolve_notify_rate_per_second(" 5 ") == 5.0
+    with pytest.raises(ValueError):
+        resolve_notify_rate_per_second("0")
+    with pytest.raises(ValueError):
+        resolve_notify_rate_per_second("fast")
+
+
+def test_sender_paces_fan_out_and_skips_failed_sends() -> None:
+    clock = [100.0]
+    sent: list[tuple[float, int, str]] = []
+
+    async def _sleep(seconds: float) -> None:
+        clock[0] += seconds
+
+    async def _send(recipient: int, message: str) -> None:
+        if recipient == 2:
+            raise RuntimeError("blocked by user")
+        sent.append((clock[0], recipient, message))
+
+    async def _scenario() -> int:
+        sender = RateLimitedNotificationSender(send=_send, rate_per_second=4, clock=lambda: clock[0], sleep=_sleep)
+        queued = sender.enqueue((recipient, f"m{recipient}") for recipient in range(1, 6))
+        await asyncio.wait_for(sender.join(), timeout=2)
+        sender.shutdown()
+        return queued
+
+    assert asyncio.run(_scenario()) == 5
+    assert [(recipient, message) for _, recipient, message in sent] == [(1, "m1"), (3, "m3"), (4, "m4"), (5, "m5")]
+    assert [at - 100.0 for at, _, _ in sent] == [0.0, 0.5, 0.75, 1.0]
+
+
+def test_sender_close_drains_queue_and_counts_what_is_left_after_timeout() -> None:
+    sent: list[int] = []
+
+    async def _send(recipient: int, message: str) -> None:
+        sent.append(recipient)
+
+    async def _drained() -> int:
+        sender = RateLimitedNotificationSender(send=_send, rate_per_second=1000)
+        sender.enqueue((recipient, "m") for recipient in range(1, 4))
+        return await sender.close(timeout_seconds=2)
+
+    assert asyncio.run(_drained()) == 0
+    assert sent == [1, 2, 3]
+
+    async def _stalled_send(recipient: int, message: str) -> None:
+        await asyncio.sleep(60)
+
+    async def _timed_out() -> int:
+        sender = RateLimitedNotificationSender(send=_stalled_send, rate_per_second=1000)
+        sender.enqueue((recipient, "m") for recipient in range(1, 4))
+        return await sender.close(timeout_seconds=0.05)
+
+    # The first notification is in flight when the worker is cancelled; the other two never left the queue.
+    assert asyncio.run(_timed_out()) == 2
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, time, timedelta
 
 import pytest
 
-from app.telegram.callbacks import BOOKING_DATE_HORIZON_DAYS, build_booking_date_markup, build_client_date_markup, build_slot_markup
-from app.telegram.presentation import chunk_inline_buttons, format_ru_datetime, format_ru_slot_range
+from app.telegram.callbacks import (
+    BOOKING_DATE_HORIZON_DAYS,
+    FULL_DAY_LABEL_PREFIX,
+    build_booking_date_markup,
+    build_client_date_markup,
+    build_client_master_markup,
+    build_slot_markup,
+)
+from app.timezone import business_now, combine_business_date_time
+from app.telegram.presentation import (
+    chunk_inline_buttons,
+    format_ru_datetime,
+    format_ru_next_free,
+    format_ru_slot_range,
+)
 
 
 def _button_texts(markup) -> list[str]:
@@ -27,6 +40,28 @@ def test_format_ru_datetime_output() -> None:
     assert format_ru_datetime(value) == "11.02.2026 18:45"
 
 
+def test_format_ru_next_free_names_today_and_tomorrow() -> None:
+    today = datetime(2026, 2, 11).date()
+    at_today = combine_business_date_time(today, time(17, 30))
+    assert format_ru_next_free(at_today, today=today) == "сегодня 17:30"
+    assert format_ru_next_free(at_today + timedelta(days=1), today=today) == "завтра 17:30"
+    assert format_ru_next_free(at_today + timedelta(days=3), today=today) == "14.02.2026 17:30"
+
+
+def test_build_client_master_markup_appends_next_free_slot_when_known() -> None:
+    slot_start = combine_business_date_time(business_now().date() + timedelta(days=1), time(10, 0))
+    markup = build_client_master_markup(
+        [
+            {"id": 1, "display_name": "Анна", "next_free_at": slot_start.isoformat()},
+            {"id": 2, "display_name": "Борис"},
+        ]
+    )
+
+    labels = _button_texts(markup)
+    assert "Анна · завтра 10:00" in labels
+    assert "Борис" in labels
+
+
 def test_chunk_inline_buttons_splits_rows_by_max_size() -> None:
     from aiogram.types import InlineKeyboardButton
 
@@ -86,3 +121,15 @@ def test_build_booking_date_markup_supports_navigation_for_two_month_horizon() -
     last_labels = _button_texts(markup_last)
     assert "Вперед по датам" not in last_labels
     assert "Назад по датам" in last_labels
+
+
+def test_build_booking_date_markup_marks_full_days_without_dropping_them() -> None:
+    today = business_now().date()
+    full_day = today + timedelta(days=2)
+    markup = build_booking_date_markup(date_action="csd", page_action="cdp", page=0, full_dates=frozenset({full_day}))
+    date_buttons = [button for row in markup.inline_keyboard for button in row if button.text.count(".") == 2]
+
+    assert len(date_buttons) == 7
+    marked = [button for button in date_buttons if button.text.startswith(FULL_DAY_LABEL_PREFIX)]
+    assert len(marked) == 1
+    assert marked[0].callback_data.endswith(full_day.strftime("%Y%m%d"))
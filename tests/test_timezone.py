@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-from datetime import UTC, date, datetime
+from datetime import UTC, date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
 
 import pytest
 
 from app.booking.guardrails import same_day_min_slot_start
 from app.telegram.presentation import format_ru_datetime, format_ru_slot_range
 from app.timezone import (
+    BusinessCalendar,
+    business_date,
     business_day_bounds,
+    combine_business_date_time,
+    configure_business_calendar,
+    get_business_calendar,
     get_business_timezone,
     resolve_business_timezone,
 )
@@ -55,3 +61,31 @@ def test_business_day_bounds_handle_berlin_dst_fall_back(monkeypatch: pytest.Mon
 
     day_start, day_end = business_day_bounds(date(2026, 10, 25))
     assert (day_end - day_start).total_seconds() == 25 * 3600
+
+
+def test_business_calendar_matches_zoneinfo_across_dst_transitions() -> None:
+    timezone = ZoneInfo("Europe/Berlin")
+    calendar = BusinessCalendar(timezone)
+    calendar.precompute(date(2026, 3, 27), 5)
+
+    assert calendar.combine(date(2026, 3, 29), time(10, 0)) == datetime(2026, 3, 29, 8, 0, tzinfo=UTC)
+    assert calendar.combine(date(2026, 3, 28), time(10, 0)) == datetime(2026, 3, 28, 9, 0, tzinfo=UTC)
+    value = datetime(2026, 10, 24, 20, 0, tzinfo=UTC)
+    for _ in range(24 * 4 * 3):
+        assert calendar.business_date(value) == value.astimezone(timezone).date()
+        value += timedelta(minutes=15)
+
+
+def test_configured_business_calendar_is_reused_until_reset(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BUSINESS_TIMEZONE", "Europe/Moscow")
+    calendar = get_business_calendar()
+    assert get_business_calendar() is calendar
+
+    configure_business_calendar(calendar)
+    try:
+        monkeypatch.setenv("BUSINESS_TIMEZONE", "UTC")
+        assert combine_business_date_time(date(2026, 2, 10), time(10, 0)) == datetime(2026, 2, 10, 7, 0, tzinfo=UTC)
+        assert business_date(datetime(2026, 2, 10, 21, 30, tzinfo=UTC)) == date(2026, 2, 11)
+    finally:
+        configure_business_calendar(None)
+    assert str(get_business_timezone()) == "UTC"